@@ -1,5 +1,22 @@
 """ユースケースのパッケージ."""
 
+from .ad_copy_batch_job_usecase import (
+    GetAdCopyBatchJobResultsUseCase,
+    GetAdCopyBatchJobUseCase,
+    SubmitAdCopyBatchJobUseCase,
+)
+from .generate_ad_copy_batch_usecase import GenerateAdCopyBatchUseCase
 from .generate_ad_copy_usecase import GenerateAdCopyUseCase
+from .generation_job_usecase import GetGenerationJobUseCase, SubmitGenerationJobUseCase
+from .stream_ad_copy_usecase import StreamAdCopyUseCase
 
-__all__ = ["GenerateAdCopyUseCase"]
\ No newline at end of file
+__all__ = [
+    "GenerateAdCopyBatchUseCase",
+    "GenerateAdCopyUseCase",
+    "GetAdCopyBatchJobResultsUseCase",
+    "GetAdCopyBatchJobUseCase",
+    "GetGenerationJobUseCase",
+    "StreamAdCopyUseCase",
+    "SubmitAdCopyBatchJobUseCase",
+    "SubmitGenerationJobUseCase",
+]
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""非同期一括生成ジョブのユースケース."""
+
+from typing import List, Sequence
+
+from app.domain.entities import AdCopyBatchItemResult, AdCopyBatchJob, AdInput
+from app.domain.exceptions import AdGenerationError, DomainError, InvalidInputError
+from app.domain.repositories import AdBatchJobRepository
+
+
+class SubmitAdCopyBatchJobUseCase:
+    """一括生成ジョブ登録ユースケース."""
+
+    def __init__(self, ad_batch_job_repository: AdBatchJobRepository) -> None:
+        self._ad_batch_job_repository = ad_batch_job_repository
+
+    async def execute(self, ad_inputs: Sequence[AdInput]) -> AdCopyBatchJob:
+        """一括生成ジョブを登録する.
+
+        Args:
+            ad_inputs: 広告文生成のための入力データのリスト
+
+        Returns:
+            登録されたジョブ
+
+        Raises:
+            InvalidInputError: 入力データが空の場合
+            AdGenerationError: ジョブの登録に失敗した場合
+        """
+        if not ad_inputs:
+            raise InvalidInputError("入力データは最低1件必要です")
+
+        try:
+            return await self._ad_batch_job_repository.submit(ad_inputs)
+        except DomainError:
+            raise
+        except Exception as e:
+            raise AdGenerationError(f"ジョブの登録中にエラーが発生しました: {str(e)}") from e
+
+
+class GetAdCopyBatchJobUseCase:
+    """一括生成ジョブ状態取得ユースケース."""
+
+    def __init__(self, ad_batch_job_repository: AdBatchJobRepository) -> None:
+        self._ad_batch_job_repository = ad_batch_job_repository
+
+    async def execute(self, job_id: str) -> AdCopyBatchJob:
+        """ジョブの最新の状態を取得する.
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+        """
+        return await self._ad_batch_job_repository.get_job(job_id)
+
+
+class GetAdCopyBatchJobResultsUseCase:
+    """一括生成ジョブ結果取得ユースケース."""
+
+    def __init__(self, ad_batch_job_repository: AdBatchJobRepository) -> None:
+        self._ad_batch_job_repository = ad_batch_job_repository
+
+    async def execute(self, job_id: str) -> List[AdCopyBatchItemResult]:
+        """完了したジョブの生成結果を取得する.
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+            JobNotReadyError: ジョブが完了していない場合
+        """
+        return await self._ad_batch_job_repository.get_results(job_id)
@@ -0,0 +1,62 @@
+"""広告文一括生成ユースケース."""
+
+import asyncio
+from typing import List, Optional, Sequence
+
+from app.application.usecases.generate_ad_copy_usecase import GenerateAdCopyUseCase
+from app.domain.entities import AdCopyBatchItemResult, AdInput
+from app.domain.exceptions import DomainError
+
+
+class GenerateAdCopyBatchUseCase:
+    """広告文一括生成ユースケース."""
+
+    def __init__(
+        self,
+        generate_ad_copy_usecase: GenerateAdCopyUseCase,
+        max_concurrency: int,
+        global_limiter: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        """ユースケースを初期化する.
+
+        Args:
+            generate_ad_copy_usecase: 1件分の広告文生成ユースケース
+            max_concurrency: 1回の一括生成で同時に実行する件数の上限
+            global_limiter: 全ての一括生成で共有する同時実行数の制限
+        """
+        self._generate_ad_copy_usecase = generate_ad_copy_usecase
+        self._max_concurrency = max_concurrency
+        self._global_limiter = global_limiter
+
+    async def execute(self, ad_inputs: Sequence[AdInput]) -> List[AdCopyBatchItemResult]:
+        """複数の入力に対して広告文生成を実行する.
+
+        Args:
+            ad_inputs: 広告文生成のための入力データのリスト
+
+        Returns:
+            入力と同じ順序の生成結果のリスト。失敗した入力にはエラーが設定される
+        """
+        results: List[Optional[AdCopyBatchItemResult]] = [None] * len(ad_inputs)
+        pending = iter(enumerate(ad_inputs))
+
+        async def worker() -> None:
+            for index, ad_input in pending:
+                results[index] = await self._execute_item(index, ad_input)
+
+        # 固定数のワーカーで入力を順に取り出し、件数によらずタスク数を一定に保つ
+        num_workers = min(self._max_concurrency, len(ad_inputs))
+        await asyncio.gather(*(worker() for _ in range(num_workers)))
+
+        return [result for result in results if result is not None]
+
+    async def _execute_item(self, index: int, ad_input: AdInput) -> AdCopyBatchItemResult:
+        try:
+            if self._global_limiter is None:
+                ad_copies = await self._generate_ad_copy_usecase.execute(ad_input)
+            else:
+                async with self._global_limiter:
+                    ad_copies = await self._generate_ad_copy_usecase.execute(ad_input)
+            return AdCopyBatchItemResult(index=index, ad_copies=ad_copies)
+        except DomainError as e:
+            return AdCopyBatchItemResult(index=index, error=e)
@@ -3,7 +3,7 @@
 from typing import List
 
 from app.domain.entities import AdCopy, AdInput
-from app.domain.exceptions import AdGenerationError, InvalidInputError
+from app.domain.exceptions import AdGenerationError, DomainError, InvalidInputError
 from app.domain.repositories import AdGenerationRepository
 
 
@@ -35,6 +35,9 @@ class GenerateAdCopyUseCase:
             
             return ad_copies
             
+        except DomainError:
+            # 再試行の可否や待ち時間などの情報を保ったまま伝える
+            raise
         except ValueError as e:
             raise InvalidInputError(str(e)) from e
         except Exception as e:
@@ -0,0 +1,46 @@
+"""キューで非同期に処理する広告文生成ジョブのユースケース."""
+
+from app.domain.entities import AdInput, GenerationJob
+from app.domain.exceptions import AdGenerationError, DomainError
+from app.domain.repositories import GenerationJobRepository
+
+
+class SubmitGenerationJobUseCase:
+    """広告文生成ジョブ登録ユースケース."""
+
+    def __init__(self, generation_job_repository: GenerationJobRepository) -> None:
+        self._generation_job_repository = generation_job_repository
+
+    async def execute(self, ad_input: AdInput) -> GenerationJob:
+        """広告文生成ジョブをキューに登録する.
+
+        Args:
+            ad_input: 広告文生成のための入力データ
+
+        Returns:
+            登録されたジョブ
+
+        Raises:
+            AdGenerationError: ジョブの登録に失敗した場合
+        """
+        try:
+            return await self._generation_job_repository.submit(ad_input)
+        except DomainError:
+            raise
+        except Exception as e:
+            raise AdGenerationError(f"ジョブの登録中にエラーが発生しました: {str(e)}") from e
+
+
+class GetGenerationJobUseCase:
+    """広告文生成ジョブ取得ユースケース."""
+
+    def __init__(self, generation_job_repository: GenerationJobRepository) -> None:
+        self._generation_job_repository = generation_job_repository
+
+    async def execute(self, job_id: str) -> GenerationJob:
+        """ジョブの最新の状態と結果を取得する.
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+        """
+        return await self._generation_job_repository.get_job(job_id)
@@ -0,0 +1,43 @@
+"""広告文ストリーミング生成ユースケース."""
+
+from typing import AsyncIterator
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import AdGenerationError, DomainError, InvalidInputError
+from app.domain.repositories import AdGenerationRepository
+
+
+class StreamAdCopyUseCase:
+    """広告文ストリーミング生成ユースケース."""
+
+    def __init__(self, ad_generation_repository: AdGenerationRepository) -> None:
+        self._ad_generation_repository = ad_generation_repository
+
+    async def execute(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """広告文を生成し、生成できたものから順に返す.
+
+        Args:
+            ad_input: 広告文生成のための入力データ
+
+        Yields:
+            生成された広告文
+
+        Raises:
+            InvalidInputError: 入力データが不正な場合
+            AdGenerationError: 広告文生成に失敗した場合
+        """
+        num_generated = 0
+        try:
+            async for ad_copy in self._ad_generation_repository.stream_ad_copies(ad_input):
+                num_generated += 1
+                yield ad_copy
+
+        except DomainError:
+            raise
+        except ValueError as e:
+            raise InvalidInputError(str(e)) from e
+        except Exception as e:
+            raise AdGenerationError(f"広告文生成中にエラーが発生しました: {str(e)}") from e
+
+        if num_generated == 0:
+            raise AdGenerationError("広告文の生成に失敗しました")
@@ -1,13 +1,83 @@
 """�X'�en-�."""
 
+import asyncio
 from functools import lru_cache
+from typing import Optional
 
 from fastapi import Depends
 
-from app.application.usecases import GenerateAdCopyUseCase
-from app.domain.repositories import AdGenerationRepository
+from app.application.usecases import (
+    GenerateAdCopyBatchUseCase,
+    GenerateAdCopyUseCase,
+    GetAdCopyBatchJobResultsUseCase,
+    GetAdCopyBatchJobUseCase,
+    GetGenerationJobUseCase,
+    StreamAdCopyUseCase,
+    SubmitAdCopyBatchJobUseCase,
+    SubmitGenerationJobUseCase,
+)
+from app.domain.repositories import (
+    AdBatchJobRepository,
+    AdGenerationRepository,
+    GenerationJobRepository,
+)
+from app.domain.services import (
+    AdCopyFanOutService,
+    AdCopyRankingService,
+    NearDuplicateDetector,
+)
+from app.infrastructure.admission import AdmissionController
+from app.infrastructure.batch import (
+    AnthropicMessageBatchBackend,
+    LocalMessageBatchBackend,
+    MessageBatchBackend,
+    SQLiteBatchJobStore,
+)
+from app.infrastructure.cache import (
+    CacheBackend,
+    CachedAdGenerationRepository,
+    InMemoryLRUCacheBackend,
+    SingleFlightAdGenerationRepository,
+    SQLiteCacheBackend,
+)
+from app.infrastructure.clients.claude_batch_client import ClaudeBatchJobRepository
 from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.clients.client_pool import AnthropicClientPool
+from app.infrastructure.clients.fan_out_repository import FanOutAdGenerationRepository
+from app.infrastructure.clients.max_tokens import MaxTokensEstimator
 from app.infrastructure.config.settings import Settings
+from app.infrastructure.idempotency import (
+    IdempotencyCoordinator,
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+)
+from app.infrastructure.jobs import (
+    GenerationJobWorkerPool,
+    QueuedGenerationJobRepository,
+    SQLiteJobQueue,
+)
+from app.infrastructure.model_routing import ModelProfile, ModelRouter, RoutingPolicy
+from app.infrastructure.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    RateLimitStore,
+    SQLiteRateLimitStore,
+)
+from app.infrastructure.resilience import (
+    CircuitBreaker,
+    LatencyTracker,
+    ResilientAdGenerationRepository,
+    RetryPolicy,
+)
+from app.infrastructure.tracing import (
+    JSONLinesSpanExporter,
+    OpenTelemetryTracer,
+    RecordingTracer,
+    Tracer,
+    configure_tracing,
+    get_tracer,
+)
 
 
 @lru_cache()
@@ -16,15 +86,521 @@ def get_settings() -> Settings:
     return Settings()
 
 
-def get_ad_generation_repository(
+@lru_cache()
+def get_client_pool(
+    settings: Settings = Depends(get_settings),
+) -> AnthropicClientPool:
+    """Get the process-wide Anthropic client pool."""
+    return AnthropicClientPool(
+        api_key=settings.anthropic_api_key,
+        max_connections=settings.claude_max_connections,
+        max_keepalive_connections=settings.claude_max_keepalive_connections,
+        keepalive_expiry=settings.claude_keepalive_expiry_seconds,
+        http2=settings.claude_http2,
+        use_sync_client=settings.claude_use_sync_client,
+        base_url=settings.claude_base_url,
+    )
+
+
+@lru_cache()
+def get_cache_backend(
+    settings: Settings = Depends(get_settings),
+) -> Optional[CacheBackend]:
+    """Get the generation result cache backend."""
+    if settings.cache_backend == "memory":
+        return InMemoryLRUCacheBackend(
+            max_entries=settings.cache_max_entries,
+            ttl_seconds=settings.cache_ttl_seconds,
+        )
+    if settings.cache_backend == "sqlite":
+        return SQLiteCacheBackend(
+            path=settings.cache_sqlite_path,
+            max_entries=settings.cache_max_entries,
+            ttl_seconds=settings.cache_ttl_seconds,
+        )
+    return None
+
+
+@lru_cache()
+def get_rate_limiter(
+    settings: Settings = Depends(get_settings),
+) -> Optional[RateLimiter]:
+    """Get the client-side rate limiter for Claude API calls."""
+    requests_per_minute = settings.rate_limit_requests_per_minute
+    tokens_per_minute = settings.rate_limit_tokens_per_minute
+    if requests_per_minute <= 0 and tokens_per_minute <= 0:
+        return None
+
+    limits = {
+        "requests_per_minute": requests_per_minute if requests_per_minute > 0 else None,
+        "tokens_per_minute": tokens_per_minute if tokens_per_minute > 0 else None,
+    }
+    store: RateLimitStore
+    if settings.rate_limit_backend == "sqlite":
+        store = SQLiteRateLimitStore(path=settings.rate_limit_sqlite_path, **limits)
+    else:
+        store = InMemoryRateLimitStore(**limits)
+    return RateLimiter(store, bulk_reserve_ratio=settings.rate_limit_bulk_reserve_ratio)
+
+
+def create_model_router(settings: Settings) -> ModelRouter:
+    """Create the router that picks a Claude model for each request."""
+    names = dict.fromkeys(settings.claude_models + settings.claude_fast_models)
+    return ModelRouter(
+        [
+            ModelProfile.from_name(
+                name,
+                max_tokens=settings.claude_max_tokens,
+                temperature=settings.claude_temperature,
+            )
+            for name in names
+        ],
+        RoutingPolicy(
+            quality_models=settings.claude_models,
+            fast_models=settings.claude_fast_models,
+            fast_max_copies=settings.claude_fast_max_copies,
+            fast_tones=frozenset(settings.claude_fast_tones),
+        ),
+        latency_budget=(
+            settings.model_routing_latency_budget_seconds
+            if settings.model_routing_latency_budget_seconds > 0
+            else None
+        ),
+        latency_quantile=settings.model_routing_latency_quantile,
+        cost_budget=(
+            settings.model_routing_cost_budget_usd
+            if settings.model_routing_cost_budget_usd > 0
+            else None
+        ),
+        min_samples=settings.model_routing_min_samples,
+        throttle_cooldown=settings.model_routing_throttle_cooldown_seconds,
+    )
+
+
+@lru_cache()
+def get_claude_repository(
+    settings: Settings = Depends(get_settings),
+    client_pool: AnthropicClientPool = Depends(get_client_pool),
+    rate_limiter: Optional[RateLimiter] = Depends(get_rate_limiter),
+) -> ClaudeAdGenerationRepository:
+    """Get the Claude repository.
+
+    The repository is shared by every request in the process so that its
+    concurrency limit applies to the whole worker.
+    """
+    # Retries are handled by the resilient repository, so the SDK must not retry as well.
+    # The client is created on first use so that startup does not import anthropic.
+    return ClaudeAdGenerationRepository(
+        client_factory=lambda: client_pool.client.with_options(max_retries=0),
+        timeout=settings.claude_timeout_seconds,
+        max_concurrency=settings.claude_max_concurrency,
+        rate_limiter=rate_limiter,
+        prompt_cache=settings.claude_prompt_cache,
+        structured_output=settings.claude_structured_output,
+        model_router=create_model_router(settings),
+        max_tokens_estimator=MaxTokensEstimator(
+            default_tokens_per_copy=settings.claude_max_tokens_per_copy,
+            headroom=settings.claude_max_tokens_headroom,
+        ),
+        max_continuations=settings.claude_max_continuations,
+        latency_tracker=LatencyTracker(min_samples=settings.hedge_min_samples),
+    )
+
+
+@lru_cache()
+def get_resilient_repository(
+    settings: Settings = Depends(get_settings),
+    claude_repository: ClaudeAdGenerationRepository = Depends(get_claude_repository),
+) -> ResilientAdGenerationRepository:
+    """Get the repository that retries, hedges and sheds Claude calls."""
+    return ResilientAdGenerationRepository(
+        claude_repository,
+        retry_policy=RetryPolicy(
+            max_retries=settings.claude_max_retries,
+            base_delay=settings.claude_retry_base_delay_seconds,
+            max_delay=settings.claude_retry_max_delay_seconds,
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout=settings.circuit_breaker_reset_seconds,
+        ),
+        deadline=settings.claude_deadline_seconds if settings.claude_deadline_seconds > 0 else None,
+        hedge_quantile=settings.hedge_quantile if settings.hedge_enabled else None,
+        # Hedge on upstream latency only, and only when a hedge could start right away
+        latency_tracker=claude_repository.latency_tracker,
+        record_latency=False,
+        has_capacity=claude_repository.has_free_capacity,
+    )
+
+
+@lru_cache()
+def get_ranking_service(
     settings: Settings = Depends(get_settings),
+) -> AdCopyRankingService:
+    """Get the service that deduplicates and ranks generated copies."""
+    detector = None
+    if settings.near_duplicate_filter:
+        detector = NearDuplicateDetector(threshold=settings.near_duplicate_threshold)
+    return AdCopyRankingService(near_duplicate_detector=detector)
+
+
+@lru_cache()
+def get_fan_out_service(
+    settings: Settings = Depends(get_settings),
+    ranking_service: AdCopyRankingService = Depends(get_ranking_service),
+) -> AdCopyFanOutService:
+    """Get the service that splits large generations into smaller calls."""
+    return AdCopyFanOutService(
+        max_copies_per_call=settings.fan_out_max_copies_per_call,
+        ranking_service=ranking_service,
+    )
+
+
+@lru_cache()
+def get_fan_out_repository(
+    settings: Settings = Depends(get_settings),
+    resilient_repository: ResilientAdGenerationRepository = Depends(get_resilient_repository),
+    fan_out_service: AdCopyFanOutService = Depends(get_fan_out_service),
+    ranking_service: AdCopyRankingService = Depends(get_ranking_service),
+) -> FanOutAdGenerationRepository:
+    """Get the repository that fans large generations out in parallel."""
+    return FanOutAdGenerationRepository(
+        resilient_repository,
+        fan_out_service=fan_out_service,
+        ranking_service=ranking_service,
+        top_up=settings.fan_out_top_up,
+    )
+
+
+@lru_cache()
+def get_single_flight_repository(
+    fan_out_repository: FanOutAdGenerationRepository = Depends(get_fan_out_repository),
+) -> SingleFlightAdGenerationRepository:
+    """Get the repository that coalesces concurrent duplicate generations."""
+    return SingleFlightAdGenerationRepository(fan_out_repository)
+
+
+@lru_cache()
+def get_ad_generation_repository(
+    single_flight_repository: SingleFlightAdGenerationRepository = Depends(
+        get_single_flight_repository
+    ),
+    cache_backend: Optional[CacheBackend] = Depends(get_cache_backend),
+    ranking_service: AdCopyRankingService = Depends(get_ranking_service),
 ) -> AdGenerationRepository:
-    """Get ad generation repository."""
-    return ClaudeAdGenerationRepository(api_key=settings.anthropic_api_key)
+    """Get ad generation repository.
+
+    Cached copies are shared by requests that differ only in numCopies.
+    """
+    repository: AdGenerationRepository = single_flight_repository
+    if cache_backend is not None:
+        repository = CachedAdGenerationRepository(
+            repository, cache_backend, ranking_service=ranking_service
+        )
+    return repository
+
+
+@lru_cache()
+def get_idempotency_store(
+    settings: Settings = Depends(get_settings),
+) -> Optional[IdempotencyStore]:
+    """Get the store of results replayed for Idempotency-Key retries (None when disabled)."""
+    if settings.idempotency_backend == "memory":
+        return InMemoryIdempotencyStore(
+            max_entries=settings.idempotency_max_entries,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+        )
+    if settings.idempotency_backend == "sqlite":
+        return SQLiteIdempotencyStore(
+            path=settings.idempotency_sqlite_path,
+            max_entries=settings.idempotency_max_entries,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+        )
+    return None
+
+
+@lru_cache()
+def get_idempotency_coordinator(
+    store: Optional[IdempotencyStore] = Depends(get_idempotency_store),
+) -> Optional[IdempotencyCoordinator]:
+    """Get the coordinator that runs each Idempotency-Key once (None when disabled)."""
+    if store is None:
+        return None
+    return IdempotencyCoordinator(store)
+
+
+@lru_cache()
+def get_admission_controller(
+    settings: Settings = Depends(get_settings),
+) -> Optional[AdmissionController]:
+    """Get the admission controller for generation requests (None when disabled).
+
+    Generations beyond the upstream concurrency limit share its slots, so the
+    limit is used as the capacity.
+    """
+    if not settings.admission_control:
+        return None
+    return AdmissionController(
+        capacity=settings.claude_max_concurrency,
+        deadline=settings.admission_deadline_seconds,
+        max_in_flight=settings.admission_max_in_flight if settings.admission_max_in_flight > 0 else None,
+        smoothing=settings.admission_latency_smoothing,
+    )
+
+
+@lru_cache()
+def get_batch_job_store(
+    settings: Settings = Depends(get_settings),
+) -> SQLiteBatchJobStore:
+    """Get the store that keeps batch job state."""
+    return SQLiteBatchJobStore(path=settings.batch_job_store_path)
+
+
+@lru_cache()
+def get_message_batch_backend(
+    settings: Settings = Depends(get_settings),
+    client_pool: AnthropicClientPool = Depends(get_client_pool),
+    rate_limiter: Optional[RateLimiter] = Depends(get_rate_limiter),
+) -> MessageBatchBackend:
+    """Get the message batch backend."""
+    if settings.batch_job_backend == "local":
+        return LocalMessageBatchBackend(
+            client=client_pool.client,
+            max_concurrency=settings.batch_job_local_max_concurrency,
+            rate_limiter=rate_limiter,
+        )
+    return AnthropicMessageBatchBackend(client=client_pool.client)
+
+
+@lru_cache()
+def get_batch_job_repository(
+    claude_repository: ClaudeAdGenerationRepository = Depends(get_claude_repository),
+    backend: MessageBatchBackend = Depends(get_message_batch_backend),
+    store: SQLiteBatchJobStore = Depends(get_batch_job_store),
+    fan_out_service: AdCopyFanOutService = Depends(get_fan_out_service),
+) -> AdBatchJobRepository:
+    """Get batch job repository."""
+    return ClaudeBatchJobRepository(
+        claude_repository=claude_repository,
+        backend=backend,
+        store=store,
+        fan_out_service=fan_out_service,
+    )
+
+
+@lru_cache()
+def get_job_queue(
+    settings: Settings = Depends(get_settings),
+) -> SQLiteJobQueue:
+    """Get the durable queue of background generation jobs."""
+    return SQLiteJobQueue(path=settings.job_queue_path, max_attempts=settings.job_max_attempts)
+
+
+@lru_cache()
+def get_job_worker_pool(
+    settings: Settings = Depends(get_settings),
+    queue: SQLiteJobQueue = Depends(get_job_queue),
+    repository: AdGenerationRepository = Depends(get_ad_generation_repository),
+) -> GenerationJobWorkerPool:
+    """Get the worker pool that drains the job queue (started on application startup)."""
+    return GenerationJobWorkerPool(
+        queue=queue,
+        usecase=GenerateAdCopyUseCase(ad_generation_repository=repository),
+        num_workers=settings.job_workers,
+        visibility_timeout=settings.job_visibility_timeout_seconds,
+        poll_interval=settings.job_poll_interval_seconds,
+        retry_policy=RetryPolicy(
+            base_delay=settings.job_retry_base_delay_seconds,
+            max_delay=settings.job_retry_max_delay_seconds,
+        ),
+    )
+
+
+@lru_cache()
+def get_generation_job_repository(
+    queue: SQLiteJobQueue = Depends(get_job_queue),
+    worker_pool: GenerationJobWorkerPool = Depends(get_job_worker_pool),
+) -> GenerationJobRepository:
+    """Get generation job repository."""
+    return QueuedGenerationJobRepository(queue, on_submit=worker_pool.notify)
+
+
+def create_tracer(settings: Settings) -> Optional[Tracer]:
+    """Create the tracer selected by the settings (None when tracing is disabled)."""
+    if settings.tracing_exporter == "console":
+        return RecordingTracer(JSONLinesSpanExporter())
+    if settings.tracing_exporter == "file":
+        return RecordingTracer(JSONLinesSpanExporter(path=settings.tracing_file_path))
+    if settings.tracing_exporter == "otel":
+        return OpenTelemetryTracer()
+    return None
+
+
+async def startup_dependencies() -> Optional[GenerationJobWorkerPool]:
+    """Create process-wide resources on application startup.
+
+    Returns the job worker pool started here (None when job workers are disabled),
+    which must be passed back to shutdown_dependencies.
+    """
+    settings = get_settings()
+    configure_tracing(create_tracer(settings))
+    client_pool = get_client_pool(settings=settings)
+    claude_repository = get_claude_repository(
+        settings=settings,
+        client_pool=client_pool,
+        rate_limiter=get_rate_limiter(settings=settings),
+    )
+    if settings.claude_warm_up_on_startup:
+        claude_repository.warm_up()
+    ranking_service = get_ranking_service(settings=settings)
+    fan_out_repository = get_fan_out_repository(
+        settings=settings,
+        resilient_repository=get_resilient_repository(
+            settings=settings, claude_repository=claude_repository
+        ),
+        fan_out_service=get_fan_out_service(
+            settings=settings, ranking_service=ranking_service
+        ),
+        ranking_service=ranking_service,
+    )
+    repository = get_ad_generation_repository(
+        single_flight_repository=get_single_flight_repository(
+            fan_out_repository=fan_out_repository
+        ),
+        cache_backend=get_cache_backend(settings=settings),
+        ranking_service=ranking_service,
+    )
+    if settings.job_workers <= 0:
+        return None
+    job_worker_pool = get_job_worker_pool(
+        settings=settings,
+        queue=get_job_queue(settings=settings),
+        repository=repository,
+    )
+    job_worker_pool.start()
+    return job_worker_pool
+
+
+async def shutdown_dependencies(job_worker_pool: Optional[GenerationJobWorkerPool] = None) -> None:
+    """Close process-wide resources on application shutdown.
+
+    job_worker_pool is the pool returned by startup_dependencies.
+    """
+    settings = get_settings()
+    if job_worker_pool is not None:
+        # Release the leases of in-flight jobs before the queue and the upstream client are closed
+        await job_worker_pool.stop()
+    if get_job_queue.cache_info().currsize:
+        get_job_queue(settings=settings).close()
+    if get_client_pool.cache_info().currsize:
+        await get_client_pool(settings=settings).aclose()
+    if get_cache_backend.cache_info().currsize:
+        cache_backend = get_cache_backend(settings=settings)
+        if isinstance(cache_backend, SQLiteCacheBackend):
+            cache_backend.close()
+    if get_batch_job_store.cache_info().currsize:
+        get_batch_job_store(settings=settings).close()
+    if get_idempotency_store.cache_info().currsize:
+        idempotency_store = get_idempotency_store(settings=settings)
+        if isinstance(idempotency_store, SQLiteIdempotencyStore):
+            idempotency_store.close()
+    if get_rate_limiter.cache_info().currsize:
+        rate_limiter = get_rate_limiter(settings=settings)
+        if rate_limiter is not None and isinstance(rate_limiter.store, SQLiteRateLimitStore):
+            rate_limiter.store.close()
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.shutdown()
+        configure_tracing(None)
+    for dependency in (
+        get_generation_job_repository,
+        get_job_worker_pool,
+        get_job_queue,
+        get_batch_job_repository,
+        get_message_batch_backend,
+        get_batch_job_store,
+        get_admission_controller,
+        get_idempotency_coordinator,
+        get_idempotency_store,
+        get_ad_generation_repository,
+        get_single_flight_repository,
+        get_fan_out_repository,
+        get_fan_out_service,
+        get_ranking_service,
+        get_resilient_repository,
+        get_claude_repository,
+        get_rate_limiter,
+        get_cache_backend,
+        get_client_pool,
+        get_batch_limiter,
+    ):
+        dependency.cache_clear()
 
 
 def get_generate_ad_copy_usecase(
     repository: AdGenerationRepository = Depends(get_ad_generation_repository),
 ) -> GenerateAdCopyUseCase:
     """Get generate ad copy usecase."""
-    return GenerateAdCopyUseCase(ad_generation_repository=repository)
\ No newline at end of file
+    return GenerateAdCopyUseCase(ad_generation_repository=repository)
+
+
+def get_stream_ad_copy_usecase(
+    repository: AdGenerationRepository = Depends(get_ad_generation_repository),
+) -> StreamAdCopyUseCase:
+    """Get stream ad copy usecase."""
+    return StreamAdCopyUseCase(ad_generation_repository=repository)
+
+
+@lru_cache()
+def get_batch_limiter(
+    settings: Settings = Depends(get_settings),
+) -> asyncio.Semaphore:
+    """Get the limiter shared by every batch generation in the process."""
+    return asyncio.Semaphore(settings.batch_global_max_concurrency)
+
+
+def get_generate_ad_copy_batch_usecase(
+    settings: Settings = Depends(get_settings),
+    usecase: GenerateAdCopyUseCase = Depends(get_generate_ad_copy_usecase),
+    batch_limiter: asyncio.Semaphore = Depends(get_batch_limiter),
+) -> GenerateAdCopyBatchUseCase:
+    """Get generate ad copy batch usecase."""
+    return GenerateAdCopyBatchUseCase(
+        generate_ad_copy_usecase=usecase,
+        max_concurrency=settings.batch_max_concurrency,
+        global_limiter=batch_limiter,
+    )
+
+
+def get_submit_batch_job_usecase(
+    repository: AdBatchJobRepository = Depends(get_batch_job_repository),
+) -> SubmitAdCopyBatchJobUseCase:
+    """Get submit batch job usecase."""
+    return SubmitAdCopyBatchJobUseCase(ad_batch_job_repository=repository)
+
+
+def get_batch_job_usecase(
+    repository: AdBatchJobRepository = Depends(get_batch_job_repository),
+) -> GetAdCopyBatchJobUseCase:
+    """Get batch job usecase."""
+    return GetAdCopyBatchJobUseCase(ad_batch_job_repository=repository)
+
+
+def get_batch_job_results_usecase(
+    repository: AdBatchJobRepository = Depends(get_batch_job_repository),
+) -> GetAdCopyBatchJobResultsUseCase:
+    """Get batch job results usecase."""
+    return GetAdCopyBatchJobResultsUseCase(ad_batch_job_repository=repository)
+
+def get_submit_generation_job_usecase(
+    repository: GenerationJobRepository = Depends(get_generation_job_repository),
+) -> SubmitGenerationJobUseCase:
+    """Get submit generation job usecase."""
+    return SubmitGenerationJobUseCase(generation_job_repository=repository)
+
+
+def get_generation_job_usecase(
+    repository: GenerationJobRepository = Depends(get_generation_job_repository),
+) -> GetGenerationJobUseCase:
+    """Get generation job usecase."""
+    return GetGenerationJobUseCase(generation_job_repository=repository)
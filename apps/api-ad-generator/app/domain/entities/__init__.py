@@ -2,6 +2,19 @@
 
 from .ad_copy import AdCopy, AdCopyEvaluation
 from .ad_input import AdInput
+from .batch_item_result import AdCopyBatchItemResult
+from .batch_job import AdCopyBatchJob, BatchJobStatus
+from .generation_job import GenerationJob, GenerationJobStatus
 from .tone import Tone
 
-__all__ = ["AdCopy", "AdCopyEvaluation", "AdInput", "Tone"]
\ No newline at end of file
+__all__ = [
+    "AdCopy",
+    "AdCopyBatchItemResult",
+    "AdCopyBatchJob",
+    "AdCopyEvaluation",
+    "AdInput",
+    "BatchJobStatus",
+    "GenerationJob",
+    "GenerationJobStatus",
+    "Tone",
+]
\ No newline at end of file
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AdCopyEvaluation:
     """広告文の評価情報を保持するValue Object."""
 
@@ -24,7 +24,7 @@ class AdCopyEvaluation:
             raise ValueError("ターゲット層への響きやすさコメントは必須です")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AdCopy:
     """生成された広告文を保持するエンティティ."""
 
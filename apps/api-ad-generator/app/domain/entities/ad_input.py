@@ -5,8 +5,11 @@ from typing import List, Optional
 
 from app.domain.entities.tone import Tone
 
+# 1回のリクエストで指定できる生成数の上限
+MAX_NUM_COPIES = 50
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class AdInput:
     """広告文生成のための入力情報を保持するエンティティ."""
 
@@ -30,5 +33,5 @@ class AdInput:
         if any(not point.strip() for point in self.appeal_points):
             raise ValueError("アピールポイントは空文字を含むことはできません")
         
-        if self.num_copies < 1 or self.num_copies > 5:
-            raise ValueError("生成数は1から5の間で指定してください")
\ No newline at end of file
+        if self.num_copies < 1 or self.num_copies > MAX_NUM_COPIES:
+            raise ValueError(f"生成数は1から{MAX_NUM_COPIES}の間で指定してください")
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""一括生成の各入力に対する結果を表すドメインエンティティ."""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.domain.entities.ad_copy import AdCopy
+from app.domain.exceptions import DomainError
+
+
+@dataclass(frozen=True, slots=True)
+class AdCopyBatchItemResult:
+    """一括生成における1件分の生成結果を保持するエンティティ."""
+
+    index: int
+    ad_copies: Optional[List[AdCopy]] = None
+    error: Optional[DomainError] = None
+
+    def __post_init__(self) -> None:
+        """バリデーションロジック."""
+        if (self.ad_copies is None) == (self.error is None):
+            raise ValueError("生成結果とエラーのどちらか一方のみを指定してください")
+
+    @property
+    def succeeded(self) -> bool:
+        """生成に成功したかどうか."""
+        return self.error is None
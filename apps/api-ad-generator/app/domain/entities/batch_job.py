@@ -0,0 +1,32 @@
+"""非同期の一括生成ジョブを表すドメインエンティティ."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+class BatchJobStatus(str, Enum):
+    """一括生成ジョブの状態を表す列挙型."""
+
+    IN_PROGRESS = "in_progress"
+    ENDED = "ended"
+
+
+@dataclass(frozen=True, slots=True)
+class AdCopyBatchJob:
+    """非同期の一括生成ジョブの状態を保持するエンティティ."""
+
+    job_id: str
+    status: BatchJobStatus
+    num_items: int
+    created_at: datetime
+    ended_at: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        """バリデーションロジック."""
+        if not self.job_id.strip():
+            raise ValueError("ジョブIDは必須です")
+
+        if self.num_items < 1:
+            raise ValueError("ジョブには最低1件の入力が必要です")
@@ -0,0 +1,47 @@
+"""キューで非同期に処理する広告文生成ジョブを表すドメインエンティティ."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from app.domain.entities.ad_copy import AdCopy
+from app.domain.exceptions import DomainError
+
+
+class GenerationJobStatus(str, Enum):
+    """広告文生成ジョブの状態を表す列挙型."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationJob:
+    """キューで非同期に処理する広告文生成ジョブの状態と結果を保持するエンティティ."""
+
+    job_id: str
+    status: GenerationJobStatus
+    created_at: datetime
+    attempts: int = 0
+    finished_at: Optional[datetime] = None
+    ad_copies: Optional[List[AdCopy]] = None
+    error: Optional[DomainError] = None
+
+    def __post_init__(self) -> None:
+        """バリデーションロジック."""
+        if not self.job_id.strip():
+            raise ValueError("ジョブIDは必須です")
+
+        if self.status == GenerationJobStatus.SUCCEEDED and self.ad_copies is None:
+            raise ValueError("成功したジョブには生成結果が必要です")
+
+        if self.status == GenerationJobStatus.FAILED and self.error is None:
+            raise ValueError("失敗したジョブにはエラーが必要です")
+
+    @property
+    def finished(self) -> bool:
+        """処理が終わった（成功または失敗した）かどうか."""
+        return self.status in (GenerationJobStatus.SUCCEEDED, GenerationJobStatus.FAILED)
@@ -1,5 +1,7 @@
 """ドメイン例外定義."""
 
+from typing import Optional
+
 
 class DomainError(Exception):
     """ドメイン層の基底例外クラス."""
@@ -18,4 +20,41 @@ class AdGenerationError(DomainError):
 class InvalidInputError(DomainError):
     """不正な入力エラー."""
 
-    pass
\ No newline at end of file
+    pass
+
+
+class JobNotFoundError(DomainError):
+    """ジョブが存在しないエラー."""
+
+    pass
+
+
+class JobNotReadyError(DomainError):
+    """ジョブが完了していないエラー."""
+
+    pass
+
+
+class IdempotencyKeyMismatchError(DomainError):
+    """冪等キーが異なる内容のリクエストに再利用されたエラー."""
+
+    pass
+
+class ServiceUnavailableError(AdGenerationError):
+    """生成サービスが一時的に利用できないエラー."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class TransientGenerationError(ServiceUnavailableError):
+    """再試行で回復する可能性のある一時的な広告文生成エラー."""
+
+    pass
+
+
+class GenerationTimeoutError(AdGenerationError):
+    """広告文生成が期限内に完了しなかったエラー."""
+
+    pass
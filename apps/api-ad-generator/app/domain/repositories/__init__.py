@@ -1,5 +1,7 @@
 """リポジトリインターフェースのパッケージ."""
 
+from .ad_batch_job_repository import AdBatchJobRepository
 from .ad_generation_repository import AdGenerationRepository
+from .generation_job_repository import GenerationJobRepository
 
-__all__ = ["AdGenerationRepository"]
\ No newline at end of file
+__all__ = ["AdBatchJobRepository", "AdGenerationRepository", "GenerationJobRepository"]
\ No newline at end of file
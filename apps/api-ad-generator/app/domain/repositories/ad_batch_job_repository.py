@@ -0,0 +1,56 @@
+"""非同期一括生成ジョブリポジトリのインターフェース."""
+
+from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+from app.domain.entities import AdCopyBatchItemResult, AdCopyBatchJob, AdInput
+
+
+class AdBatchJobRepository(ABC):
+    """非同期の一括生成ジョブを管理するためのリポジトリインターフェース."""
+
+    @abstractmethod
+    async def submit(self, ad_inputs: Sequence[AdInput]) -> AdCopyBatchJob:
+        """一括生成ジョブを登録する.
+
+        Args:
+            ad_inputs: 広告文生成のための入力データのリスト
+
+        Returns:
+            登録されたジョブ
+
+        Raises:
+            AdGenerationError: ジョブの登録に失敗した場合
+        """
+        pass
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> AdCopyBatchJob:
+        """ジョブの最新の状態を取得する.
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブ
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+        """
+        pass
+
+    @abstractmethod
+    async def get_results(self, job_id: str) -> List[AdCopyBatchItemResult]:
+        """完了したジョブの生成結果を取得する.
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            入力と同じ順序の生成結果のリスト
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+            JobNotReadyError: ジョブが完了していない場合
+        """
+        pass
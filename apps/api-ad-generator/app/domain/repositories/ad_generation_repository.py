@@ -1,7 +1,7 @@
 """広告文生成リポジトリのインターフェース."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List
 
 from app.domain.entities import AdCopy, AdInput
 
@@ -22,4 +22,21 @@ class AdGenerationRepository(ABC):
         Raises:
             AdGenerationError: 広告文生成に失敗した場合
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """広告文を生成し、生成できたものから順に返す.
+
+        ストリーミングに対応しない実装では、全件の生成後に順に返す。
+
+        Args:
+            ad_input: 広告文生成のための入力データ
+
+        Yields:
+            生成された広告文
+
+        Raises:
+            AdGenerationError: 広告文生成に失敗した場合
+        """
+        for ad_copy in await self.generate_ad_copies(ad_input):
+            yield ad_copy
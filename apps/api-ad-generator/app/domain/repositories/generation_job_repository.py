@@ -0,0 +1,39 @@
+"""広告文生成ジョブリポジトリのインターフェース."""
+
+from abc import ABC, abstractmethod
+
+from app.domain.entities import AdInput, GenerationJob
+
+
+class GenerationJobRepository(ABC):
+    """キューで非同期に処理する広告文生成ジョブを管理するためのリポジトリインターフェース."""
+
+    @abstractmethod
+    async def submit(self, ad_input: AdInput) -> GenerationJob:
+        """広告文生成ジョブをキューに登録する.
+
+        Args:
+            ad_input: 広告文生成のための入力データ
+
+        Returns:
+            登録されたジョブ
+
+        Raises:
+            AdGenerationError: ジョブの登録に失敗した場合
+        """
+        pass
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> GenerationJob:
+        """ジョブの最新の状態と結果を取得する.
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブ
+
+        Raises:
+            JobNotFoundError: ジョブが存在しない場合
+        """
+        pass
@@ -0,0 +1,12 @@
+"""ドメインサービスのパッケージ."""
+
+from .ad_copy_fan_out_service import DEFAULT_MAX_COPIES_PER_CALL, AdCopyFanOutService
+from .ad_copy_ranking_service import AdCopyRankingService
+from .near_duplicate_detector import NearDuplicateDetector
+
+__all__ = [
+    "AdCopyFanOutService",
+    "AdCopyRankingService",
+    "DEFAULT_MAX_COPIES_PER_CALL",
+    "NearDuplicateDetector",
+]
@@ -0,0 +1,58 @@
+"""多数の広告文を複数の小さな生成に分割するドメインサービス."""
+
+import dataclasses
+from typing import Iterable, List, Optional
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.services.ad_copy_ranking_service import AdCopyRankingService
+
+# 1回の生成で作成する広告文の既定の上限数
+DEFAULT_MAX_COPIES_PER_CALL = 5
+
+
+class AdCopyFanOutService:
+    """生成数の多い入力を分割し、分割した生成結果をまとめるドメインサービス."""
+
+    def __init__(
+        self,
+        max_copies_per_call: int = DEFAULT_MAX_COPIES_PER_CALL,
+        ranking_service: Optional[AdCopyRankingService] = None,
+    ) -> None:
+        if max_copies_per_call < 1:
+            raise ValueError("1回の生成数は1以上で指定してください")
+        self._max_copies_per_call = max_copies_per_call
+        self._ranking_service = ranking_service or AdCopyRankingService()
+
+    def split(self, ad_input: AdInput) -> List[AdInput]:
+        """入力を1回の生成数が上限以下になるように分割する.
+
+        Args:
+            ad_input: 広告文生成のための入力データ
+
+        Returns:
+            生成数をできるだけ均等に割り振った入力のリスト
+            （分割が不要な場合は元の入力のみ）
+        """
+        if ad_input.num_copies <= self._max_copies_per_call:
+            return [ad_input]
+
+        num_calls = -(-ad_input.num_copies // self._max_copies_per_call)
+        base, remainder = divmod(ad_input.num_copies, num_calls)
+        return [
+            dataclasses.replace(ad_input, num_copies=base + (1 if index < remainder else 0))
+            for index in range(num_calls)
+        ]
+
+    def merge(
+        self, results: Iterable[List[AdCopy]], num_copies: Optional[int] = None
+    ) -> List[AdCopy]:
+        """分割した生成結果を重複除去・順位付けしてまとめる.
+
+        Args:
+            results: 分割した入力ごとの生成結果
+            num_copies: 返す最大件数（None の場合は全件）
+
+        Returns:
+            評価スコアの高い順に並べた広告文のリスト
+        """
+        return self._ranking_service.merge(results, limit=num_copies)
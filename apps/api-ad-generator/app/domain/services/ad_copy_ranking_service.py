@@ -0,0 +1,124 @@
+"""広告文の重複除去と順位付けを行うドメインサービス."""
+
+import re
+import unicodedata
+from typing import Iterable, List, Optional
+
+from app.domain.entities import AdCopy
+from app.domain.services.near_duplicate_detector import NearDuplicateDetector
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class AdCopyRankingService:
+    """複数回の生成結果をまとめ、評価スコアの高い順に並べるドメインサービス."""
+
+    def __init__(self, near_duplicate_detector: Optional[NearDuplicateDetector] = None) -> None:
+        """ドメインサービスを初期化する.
+
+        Args:
+            near_duplicate_detector: ほぼ同じ広告文を検出する検出器
+                （None の場合は本文が同じものだけを重複とみなす）
+        """
+        self._near_duplicate_detector = near_duplicate_detector
+
+    def score(self, ad_copy: AdCopy) -> float:
+        """広告文の評価スコアを算出する（評価がない場合は 0.0）.
+
+        Args:
+            ad_copy: 評価対象の広告文
+
+        Returns:
+            関連性スコアと創造性スコアの平均
+        """
+        if ad_copy.evaluation is None:
+            return 0.0
+        return (ad_copy.evaluation.relevance_score + ad_copy.evaluation.creativity_score) / 2
+
+    def deduplicate(self, ad_copies: Iterable[AdCopy]) -> List[AdCopy]:
+        """本文が同じ・ほぼ同じ広告文を取り除く（表記ゆれと空白の違いは同一とみなす）.
+
+        Args:
+            ad_copies: 広告文のリスト
+
+        Returns:
+            最初に現れたものだけを残した広告文のリスト
+        """
+        seen = set()
+        unique = []
+        for ad_copy in ad_copies:
+            key = self.duplicate_key(ad_copy)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(ad_copy)
+
+        if self._near_duplicate_detector is None:
+            return unique
+        duplicates = self._near_duplicate_detector.find_duplicates(
+            [ad_copy.copy_text for ad_copy in unique]
+        )
+        return [ad_copy for ad_copy, duplicate in zip(unique, duplicates, strict=True) if not duplicate]
+
+    def is_duplicate(self, ad_copy: AdCopy, kept: List[AdCopy]) -> bool:
+        """広告文が残した広告文のいずれかと同じ・ほぼ同じかどうかを判定する.
+
+        Args:
+            ad_copy: 判定する広告文
+            kept: 既に残した広告文のリスト
+
+        Returns:
+            重複しているかどうか
+        """
+        key = self.duplicate_key(ad_copy)
+        if any(self.duplicate_key(other) == key for other in kept):
+            return True
+        if self._near_duplicate_detector is None:
+            return False
+        return self._near_duplicate_detector.is_duplicate(
+            ad_copy.copy_text, [other.copy_text for other in kept]
+        )
+
+    def rank(self, ad_copies: Iterable[AdCopy]) -> List[AdCopy]:
+        """評価スコアの高い順に並べ替える（同点の場合は元の順序を保つ）.
+
+        Args:
+            ad_copies: 広告文のリスト
+
+        Returns:
+            並べ替えた広告文のリスト
+        """
+        return sorted(ad_copies, key=self.score, reverse=True)
+
+    def merge(
+        self, ad_copy_lists: Iterable[List[AdCopy]], limit: Optional[int] = None
+    ) -> List[AdCopy]:
+        """複数の生成結果を順位付けして重複除去し、上位を返す.
+
+        重複している広告文は、評価スコアの最も高いものを残す。
+
+        Args:
+            ad_copy_lists: 生成結果のリスト
+            limit: 返す最大件数（None の場合は全件）
+
+        Returns:
+            評価スコアの高い順に並べた広告文のリスト
+        """
+        merged = self.deduplicate(
+            self.rank(ad_copy for ad_copies in ad_copy_lists for ad_copy in ad_copies)
+        )
+        if limit is None:
+            return merged
+        return merged[:limit]
+
+    def duplicate_key(self, ad_copy: AdCopy) -> str:
+        """重複判定に使用するキーを算出する.
+
+        Args:
+            ad_copy: 広告文
+
+        Returns:
+            本文を正規化した文字列
+        """
+        text = unicodedata.normalize("NFKC", ad_copy.copy_text)
+        return _WHITESPACE_PATTERN.sub(" ", text).strip().casefold()
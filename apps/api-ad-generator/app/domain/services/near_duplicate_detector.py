@@ -0,0 +1,213 @@
+"""広告文の類似度を判定し、ほぼ同じ広告文を検出するドメインサービス."""
+
+import math
+import random
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy は任意依存
+    np = None
+
+# 空白と句読点は類似度の判定に影響させない
+_IGNORED_CHARS_PATTERN = re.compile(r"[\s、。，．,.!！?？・「」『』（）()\[\]【】]+")
+
+# n-gram のハッシュ値の計算に使用するメルセンヌ素数（2^31 - 1）
+_MERSENNE_PRIME = (1 << 31) - 1
+
+# 文字 n-gram の多項式ハッシュの基数
+_NGRAM_HASH_BASE = 1_000_003
+
+# 署名の一致率を一度に比較する要素数の上限
+_COMPARISON_BLOCK_ELEMENTS = 1 << 22
+
+
+class NearDuplicateDetector:
+    """文字 n-gram の Jaccard 類似度で、ほぼ同じ広告文を検出する.
+
+    日本語は単語の区切りがないため、単語ではなく文字 n-gram を比較する。
+    numpy がインストールされている場合は MinHash の署名をまとめて計算し、
+    署名の一致率で類似度を推定する。インストールされていない場合は
+    n-gram 集合から Jaccard 類似度を正確に計算する。
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        ngram_size: int = 3,
+        num_perm: int = 128,
+        seed: int = 1,
+    ) -> None:
+        """検出器を初期化する.
+
+        Args:
+            threshold: ほぼ同じとみなす類似度の下限（0.0〜1.0）
+            ngram_size: 比較する文字 n-gram の長さ
+            num_perm: MinHash の署名の長さ
+            seed: MinHash のハッシュ関数を生成する乱数のシード
+        """
+        if not (0.0 < threshold <= 1.0):
+            raise ValueError("類似度のしきい値は0.0より大きく1.0以下で指定してください")
+        if ngram_size < 1:
+            raise ValueError("n-gram の長さは1以上で指定してください")
+        self._threshold = threshold
+        self._ngram_size = ngram_size
+        self._num_perm = num_perm
+        self._permutations = None
+        if np is not None:
+            rng = random.Random(seed)
+            multipliers = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+            increments = [rng.getrandbits(64) for _ in range(num_perm)]
+            self._permutations = (
+                np.array(multipliers, dtype=np.uint64),
+                np.array(increments, dtype=np.uint64),
+            )
+
+    @property
+    def threshold(self) -> float:
+        """ほぼ同じとみなす類似度の下限."""
+        return self._threshold
+
+    def shingles(self, text: str) -> FrozenSet[str]:
+        """テキストを正規化し、文字 n-gram の集合に変換する.
+
+        Args:
+            text: 対象のテキスト
+
+        Returns:
+            文字 n-gram の集合（n より短いテキストはテキスト全体のみ）
+        """
+        normalized = self._normalize(text)
+        if len(normalized) <= self._ngram_size:
+            return frozenset([normalized])
+        return frozenset(
+            normalized[index:index + self._ngram_size]
+            for index in range(len(normalized) - self._ngram_size + 1)
+        )
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        """2つのテキストの Jaccard 類似度を計算する.
+
+        Args:
+            text_a: 比較するテキスト
+            text_b: 比較するテキスト
+
+        Returns:
+            0.0〜1.0 の類似度
+        """
+        return self._jaccard(self.shingles(text_a), self.shingles(text_b))
+
+    def find_duplicates(self, texts: Sequence[str]) -> List[bool]:
+        """先に現れた（残した）テキストとほぼ同じテキストを検出する.
+
+        Args:
+            texts: 判定するテキストのリスト（優先して残すものから順に並べる）
+
+        Returns:
+            テキストごとに、ほぼ同じテキストが前にあるかどうか
+        """
+        if len(texts) < 2:
+            return [False] * len(texts)
+        if self._permutations is not None:
+            return self._find_duplicates_minhash(texts)
+
+        shingle_sets = [self.shingles(text) for text in texts]
+        duplicates = []
+        kept: List[FrozenSet[str]] = []
+        for shingle_set in shingle_sets:
+            duplicate = any(self._jaccard(shingle_set, other) >= self._threshold for other in kept)
+            duplicates.append(duplicate)
+            if not duplicate:
+                kept.append(shingle_set)
+        return duplicates
+
+    def is_duplicate(self, text: str, kept_texts: Sequence[str]) -> bool:
+        """テキストが残したテキストのいずれかとほぼ同じかどうかを判定する.
+
+        Args:
+            text: 判定するテキスト
+            kept_texts: 既に残したテキストのリスト
+
+        Returns:
+            ほぼ同じテキストがあるかどうか
+        """
+        shingle_set = self.shingles(text)
+        return any(
+            self._jaccard(shingle_set, self.shingles(other)) >= self._threshold
+            for other in kept_texts
+        )
+
+    def _find_duplicates_minhash(self, texts: Sequence[str]) -> List[bool]:
+        signatures = self._signatures(texts)
+        similar_pairs = self._similar_pairs(signatures)
+
+        # 先に残したテキストと似ているものから順に重複とする
+        duplicates = [False] * len(texts)
+        for row, earlier_rows in similar_pairs.items():
+            duplicates[row] = any(not duplicates[earlier] for earlier in earlier_rows)
+        return duplicates
+
+    def _similar_pairs(self, signatures: "np.ndarray") -> Dict[int, List[int]]:
+        """署名の一致率がしきい値以上の組を、後ろの行ごとにまとめて返す."""
+        num_rows = len(signatures)
+        min_matches = math.ceil(self._threshold * self._num_perm)
+        pairs: Dict[int, List[int]] = {}
+        # メモリ使用量を抑えるため、行をブロックに分けて一致数を数える
+        block_size = max(1, _COMPARISON_BLOCK_ELEMENTS // (num_rows * self._num_perm))
+        for start in range(0, num_rows, block_size):
+            block = signatures[start:start + block_size]
+            matches = (block[:, None, :] == signatures[None, :, :]).sum(axis=2)
+            rows, columns = np.nonzero(matches >= min_matches)
+            for row, column in zip((rows + start).tolist(), columns.tolist(), strict=True):
+                if column < row:
+                    pairs.setdefault(row, []).append(column)
+        return dict(sorted(pairs.items()))
+
+    def _signatures(self, texts: Sequence[str]) -> "np.ndarray":
+        hashes, counts = self._ngram_hashes(texts)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        # 全テキストの n-gram に全てのハッシュ関数をまとめて適用し、テキストごとの最小値を署名とする
+        # （multiply-shift 方式のため 2^64 でのオーバーフローは意図したもの）
+        multipliers, increments = self._permutations
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(multipliers, hashes) + increments[:, None]) >> np.uint64(32)
+        return np.minimum.reduceat(permuted, offsets, axis=1).T.astype(np.uint32)
+
+    def _ngram_hashes(self, texts: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """全テキストの文字 n-gram のハッシュ値を、文字コードの多項式ハッシュでまとめて計算する.
+
+        Returns:
+            n-gram のハッシュ値（テキスト順に連結したもの）と、テキストごとの n-gram 数
+        """
+        size = self._ngram_size
+        # n より短いテキストはテキスト全体を1つの n-gram とするため、n 文字まで埋める
+        normalized = [self._normalize(text).ljust(size, "\0") for text in texts]
+        lengths = np.array([len(text) for text in normalized])
+        codes = np.frombuffer("".join(normalized).encode("utf-32-le"), dtype=np.uint32)
+        codes = codes.astype(np.uint64)
+
+        count = len(codes) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = (hashes * _NGRAM_HASH_BASE + codes[offset:offset + count]) % _MERSENNE_PRIME
+
+        # テキストの境界をまたぐ n-gram を取り除く
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        position_in_text = np.arange(len(codes)) - np.repeat(starts, lengths)
+        last_start = np.repeat(lengths - size, lengths)
+        valid = (position_in_text <= last_start)[:count]
+        return hashes[valid], lengths - size + 1
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _IGNORED_CHARS_PATTERN.sub("", unicodedata.normalize("NFKC", text)).casefold()
+
+    @staticmethod
+    def _jaccard(set_a: FrozenSet[str], set_b: FrozenSet[str]) -> float:
+        if not set_a and not set_b:
+            return 1.0
+        intersection = len(set_a & set_b)
+        return intersection / (len(set_a) + len(set_b) - intersection)
+
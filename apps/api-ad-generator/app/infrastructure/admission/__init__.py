@@ -0,0 +1,17 @@
+"""Admission control for Ad Generator."""
+
+from .controller import AdmissionController, AdmissionStats, AdmissionTicket
+from .middleware import (
+    ADMISSION_PATHS,
+    REQUEST_TIMEOUT_HEADER,
+    AdmissionControlMiddleware,
+)
+
+__all__ = [
+    "ADMISSION_PATHS",
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "AdmissionStats",
+    "AdmissionTicket",
+    "REQUEST_TIMEOUT_HEADER",
+]
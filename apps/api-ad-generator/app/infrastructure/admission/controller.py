@@ -0,0 +1,164 @@
+"""処理中の生成数と上流のレイテンシの推定から、リクエストを受け付けるかを決める受付制御."""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from app.domain.exceptions import ServiceUnavailableError
+
+
+@dataclass
+class AdmissionStats:
+    """受付制御の判定の統計情報."""
+
+    admitted: int = 0
+    rejected: int = 0
+    disconnected: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "disconnected": self.disconnected,
+        }
+
+
+@dataclass(frozen=True)
+class AdmissionTicket:
+    """受け付けたリクエストの開始時刻と、受け付けた時点の負荷."""
+
+    started_at: float
+    load: float
+
+
+class AdmissionController:
+    """期限内に応答できる見込みのないリクエストを、処理を始める前に拒否する.
+
+    上流への同時リクエスト数の上限（capacity）を超えて処理中の生成は、上流の枠を
+    分け合って進むとみなし、新しいリクエストの応答までの時間を
+    「1件あたりのレイテンシ × max(1, 処理中の生成数 / capacity)」で予測する。
+    1件あたりのレイテンシは、完了したリクエストの所要時間を受け付けた時点の負荷で割った値の
+    指数移動平均で推定する。推定に使える完了がまだない場合は、処理中の生成数の上限のみで判定する。
+
+    処理中の生成が capacity 未満の場合は待ちが発生しないため、予測にかかわらず受け付ける。
+    遅い呼び出しで推定が期限を超えても、空いている間に受け付けた完了で推定が戻るようにするためで、
+    1件の所要時間は既定の期限で頭打ちにして推定に加える。
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        deadline: float,
+        max_in_flight: Optional[int] = None,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """受付制御を初期化する.
+
+        Args:
+            capacity: 同時に処理しても待ちが発生しない生成の数（上流への同時リクエスト数の上限）
+            deadline: クライアントが期限を指定しない場合に使用する、応答までの期限の秒数
+            max_in_flight: 処理中の生成の数の上限（None の場合は無制限）
+            smoothing: レイテンシの指数移動平均で新しい値にかける重み（0.0〜1.0）
+            clock: 現在時刻を返す関数
+
+        Raises:
+            ValueError: 引数が不正な場合
+        """
+        if capacity <= 0:
+            raise ValueError("capacity は1以上である必要があります")
+        if deadline <= 0:
+            raise ValueError("deadline は正の値である必要があります")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing は0より大きく1以下である必要があります")
+        self._capacity = capacity
+        self._deadline = deadline
+        self._max_in_flight = max_in_flight
+        self._smoothing = smoothing
+        self._clock = clock
+        self._in_flight = 0
+        self._latency: Optional[float] = None
+        self.stats = AdmissionStats()
+
+    @property
+    def in_flight(self) -> int:
+        """処理中の生成の数."""
+        return self._in_flight
+
+    @property
+    def latency_estimate(self) -> Optional[float]:
+        """待ちがない場合の1件あたりのレイテンシの推定（秒）."""
+        return self._latency
+
+    def predicted_response_time(self) -> Optional[float]:
+        """新しいリクエストを受け付けた場合の応答までの時間の予測（秒）.
+
+        Returns:
+            予測した秒数（レイテンシの推定がまだない場合は None）
+        """
+        if self._latency is None:
+            return None
+        return self._latency * max(1.0, (self._in_flight + 1) / self._capacity)
+
+    def admit(self, deadline: Optional[float] = None) -> AdmissionTicket:
+        """リクエストを受け付ける.
+
+        Args:
+            deadline: クライアントが指定した応答までの期限の秒数（None の場合は既定の期限）
+
+        Returns:
+            AdmissionTicket: 完了時に release に渡すチケット
+
+        Raises:
+            ServiceUnavailableError: 処理中の生成が上限に達しているか、
+                予測した応答までの時間が期限を超える場合
+        """
+        if self._max_in_flight is not None and self._in_flight >= self._max_in_flight:
+            self.stats.rejected += 1
+            raise ServiceUnavailableError(
+                "処理中のリクエストが多すぎるため受け付けられません", retry_after=self._latency
+            )
+
+        deadline = self._deadline if deadline is None else deadline
+        predicted = self.predicted_response_time()
+        if self._in_flight >= self._capacity and predicted is not None and predicted > deadline:
+            self.stats.rejected += 1
+            # 処理中の生成が減って予測が期限内に収まるまでのおおよその時間
+            raise ServiceUnavailableError(
+                f"予測される応答までの時間（{predicted:.1f}秒）が期限（{deadline:.1f}秒）を超えるため"
+                "受け付けられません",
+                retry_after=predicted - deadline,
+            )
+
+        self._in_flight += 1
+        self.stats.admitted += 1
+        return AdmissionTicket(
+            started_at=self._clock(), load=max(1.0, self._in_flight / self._capacity)
+        )
+
+    def release(self, ticket: AdmissionTicket, completed: bool) -> None:
+        """受け付けたリクエストの処理の終了を記録する.
+
+        Args:
+            ticket: admit が返したチケット
+            completed: 応答を返せたか（False の場合はレイテンシの推定に使用しない）
+        """
+        self._in_flight -= 1
+        if not completed:
+            return
+
+        latency = min((self._clock() - ticket.started_at) / ticket.load, self._deadline)
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self._smoothing * (latency - self._latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報と現在の推定を辞書に変換する."""
+        return {
+            **self.stats.to_dict(),
+            "inFlight": self._in_flight,
+            "latencyEstimateSeconds": self._latency,
+            "predictedResponseSeconds": self.predicted_response_time(),
+        }
@@ -0,0 +1,179 @@
+"""生成のリクエストに受付制御をかけ、切断されたリクエストの処理を止める ASGI ミドルウェア."""
+
+import asyncio
+import math
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from app.domain.exceptions import ServiceUnavailableError
+from app.infrastructure.admission.controller import AdmissionController
+from app.infrastructure.api.responses import FastJSONResponse, retry_after_headers
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# 受付制御の対象とするパス（POST のみ）
+ADMISSION_PATHS = ("/generate-ad-copy",)
+
+# クライアントが応答までの期限（秒）を指定するヘッダー
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+_REQUEST_TIMEOUT_HEADER_KEY = REQUEST_TIMEOUT_HEADER.lower().encode("latin-1")
+
+
+def _request_timeout(scope: Scope) -> Optional[float]:
+    """X-Request-Timeout ヘッダーから応答までの期限の秒数を取得する.
+
+    Raises:
+        ValueError: ヘッダーの値が正の有限の数でない場合
+    """
+    for name, value in scope["headers"]:
+        if name == _REQUEST_TIMEOUT_HEADER_KEY:
+            try:
+                timeout = float(value.decode("latin-1"))
+            except ValueError:
+                timeout = math.nan
+            if not (math.isfinite(timeout) and timeout > 0):
+                raise ValueError(f"{REQUEST_TIMEOUT_HEADER} は正の秒数で指定してください")
+            return timeout
+    return None
+
+
+class AdmissionControlMiddleware:
+    """広告文生成のリクエストを、期限内に応答できる見込みがある場合にだけ処理する.
+
+    - 予測した応答までの時間がクライアントの指定した期限（X-Request-Timeout）か
+      既定の期限を超える場合は、処理を始めずに 503 と Retry-After を返す
+    - リクエストの本文を読み終えた後にクライアントが切断した場合は、処理（上流の呼び出しを含む）を
+      キャンセルする。冪等キーや同じ内容のリクエストで共有している生成は、他の待ち手のために継続する
+
+    受付制御は起動時に生成されるため、リクエストごとに get_controller から取得する
+    （起動前や無効な場合は None が返り、受付制御をかけずに処理する）。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        get_controller: Callable[[], Optional[AdmissionController]],
+        paths: Sequence[str] = ADMISSION_PATHS,
+    ) -> None:
+        self.app = app
+        self._get_controller = get_controller
+        self._paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self._paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        controller = self._get_controller()
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            ticket = controller.admit(_request_timeout(scope))
+        except ValueError as e:
+            await self._send_error(scope, receive, send, 400, str(e), "BAD_REQUEST")
+            return
+        except ServiceUnavailableError as e:
+            await self._send_error(
+                scope, receive, send, 503, e.message, "SERVICE_UNAVAILABLE", retry_after_headers(e)
+            )
+            return
+
+        status: Optional[int] = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        disconnected = False
+        try:
+            disconnected = await self._call_until_disconnect(scope, receive, send_with_status)
+        finally:
+            controller.release(ticket, completed=not disconnected and status == 200)
+        if disconnected:
+            controller.stats.disconnected += 1
+
+    async def _call_until_disconnect(self, scope: Scope, receive: Receive, send: Send) -> bool:
+        """アプリケーションを呼び出し、応答を返す前にクライアントが切断した場合はキャンセルする.
+
+        Returns:
+            bool: クライアントの切断でキャンセルした場合は True
+        """
+        request_read = asyncio.Event()
+        disconnect_received = asyncio.Event()
+        response_sent = False
+        cancelled_by_disconnect = False
+
+        async def receive_request() -> Message:
+            if request_read.is_set():
+                # 本文を読み終えた後の receive は切断の通知を待つ（切断の監視と同じ通知を返す）
+                await disconnect_received.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnect_received.set()
+            elif not message.get("more_body", False):
+                request_read.set()
+            return message
+
+        async def send_response(message: Message) -> None:
+            nonlocal response_sent
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_sent = True
+            await send(message)
+
+        app_task = asyncio.ensure_future(self.app(scope, receive_request, send_response))
+
+        async def watch_disconnect() -> None:
+            nonlocal cancelled_by_disconnect
+            await request_read.wait()
+            message = await receive()
+            if message["type"] != "http.disconnect":
+                return
+            disconnect_received.set()
+            if not response_sent and not app_task.done():
+                cancelled_by_disconnect = True
+                app_task.cancel()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not app_task.done():
+                # サーバーの停止などで呼び出し元がキャンセルされた
+                app_task.cancel()
+                await asyncio.gather(app_task, return_exceptions=True)
+                raise
+            if cancelled_by_disconnect:
+                return True
+            raise
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+        return False
+
+    async def _send_error(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        message: str,
+        code: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """HTTPException と同じ形式のエラーレスポンスを返す."""
+        response = FastJSONResponse(
+            {"detail": {"message": message, "code": code}}, status_code=status_code, headers=headers
+        )
+        await response(scope, receive, send)
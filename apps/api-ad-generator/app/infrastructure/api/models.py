@@ -1,10 +1,11 @@
 """FastAPI のリクエスト・レスポンスモデル定義."""
 
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
-from app.domain.entities import Tone
+from app.domain.entities import BatchJobStatus, GenerationJobStatus, Tone
 
 
 class AdCopyGenerationRequest(BaseModel):
@@ -16,7 +17,7 @@ class AdCopyGenerationRequest(BaseModel):
     target_audience: str = Field(..., alias="targetAudience", description="広告のターゲットとなる顧客層")
     appeal_points: List[str] = Field(..., alias="appealPoints", description="商品/サービスの主なアピールポイント（複数可）")
     tone: Optional[Tone] = Field(Tone.PROFESSIONAL, description="広告文のトーン")
-    num_copies: int = Field(3, alias="numCopies", ge=1, le=5, description="生成する広告文の候補数")
+    num_copies: int = Field(3, alias="numCopies", ge=1, le=50, description="生成する広告文の候補数")
 
 
 class AdCopyEvaluationResponse(BaseModel):
@@ -52,4 +53,58 @@ class ErrorResponse(BaseModel):
     """エラーレスポンスモデル."""
 
     message: str = Field(..., description="エラーメッセージ")
-    code: str = Field(..., description="エラーコード")
\ No newline at end of file
+    code: str = Field(..., description="エラーコード")
+
+
+class AdCopyBatchGenerationRequest(BaseModel):
+    """広告文一括生成リクエストモデル."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    items: List[AdCopyGenerationRequest] = Field(..., min_length=1, description="広告文生成リクエストのリスト")
+
+
+class AdCopyBatchItemResponse(BaseModel):
+    """広告文一括生成の1件分のレスポンスモデル."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    index: int = Field(..., description="リクエストの items における位置")
+    generated_copies: Optional[List[GeneratedAdCopyResponse]] = Field(None, alias="generatedCopies", description="生成された広告文の候補リスト（成功時）")
+    error: Optional[ErrorResponse] = Field(None, description="エラー情報（失敗時）")
+
+
+class AdCopyBatchGenerationResponse(BaseModel):
+    """広告文一括生成レスポンスモデル."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    results: List[AdCopyBatchItemResponse] = Field(..., description="リクエストと同じ順序の生成結果のリスト")
+
+
+class AdCopyBatchJobResponse(BaseModel):
+    """非同期一括生成ジョブレスポンスモデル."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    job_id: str = Field(..., alias="jobId", description="ジョブID")
+    status: BatchJobStatus = Field(..., description="ジョブの状態")
+    num_items: int = Field(..., alias="numItems", description="ジョブに含まれる入力の件数")
+    created_at: datetime = Field(..., alias="createdAt", description="ジョブの登録日時")
+    ended_at: Optional[datetime] = Field(None, alias="endedAt", description="ジョブの完了日時")
+
+
+class GenerationJobResponse(BaseModel):
+    """バックグラウンド生成ジョブレスポンスモデル."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    job_id: str = Field(..., alias="jobId", description="ジョブID")
+    status: GenerationJobStatus = Field(..., description="ジョブの状態")
+    attempts: int = Field(..., description="ジョブの処理を開始した回数（再試行を含む）")
+    created_at: datetime = Field(..., alias="createdAt", description="ジョブの登録日時")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt", description="ジョブの処理が終わった日時")
+    generated_copies: Optional[List[GeneratedAdCopyResponse]] = Field(
+        None, alias="generatedCopies", description="生成された広告文のリスト（成功した場合のみ）"
+    )
+    error: Optional[ErrorResponse] = Field(None, description="失敗した理由（失敗した場合のみ）")
@@ -0,0 +1,73 @@
+"""サーバー側で組み立てたレスポンスを直接 JSON に変換するレスポンスクラス.
+
+ドメインエンティティは生成時に検証済みのため、レスポンスモデルを経由せずに
+辞書へ変換し、FastAPI の response_model による再検証も行わない。
+レスポンスモデルは OpenAPI の定義にのみ使用する。
+
+orjson がインストールされている場合は JSON のエンコードに使用する。
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+
+from app.domain.entities import AdCopy, AdCopyEvaluation
+from app.domain.exceptions import ServiceUnavailableError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意依存
+    orjson = None
+
+# 使用中の JSON バックエンド名（ベンチマーク表示用）
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dump_json(content: Any) -> bytes:
+    """値を UTF-8 の JSON に変換する（区切り文字の空白は含めない）."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def evaluation_to_dict(evaluation: Optional[AdCopyEvaluation]) -> Optional[Dict[str, Any]]:
+    """評価情報を AdCopyEvaluationResponse と同じ形式の辞書に変換する."""
+    if evaluation is None:
+        return None
+    return {
+        "relevanceScore": evaluation.relevance_score,
+        "creativityScore": evaluation.creativity_score,
+        "targetAudienceAppeal": evaluation.target_audience_appeal,
+    }
+
+
+def ad_copy_to_dict(ad_copy: AdCopy) -> Dict[str, Any]:
+    """広告文を GeneratedAdCopyResponse と同じ形式の辞書に変換する."""
+    return {
+        "copyText": ad_copy.copy_text,
+        "headline": ad_copy.headline,
+        "callToAction": ad_copy.call_to_action,
+        "evaluation": evaluation_to_dict(ad_copy.evaluation),
+    }
+
+
+def ad_copies_to_dicts(ad_copies: List[AdCopy]) -> List[Dict[str, Any]]:
+    """広告文のリストを GeneratedAdCopyResponse と同じ形式の辞書のリストに変換する."""
+    return [ad_copy_to_dict(ad_copy) for ad_copy in ad_copies]
+
+
+def retry_after_headers(error: ServiceUnavailableError) -> Optional[Dict[str, str]]:
+    """再試行までの待ち時間を Retry-After ヘッダーに変換する."""
+    if error.retry_after is None:
+        return None
+    return {"Retry-After": str(max(math.ceil(error.retry_after), 1))}
+
+
+class FastJSONResponse(JSONResponse):
+    """検証済みの辞書を再検証せずにエンコードする JSON レスポンス."""
+
+    def render(self, content: Any) -> bytes:
+        """レスポンスボディを返す."""
+        return dump_json(content)
@@ -1,31 +1,156 @@
 """FastAPI ルート定義."""
 
-from typing import List
+from dataclasses import replace
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.application.usecases import GenerateAdCopyUseCase
-from app.dependencies import get_generate_ad_copy_usecase
-from app.domain.entities import AdInput
-from app.domain.exceptions import AdGenerationError, InvalidInputError
+from app.application.usecases import (
+    GenerateAdCopyBatchUseCase,
+    GenerateAdCopyUseCase,
+    GetAdCopyBatchJobResultsUseCase,
+    GetAdCopyBatchJobUseCase,
+    GetGenerationJobUseCase,
+    StreamAdCopyUseCase,
+    SubmitAdCopyBatchJobUseCase,
+    SubmitGenerationJobUseCase,
+)
+from app.dependencies import (
+    get_batch_job_results_usecase,
+    get_batch_job_usecase,
+    get_generate_ad_copy_batch_usecase,
+    get_generate_ad_copy_usecase,
+    get_generation_job_usecase,
+    get_idempotency_coordinator,
+    get_settings,
+    get_stream_ad_copy_usecase,
+    get_submit_batch_job_usecase,
+    get_submit_generation_job_usecase,
+)
+from app.domain.entities import (
+    AdCopy,
+    AdCopyBatchItemResult,
+    AdCopyBatchJob,
+    AdInput,
+    GenerationJob,
+)
+from app.domain.exceptions import (
+    AdGenerationError,
+    DomainError,
+    GenerationTimeoutError,
+    IdempotencyKeyMismatchError,
+    InvalidInputError,
+    JobNotFoundError,
+    JobNotReadyError,
+    ServiceUnavailableError,
+)
 from app.infrastructure.api.models import (
+    AdCopyBatchGenerationRequest,
+    AdCopyBatchGenerationResponse,
+    AdCopyBatchItemResponse,
+    AdCopyBatchJobResponse,
+    AdCopyEvaluationResponse,
     AdCopyGenerationRequest,
     AdCopyGenerationResponse,
     ErrorResponse,
     GeneratedAdCopyResponse,
-    AdCopyEvaluationResponse,
+    GenerationJobResponse,
 )
-
+from app.infrastructure.api.responses import (
+    FastJSONResponse,
+    ad_copies_to_dicts,
+    ad_copy_to_dict,
+    dump_json,
+    retry_after_headers,
+)
+from app.infrastructure.cache import CacheControl, ad_input_cache_key, cache_control
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.idempotency import IdempotencyCoordinator
+from app.infrastructure.metrics.instruments import (
+    RESPONSE_BUILD,
+    VALIDATION,
+    observe_request_parse,
+    record_error,
+)
+from app.infrastructure.rate_limit import RequestPriority, request_priority
+from app.infrastructure.tracing import start_span
 
 router = APIRouter(tags=["ads"])
 
+# Idempotency-Key ヘッダーの最大文字数
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def _to_ad_input(request: AdCopyGenerationRequest) -> AdInput:
+    """リクエストモデルをドメインエンティティに変換する."""
+    return AdInput(
+        product_name=request.product_name,
+        target_audience=request.target_audience,
+        appeal_points=request.appeal_points,
+        tone=request.tone,
+        num_copies=request.num_copies,
+    )
+
+
+def _to_generated_copies(ad_copies: List[AdCopy]) -> List[GeneratedAdCopyResponse]:
+    """広告文エンティティをレスポンスモデルに変換する."""
+    generated_copies: List[GeneratedAdCopyResponse] = []
+    for ad_copy in ad_copies:
+        evaluation_response = None
+        if ad_copy.evaluation:
+            evaluation_response = AdCopyEvaluationResponse(
+                relevance_score=ad_copy.evaluation.relevance_score,
+                creativity_score=ad_copy.evaluation.creativity_score,
+                target_audience_appeal=ad_copy.evaluation.target_audience_appeal,
+            )
+
+        generated_copy = GeneratedAdCopyResponse(
+            copy_text=ad_copy.copy_text,
+            headline=ad_copy.headline,
+            call_to_action=ad_copy.call_to_action,
+            evaluation=evaluation_response,
+        )
+        generated_copies.append(generated_copy)
+
+    return generated_copies
+
+
+def _to_error_response(error: DomainError) -> ErrorResponse:
+    """ドメイン例外をエラーレスポンスモデルに変換する."""
+    if isinstance(error, InvalidInputError):
+        return ErrorResponse(message=error.message, code="BAD_REQUEST")
+    if isinstance(error, ServiceUnavailableError):
+        return ErrorResponse(message=error.message, code="SERVICE_UNAVAILABLE")
+    if isinstance(error, GenerationTimeoutError):
+        return ErrorResponse(message=error.message, code="GATEWAY_TIMEOUT")
+    return ErrorResponse(message=error.message, code="INTERNAL_SERVER_ERROR")
+
+
+def _to_batch_response(results: List[AdCopyBatchItemResult]) -> AdCopyBatchGenerationResponse:
+    """一括生成の結果をレスポンスモデルに変換する."""
+    return AdCopyBatchGenerationResponse(
+        results=[
+            AdCopyBatchItemResponse(
+                index=result.index,
+                generated_copies=_to_generated_copies(result.ad_copies) if result.ad_copies is not None else None,
+                error=_to_error_response(result.error) if result.error is not None else None,
+            )
+            for result in results
+        ]
+    )
+
 
 @router.post(
     "/generate-ad-copy",
     response_model=AdCopyGenerationResponse,
+    response_class=FastJSONResponse,
     responses={
         400: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
     },
     summary="広告文を生成する",
     description="商品/サービスの名称、ターゲット層、アピールポイントなどの情報に基づいて、AIが複数の広告文候補とそれぞれの評価を生成します。",
@@ -33,50 +158,342 @@ router = APIRouter(tags=["ads"])
 async def generate_ad_copy(
     request: AdCopyGenerationRequest,
     usecase: GenerateAdCopyUseCase = Depends(get_generate_ad_copy_usecase),
-) -> AdCopyGenerationResponse:
-    """広告文を生成するエンドポイント."""
-    try:
-        # リクエストをドメインエンティティに変換
-        ad_input = AdInput(
-            product_name=request.product_name,
-            target_audience=request.target_audience,
-            appeal_points=request.appeal_points,
-            tone=request.tone,
-            num_copies=request.num_copies,
+    idempotency: Optional[IdempotencyCoordinator] = Depends(get_idempotency_coordinator),
+    cache_control_header: Optional[str] = Header(None, alias="Cache-Control"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+) -> FastJSONResponse:
+    """広告文を生成するエンドポイント.
+
+    生成数だけが異なるリクエストは蓄積した広告文の上位を共有し、足りない分だけを生成します。
+    `Cache-Control: no-cache` を指定するとキャッシュを参照せずに再生成します。
+    `Idempotency-Key` を指定した再送は、実行中の生成の完了を待つか、成功した生成の結果を
+    そのまま返し（`Idempotent-Replayed: true`）、同じキーで内容の異なるリクエストは 422 とします。
+    レスポンスは検証済みのエンティティから直接組み立て、response_model による再検証は行いません。
+    """
+    observe_request_parse()
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": f"Idempotency-Key は1から{MAX_IDEMPOTENCY_KEY_LENGTH}文字で指定してください",
+                "code": "BAD_REQUEST",
+            },
         )
-        
-        # ユースケース実行
-        ad_copies = await usecase.execute(ad_input)
-        
-        # レスポンスモデルに変換
-        generated_copies: List[GeneratedAdCopyResponse] = []
-        for ad_copy in ad_copies:
-            evaluation_response = None
-            if ad_copy.evaluation:
-                evaluation_response = AdCopyEvaluationResponse(
-                    relevance_score=ad_copy.evaluation.relevance_score,
-                    creativity_score=ad_copy.evaluation.creativity_score,
-                    target_audience_appeal=ad_copy.evaluation.target_audience_appeal,
+
+    cache_control_token = cache_control.set(CacheControl.from_header(cache_control_header))
+    try:
+        with start_span("routes.generate_ad_copy") as span:
+            span.set_attribute("ad.num_copies", request.num_copies)
+
+            # リクエストをドメインエンティティに変換
+            with VALIDATION.time():
+                ad_input = _to_ad_input(request)
+
+            # ユースケース実行（冪等キーがあれば同じキーの実行を1回にまとめる）
+            replayed = False
+            with start_span("GenerateAdCopyUseCase.execute"):
+                if idempotency is None or idempotency_key is None:
+                    ad_copies = await usecase.execute(ad_input)
+                else:
+                    ad_copies, replayed = await idempotency.execute(
+                        idempotency_key,
+                        ad_input_cache_key(ad_input),
+                        lambda: usecase.execute(ad_input),
+                    )
+
+            # レスポンスに変換
+            with RESPONSE_BUILD.time():
+                return FastJSONResponse(
+                    {"generatedCopies": ad_copies_to_dicts(ad_copies)},
+                    headers={"Idempotent-Replayed": "true"} if replayed else None,
                 )
-            
-            generated_copy = GeneratedAdCopyResponse(
-                copy_text=ad_copy.copy_text,
-                headline=ad_copy.headline,
-                call_to_action=ad_copy.call_to_action,
-                evaluation=evaluation_response,
-            )
-            generated_copies.append(generated_copy)
-        
-        return AdCopyGenerationResponse(generated_copies=generated_copies)
-        
+
     except ValueError as e:
+        record_error(e)
         raise HTTPException(status_code=400, detail={"message": str(e), "code": "BAD_REQUEST"})
     except InvalidInputError as e:
+        record_error(e)
         raise HTTPException(status_code=400, detail={"message": e.message, "code": "BAD_REQUEST"})
+    except IdempotencyKeyMismatchError as e:
+        record_error(e)
+        raise HTTPException(
+            status_code=422, detail={"message": e.message, "code": "IDEMPOTENCY_KEY_MISMATCH"}
+        )
+    except ServiceUnavailableError as e:
+        record_error(e)
+        raise HTTPException(
+            status_code=503,
+            detail={"message": e.message, "code": "SERVICE_UNAVAILABLE"},
+            headers=retry_after_headers(e),
+        )
+    except GenerationTimeoutError as e:
+        record_error(e)
+        raise HTTPException(status_code=504, detail={"message": e.message, "code": "GATEWAY_TIMEOUT"})
     except AdGenerationError as e:
+        record_error(e)
         raise HTTPException(status_code=500, detail={"message": e.message, "code": "INTERNAL_SERVER_ERROR"})
     except Exception as e:
+        record_error(e)
         raise HTTPException(
             status_code=500,
             detail={"message": f"予期しないエラーが発生しました: {str(e)}", "code": "INTERNAL_SERVER_ERROR"}
-        )
\ No newline at end of file
+        )
+    finally:
+        cache_control.reset(cache_control_token)
+
+
+def _format_stream_event(event: str, payload: str, use_sse: bool) -> str:
+    """ストリーミングレスポンスの1イベント分を整形する."""
+    if use_sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+    if event == "error":
+        return f'{{"error": {payload}}}\n'
+    return f"{payload}\n"
+
+
+@router.post(
+    "/generate-ad-copy/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "生成された広告文を1件ずつ返すストリーム",
+            "content": {"application/x-ndjson": {}, "text/event-stream": {}},
+        },
+        400: {"model": ErrorResponse},
+    },
+    summary="広告文をストリーミング生成する",
+    description="広告文を生成できたものから1件ずつ返します。既定では NDJSON 形式で、`Accept: text/event-stream` を指定すると Server-Sent Events 形式で返します。",
+)
+async def stream_ad_copy(
+    request: AdCopyGenerationRequest,
+    usecase: StreamAdCopyUseCase = Depends(get_stream_ad_copy_usecase),
+    accept: Optional[str] = Header(None),
+    cache_control_header: Optional[str] = Header(None, alias="Cache-Control"),
+) -> StreamingResponse:
+    """広告文をストリーミング生成するエンドポイント."""
+    observe_request_parse()
+    try:
+        with VALIDATION.time():
+            ad_input = _to_ad_input(request)
+    except ValueError as e:
+        record_error(e)
+        raise HTTPException(status_code=400, detail={"message": str(e), "code": "BAD_REQUEST"})
+
+    use_sse = accept is not None and "text/event-stream" in accept
+    control = CacheControl.from_header(cache_control_header)
+
+    async def stream() -> AsyncIterator[str]:
+        # ボディはレスポンス送信用のタスク内で生成されるため、ここで設定する
+        cache_control.set(control)
+        try:
+            async for ad_copy in usecase.execute(ad_input):
+                payload = dump_json(ad_copy_to_dict(ad_copy)).decode("utf-8")
+                yield _format_stream_event("adCopy", payload, use_sse)
+            if use_sse:
+                yield _format_stream_event("done", "{}", use_sse)
+        except DomainError as e:
+            record_error(e)
+            yield _format_stream_event("error", _to_error_response(e).model_dump_json(), use_sse)
+
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+
+@router.post(
+    "/generate-ad-copy/batch",
+    response_model=AdCopyBatchGenerationResponse,
+    responses={
+        400: {"model": ErrorResponse},
+    },
+    summary="広告文を一括生成する",
+    description="複数の商品/サービスの広告文をまとめて生成します。各項目は同時実行数を制限して処理され、失敗した項目はバッチ全体を失敗させずに項目ごとのエラーとして返されます。",
+)
+async def generate_ad_copy_batch(
+    request: AdCopyBatchGenerationRequest,
+    usecase: GenerateAdCopyBatchUseCase = Depends(get_generate_ad_copy_batch_usecase),
+    settings: Settings = Depends(get_settings),
+) -> AdCopyBatchGenerationResponse:
+    """広告文を一括生成するエンドポイント."""
+    observe_request_parse()
+    if len(request.items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": f"一括生成できるのは最大{settings.batch_max_items}件です", "code": "BAD_REQUEST"},
+        )
+
+    # 変換に失敗した項目はその場でエラー結果とし、残りをユースケースに渡す
+    results: List[Optional[AdCopyBatchItemResult]] = [None] * len(request.items)
+    valid_indices: List[int] = []
+    ad_inputs: List[AdInput] = []
+    for index, item in enumerate(request.items):
+        try:
+            with VALIDATION.time():
+                ad_inputs.append(_to_ad_input(item))
+            valid_indices.append(index)
+        except ValueError as e:
+            record_error(e)
+            results[index] = AdCopyBatchItemResult(index=index, error=InvalidInputError(str(e)))
+
+    # 一括生成は対話的な生成よりも低い優先度でレート制限の割り当てを待つ
+    priority_token = request_priority.set(RequestPriority.BULK)
+    try:
+        item_results = await usecase.execute(ad_inputs)
+    finally:
+        request_priority.reset(priority_token)
+
+    for index, result in zip(valid_indices, item_results, strict=True):
+        if result.error is not None:
+            record_error(result.error)
+        results[index] = replace(result, index=index)
+
+    with RESPONSE_BUILD.time():
+        return _to_batch_response([result for result in results if result is not None])
+
+
+def _to_batch_job_response(job: AdCopyBatchJob) -> AdCopyBatchJobResponse:
+    """ジョブエンティティをレスポンスモデルに変換する."""
+    return AdCopyBatchJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        num_items=job.num_items,
+        created_at=job.created_at,
+        ended_at=job.ended_at,
+    )
+
+
+@router.post(
+    "/generate-ad-copy/batch-jobs",
+    response_model=AdCopyBatchJobResponse,
+    status_code=202,
+    responses={
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="非同期の一括生成ジョブを登録する",
+    description="低レイテンシが不要な大量の広告文生成を、1つのメッセージバッチとして非同期に処理するジョブを登録します。結果はジョブIDを使って後から取得します。",
+)
+async def submit_ad_copy_batch_job(
+    request: AdCopyBatchGenerationRequest,
+    usecase: SubmitAdCopyBatchJobUseCase = Depends(get_submit_batch_job_usecase),
+) -> AdCopyBatchJobResponse:
+    """非同期の一括生成ジョブを登録するエンドポイント."""
+    ad_inputs: List[AdInput] = []
+    for index, item in enumerate(request.items):
+        try:
+            ad_inputs.append(_to_ad_input(item))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": f"items[{index}]: {str(e)}", "code": "BAD_REQUEST"},
+            )
+
+    try:
+        job = await usecase.execute(ad_inputs)
+        return _to_batch_job_response(job)
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail={"message": e.message, "code": "BAD_REQUEST"})
+    except AdGenerationError as e:
+        raise HTTPException(status_code=500, detail={"message": e.message, "code": "INTERNAL_SERVER_ERROR"})
+
+
+@router.get(
+    "/generate-ad-copy/batch-jobs/{job_id}",
+    response_model=AdCopyBatchJobResponse,
+    responses={
+        404: {"model": ErrorResponse},
+    },
+    summary="一括生成ジョブの状態を取得する",
+)
+async def get_ad_copy_batch_job(
+    job_id: str,
+    usecase: GetAdCopyBatchJobUseCase = Depends(get_batch_job_usecase),
+) -> AdCopyBatchJobResponse:
+    """一括生成ジョブの状態を取得するエンドポイント."""
+    try:
+        return _to_batch_job_response(await usecase.execute(job_id))
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail={"message": e.message, "code": "NOT_FOUND"})
+
+
+@router.get(
+    "/generate-ad-copy/batch-jobs/{job_id}/results",
+    response_model=AdCopyBatchGenerationResponse,
+    responses={
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+    },
+    summary="一括生成ジョブの結果を取得する",
+)
+async def get_ad_copy_batch_job_results(
+    job_id: str,
+    usecase: GetAdCopyBatchJobResultsUseCase = Depends(get_batch_job_results_usecase),
+) -> AdCopyBatchGenerationResponse:
+    """一括生成ジョブの結果を取得するエンドポイント."""
+    try:
+        results = await usecase.execute(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail={"message": e.message, "code": "NOT_FOUND"})
+    except JobNotReadyError as e:
+        raise HTTPException(status_code=409, detail={"message": e.message, "code": "JOB_NOT_READY"})
+
+    return _to_batch_response(results)
+
+
+def _to_generation_job_response(job: GenerationJob) -> GenerationJobResponse:
+    """バックグラウンド生成ジョブのエンティティをレスポンスモデルに変換する."""
+    return GenerationJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        attempts=job.attempts,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        generated_copies=_to_generated_copies(job.ad_copies) if job.ad_copies is not None else None,
+        error=_to_error_response(job.error) if job.error is not None else None,
+    )
+
+
+@router.post(
+    "/jobs",
+    response_model=GenerationJobResponse,
+    status_code=202,
+    responses={
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="バックグラウンド生成ジョブを登録する",
+    description="時間のかかる広告文生成をキューに登録し、すぐにジョブIDを返します。ジョブはワーカーが順に処理し、上流の混雑やタイムアウトで失敗した場合は再試行します。結果はジョブIDを使って後から取得します。",
+)
+async def submit_generation_job(
+    request: AdCopyGenerationRequest,
+    usecase: SubmitGenerationJobUseCase = Depends(get_submit_generation_job_usecase),
+) -> GenerationJobResponse:
+    """バックグラウンド生成ジョブを登録するエンドポイント."""
+    try:
+        ad_input = _to_ad_input(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "code": "BAD_REQUEST"})
+
+    try:
+        return _to_generation_job_response(await usecase.execute(ad_input))
+    except AdGenerationError as e:
+        raise HTTPException(status_code=500, detail={"message": e.message, "code": "INTERNAL_SERVER_ERROR"})
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=GenerationJobResponse,
+    responses={
+        404: {"model": ErrorResponse},
+    },
+    summary="バックグラウンド生成ジョブの状態と結果を取得する",
+    description="ジョブの状態を返します。成功したジョブは生成された広告文を、失敗したジョブは失敗した理由を含みます。",
+)
+async def get_generation_job(
+    job_id: str,
+    usecase: GetGenerationJobUseCase = Depends(get_generation_job_usecase),
+) -> GenerationJobResponse:
+    """バックグラウンド生成ジョブの状態と結果を取得するエンドポイント."""
+    try:
+        return _to_generation_job_response(await usecase.execute(job_id))
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail={"message": e.message, "code": "NOT_FOUND"})
@@ -0,0 +1,97 @@
+"""運用監視用のルート定義."""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.dependencies import (
+    get_admission_controller,
+    get_cache_backend,
+    get_claude_repository,
+    get_client_pool,
+    get_idempotency_coordinator,
+    get_job_worker_pool,
+    get_rate_limiter,
+    get_resilient_repository,
+    get_single_flight_repository,
+)
+from app.infrastructure.admission import AdmissionController
+from app.infrastructure.cache import CacheBackend, SingleFlightAdGenerationRepository
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.clients.client_pool import AnthropicClientPool
+from app.infrastructure.idempotency import IdempotencyCoordinator
+from app.infrastructure.jobs import GenerationJobWorkerPool
+from app.infrastructure.metrics import REGISTRY, render_stats
+from app.infrastructure.rate_limit import RateLimiter
+from app.infrastructure.resilience import ResilientAdGenerationRepository
+
+router = APIRouter(tags=["monitoring"])
+
+
+async def collect_stats(
+    client_pool: AnthropicClientPool = Depends(get_client_pool),
+    cache_backend: Optional[CacheBackend] = Depends(get_cache_backend),
+    single_flight_repository: SingleFlightAdGenerationRepository = Depends(
+        get_single_flight_repository
+    ),
+    resilient_repository: ResilientAdGenerationRepository = Depends(get_resilient_repository),
+    rate_limiter: Optional[RateLimiter] = Depends(get_rate_limiter),
+    claude_repository: ClaudeAdGenerationRepository = Depends(get_claude_repository),
+    job_worker_pool: GenerationJobWorkerPool = Depends(get_job_worker_pool),
+    idempotency: Optional[IdempotencyCoordinator] = Depends(get_idempotency_coordinator),
+    admission_controller: Optional[AdmissionController] = Depends(get_admission_controller),
+) -> Dict[str, Any]:
+    """各コンポーネントの稼働統計を集める."""
+    stats: Dict[str, Any] = {
+        "connectionPool": client_pool.stats.to_dict(),
+        "claudeUsage": claude_repository.usage_stats.to_dict(),
+        "outputFormat": claude_repository.output_stats.to_dict(),
+        "models": claude_repository.model_router.to_dict(),
+        "maxTokens": claude_repository.max_tokens_estimator.to_dict(),
+        "singleFlight": single_flight_repository.stats.to_dict(),
+        "resilience": {
+            **resilient_repository.stats.to_dict(),
+            "circuitState": resilient_repository.circuit_breaker.state.value,
+        },
+        "jobs": await job_worker_pool.to_dict(),
+    }
+    if rate_limiter is not None:
+        stats["rateLimit"] = rate_limiter.stats.to_dict()
+    if cache_backend is not None:
+        stats["cache"] = {**cache_backend.stats.to_dict(), "size": await cache_backend.size()}
+    if idempotency is not None:
+        stats["idempotency"] = {**idempotency.stats.to_dict(), "size": await idempotency.store.size()}
+    if admission_controller is not None:
+        stats["admission"] = admission_controller.to_dict()
+    return stats
+
+
+@router.get(
+    "/stats",
+    summary="稼働統計を取得する",
+    description="Claude API へのコネクション再利用状況やプロンプトキャッシュの利用状況、出力形式ごとの出力トークン数とパースの失敗率、モデルごとのリクエスト数・レイテンシ・見積もり料金、max_tokens の見積もりと出力の打ち切り・続きの生成の回数、キャッシュヒット率、冪等キーによる再送の合流・結果の再利用、レート制限による待機、バックグラウンド生成ジョブの処理状況とキューの状態ごとのジョブ数、再試行やサーキットブレーカーの状態などの稼働統計を返します。",
+)
+async def get_stats(stats: Dict[str, Any] = Depends(collect_stats)) -> Dict[str, Any]:
+    """稼働統計を返すエンドポイント."""
+    return stats
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus 形式のメトリクスを取得する",
+    description="リクエスト数と処理時間、段階ごとの処理時間のヒストグラム、Claude API のトークン使用量、出力形式ごとの出力トークン数とパースの失敗数、例外の種類ごとのエラー数、処理中のリクエスト数に加え、`/stats` の稼働統計を Prometheus のテキスト形式で返します。",
+)
+async def get_metrics(stats: Dict[str, Any] = Depends(collect_stats)) -> PlainTextResponse:
+    """Prometheus 形式のメトリクスを返すエンドポイント."""
+    # トークン使用量、出力形式ごと・モデルごとの統計は専用のメトリクスとして出力済みのため除く
+    stats = {
+        section: values
+        for section, values in stats.items()
+        if section not in ("claudeUsage", "outputFormat", "models")
+    }
+    return PlainTextResponse(
+        REGISTRY.render() + render_stats(stats),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,18 @@
+"""Message batch processing for Ad Generator."""
+
+from .backends import (
+    AnthropicMessageBatchBackend,
+    LocalMessageBatchBackend,
+    MessageBatchBackend,
+    MessageBatchResult,
+)
+from .job_store import BatchJobRecord, SQLiteBatchJobStore
+
+__all__ = [
+    "AnthropicMessageBatchBackend",
+    "BatchJobRecord",
+    "LocalMessageBatchBackend",
+    "MessageBatchBackend",
+    "MessageBatchResult",
+    "SQLiteBatchJobStore",
+]
@@ -0,0 +1,173 @@
+"""Message Batches API のバックエンド実装."""
+
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from app.infrastructure.lazy_import import lazy_import
+from app.infrastructure.rate_limit import (
+    RateLimiter,
+    RequestPriority,
+    estimate_message_tokens,
+)
+
+if TYPE_CHECKING:
+    import anthropic
+else:
+    anthropic = lazy_import("anthropic")
+
+
+@dataclass(frozen=True)
+class MessageBatchResult:
+    """バッチ内の1リクエスト分の結果."""
+
+    custom_id: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+class MessageBatchBackend(ABC):
+    """メッセージバッチを処理するバックエンドのインターフェース."""
+
+    @abstractmethod
+    async def create(self, requests: List[Dict[str, Any]]) -> str:
+        """バッチを作成し、バッチIDを返す.
+
+        Args:
+            requests: custom_id と params を持つリクエストのリスト
+        """
+        pass
+
+    @abstractmethod
+    async def is_ended(self, batch_id: str) -> bool:
+        """バッチの処理が完了したかどうかを返す."""
+        pass
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> List[MessageBatchResult]:
+        """完了したバッチの結果を取得する（順序は保証されない）."""
+        pass
+
+
+def _message_text(message: Any) -> str:
+    """メッセージのテキストブロックを連結する.
+
+    構造化出力のツールの呼び出しは、入力を JSON のテキストとして連結する。
+    """
+    parts = []
+    for block in message.content:
+        if block.type == "text":
+            parts.append(block.text)
+        elif block.type == "tool_use":
+            parts.append(json.dumps(block.input, ensure_ascii=False))
+    return "".join(parts)
+
+
+class AnthropicMessageBatchBackend(MessageBatchBackend):
+    """Anthropic の Message Batches API を使用するバックエンド."""
+
+    def __init__(self, client: "Union[anthropic.AsyncAnthropic, anthropic.Anthropic]") -> None:
+        self._client = client
+
+    async def create(self, requests: List[Dict[str, Any]]) -> str:
+        batch = await self._call(self._client.messages.batches.create, requests=requests)
+        return batch.id
+
+    async def is_ended(self, batch_id: str) -> bool:
+        batch = await self._call(self._client.messages.batches.retrieve, batch_id)
+        return batch.processing_status == "ended"
+
+    async def results(self, batch_id: str) -> List[MessageBatchResult]:
+        if isinstance(self._client, anthropic.AsyncAnthropic):
+            decoder = await self._client.messages.batches.results(batch_id)
+            entries = [entry async for entry in decoder]
+        else:
+            entries = await asyncio.to_thread(
+                lambda: list(self._client.messages.batches.results(batch_id))
+            )
+
+        results = []
+        for entry in entries:
+            if entry.result.type == "succeeded":
+                results.append(
+                    MessageBatchResult(
+                        custom_id=entry.custom_id, text=_message_text(entry.result.message)
+                    )
+                )
+            else:
+                error = getattr(entry.result, "error", None)
+                results.append(
+                    MessageBatchResult(
+                        custom_id=entry.custom_id, error=str(error or entry.result.type)
+                    )
+                )
+        return results
+
+    async def _call(self, method: Any, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(self._client, anthropic.AsyncAnthropic):
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+
+class LocalMessageBatchBackend(MessageBatchBackend):
+    """Message Batches API の代わりに Messages API で順次処理するローカル実装.
+
+    Message Batches API を利用できない環境での開発やテストに使用する。
+    バッチの状態はプロセス内にのみ保持される。
+    """
+
+    def __init__(
+        self,
+        client: "Union[anthropic.AsyncAnthropic, anthropic.Anthropic]",
+        max_concurrency: int = 2,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self._client = client
+        self._max_concurrency = max_concurrency
+        # 対話的なリクエストを優先するため、一括処理の優先度で割り当てを待つ
+        self._rate_limiter = rate_limiter
+        self._tasks: Dict[str, "asyncio.Task[List[MessageBatchResult]]"] = {}
+
+    async def create(self, requests: List[Dict[str, Any]]) -> str:
+        batch_id = f"localbatch_{uuid.uuid4().hex}"
+        self._tasks[batch_id] = asyncio.create_task(self._process(requests))
+        return batch_id
+
+    async def is_ended(self, batch_id: str) -> bool:
+        return self._task(batch_id).done()
+
+    async def results(self, batch_id: str) -> List[MessageBatchResult]:
+        return await self._task(batch_id)
+
+    def _task(self, batch_id: str) -> "asyncio.Task[List[MessageBatchResult]]":
+        task = self._tasks.get(batch_id)
+        if task is None:
+            raise KeyError(f"バッチが見つかりません: {batch_id}")
+        return task
+
+    async def _process(self, requests: List[Dict[str, Any]]) -> List[MessageBatchResult]:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def process_one(request: Dict[str, Any]) -> MessageBatchResult:
+            async with semaphore:
+                try:
+                    if self._rate_limiter is not None:
+                        await self._rate_limiter.acquire(
+                            estimate_message_tokens(request["params"]), RequestPriority.BULK
+                        )
+                    if isinstance(self._client, anthropic.AsyncAnthropic):
+                        message = await self._client.messages.create(**request["params"])
+                    else:
+                        message = await asyncio.to_thread(
+                            self._client.messages.create, **request["params"]
+                        )
+                    return MessageBatchResult(
+                        custom_id=request["custom_id"], text=_message_text(message)
+                    )
+                except Exception as e:
+                    return MessageBatchResult(custom_id=request["custom_id"], error=str(e))
+
+        return list(await asyncio.gather(*(process_one(request) for request in requests)))
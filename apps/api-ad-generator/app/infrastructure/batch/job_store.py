@@ -0,0 +1,140 @@
+"""一括生成ジョブの状態を保存する SQLite ストア."""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Dict, List, Optional
+
+from app.domain.entities import AdCopyBatchItemResult, AdCopyBatchJob, BatchJobStatus
+from app.domain.exceptions import AdGenerationError, DomainError, InvalidInputError
+from app.infrastructure.cache.serialization import dump_ad_copies, load_ad_copies
+
+# 保存したエラーを復元する際に使用する例外クラス
+_ERROR_TYPES = {
+    "InvalidInputError": InvalidInputError,
+    "AdGenerationError": AdGenerationError,
+}
+
+
+@dataclass(frozen=True)
+class BatchJobRecord:
+    """ストアに保存されたジョブとバックエンドのバッチIDの組."""
+
+    job: AdCopyBatchJob
+    batch_id: str
+
+
+def _dump_results(results: List[AdCopyBatchItemResult]) -> str:
+    items: List[Dict[str, Any]] = []
+    for result in results:
+        item: Dict[str, Any] = {"index": result.index}
+        if result.ad_copies is not None:
+            item["adCopies"] = dump_ad_copies(result.ad_copies)
+        if result.error is not None:
+            item["error"] = {"type": type(result.error).__name__, "message": result.error.message}
+        items.append(item)
+    return json.dumps(items, ensure_ascii=False)
+
+
+def _load_results(serialized: str) -> List[AdCopyBatchItemResult]:
+    results = []
+    for item in json.loads(serialized):
+        error: Optional[DomainError] = None
+        if "error" in item:
+            error_type = _ERROR_TYPES.get(item["error"]["type"], AdGenerationError)
+            error = error_type(item["error"]["message"])
+        ad_copies = load_ad_copies(item["adCopies"]) if "adCopies" in item else None
+        results.append(
+            AdCopyBatchItemResult(index=item["index"], ad_copies=ad_copies, error=error)
+        )
+    return results
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=UTC)
+
+
+class SQLiteBatchJobStore:
+    """ジョブの状態と結果を SQLite に保存するストア."""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS batch_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    batch_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    num_items INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    ended_at REAL,
+                    results TEXT
+                )
+                """
+            )
+
+    def create(self, job: AdCopyBatchJob, batch_id: str) -> None:
+        """ジョブを保存する."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO batch_jobs (job_id, batch_id, status, num_items, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (job.job_id, batch_id, job.status.value, job.num_items, job.created_at.timestamp()),
+            )
+
+    def get(self, job_id: str) -> Optional[BatchJobRecord]:
+        """ジョブを取得する."""
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT job_id, batch_id, status, num_items, created_at, ended_at
+                FROM batch_jobs WHERE job_id = ?
+                """,
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        job_id, batch_id, status, num_items, created_at, ended_at = row
+        job = AdCopyBatchJob(
+            job_id=job_id,
+            status=BatchJobStatus(status),
+            num_items=num_items,
+            created_at=_to_datetime(created_at),
+            ended_at=_to_datetime(ended_at),
+        )
+        return BatchJobRecord(job=job, batch_id=batch_id)
+
+    def mark_ended(
+        self, job_id: str, ended_at: datetime, results: List[AdCopyBatchItemResult]
+    ) -> None:
+        """ジョブを完了状態にし、結果を保存する."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE batch_jobs SET status = ?, ended_at = ?, results = ? WHERE job_id = ?",
+                (BatchJobStatus.ENDED.value, ended_at.timestamp(), _dump_results(results), job_id),
+            )
+
+    def get_results(self, job_id: str) -> Optional[List[AdCopyBatchItemResult]]:
+        """保存された結果を取得する（未完了の場合は None）."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT results FROM batch_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return _load_results(row[0])
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,25 @@
+"""Cache for Ad Generator."""
+
+from .ad_copy_cache import CacheControl, CachedAdGenerationRepository, cache_control
+from .backends import (
+    CacheBackend,
+    CacheStats,
+    InMemoryLRUCacheBackend,
+    SQLiteCacheBackend,
+)
+from .keys import ad_input_cache_key, generation_cache_key
+from .single_flight import SingleFlightAdGenerationRepository, SingleFlightStats
+
+__all__ = [
+    "CacheBackend",
+    "CacheControl",
+    "CacheStats",
+    "CachedAdGenerationRepository",
+    "InMemoryLRUCacheBackend",
+    "SQLiteCacheBackend",
+    "SingleFlightAdGenerationRepository",
+    "SingleFlightStats",
+    "ad_input_cache_key",
+    "cache_control",
+    "generation_cache_key",
+]
@@ -0,0 +1,141 @@
+"""広告文生成結果をキャッシュするリポジトリデコレーター."""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, List, Optional
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.repositories import AdGenerationRepository
+from app.domain.services import AdCopyRankingService
+from app.infrastructure.cache.backends import CacheBackend
+from app.infrastructure.cache.keys import generation_cache_key
+
+
+@dataclass(frozen=True)
+class CacheControl:
+    """リクエスト単位のキャッシュ制御指定."""
+
+    no_cache: bool = False
+    no_store: bool = False
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "CacheControl":
+        """Cache-Control ヘッダーの値から生成する."""
+        if not value:
+            return cls()
+        directives = {directive.strip().lower() for directive in value.split(",")}
+        return cls(
+            no_cache="no-cache" in directives or "no-store" in directives,
+            no_store="no-store" in directives,
+        )
+
+
+# 現在のリクエストのキャッシュ制御指定（ルートで設定される。未設定の場合は None）
+cache_control: ContextVar[Optional[CacheControl]] = ContextVar("cache_control", default=None)
+
+
+# 不足分の生成が蓄積と重複して足りない場合に、生成し直す回数を含めた生成の回数の上限
+MAX_GENERATION_ROUNDS = 3
+
+
+class CachedAdGenerationRepository(AdGenerationRepository):
+    """生成数を除いた同一入力に対する生成結果を蓄積し、上位から返すリポジトリ.
+
+    生成結果は評価スコアの高い順に並べて保存する。蓄積した件数が要求された生成数に
+    足りる場合は上位を返し、足りない場合は不足分だけを内部のリポジトリで生成して
+    蓄積に加える。生成した広告文が蓄積と重複して足りない場合は、新しい広告文が
+    得られる間、MAX_GENERATION_ROUNDS 回まで不足分を生成し直す。
+    """
+
+    def __init__(
+        self,
+        inner: AdGenerationRepository,
+        backend: CacheBackend,
+        ranking_service: Optional[AdCopyRankingService] = None,
+    ) -> None:
+        self._inner = inner
+        self._backend = backend
+        self._ranking_service = ranking_service or AdCopyRankingService()
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        """蓄積した広告文を参照し、足りない分だけを内部のリポジトリで生成する."""
+        control = cache_control.get() or CacheControl()
+        key = generation_cache_key(ad_input)
+        stored = await self._lookup(key, ad_input.num_copies, control)
+        if len(stored) >= ad_input.num_copies:
+            return stored[: ad_input.num_copies]
+
+        generated: List[AdCopy] = []
+        unique = stored
+        for _ in range(MAX_GENERATION_ROUNDS):
+            missing = ad_input.num_copies - len(unique)
+            if missing <= 0:
+                break
+            generated += await self._inner.generate_ad_copies(
+                replace(ad_input, num_copies=missing)
+            )
+            merged = self._ranking_service.merge([stored, generated])
+            if len(merged) == len(unique):
+                # 重複しない広告文が得られない場合は生成し直さない
+                break
+            unique = merged
+
+        ad_copies = await self._store(key, stored, generated, control)
+        return ad_copies[: ad_input.num_copies]
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """蓄積した広告文を返し、足りない分は生成しながら返して最後に蓄積に加える."""
+        control = cache_control.get() or CacheControl()
+        key = generation_cache_key(ad_input)
+        stored = await self._lookup(key, ad_input.num_copies, control)
+        for ad_copy in stored[: ad_input.num_copies]:
+            yield ad_copy
+        if len(stored) >= ad_input.num_copies:
+            return
+
+        generated: List[AdCopy] = []
+        kept = list(stored)
+        for _ in range(MAX_GENERATION_ROUNDS):
+            missing = ad_input.num_copies - len(kept)
+            if missing <= 0:
+                break
+            added = False
+            async for ad_copy in self._inner.stream_ad_copies(
+                replace(ad_input, num_copies=missing)
+            ):
+                generated.append(ad_copy)
+                # 返した広告文と重複するものは返さない
+                if len(kept) < ad_input.num_copies and not self._ranking_service.is_duplicate(
+                    ad_copy, kept
+                ):
+                    kept.append(ad_copy)
+                    added = True
+                    yield ad_copy
+            if not added:
+                break
+
+        # 最後まで生成できた場合のみ保存する
+        await self._store(key, stored, generated, control)
+
+    async def _lookup(self, key: str, num_copies: int, control: CacheControl) -> List[AdCopy]:
+        """蓄積した広告文を取得する（no-cache の場合は参照しない）."""
+        if control.no_cache:
+            self._backend.stats.bypasses += 1
+            return []
+        stored = await self._backend.get(key) or []
+        if len(stored) >= num_copies:
+            self._backend.stats.hits += 1
+        elif stored:
+            self._backend.stats.partial_hits += 1
+        else:
+            self._backend.stats.misses += 1
+        return stored
+
+    async def _store(
+        self, key: str, stored: List[AdCopy], generated: List[AdCopy], control: CacheControl
+    ) -> List[AdCopy]:
+        """生成した広告文を蓄積に加え、評価スコアの高い順に並べた全体を返す."""
+        ad_copies = self._ranking_service.merge([stored, generated])
+        if generated and not control.no_store:
+            await self._backend.set(key, ad_copies)
+        return ad_copies
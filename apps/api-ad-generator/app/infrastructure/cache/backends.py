@@ -0,0 +1,207 @@
+"""広告文キャッシュのバックエンド実装."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.domain.entities import AdCopy
+from app.infrastructure.cache.serialization import dump_ad_copies, load_ad_copies
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの利用状況を保持する統計情報."""
+
+    hits: int = 0
+    # 蓄積した広告文が要求された生成数に足りず、不足分だけを生成した回数
+    partial_hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """キャッシュヒット率（不足分を生成した場合はヒットに含めない）."""
+        lookups = self.hits + self.partial_hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "hits": self.hits,
+            "partialHits": self.partial_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hitRatio": self.hit_ratio,
+        }
+
+
+class CacheBackend(ABC):
+    """広告文キャッシュのバックエンドインターフェース."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[List[AdCopy]]:
+        """キーに対応する広告文を取得する（存在しない・期限切れの場合は None）."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, ad_copies: List[AdCopy]) -> None:
+        """広告文を保存する."""
+        pass
+
+    @abstractmethod
+    async def size(self) -> int:
+        """保存されているエントリ数を取得する."""
+        pass
+
+
+class InMemoryLRUCacheBackend(CacheBackend):
+    """プロセス内で保持する TTL 付き LRU キャッシュ."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, List[AdCopy]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[List[AdCopy]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, ad_copies = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return list(ad_copies)
+
+    async def set(self, key: str, ad_copies: List[AdCopy]) -> None:
+        self._entries[key] = (self._clock() + self._ttl_seconds, list(ad_copies))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """複数ワーカーで共有できる SQLite ファイルベースのキャッシュ."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ad_copy_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ad_copy_cache_accessed_at "
+                "ON ad_copy_cache (accessed_at)"
+            )
+
+    async def get(self, key: str) -> Optional[List[AdCopy]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, ad_copies: List[AdCopy]) -> None:
+        await asyncio.to_thread(self._set, key, dump_ad_copies(ad_copies))
+
+    async def size(self) -> int:
+        return await asyncio.to_thread(self._size)
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> Optional[List[AdCopy]]:
+        now = self._clock()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM ad_copy_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._connection.execute("DELETE FROM ad_copy_cache WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE ad_copy_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return load_ad_copies(value)
+
+    def _set(self, key: str, value: str) -> None:
+        now = self._clock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO ad_copy_cache (key, value, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    expires_at = excluded.expires_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (key, value, now + self._ttl_seconds, now),
+            )
+            evicted = self._connection.execute(
+                """
+                DELETE FROM ad_copy_cache WHERE key IN (
+                    SELECT key FROM ad_copy_cache
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_entries,),
+            ).rowcount
+            self.stats.evictions += max(evicted, 0)
+
+    def _size(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM ad_copy_cache").fetchone()
+        return int(row[0])
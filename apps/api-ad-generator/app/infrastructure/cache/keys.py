@@ -0,0 +1,45 @@
+"""キャッシュキーの生成."""
+
+import hashlib
+import json
+import unicodedata
+from typing import Any, Dict
+
+from app.domain.entities import AdInput
+
+# プロンプトや出力形式を変更した場合はバージョンを上げて既存エントリを無効化する
+CACHE_KEY_VERSION = "v2"
+
+
+def normalize_text(text: str) -> str:
+    """表記ゆれを吸収するためにテキストを正規化する."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _canonical_payload(ad_input: AdInput) -> Dict[str, Any]:
+    """生成数を除いた AdInput の内容を正規化する（アピールポイントは順序によらない）."""
+    return {
+        "productName": normalize_text(ad_input.product_name),
+        "targetAudience": normalize_text(ad_input.target_audience),
+        "appealPoints": sorted(normalize_text(point) for point in ad_input.appeal_points),
+        "tone": ad_input.tone.value if ad_input.tone else None,
+    }
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    serialized = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_VERSION}:{digest}"
+
+
+def ad_input_cache_key(ad_input: AdInput) -> str:
+    """AdInput の正規化した内容（生成数を含む）からキャッシュキーを生成する."""
+    return _digest({**_canonical_payload(ad_input), "numCopies": ad_input.num_copies})
+
+
+def generation_cache_key(ad_input: AdInput) -> str:
+    """生成数を除いた AdInput の正規化した内容から、生成結果を蓄積するキーを生成する.
+
+    生成数だけが異なる入力は同じキーになり、蓄積した広告文の上位を共有する。
+    """
+    return _digest(_canonical_payload(ad_input))
@@ -0,0 +1,26 @@
+"""キャッシュに保存する広告文のシリアライズ."""
+
+import json
+from dataclasses import asdict
+from typing import List
+
+from app.domain.entities import AdCopy, AdCopyEvaluation
+
+
+def dump_ad_copies(ad_copies: List[AdCopy]) -> str:
+    """広告文のリストを JSON 文字列に変換する."""
+    return json.dumps([asdict(ad_copy) for ad_copy in ad_copies], ensure_ascii=False)
+
+
+def load_ad_copies(serialized: str) -> List[AdCopy]:
+    """JSON 文字列から広告文のリストを復元する."""
+    ad_copies = []
+    for item in json.loads(serialized):
+        evaluation = item.pop("evaluation", None)
+        ad_copies.append(
+            AdCopy(
+                **item,
+                evaluation=AdCopyEvaluation(**evaluation) if evaluation else None,
+            )
+        )
+    return ad_copies
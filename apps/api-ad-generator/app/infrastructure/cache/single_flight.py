@@ -0,0 +1,73 @@
+"""同一入力の同時リクエストを1回の生成にまとめるリポジトリデコレーター."""
+
+import asyncio
+import functools
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.repositories import AdGenerationRepository
+from app.infrastructure.cache.keys import ad_input_cache_key
+
+
+@dataclass
+class SingleFlightStats:
+    """リクエスト集約の状況を保持する統計情報."""
+
+    leaders: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {"leaders": self.leaders, "coalesced": self.coalesced}
+
+
+class SingleFlightAdGenerationRepository(AdGenerationRepository):
+    """実行中の同一入力の生成があればその結果を共有するリポジトリ.
+
+    待機側の一部がキャンセルされても共有している生成は継続し、
+    全ての待機側がキャンセルされた場合は結果を受け取る相手がいないため生成も止める。
+    """
+
+    def __init__(self, inner: AdGenerationRepository) -> None:
+        self._inner = inner
+        self._in_flight: Dict[str, "asyncio.Future[List[AdCopy]]"] = {}
+        self._waiters: Dict["asyncio.Future[List[AdCopy]]", int] = {}
+        self.stats = SingleFlightStats()
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        """実行中の生成に合流するか、新たに生成を開始する."""
+        key = ad_input_cache_key(ad_input)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._inner.generate_ad_copies(ad_input))
+            future.add_done_callback(functools.partial(self._on_done, key))
+            self._in_flight[key] = future
+            self.stats.leaders += 1
+        else:
+            self.stats.coalesced += 1
+
+        # 待機側がキャンセルされても共有している生成処理は継続させる
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            ad_copies = await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                # 最後の待機側がキャンセルされた場合（クライアントの切断など）は生成も止める
+                # （完了済みの場合は何もしない）
+                future.cancel()
+        return list(ad_copies)
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """ストリーミングは集約せず、内部のリポジトリにそのまま委譲する."""
+        async for ad_copy in self._inner.stream_ad_copies(ad_input):
+            yield ad_copy
+
+    def _on_done(self, key: str, future: "asyncio.Future[List[AdCopy]]") -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        # 全ての待機側がキャンセル済みでも未取得例外の警告を出さない
+        if not future.cancelled():
+            future.exception()
@@ -1,5 +1,11 @@
 """Clients for Ad Generator."""
 
+from .claude_batch_client import ClaudeBatchJobRepository
 from .claude_client import ClaudeAdGenerationRepository
+from .fan_out_repository import FanOutAdGenerationRepository
 
-__all__ = ["ClaudeAdGenerationRepository"]
\ No newline at end of file
+__all__ = [
+    "ClaudeAdGenerationRepository",
+    "ClaudeBatchJobRepository",
+    "FanOutAdGenerationRepository",
+]
\ No newline at end of file
@@ -0,0 +1,343 @@
+"""Claude API の出力から広告文を取り出すパーサー.
+
+"adCopies": [ の位置を起点に、文字列リテラル内の括弧やエスケープを考慮して
+配列の範囲を特定する。前後の文章に括弧が含まれていても影響を受けず、
+ストリーミング出力に対しても同じ走査器を使用する。
+
+orjson がインストールされている場合は JSON のデコードに使用する。
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.domain.entities import AdCopy, AdCopyEvaluation
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意依存
+    orjson = None
+
+# 使用中の JSON バックエンド名（ベンチマークや統計表示用）
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# "adCopies" キーに続く配列の開始位置を探すパターン
+_AD_COPIES_ARRAY_PATTERN = re.compile(r'"adCopies"\s*:\s*\[')
+
+# キーがチャンク境界で分断された場合に備えて残しておく末尾の文字数
+_KEY_LOOKBEHIND = len('"adCopies" : [') + 16
+
+# 文字列リテラルの外で意味を持つ文字
+_STRUCTURAL_PATTERN = re.compile(r'[{}\[\]"]')
+
+# 文字列リテラルの中で意味を持つ文字
+_STRING_SPECIAL_PATTERN = re.compile(r'["\\]')
+
+# 走査イベントの種類
+_OBJECT_START = "object_start"
+_OBJECT_END = "object_end"
+_ARRAY_END = "array_end"
+
+_decoder = json.JSONDecoder()
+
+
+def _orjson_loads(text: str) -> Any:
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        # 呼び出し側が標準の例外だけを扱えるように変換する
+        raise json.JSONDecodeError(str(e), text, 0) from e
+
+
+_loads: Callable[[str], Any] = _orjson_loads if orjson is not None else json.loads
+
+
+def _checked(value: Any, key: str, types: Tuple[type, ...]) -> Any:
+    """出力 JSON の値の型を確認して返す（bool は数値とみなさない）.
+
+    Raises:
+        ValueError: 値の型が types のいずれでもない場合
+    """
+    if isinstance(value, bool) or not isinstance(value, types):
+        raise ValueError(f"{key} の型が不正です: {type(value).__name__}")
+    return value
+
+
+def ad_copy_from_dict(item: Dict[str, Any]) -> AdCopy:
+    """出力 JSON の1要素を AdCopy に変換する.
+
+    Raises:
+        KeyError: copyText が含まれない場合
+        ValueError: 値の型が不正な場合や、値がドメインのルールに違反する場合
+    """
+    if not isinstance(item, dict):
+        raise ValueError("adCopies の要素がオブジェクトではありません")
+
+    evaluation = None
+    if "evaluation" in item and item["evaluation"]:
+        eval_data = _checked(item["evaluation"], "evaluation", (dict,))
+        evaluation = AdCopyEvaluation(
+            relevance_score=_checked(
+                eval_data.get("relevanceScore", 0.0), "relevanceScore", (int, float)
+            ),
+            creativity_score=_checked(
+                eval_data.get("creativityScore", 0.0), "creativityScore", (int, float)
+            ),
+            target_audience_appeal=_checked(
+                eval_data.get("targetAudienceAppeal", ""), "targetAudienceAppeal", (str,)
+            ),
+        )
+
+    return AdCopy(
+        copy_text=_checked(item["copyText"], "copyText", (str,)),
+        headline=_checked(item.get("headline"), "headline", (str, type(None))),
+        call_to_action=_checked(item.get("callToAction"), "callToAction", (str, type(None))),
+        evaluation=evaluation,
+    )
+
+
+class _ArrayScanner:
+    """配列内の括弧の対応を、文字列リテラルを考慮しながら追跡する.
+
+    状態を保持するため、テキストを分割して複数回に分けて走査できる。
+    正規表現で次の意味を持つ文字まで読み飛ばすので、1文字ずつの
+    Python ループよりも高速に動作する。
+    """
+
+    def __init__(self) -> None:
+        self.position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def scan(self, text: str, index: int) -> Iterator[Tuple[str, int]]:
+        """text の index 以降を走査し、(イベント種類, 位置) を順に返す.
+
+        走査を終えた位置は position に保持される。
+        """
+        length = len(text)
+        while index < length:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    index += 1
+                    continue
+                match = _STRING_SPECIAL_PATTERN.search(text, index)
+                if match is None:
+                    index = length
+                    break
+                index = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURAL_PATTERN.search(text, index)
+            if match is None:
+                index = length
+                break
+            char = match.group()
+            position = match.start()
+            index = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char == "{" or char == "[":
+                if self._depth == 0 and char == "{":
+                    yield _OBJECT_START, position
+                self._depth += 1
+            elif self._depth == 0:
+                # 配列の終端
+                self.position = index
+                yield _ARRAY_END, position
+                return
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    yield _OBJECT_END, position
+
+        self.position = index
+
+
+def find_ad_copies_array(text: str) -> Optional[Tuple[int, int]]:
+    """adCopies 配列の範囲を探す.
+
+    Returns:
+        配列の開始位置 "[" と終端 "]" の次の位置の組（見つからない場合は None）
+
+    Raises:
+        ValueError: 配列が閉じていない場合
+    """
+    match = _AD_COPIES_ARRAY_PATTERN.search(text)
+    if match is None:
+        return None
+
+    scanner = _ArrayScanner()
+    for event, position in scanner.scan(text, match.end()):
+        if event == _ARRAY_END:
+            return match.end() - 1, position + 1
+    raise ValueError("adCopies 配列が閉じていません")
+
+
+def parse_ad_copy_items(text: str) -> List[Dict[str, Any]]:
+    """出力テキスト全体から adCopies 配列の要素を取り出す.
+
+    Raises:
+        ValueError: adCopies 配列が見つからない・閉じていない場合
+        json.JSONDecodeError: 配列が JSON として不正な場合
+    """
+    if orjson is None:
+        # 標準の json では部分文字列を切り出さずに配列の位置から直接デコードする
+        match = _AD_COPIES_ARRAY_PATTERN.search(text)
+        if match is None:
+            raise ValueError("JSONが見つかりません")
+        items, _ = _decoder.raw_decode(text, match.end() - 1)
+        return items
+
+    match = _AD_COPIES_ARRAY_PATTERN.search(text)
+    if match is None:
+        raise ValueError("JSONが見つかりません")
+
+    # 通常は最後の "]" が配列の終端なので、まずはそのままデコードを試す
+    start = match.end() - 1
+    end = text.rfind("]") + 1
+    if end > start:
+        try:
+            items = _loads(text[start:end])
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(items, list):
+                return items
+
+    # 後続の文章に "]" が含まれる場合などは括弧の対応を走査して終端を特定する
+    span = find_ad_copies_array(text)
+    if span is None:
+        raise ValueError("JSONが見つかりません")
+    start, end = span
+    return _loads(text[start:end])
+
+
+def parse_ad_copies(text: str) -> List[AdCopy]:
+    """出力テキスト全体をパースして AdCopy のリストに変換する.
+
+    Raises:
+        ValueError: adCopies 配列が見つからない場合や値が不正な場合
+        KeyError: copyText が含まれない要素がある場合
+        json.JSONDecodeError: 配列が JSON として不正な場合
+    """
+    return [ad_copy_from_dict(item) for item in parse_ad_copy_items(text)]
+
+
+def salvage_ad_copies(text: str) -> List[AdCopy]:
+    """途中で打ち切られた出力テキストから、閉じている要素だけを AdCopy に変換する.
+
+    adCopies 配列が始まる前に打ち切られた場合は空のリストを返す。
+
+    Raises:
+        ValueError: 値がドメインのルールに違反する場合
+        KeyError: copyText が含まれない要素がある場合
+        json.JSONDecodeError: 閉じている要素が JSON として不正な場合
+    """
+    return [ad_copy_from_dict(item) for item in AdCopyStreamParser().feed(text)]
+
+
+def ad_copies_from_tool_input(tool_input: Any, truncated: bool = False) -> List[AdCopy]:
+    """構造化出力のツールの入力を AdCopy のリストに変換する.
+
+    出力が打ち切られた場合は、最後の要素は途中までしか含まれない可能性があるため除く。
+
+    Args:
+        tool_input: ツールの呼び出しの入力（呼び出しがない場合は None）
+        truncated: 出力が max_tokens で打ち切られたか
+
+    Raises:
+        ValueError: adCopies 配列がない場合や値がドメインのルールに違反する場合
+        KeyError: copyText が含まれない要素がある場合
+    """
+    items = tool_input.get("adCopies") if isinstance(tool_input, dict) else None
+    if not isinstance(items, list):
+        if truncated:
+            return []
+        raise ValueError("adCopies 配列が見つかりません")
+    if truncated:
+        items = items[:-1]
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError("adCopies の要素がオブジェクトではありません")
+    return [ad_copy_from_dict(item) for item in items]
+
+
+class AdCopyStreamParser:
+    """ストリーミング出力から adCopies 配列の要素を逐次取り出すパーサー.
+
+    文字列リテラル内の括弧やエスケープを考慮し、配列の各オブジェクトが
+    閉じた時点でその要素を返す。
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._cursor = 0
+        self._in_array = False
+        self._finished = False
+        self._scanner = _ArrayScanner()
+        self._object_start = -1
+
+    @property
+    def found_array(self) -> bool:
+        """adCopies 配列の開始が見つかったかどうか."""
+        return self._in_array or self._finished
+
+    @property
+    def finished(self) -> bool:
+        """adCopies 配列の終端まで読み終えたかどうか."""
+        return self._finished
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """テキストの断片を追加し、新たに完成した要素を返す.
+
+        Raises:
+            json.JSONDecodeError: 完成した要素が JSON として不正な場合
+        """
+        if self._finished:
+            return []
+
+        self._buffer += chunk
+        if not self._in_array and not self._seek_array():
+            return []
+        return self._scan()
+
+    def _seek_array(self) -> bool:
+        match = _AD_COPIES_ARRAY_PATTERN.search(self._buffer, self._cursor)
+        if match is None:
+            self._cursor = max(self._cursor, len(self._buffer) - _KEY_LOOKBEHIND)
+            return False
+
+        self._buffer = self._buffer[match.end():]
+        self._cursor = 0
+        self._in_array = True
+        return True
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        buffer = self._buffer
+
+        for event, position in self._scanner.scan(buffer, self._cursor):
+            if event == _OBJECT_START:
+                self._object_start = position
+            elif event == _OBJECT_END and self._object_start >= 0:
+                items.append(_loads(buffer[self._object_start:position + 1]))
+                self._object_start = -1
+            elif event == _ARRAY_END:
+                self._finished = True
+                self._in_array = False
+
+        # 取り出し済みの部分は破棄してバッファの肥大化を防ぐ
+        index = self._scanner.position
+        if self._object_start >= 0:
+            self._buffer = buffer[self._object_start:]
+            self._cursor = index - self._object_start
+            self._object_start = 0
+        else:
+            self._buffer = ""
+            self._cursor = 0
+        return items
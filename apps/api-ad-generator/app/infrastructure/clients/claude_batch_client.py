@@ -0,0 +1,151 @@
+"""Claude Message Batches API を使用した一括生成ジョブリポジトリの実装."""
+
+import asyncio
+import uuid
+from datetime import UTC, datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.domain.entities import (
+    AdCopy,
+    AdCopyBatchItemResult,
+    AdCopyBatchJob,
+    AdInput,
+    BatchJobStatus,
+)
+from app.domain.exceptions import AdGenerationError, JobNotFoundError, JobNotReadyError
+from app.domain.repositories import AdBatchJobRepository
+from app.domain.services import AdCopyFanOutService
+from app.infrastructure.batch import (
+    BatchJobRecord,
+    MessageBatchBackend,
+    MessageBatchResult,
+    SQLiteBatchJobStore,
+)
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+class ClaudeBatchJobRepository(AdBatchJobRepository):
+    """入力をまとめて1つのメッセージバッチとして処理するリポジトリの実装."""
+
+    def __init__(
+        self,
+        claude_repository: ClaudeAdGenerationRepository,
+        backend: MessageBatchBackend,
+        store: SQLiteBatchJobStore,
+        clock: Callable[[], datetime] = _utcnow,
+        fan_out_service: Optional[AdCopyFanOutService] = None,
+    ) -> None:
+        """リポジトリを初期化する.
+
+        Args:
+            claude_repository: プロンプト構築とレスポンス解析に使用するリポジトリ
+            backend: メッセージバッチを処理するバックエンド
+            store: ジョブの状態を保存するストア
+            clock: 現在時刻を返す関数
+            fan_out_service: 生成数の多い入力の分割と結果の集約を行うドメインサービス
+        """
+        self._claude_repository = claude_repository
+        self._backend = backend
+        self._store = store
+        self._clock = clock
+        self._fan_out_service = fan_out_service or AdCopyFanOutService()
+
+    async def submit(self, ad_inputs: Sequence[AdInput]) -> AdCopyBatchJob:
+        """入力をメッセージバッチとして登録する.
+
+        生成数の多い入力は分割し、"<入力の位置>.<分割番号>" の custom_id で登録する。
+        """
+        requests = []
+        for index, ad_input in enumerate(ad_inputs):
+            sub_inputs = self._fan_out_service.split(ad_input)
+            for shard, sub_input in enumerate(sub_inputs):
+                custom_id = str(index) if len(sub_inputs) == 1 else f"{index}.{shard}"
+                requests.append(
+                    {
+                        "custom_id": custom_id,
+                        "params": self._claude_repository._build_message_params(sub_input),
+                    }
+                )
+        batch_id = await self._backend.create(requests)
+
+        job = AdCopyBatchJob(
+            job_id=uuid.uuid4().hex,
+            status=BatchJobStatus.IN_PROGRESS,
+            num_items=len(ad_inputs),
+            created_at=self._clock(),
+        )
+        await asyncio.to_thread(self._store.create, job, batch_id)
+        return job
+
+    async def get_job(self, job_id: str) -> AdCopyBatchJob:
+        """ジョブの状態を取得し、バッチが完了していれば結果を取り込む."""
+        record = await self._get_record(job_id)
+        if record.job.status == BatchJobStatus.IN_PROGRESS and await self._backend.is_ended(
+            record.batch_id
+        ):
+            results = self._to_item_results(
+                await self._backend.results(record.batch_id), record.job.num_items
+            )
+            await asyncio.to_thread(self._store.mark_ended, job_id, self._clock(), results)
+            record = await self._get_record(job_id)
+        return record.job
+
+    async def get_results(self, job_id: str) -> List[AdCopyBatchItemResult]:
+        """完了したジョブの生成結果を取得する."""
+        job = await self.get_job(job_id)
+        results: Optional[List[AdCopyBatchItemResult]] = None
+        if job.status == BatchJobStatus.ENDED:
+            results = await asyncio.to_thread(self._store.get_results, job_id)
+        if results is None:
+            raise JobNotReadyError(f"ジョブはまだ完了していません: {job_id}")
+        return results
+
+    async def _get_record(self, job_id: str) -> BatchJobRecord:
+        record = await asyncio.to_thread(self._store.get, job_id)
+        if record is None:
+            raise JobNotFoundError(f"ジョブが見つかりません: {job_id}")
+        return record
+
+    def _to_item_results(
+        self, batch_results: List[MessageBatchResult], num_items: int
+    ) -> List[AdCopyBatchItemResult]:
+        """バッチの結果を入力順の生成結果に変換する."""
+        by_index: Dict[int, List[MessageBatchResult]] = {}
+        for result in batch_results:
+            index = int(result.custom_id.partition(".")[0])
+            by_index.setdefault(index, []).append(result)
+
+        item_results = []
+        for index in range(num_items):
+            shard_results = by_index.get(index, [])
+            if not shard_results:
+                error = AdGenerationError("バッチの結果が見つかりません")
+                item_results.append(AdCopyBatchItemResult(index=index, error=error))
+            else:
+                item_results.append(self._merge_item(index, shard_results))
+        return item_results
+
+    def _merge_item(
+        self, index: int, shard_results: List[MessageBatchResult]
+    ) -> AdCopyBatchItemResult:
+        """分割した入力の結果をまとめ、1つの入力の生成結果にする."""
+        results: List[List[AdCopy]] = []
+        error: Optional[AdGenerationError] = None
+        for shard_result in shard_results:
+            if shard_result.text is None:
+                error = AdGenerationError(f"Claude APIでエラーが発生しました: {shard_result.error}")
+                continue
+            try:
+                results.append(self._claude_repository._parse_response(shard_result.text))
+            except AdGenerationError as e:
+                error = e
+
+        ad_copies = self._fan_out_service.merge(results)
+        if not ad_copies:
+            error = error or AdGenerationError("広告文の生成に失敗しました")
+            return AdCopyBatchItemResult(index=index, error=error)
+        return AdCopyBatchItemResult(index=index, ad_copies=ad_copies)
@@ -1,115 +1,666 @@
 """Claude API クライアント実装."""
 
+import asyncio
 import json
-from typing import List
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import anthropic
-
-from app.domain.entities import AdCopy, AdCopyEvaluation, AdInput
-from app.domain.exceptions import AdGenerationError
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import AdGenerationError, TransientGenerationError
 from app.domain.repositories import AdGenerationRepository
+from app.infrastructure.clients.ad_copy_parser import (
+    AdCopyStreamParser,
+    ad_copies_from_tool_input,
+    ad_copy_from_dict,
+    parse_ad_copies,
+    salvage_ad_copies,
+)
+from app.infrastructure.clients.max_tokens import MaxTokensEstimator
+from app.infrastructure.clients.prompt_builder import (
+    AD_COPIES_TOOL_NAME,
+    AdCopyPromptBuilder,
+)
+from app.infrastructure.lazy_import import lazy_import
+from app.infrastructure.metrics.instruments import (
+    AD_COPIES_EXTRACTED,
+    AD_COPY_OUTPUT_TOKENS,
+    AD_COPY_RESPONSES,
+    PROMPT_BUILD,
+    RATE_LIMIT_WAIT,
+    RESPONSE_PARSE,
+    UPSTREAM,
+    UPSTREAM_REQUESTS_IN_FLIGHT,
+    UPSTREAM_TOKENS,
+)
+from app.infrastructure.model_routing import ModelProfile, ModelRouter
+from app.infrastructure.rate_limit import RateLimiter, estimate_message_tokens
+from app.infrastructure.resilience import LatencyTracker, parse_retry_after
+from app.infrastructure.tracing import Span, start_span
+
+if TYPE_CHECKING:
+    import anthropic
+else:
+    anthropic = lazy_import("anthropic")
+
+# 再試行で回復する可能性のある HTTP ステータスコード（529 は Claude API の過負荷）
+_TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+# ストリーミング中のエラーイベントのうち、再試行で回復する可能性のある種類
+_TRANSIENT_ERROR_TYPES = frozenset({"overloaded_error", "rate_limit_error", "api_error"})
+
+# スロットリングを表す HTTP ステータスコードとエラーの種類（別のモデルにフォールバックする）
+_THROTTLED_STATUS_CODES = frozenset({429, 529})
+_THROTTLED_ERROR_TYPES = frozenset({"overloaded_error", "rate_limit_error"})
+
+# 出力が max_tokens で打ち切られたことを表す stop_reason
+_STOP_REASON_MAX_TOKENS = "max_tokens"
+
+# モデルルーターを指定しない場合に使用するモデル
+DEFAULT_MODEL = ModelProfile.from_name("claude-3-5-sonnet-20241022")
+
+# メトリクスの系列（ホットパスでラベルを引かないよう事前に取得しておく）
+_UPSTREAM_IN_FLIGHT = UPSTREAM_REQUESTS_IN_FLIGHT.labels()
+_INPUT_TOKENS = UPSTREAM_TOKENS.labels("input")
+_OUTPUT_TOKENS = UPSTREAM_TOKENS.labels("output")
+_CACHE_CREATION_INPUT_TOKENS = UPSTREAM_TOKENS.labels("cache_creation_input")
+_CACHE_READ_INPUT_TOKENS = UPSTREAM_TOKENS.labels("cache_read_input")
+
+
+@dataclass
+class ClaudeUsageStats:
+    """Claude API のトークン使用量を保持する統計情報."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+
+    @property
+    def cache_read_ratio(self) -> float:
+        """入力トークンのうちプロンプトキャッシュから読み込んだ割合."""
+        total = self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+        if total == 0:
+            return 0.0
+        return self.cache_read_input_tokens / total
+
+    def record(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_creation_input_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+    ) -> None:
+        """1リクエスト分の使用量を加算する."""
+        self.requests += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cache_creation_input_tokens += cache_creation_input_tokens
+        self.cache_read_input_tokens += cache_read_input_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "requests": self.requests,
+            "inputTokens": self.input_tokens,
+            "outputTokens": self.output_tokens,
+            "cacheCreationInputTokens": self.cache_creation_input_tokens,
+            "cacheReadInputTokens": self.cache_read_input_tokens,
+            "cacheReadRatio": self.cache_read_ratio,
+        }
+
+
+@dataclass
+class OutputFormatStats:
+    """出力形式ごとの出力トークン数とパースの失敗を保持する統計情報.
+
+    mode は、出力形式を文章で指示してテキストから JSON を取り出す場合は text、
+    広告文のスキーマをツールとして定義する構造化出力の場合は tool とする。
+    """
+
+    mode: str
+    parsed: int = 0
+    parse_failures: int = 0
+    output_tokens: int = 0
+    ad_copies: int = 0
+
+    @property
+    def parse_failure_rate(self) -> float:
+        """応答のうち広告文を取り出せなかった割合."""
+        total = self.parsed + self.parse_failures
+        if total == 0:
+            return 0.0
+        return self.parse_failures / total
+
+    @property
+    def output_tokens_per_copy(self) -> Optional[float]:
+        """取り出した広告文1件あたりの出力トークン数."""
+        if self.ad_copies == 0:
+            return None
+        return self.output_tokens / self.ad_copies
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "mode": self.mode,
+            "parsed": self.parsed,
+            "parseFailures": self.parse_failures,
+            "parseFailureRate": self.parse_failure_rate,
+            "outputTokens": self.output_tokens,
+            "adCopies": self.ad_copies,
+            "outputTokensPerCopy": self.output_tokens_per_copy,
+        }
+
+
+@dataclass
+class _StreamOutcome:
+    """1回のストリーミングで返した広告文の件数と、出力が打ち切られたかどうか."""
+
+    num_copies: int = 0
+    truncated: bool = False
 
 
 class ClaudeAdGenerationRepository(AdGenerationRepository):
     """Claude API を使用した広告文生成リポジトリの実装."""
 
-    def __init__(self, api_key: str) -> None:
-        self._client = anthropic.Anthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        *,
+        client: "Optional[Union[anthropic.AsyncAnthropic, anthropic.Anthropic]]" = None,
+        client_factory: Optional[
+            Callable[[], "Union[anthropic.AsyncAnthropic, anthropic.Anthropic]"]
+        ] = None,
+        timeout: float = 60.0,
+        max_concurrency: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+        prompt_cache: bool = True,
+        model_router: Optional[ModelRouter] = None,
+        max_tokens_estimator: Optional[MaxTokensEstimator] = None,
+        max_continuations: int = 2,
+        structured_output: bool = False,
+        latency_tracker: Optional[LatencyTracker] = None,
+    ) -> None:
+        """リポジトリを初期化する.
+
+        Args:
+            api_key: Anthropic APIキー（client 未指定時に使用）
+            client: 使用する Anthropic クライアント。同期クライアントの場合は
+                スレッドにオフロードして呼び出す
+            client_factory: 最初に使用する時点でクライアントを生成する関数（client 未指定時に使用）。
+                どちらも未指定の場合は api_key で AsyncAnthropic を生成する
+            timeout: 1リクエストあたりのタイムアウト秒数
+            max_concurrency: Claude API への同時リクエスト数の上限
+            rate_limiter: 1分あたりのリクエスト数とトークン数を制限するレート制限
+            prompt_cache: 共通のシステムプロンプトをプロンプトキャッシュの対象にするか
+            model_router: リクエストごとに使用するモデルを選択するルーター。
+                未指定の場合は DEFAULT_MODEL のみを使用する
+            max_tokens_estimator: 生成数と出力トークン数の実績から max_tokens を決める見積もり
+            max_continuations: 出力が max_tokens で打ち切られた場合に、不足分を続けて生成する回数の上限
+            structured_output: 広告文のスキーマをツールとして定義し、テキストから JSON を
+                取り出す代わりにツールの入力を読むか
+            latency_tracker: 上流の呼び出しのレイテンシ（同時リクエスト数の枠やレート制限の
+                待ち時間を含まない）を記録するトラッカー
+        """
+        # 起動を速くするため、クライアントの生成（anthropic の読み込みを含む）は最初に使用するまで遅らせる
+        self._client = client
+        self._client_factory = client_factory
+        self._api_key = api_key
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limiter = rate_limiter
+        self._prompt_builder = AdCopyPromptBuilder(
+            cache_system_prompt=prompt_cache, structured_output=structured_output
+        )
+        self.model_router = model_router or ModelRouter.single(DEFAULT_MODEL)
+        self.max_tokens_estimator = max_tokens_estimator or MaxTokensEstimator()
+        self._max_continuations = max_continuations
+        self.latency_tracker = latency_tracker
+        self.usage_stats = ClaudeUsageStats()
+        mode = "tool" if structured_output else "text"
+        self.output_stats = OutputFormatStats(mode=mode)
+        self._parsed_responses = AD_COPY_RESPONSES.labels(mode, "parsed")
+        self._parse_failures = AD_COPY_RESPONSES.labels(mode, "parse_failure")
+        self._parsed_output_tokens = AD_COPY_OUTPUT_TOKENS.labels(mode)
+        self._extracted_ad_copies = AD_COPIES_EXTRACTED.labels(mode)
+
+    @property
+    def client(self) -> "Union[anthropic.AsyncAnthropic, anthropic.Anthropic]":
+        """使用する Anthropic クライアントを取得する（未生成の場合は生成する）."""
+        if self._client is None:
+            if self._client_factory is not None:
+                self._client = self._client_factory()
+            else:
+                self._client = anthropic.AsyncAnthropic(api_key=self._api_key)
+        return self._client
+
+    def has_free_capacity(self) -> bool:
+        """同時リクエスト数の枠とレート制限を待たずに、上流への呼び出しを始められるかどうか."""
+        if self._semaphore.locked():
+            return False
+        return self._rate_limiter is None or self._rate_limiter.waiting == 0
+
+    def warm_up(self) -> None:
+        """anthropic の読み込みとクライアントの生成を済ませ、最初のリクエストの遅延をなくす."""
+        _ = self.client
 
     async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
-        """Claude APIを使用して広告文を生成する."""
+        """Claude APIを使用して広告文を生成する.
+
+        モデルがスロットリングされた場合は、モデルルーターが返す次のモデルで生成する。
+        """
+        candidates = self.model_router.candidates(ad_input)
+        for index, profile in enumerate(candidates):
+            try:
+                return await self._generate_with_model(ad_input, profile)
+            except AdGenerationError:
+                # パースの失敗は上流の呼び出しの成功として記録済みのため、そのまま送出する
+                raise
+            except Exception as e:
+                if not self._fall_back(profile, e, has_next=index + 1 < len(candidates)):
+                    raise self._to_generation_error(e) from e
+        raise AssertionError("モデルの候補がありません")
+
+    async def _generate_with_model(self, ad_input: AdInput, profile: ModelProfile) -> List[AdCopy]:
+        """指定したモデルで広告文を生成する.
+
+        出力が max_tokens で打ち切られた場合は、閉じている広告文を取り出し、
+        不足分を上限の max_tokens で続けて生成する。
+        """
+        ad_copies, truncated = await self._request_ad_copies(ad_input, profile)
+        for _ in range(self._max_continuations):
+            missing = ad_input.num_copies - len(ad_copies)
+            if not truncated or missing <= 0:
+                break
+            self.max_tokens_estimator.stats.continuations += 1
+            more, truncated = await self._request_ad_copies(
+                replace(ad_input, num_copies=missing), profile, max_tokens=profile.max_tokens
+            )
+            ad_copies += more
+        if truncated and not ad_copies:
+            raise AdGenerationError("レスポンスのパースに失敗しました: 出力が max_tokens で打ち切られました")
+        return ad_copies
+
+    async def _request_ad_copies(
+        self, ad_input: AdInput, profile: ModelProfile, max_tokens: Optional[int] = None
+    ) -> Tuple[List[AdCopy], bool]:
+        """Messages API を1回呼び出し、広告文と出力が打ち切られたかどうかを返す."""
+        with PROMPT_BUILD.time(), start_span("ClaudeAdGenerationRepository._build_prompt"):
+            params = self._build_message_params(ad_input, profile, max_tokens)
+        estimated_tokens = await self._acquire_rate_limit(params)
+
+        async with self._semaphore:
+            _UPSTREAM_IN_FLIGHT.inc()
+            started = time.perf_counter()
+            try:
+                with UPSTREAM.time(), start_span("claude.messages.create") as span:
+                    span.set_attribute("gen_ai.system", "anthropic")
+                    span.set_attribute("gen_ai.request.model", params["model"])
+                    span.set_attribute("gen_ai.request.max_tokens", params["max_tokens"])
+                    span.set_attribute("ad.num_copies", ad_input.num_copies)
+                    response = await self._create_message(**params)
+                    latency = time.perf_counter() - started
+                    self._set_usage_attributes(span, response)
+            finally:
+                _UPSTREAM_IN_FLIGHT.dec()
+        if self.latency_tracker is not None:
+            self.latency_tracker.record(latency)
+        await self._record_usage(estimated_tokens, response, profile, latency)
+
+        truncated = getattr(response, "stop_reason", None) == _STOP_REASON_MAX_TOKENS
+        with RESPONSE_PARSE.time(), start_span("ClaudeAdGenerationRepository._parse_response"):
+            ad_copies = self._extract_ad_copies(response, truncated)
+        self._record_output(response, len(ad_copies), truncated)
+        return ad_copies, truncated
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """Claude APIのストリーミング出力から広告文を1件ずつ返す.
+
+        最初の1件を返す前にモデルがスロットリングされた場合は、次のモデルでストリーミングする。
+        """
+        if not isinstance(self.client, anthropic.AsyncAnthropic):
+            # 同期クライアントではストリーミングせず、生成後にまとめて返す
+            for ad_copy in await self.generate_ad_copies(ad_input):
+                yield ad_copy
+            return
+
+        candidates = self.model_router.candidates(ad_input)
+        for index, profile in enumerate(candidates):
+            num_yielded = 0
+            try:
+                async with aclosing(self._stream_with_model(ad_input, profile)) as ad_copies:
+                    async for ad_copy in ad_copies:
+                        num_yielded += 1
+                        yield ad_copy
+                return
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                self._record_parse_failure()
+                raise AdGenerationError(f"レスポンスのパースに失敗しました: {str(e)}") from e
+            except AdGenerationError:
+                # パースの失敗は上流の呼び出しの成功として記録済みのため、そのまま送出する
+                raise
+            except Exception as e:
+                has_next = num_yielded == 0 and index + 1 < len(candidates)
+                if not self._fall_back(profile, e, has_next=has_next):
+                    raise self._to_generation_error(e) from e
+
+    async def _stream_with_model(self, ad_input: AdInput, profile: ModelProfile) -> AsyncIterator[AdCopy]:
+        """指定したモデルのストリーミング出力から広告文を1件ずつ返す.
+
+        出力が max_tokens で打ち切られた場合は、不足分を上限の max_tokens で続けてストリーミングする。
+        """
+        remaining = ad_input
+        max_tokens: Optional[int] = None
+        for continuation in range(self._max_continuations + 1):
+            outcome = _StreamOutcome()
+            async with aclosing(self._stream_once(remaining, profile, max_tokens, outcome)) as ad_copies:
+                async for ad_copy in ad_copies:
+                    yield ad_copy
+            missing = remaining.num_copies - outcome.num_copies
+            if not outcome.truncated or missing <= 0:
+                return
+            if continuation == self._max_continuations:
+                break
+            self.max_tokens_estimator.stats.continuations += 1
+            remaining = replace(ad_input, num_copies=missing)
+            max_tokens = profile.max_tokens
+        if missing == ad_input.num_copies:
+            raise AdGenerationError("レスポンスのパースに失敗しました: 出力が max_tokens で打ち切られました")
+
+    async def _stream_once(
+        self,
+        ad_input: AdInput,
+        profile: ModelProfile,
+        max_tokens: Optional[int],
+        outcome: "_StreamOutcome",
+    ) -> AsyncIterator[AdCopy]:
+        """Messages API を1回ストリーミングで呼び出し、結果を outcome に記録する.
+
+        上流の読み出しは別のタスクで行い、読み出した広告文をキューを介して返す。
+        同時リクエスト数の枠とタイムアウトを上流の読み出しの間だけに限り、
+        呼び出し元の消費が遅くても枠を占有し続けないようにするため。
+        """
+        parser = AdCopyStreamParser()
+        with PROMPT_BUILD.time():
+            params = self._build_message_params(ad_input, profile, max_tokens)
+        estimated_tokens = await self._acquire_rate_limit(params)
+        # 要求した数の広告文までは、呼び出し元の消費を待たずに読み出せる
+        queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=ad_input.num_copies)
+        reader = asyncio.ensure_future(
+            self._read_stream(params, profile, estimated_tokens, parser, queue)
+        )
+        try:
+            while (item := await queue.get()) is not None:
+                outcome.num_copies += 1
+                yield ad_copy_from_dict(item)
+            response = await reader
+        finally:
+            if not reader.done():
+                reader.cancel()
+                await asyncio.gather(reader, return_exceptions=True)
+
+        # 打ち切られた出力は閉じている広告文を返し終えているため、そのまま続きを生成する
+        outcome.truncated = getattr(response, "stop_reason", None) == _STOP_REASON_MAX_TOKENS
+        self._record_output(response, outcome.num_copies, outcome.truncated)
+        if not parser.found_array and not outcome.truncated:
+            self._record_parse_failure()
+            raise AdGenerationError("レスポンスのパースに失敗しました: JSONが見つかりません")
+
+    async def _read_stream(
+        self,
+        params: Dict[str, Any],
+        profile: ModelProfile,
+        estimated_tokens: int,
+        parser: AdCopyStreamParser,
+        queue: "asyncio.Queue[Optional[Dict[str, Any]]]",
+    ) -> Any:
+        """ストリーミング出力を読み出して広告文の要素をキューに入れ、最終的なメッセージを返す.
+
+        読み出しを終えるか失敗した時点で、キューに終わりを表す None を入れる
+        （呼び出し元が読み出しをキャンセルした場合は入れない）。
+        """
         try:
-            prompt = self._build_prompt(ad_input)
-            
-            response = self._client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
+            async with self._semaphore, asyncio.timeout(self._timeout):
+                # ストリーミングは応答を返しながら待つため、応答待ちの時間は記録しない
+                _UPSTREAM_IN_FLIGHT.inc()
+                started = time.perf_counter()
+                try:
+                    async with self.client.messages.stream(timeout=self._timeout, **params) as stream:
+                        # 構造化出力ではツールの入力の JSON を、テキストと同じ走査器で読む
+                        if self._prompt_builder.structured_output:
+                            chunks = self._tool_input_chunks(stream)
+                        else:
+                            chunks = stream.text_stream
+                        async for chunk in chunks:
+                            for item in parser.feed(chunk):
+                                await queue.put(item)
+                        response = await stream.get_final_message()
+                finally:
+                    _UPSTREAM_IN_FLIGHT.dec()
+            await self._record_usage(estimated_tokens, response, profile, time.perf_counter() - started)
+            return response
+        finally:
+            task = asyncio.current_task()
+            if task is None or not task.cancelling():
+                await queue.put(None)
+
+    @staticmethod
+    async def _tool_input_chunks(stream: Any) -> AsyncIterator[str]:
+        """ストリーミング出力から、ツールの入力の JSON の断片を返す."""
+        async for event in stream:
+            if event.type == "input_json":
+                yield event.partial_json
+
+    def _fall_back(self, profile: ModelProfile, error: Exception, has_next: bool) -> bool:
+        """モデルの失敗を記録し、次のモデルを試すかどうかを返す."""
+        if not self._is_throttled(error):
+            self.model_router.record_error(profile.name)
+            return False
+        retry_after = None
+        if isinstance(error, anthropic.APIStatusError):
+            retry_after = parse_retry_after(error.response.headers)
+        self.model_router.record_throttled(profile.name, retry_after)
+        return has_next
+
+    async def _acquire_rate_limit(self, params: Dict[str, Any]) -> int:
+        """レート制限の割り当てを待ち、見積もったトークン数を返す."""
+        if self._rate_limiter is None:
+            return 0
+        estimated_tokens = estimate_message_tokens(params)
+        with RATE_LIMIT_WAIT.time():
+            await self._rate_limiter.acquire(estimated_tokens)
+        return estimated_tokens
+
+    async def _record_usage(
+        self, estimated_tokens: int, response: Any, profile: ModelProfile, latency: float
+    ) -> None:
+        """使用量とモデルごとのレイテンシを記録し、見積もりより少なかった分をレート制限に戻す."""
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", None)
+        output_tokens = getattr(usage, "output_tokens", None)
+        if not (isinstance(input_tokens, int) and isinstance(output_tokens, int)):
+            self.model_router.record_success(profile.name, latency)
+            return
+        cache_creation_input_tokens = getattr(usage, "cache_creation_input_tokens", None) or 0
+        cache_read_input_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+        self.model_router.record_success(
+            profile.name,
+            latency,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=cache_creation_input_tokens,
+            cache_read_input_tokens=cache_read_input_tokens,
+        )
+        self.usage_stats.record(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=cache_creation_input_tokens,
+            cache_read_input_tokens=cache_read_input_tokens,
+        )
+        _INPUT_TOKENS.inc(input_tokens)
+        _OUTPUT_TOKENS.inc(output_tokens)
+        _CACHE_CREATION_INPUT_TOKENS.inc(cache_creation_input_tokens)
+        _CACHE_READ_INPUT_TOKENS.inc(cache_read_input_tokens)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.give_back(estimated_tokens - input_tokens - output_tokens)
+
+    def _record_output(self, response: Any, num_copies: int, truncated: bool) -> None:
+        """出力トークン数と取り出した広告文の数を記録する.
+
+        打ち切られた出力は、max_tokens の見積もりには件数のみ数える。
+        """
+        output_tokens = getattr(getattr(response, "usage", None), "output_tokens", None)
+        if not isinstance(output_tokens, int):
+            output_tokens = None
+        self.output_stats.parsed += 1
+        self.output_stats.ad_copies += num_copies
+        self._parsed_responses.inc()
+        self._extracted_ad_copies.inc(num_copies)
+        if output_tokens is not None:
+            self.output_stats.output_tokens += output_tokens
+            self._parsed_output_tokens.inc(output_tokens)
+
+        estimator = self.max_tokens_estimator
+        if truncated:
+            estimator.stats.truncated += 1
+            estimator.stats.salvaged_copies += num_copies
+        elif output_tokens is not None:
+            estimator.record(output_tokens, num_copies)
+
+    def _record_parse_failure(self) -> None:
+        """広告文を取り出せなかった応答を記録する."""
+        self.output_stats.parse_failures += 1
+        self._parse_failures.inc()
+
+    @staticmethod
+    def _set_usage_attributes(span: Span, response: Any) -> None:
+        """応答のモデル名とトークン使用量をスパンに設定する."""
+        span.set_attribute("gen_ai.response.model", getattr(response, "model", None))
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        span.set_attribute("gen_ai.usage.input_tokens", getattr(usage, "input_tokens", None))
+        span.set_attribute("gen_ai.usage.output_tokens", getattr(usage, "output_tokens", None))
+        span.set_attribute(
+            "gen_ai.usage.cache_read_input_tokens", getattr(usage, "cache_read_input_tokens", None)
+        )
+
+    @staticmethod
+    def _is_throttled(error: Exception) -> bool:
+        """Claude API の例外がスロットリング（429 / 529）によるものか."""
+        if not isinstance(error, anthropic.APIStatusError):
+            return False
+        error_type = None
+        if isinstance(error.body, dict):
+            error_type = (error.body.get("error") or {}).get("type")
+        return error.status_code in _THROTTLED_STATUS_CODES or error_type in _THROTTLED_ERROR_TYPES
+
+    @staticmethod
+    def _to_generation_error(error: Exception) -> AdGenerationError:
+        """Claude API の例外を、再試行できるかどうかを区別したドメイン例外に変換する."""
+        message = f"Claude APIでエラーが発生しました: {str(error)}"
+        if isinstance(error, anthropic.APIStatusError):
+            error_type = None
+            if isinstance(error.body, dict):
+                error_type = (error.body.get("error") or {}).get("type")
+            if error.status_code in _TRANSIENT_STATUS_CODES or error_type in _TRANSIENT_ERROR_TYPES:
+                return TransientGenerationError(
+                    message, retry_after=parse_retry_after(error.response.headers)
+                )
+        elif isinstance(error, (anthropic.APIConnectionError, TimeoutError)):
+            # APITimeoutError は APIConnectionError のサブクラス
+            return TransientGenerationError(message)
+        return AdGenerationError(message)
+
+    def _build_message_params(
+        self,
+        ad_input: AdInput,
+        profile: Optional[ModelProfile] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Messages API のリクエストパラメータを構築する.
+
+        Args:
+            ad_input: 広告文生成の入力
+            profile: 使用するモデル（未指定の場合はモデルルーターの最優先のモデル）
+            max_tokens: 出力トークン数の上限（未指定の場合は生成数と実績から見積もる）
+        """
+        if profile is None:
+            profile = self.model_router.candidates(ad_input)[0]
+        if max_tokens is None:
+            max_tokens = self.max_tokens_estimator.max_tokens(ad_input.num_copies, profile.max_tokens)
+        return {
+            "model": profile.name,
+            "max_tokens": max_tokens,
+            "temperature": profile.temperature,
+            # 共通の指示はキャッシュ対象のシステムプロンプトとして送る
+            "system": self._prompt_builder.system(),
+            "messages": [{"role": "user", "content": self._build_prompt(ad_input)}],
+            **self._prompt_builder.output_params(),
+        }
+
+    async def _create_message(self, **params: Any) -> Any:
+        """イベントループをブロックせずに Messages API を呼び出す."""
+        if isinstance(self.client, anthropic.AsyncAnthropic):
+            call = self.client.messages.create(timeout=self._timeout, **params)
+        else:
+            # 同期クライアントはワーカースレッドで実行してイベントループを解放する
+            call = asyncio.to_thread(
+                self.client.messages.create, timeout=self._timeout, **params
             )
-            
-            content = response.content[0].text
-            return self._parse_response(content)
-            
-        except Exception as e:
-            raise AdGenerationError(f"Claude APIでエラーが発生しました: {str(e)}") from e
+
+        # SDK のタイムアウトは読み取り単位のため、リクエスト全体の上限も設ける
+        return await asyncio.wait_for(call, timeout=self._timeout)
 
     def _build_prompt(self, ad_input: AdInput) -> str:
-        """広告文生成のためのプロンプトを構築する."""
-        tone_description = ""
-        if ad_input.tone:
-            tone_description = f"トーン: {ad_input.tone.get_description()}"
-        
-        appeal_points_text = "\\n".join([f"- {point}" for point in ad_input.appeal_points])
-        
-        return f"""
-あなたは広告文作成のプロフェッショナルです。以下の情報をもとに効果的な広告文を{ad_input.num_copies}つ作成してください。
-
-商品・サービス名: {ad_input.product_name}
-ターゲット層: {ad_input.target_audience}
-アピールポイント:
-{appeal_points_text}
-{tone_description}
-
-各広告文について以下の項目を含めて JSON 形式で出力してください：
-- copyText: 広告文の本文（必須）
-- headline: ヘッドライン（オプション）
-- callToAction: 行動喚起メッセージ（オプション）
-- evaluation: 評価情報（オプション）
-  - relevanceScore: 関連性スコア（0.0-1.0）
-  - creativityScore: 創造性スコア（0.0-1.0）
-  - targetAudienceAppeal: ターゲット層への響きやすさコメント
-
-出力形式例：
-{{
-  "adCopies": [
-    {{
-      "copyText": "広告文の内容",
-      "headline": "魅力的なヘッドライン",
-      "callToAction": "今すぐ行動！",
-      "evaluation": {{
-        "relevanceScore": 0.9,
-        "creativityScore": 0.8,
-        "targetAudienceAppeal": "コメント"
-      }}
-    }}
-  ]
-}}
-"""
+        """広告文生成のためのプロンプトのうち、リクエストごとに変わる部分を構築する."""
+        return self._prompt_builder.user_content(ad_input)
+
+    def _extract_ad_copies(self, response: Any, truncated: bool) -> List[AdCopy]:
+        """Messages API の応答から広告文を取り出す.
+
+        出力が打ち切られた場合は、閉じている広告文だけを取り出す。
+        """
+        try:
+            if self._prompt_builder.structured_output:
+                # ツールの入力は SDK が JSON としてデコード済みのため、括弧の走査は不要
+                return ad_copies_from_tool_input(self._tool_input(response), truncated)
+            text = response.content[0].text
+            if truncated:
+                return salvage_ad_copies(text)
+            # adCopies 配列を括弧の対応と文字列リテラルを考慮して抽出する
+            return parse_ad_copies(text)
+
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            self._record_parse_failure()
+            raise AdGenerationError(f"レスポンスのパースに失敗しました: {str(e)}") from e
+
+    @staticmethod
+    def _tool_input(response: Any) -> Any:
+        """広告文を記録するツールの呼び出しの入力を返す（呼び出しがない場合は None）."""
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use" and block.name == AD_COPIES_TOOL_NAME:
+                return block.input
+        return None
 
     def _parse_response(self, response_text: str) -> List[AdCopy]:
         """Claude APIのレスポンスをパースして AdCopy オブジェクトのリストに変換する."""
         try:
-            # JSONの抽出を試行
-            start_index = response_text.find("{")
-            end_index = response_text.rfind("}") + 1
-            
-            if start_index == -1 or end_index == 0:
-                raise ValueError("JSONが見つかりません")
-            
-            json_text = response_text[start_index:end_index]
-            data = json.loads(json_text)
-            
-            ad_copies = []
-            for item in data.get("adCopies", []):
-                evaluation = None
-                if "evaluation" in item and item["evaluation"]:
-                    eval_data = item["evaluation"]
-                    evaluation = AdCopyEvaluation(
-                        relevance_score=eval_data.get("relevanceScore", 0.0),
-                        creativity_score=eval_data.get("creativityScore", 0.0),
-                        target_audience_appeal=eval_data.get("targetAudienceAppeal", "")
-                    )
-                
-                ad_copy = AdCopy(
-                    copy_text=item["copyText"],
-                    headline=item.get("headline"),
-                    call_to_action=item.get("callToAction"),
-                    evaluation=evaluation
-                )
-                ad_copies.append(ad_copy)
-            
-            return ad_copies
-            
+            # adCopies 配列を括弧の対応と文字列リテラルを考慮して抽出する
+            return parse_ad_copies(response_text)
+
         except (json.JSONDecodeError, KeyError, ValueError) as e:
+            self._record_parse_failure()
             raise AdGenerationError(f"レスポンスのパースに失敗しました: {str(e)}") from e
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""プロセス全体で共有する Anthropic クライアントとコネクションプール."""
+
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+from app.infrastructure.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import anthropic
+    import httpx
+else:
+    anthropic = lazy_import("anthropic")
+    httpx = lazy_import("httpx")
+
+logger = logging.getLogger(__name__)
+
+# httpcore のトレースイベントのうち、新規 TCP 接続の確立を表すもの
+_CONNECT_EVENT = "connection.connect_tcp.complete"
+
+
+@dataclass
+class ConnectionPoolStats:
+    """コネクションの再利用状況を保持する統計情報."""
+
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def reused_requests(self) -> int:
+        """既存のコネクションを再利用したリクエスト数."""
+        return max(self.requests - self.connections_opened, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """コネクションを再利用したリクエストの割合."""
+        if self.requests == 0:
+            return 0.0
+        return self.reused_requests / self.requests
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "requests": self.requests,
+            "connectionsOpened": self.connections_opened,
+            "reusedRequests": self.reused_requests,
+            "reuseRatio": self.reuse_ratio,
+        }
+
+
+class AnthropicClientPool:
+    """長寿命の Anthropic クライアントを1プロセスに1つだけ保持する."""
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        use_sync_client: bool = False,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """クライアントプールを初期化する.
+
+        Args:
+            api_key: Anthropic APIキー
+            max_connections: 最大同時接続数
+            max_keepalive_connections: キープアライブで保持する最大接続数
+            keepalive_expiry: アイドル接続を保持する秒数
+            http2: HTTP/2 を使用するか（h2 パッケージが必要）
+            use_sync_client: 同期クライアントを使用するか
+            base_url: API のベース URL（テストやプロキシ用）
+        """
+        self._api_key = api_key
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+        self._http2 = http2 and self._http2_available()
+        self._use_sync_client = use_sync_client
+        self._base_url = base_url
+        self._client: "Optional[Union[anthropic.AsyncAnthropic, anthropic.Anthropic]]" = None
+        self._lock = threading.Lock()
+        self.stats = ConnectionPoolStats()
+
+    @property
+    def client(self) -> "Union[anthropic.AsyncAnthropic, anthropic.Anthropic]":
+        """共有クライアントを取得する（未生成の場合は生成する）."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    async def aclose(self) -> None:
+        """クライアントとコネクションプールを閉じる."""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        if isinstance(client, anthropic.AsyncAnthropic):
+            await client.close()
+        else:
+            client.close()
+
+    def _create_client(self) -> "Union[anthropic.AsyncAnthropic, anthropic.Anthropic]":
+        limits = httpx.Limits(
+            max_connections=self._max_connections,
+            max_keepalive_connections=self._max_keepalive_connections,
+            keepalive_expiry=self._keepalive_expiry,
+        )
+        if self._use_sync_client:
+            return anthropic.Anthropic(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                http_client=anthropic.DefaultHttpxClient(
+                    limits=limits,
+                    http2=self._http2,
+                    event_hooks={"request": [self._on_request_sync]},
+                ),
+            )
+
+        return anthropic.AsyncAnthropic(
+            api_key=self._api_key,
+            base_url=self._base_url,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=limits,
+                http2=self._http2,
+                event_hooks={"request": [self._on_request]},
+            ),
+        )
+
+    async def _on_request(self, request: "httpx.Request") -> None:
+        self.stats.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == _CONNECT_EVENT:
+            self.stats.connections_opened += 1
+
+    def _on_request_sync(self, request: "httpx.Request") -> None:
+        with self._lock:
+            self.stats.requests += 1
+        request.extensions["trace"] = self._trace_sync
+
+    def _trace_sync(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == _CONNECT_EVENT:
+            with self._lock:
+                self.stats.connections_opened += 1
+
+    @staticmethod
+    def _http2_available() -> bool:
+        if importlib.util.find_spec("h2") is not None:
+            return True
+        logger.warning("h2 がインストールされていないため HTTP/1.1 を使用します")
+        return False
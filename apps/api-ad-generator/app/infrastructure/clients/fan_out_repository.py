@@ -0,0 +1,149 @@
+"""生成数の多い入力を並列の小さな生成に分割するリポジトリデコレーター."""
+
+import asyncio
+import dataclasses
+import logging
+from typing import AsyncIterator, List, Optional, Union
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import AdGenerationError
+from app.domain.repositories import AdGenerationRepository
+from app.domain.services import AdCopyFanOutService, AdCopyRankingService
+
+logger = logging.getLogger(__name__)
+
+# ストリーミングで分割した生成の1つが終了したことを表す番兵
+_DONE = object()
+
+
+class FanOutAdGenerationRepository(AdGenerationRepository):
+    """入力を分割して並列に生成し、結果を重複除去・順位付けしてまとめるリポジトリ.
+
+    1回の生成にかかる時間は出力トークン数に比例するため、生成数を分割して
+    並列に実行することで、生成数が多くても1回の小さな生成に近い時間で応答する。
+    分割しない場合も、ほぼ同じ広告文を取り除き、取り除いた分を追加で生成する。
+    """
+
+    def __init__(
+        self,
+        inner: AdGenerationRepository,
+        fan_out_service: Optional[AdCopyFanOutService] = None,
+        ranking_service: Optional[AdCopyRankingService] = None,
+        top_up: bool = True,
+    ) -> None:
+        """リポジトリを初期化する.
+
+        Args:
+            inner: 分割した入力で生成を行うリポジトリ
+            fan_out_service: 入力の分割と結果の集約を行うドメインサービス
+            ranking_service: ストリーミング時の重複判定に使用するドメインサービス
+            top_up: 重複除去で取り除いた分を追加で生成するか
+        """
+        self._inner = inner
+        self._ranking_service = ranking_service or AdCopyRankingService()
+        self._fan_out_service = fan_out_service or AdCopyFanOutService(
+            ranking_service=self._ranking_service
+        )
+        self._top_up = top_up
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        """入力を分割して並列に生成し、評価スコアの高い順にまとめて返す."""
+        sub_inputs = self._fan_out_service.split(ad_input)
+        if len(sub_inputs) == 1:
+            results = [await self._inner.generate_ad_copies(ad_input)]
+        else:
+            results = await self._generate_all(sub_inputs)
+        ad_copies = self._fan_out_service.merge(results, ad_input.num_copies)
+
+        # 重複除去で取り除いた分だけもう1度生成する
+        generated = min(sum(len(result) for result in results), ad_input.num_copies)
+        shortage = generated - len(ad_copies)
+        if self._top_up and shortage > 0:
+            retry_input = dataclasses.replace(ad_input, num_copies=shortage)
+            try:
+                results += await self._generate_all(self._fan_out_service.split(retry_input))
+            except AdGenerationError as e:
+                logger.warning("不足分の広告文の生成に失敗しました: %s", e)
+            ad_copies = self._fan_out_service.merge(results, ad_input.num_copies)
+        return ad_copies
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """分割した生成を並列にストリーミングし、重複を除いて到着順に返す.
+
+        全件が揃う前に返すため、評価スコアによる順位付けと追加の生成は行わない。
+        """
+        sub_inputs = self._fan_out_service.split(ad_input)
+        queue: "asyncio.Queue[Union[AdCopy, Exception, object]]" = asyncio.Queue()
+        tasks = [asyncio.create_task(self._pump(sub_input, queue)) for sub_input in sub_inputs]
+        kept: List[AdCopy] = []
+        errors: List[Exception] = []
+        remaining = len(tasks)
+        completed = False
+        try:
+            while remaining and len(kept) < ad_input.num_copies:
+                item = await queue.get()
+                if item is _DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    errors.append(item)
+                elif isinstance(item, AdCopy) and not self._ranking_service.is_duplicate(
+                    item, kept
+                ):
+                    kept.append(item)
+                    yield item
+            completed = True
+        finally:
+            # 呼び出し側が中断した場合は残りの生成を止める。
+            # 必要数に達した場合は、応答の残り（使用量など）を読み終えるまで待つ。
+            # 読み込み途中でキャンセルすると HTTP 接続がプールに戻らないことがある
+            if not completed:
+                for task in tasks:
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # 分割していない場合と全ての生成に失敗した場合はエラーを伝える
+        if errors and (not kept or len(sub_inputs) == 1):
+            raise self._to_generation_error(errors[0])
+
+    async def _generate_all(self, sub_inputs: List[AdInput]) -> List[List[AdCopy]]:
+        """分割した入力を並列に生成し、成功した結果を返す.
+
+        Raises:
+            AdGenerationError: 全ての生成に失敗した場合
+        """
+        results = await asyncio.gather(
+            *(self._inner.generate_ad_copies(sub_input) for sub_input in sub_inputs),
+            return_exceptions=True,
+        )
+        succeeded: List[List[AdCopy]] = []
+        errors: List[BaseException] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+            else:
+                succeeded.append(result)
+
+        if not succeeded:
+            raise self._to_generation_error(errors[0])
+        if errors:
+            logger.warning(
+                "分割した生成の一部が失敗しました: %d/%d 件", len(errors), len(sub_inputs)
+            )
+        return succeeded
+
+    async def _pump(
+        self, sub_input: AdInput, queue: "asyncio.Queue[Union[AdCopy, Exception, object]]"
+    ) -> None:
+        try:
+            async for ad_copy in self._inner.stream_ad_copies(sub_input):
+                await queue.put(ad_copy)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_DONE)
+
+    @staticmethod
+    def _to_generation_error(error: BaseException) -> AdGenerationError:
+        if isinstance(error, AdGenerationError):
+            return error
+        return AdGenerationError(f"広告文生成中にエラーが発生しました: {str(error)}")
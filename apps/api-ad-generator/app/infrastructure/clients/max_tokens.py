@@ -0,0 +1,108 @@
+"""生成数と出力トークン数の実績から max_tokens を決める見積もり."""
+
+import bisect
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+
+@dataclass
+class MaxTokensStats:
+    """出力の打ち切りと続きの生成の状況を保持する統計情報."""
+
+    truncated: int = 0
+    salvaged_copies: int = 0
+    continuations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "truncated": self.truncated,
+            "salvagedCopies": self.salvaged_copies,
+            "continuations": self.continuations,
+        }
+
+
+class MaxTokensEstimator:
+    """広告文1件あたりの出力トークン数の分布から、リクエストごとの max_tokens を決める.
+
+    max_tokens はレート制限の割り当てで出力トークン数として予約されるため、
+    固定の大きな値では生成数の少ないリクエストで割り当てを無駄にし、
+    小さな値では生成数の多いリクエストの出力が打ち切られる。
+    直近の出力から1件あたりのトークン数の分位点を求め、生成数に比例させる。
+    """
+
+    def __init__(
+        self,
+        default_tokens_per_copy: int = 250,
+        overhead_tokens: int = 100,
+        quantile: float = 0.95,
+        headroom: float = 1.2,
+        min_tokens: int = 256,
+        window: int = 500,
+        min_samples: int = 20,
+    ) -> None:
+        """見積もりを初期化する.
+
+        Args:
+            default_tokens_per_copy: 記録が min_samples 件に満たない間の1件あたりのトークン数
+            overhead_tokens: 前置きの文章や JSON の外枠に使われるトークン数
+            quantile: 1件あたりのトークン数の分布から使用する分位点
+            headroom: 分位点に掛ける余裕の倍率
+            min_tokens: max_tokens の下限
+            window: 保持する記録の件数
+            min_samples: 分布を使用するのに必要な最小件数
+        """
+        self._default_tokens_per_copy = default_tokens_per_copy
+        self._overhead_tokens = overhead_tokens
+        self._quantile = quantile
+        self._headroom = headroom
+        self._min_tokens = min_tokens
+        self._min_samples = max(min_samples, 1)
+        self._samples: Deque[float] = deque(maxlen=window)
+        # 分位点を求めるために、保持している記録を昇順に並べたもの
+        self._ordered: List[float] = []
+        self._tokens_per_copy: Optional[float] = None
+        self.stats = MaxTokensStats()
+
+    def record(self, output_tokens: int, num_copies: int) -> None:
+        """打ち切られずに完了した出力のトークン数と広告文の件数を記録する."""
+        if num_copies <= 0:
+            return
+        if len(self._samples) == self._samples.maxlen:
+            # 保持する件数を超えて押し出される最も古い記録を並びから除く
+            del self._ordered[bisect.bisect_left(self._ordered, self._samples[0])]
+        sample = max(output_tokens - self._overhead_tokens, 0) / num_copies
+        self._samples.append(sample)
+        bisect.insort(self._ordered, sample)
+        # 分位点はリクエストごとに求めず、記録したときに更新しておく
+        if len(self._ordered) >= self._min_samples:
+            index = min(math.ceil(self._quantile * len(self._ordered)) - 1, len(self._ordered) - 1)
+            self._tokens_per_copy = self._ordered[max(index, 0)]
+
+    def tokens_per_copy(self) -> float:
+        """1件あたりの出力トークン数の見積もりを返す."""
+        if self._tokens_per_copy is None:
+            return float(self._default_tokens_per_copy)
+        return self._tokens_per_copy
+
+    def max_tokens(self, num_copies: int, limit: int) -> int:
+        """num_copies 件の生成に使用する max_tokens を返す.
+
+        Args:
+            num_copies: 生成する広告文の数
+            limit: max_tokens の上限（モデルごとの設定値）
+        """
+        estimate = math.ceil(
+            self.tokens_per_copy() * num_copies * self._headroom + self._overhead_tokens
+        )
+        return max(min(estimate, limit), min(self._min_tokens, limit))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """見積もりの状況を辞書に変換する."""
+        return {
+            **self.stats.to_dict(),
+            "samples": len(self._samples),
+            "tokensPerCopy": self.tokens_per_copy(),
+        }
@@ -0,0 +1,203 @@
+"""広告文生成のプロンプトを構築するビルダー.
+
+全リクエストで共通の指示と出力形式はシステムプロンプトにまとめ、
+プロンプトキャッシュの対象とする。リクエストごとに変わる商品情報のみを
+ユーザーメッセージとして送る。共通部分がキャッシュできる最小のトークン数に
+満たない場合は、キャッシュの指定を付けない。
+
+構造化出力では、出力形式を文章で指示する代わりに広告文のスキーマを
+ツールとして定義し、ツールの呼び出しを強制する。
+"""
+
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.domain.entities import AdInput
+from app.infrastructure.rate_limit import estimate_message_tokens
+
+# プロンプトキャッシュを作成できる共通部分の最小のトークン数（Sonnet・Opus の値。Haiku は 2048）。
+# これより短い共通部分にキャッシュの指定を付けても、キャッシュは作成されない
+MIN_CACHEABLE_PROMPT_TOKENS = 1024
+
+# 全リクエストで共通の指示と出力形式
+SYSTEM_PROMPT = """あなたは広告文作成のプロフェッショナルです。ユーザーが指定する商品・サービスの情報をもとに、効果的な広告文を指定された数だけ作成してください。
+
+各広告文について以下の項目を含めて JSON 形式で出力してください：
+- copyText: 広告文の本文（必須）
+- headline: ヘッドライン（オプション）
+- callToAction: 行動喚起メッセージ（オプション）
+- evaluation: 評価情報（オプション）
+  - relevanceScore: 関連性スコア（0.0-1.0）
+  - creativityScore: 創造性スコア（0.0-1.0）
+  - targetAudienceAppeal: ターゲット層への響きやすさコメント
+
+出力形式例：
+{
+  "adCopies": [
+    {
+      "copyText": "広告文の内容",
+      "headline": "魅力的なヘッドライン",
+      "callToAction": "今すぐ行動！",
+      "evaluation": {
+        "relevanceScore": 0.9,
+        "creativityScore": 0.8,
+        "targetAudienceAppeal": "コメント"
+      }
+    }
+  ]
+}
+"""
+
+# 構造化出力で使用するツールの名前
+AD_COPIES_TOOL_NAME = "record_ad_copies"
+
+# 構造化出力で共通の指示（出力形式はツールのスキーマで指定する）
+STRUCTURED_SYSTEM_PROMPT = f"""あなたは広告文作成のプロフェッショナルです。ユーザーが指定する商品・サービスの情報をもとに、効果的な広告文を指定された数だけ作成し、{AD_COPIES_TOOL_NAME} ツールで記録してください。
+
+各広告文には本文に加えて、ヘッドライン、行動喚起メッセージ、関連性・創造性のスコアとターゲット層への響きやすさの評価を含めてください。
+"""
+
+# 構造化出力で使用する広告文のスキーマ
+AD_COPIES_TOOL: Dict[str, Any] = {
+    "name": AD_COPIES_TOOL_NAME,
+    "description": "作成した広告文を記録する。",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "adCopies": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "copyText": {"type": "string", "description": "広告文の本文"},
+                        "headline": {"type": "string", "description": "ヘッドライン"},
+                        "callToAction": {"type": "string", "description": "行動喚起メッセージ"},
+                        "evaluation": {
+                            "type": "object",
+                            "properties": {
+                                "relevanceScore": {
+                                    "type": "number",
+                                    "minimum": 0.0,
+                                    "maximum": 1.0,
+                                    "description": "関連性スコア",
+                                },
+                                "creativityScore": {
+                                    "type": "number",
+                                    "minimum": 0.0,
+                                    "maximum": 1.0,
+                                    "description": "創造性スコア",
+                                },
+                                "targetAudienceAppeal": {
+                                    "type": "string",
+                                    "description": "ターゲット層への響きやすさコメント",
+                                },
+                            },
+                            "required": ["relevanceScore", "creativityScore", "targetAudienceAppeal"],
+                        },
+                    },
+                    "required": ["copyText"],
+                },
+            },
+        },
+        "required": ["adCopies"],
+    },
+}
+
+# リクエストごとに変わる商品情報
+USER_PROMPT_TEMPLATE = """以下の情報をもとに効果的な広告文を{num_copies}つ作成してください。
+
+商品・サービス名: {product_name}
+ターゲット層: {target_audience}
+アピールポイント:
+{appeal_points}{tone}"""
+
+
+class PromptTemplate:
+    """str.format 形式のテンプレートを事前に解析しておき、値の埋め込みだけで文字列を組み立てる."""
+
+    def __init__(self, template: str) -> None:
+        """テンプレートを解析する.
+
+        Args:
+            template: str.format 形式のテンプレート（書式指定は使用できない）
+        """
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if format_spec or conversion:
+                raise ValueError("テンプレートに書式指定は使用できません")
+            self._parts.append((literal, field))
+
+    def render(self, **values: str) -> str:
+        """値を埋め込んだ文字列を返す.
+
+        Raises:
+            KeyError: テンプレートの項目に対応する値がない場合
+        """
+        pieces: List[str] = []
+        for literal, field in self._parts:
+            pieces.append(literal)
+            if field is not None:
+                pieces.append(values[field])
+        return "".join(pieces)
+
+
+_USER_PROMPT = PromptTemplate(USER_PROMPT_TEMPLATE)
+
+
+class AdCopyPromptBuilder:
+    """システムプロンプトとユーザーメッセージを構築する."""
+
+    def __init__(
+        self,
+        cache_system_prompt: bool = True,
+        structured_output: bool = False,
+        min_cache_tokens: Optional[int] = None,
+    ) -> None:
+        """ビルダーを初期化する.
+
+        Args:
+            cache_system_prompt: システムプロンプトにプロンプトキャッシュの指定を付けるか
+            structured_output: 出力形式を文章で指示する代わりに、広告文のスキーマを
+                ツールとして定義して呼び出しを強制するか
+            min_cache_tokens: キャッシュの指定を付ける共通部分の最小のトークン数
+                （None の場合は MIN_CACHEABLE_PROMPT_TOKENS）。共通部分の見積もりが
+                これに満たない場合は、cache_system_prompt にかかわらず指定を付けない
+        """
+        self.structured_output = structured_output
+        # ツールの定義はシステムプロンプトより前に置かれ、同じキャッシュの対象になる
+        self._output_params: Dict[str, Any] = {}
+        if structured_output:
+            self._output_params = {
+                "tools": [AD_COPIES_TOOL],
+                "tool_choice": {"type": "tool", "name": AD_COPIES_TOOL_NAME},
+            }
+        text = STRUCTURED_SYSTEM_PROMPT if structured_output else SYSTEM_PROMPT
+        block: Dict[str, Any] = {"type": "text", "text": text}
+        if min_cache_tokens is None:
+            min_cache_tokens = MIN_CACHEABLE_PROMPT_TOKENS
+        self.prefix_tokens = estimate_message_tokens({"system": [block], **self._output_params})
+        self.prompt_cached = cache_system_prompt and self.prefix_tokens >= min_cache_tokens
+        if self.prompt_cached:
+            block["cache_control"] = {"type": "ephemeral"}
+        self._system_block = block
+
+    def system(self) -> List[Dict[str, Any]]:
+        """システムプロンプトのブロックを返す（ブロックは全リクエストで共有する）."""
+        return [self._system_block]
+
+    def output_params(self) -> Dict[str, Any]:
+        """出力形式を指定するリクエストパラメータを返す（構造化出力でない場合は空）."""
+        return self._output_params
+
+    def user_content(self, ad_input: AdInput) -> str:
+        """商品情報からユーザーメッセージを構築する."""
+        tone = ""
+        if ad_input.tone:
+            tone = f"\nトーン: {ad_input.tone.get_description()}"
+        return _USER_PROMPT.render(
+            num_copies=str(ad_input.num_copies),
+            product_name=ad_input.product_name,
+            target_audience=ad_input.target_audience,
+            appeal_points="\n".join(f"- {point}" for point in ad_input.appeal_points),
+            tone=tone,
+        )
@@ -1,7 +1,11 @@
 """アプリケーション設定."""
 
+from typing import Literal, Optional, Tuple
+
 from pydantic_settings import BaseSettings
 
+from app.domain.entities import Tone
+
 
 class Settings(BaseSettings):
     """アプリケーション設定クラス."""
@@ -10,5 +14,131 @@ class Settings(BaseSettings):
     app_name: str = "AI駆動型広告文生成API"
     app_version: str = "1.0.0"
 
+    # Claude API 呼び出し設定
+    claude_timeout_seconds: float = 60.0
+    claude_max_concurrency: int = 8
+    claude_use_sync_client: bool = False
+    # 共通のシステムプロンプトをプロンプトキャッシュの対象にするか
+    # （共通部分がキャッシュできる最小のトークン数に満たない場合は対象にしない）
+    claude_prompt_cache: bool = True
+    # 広告文のスキーマをツールとして定義し、テキストから JSON を取り出す代わりにツールの入力を読むか
+    claude_structured_output: bool = False
+
+    # モデルの振り分け設定（設定をキャッシュのキーにするため、複数の値はタプルで保持する）
+    # 品質を重視するモデル（先頭を優先し、残りはスロットリング時のフォールバック先）
+    claude_models: Tuple[str, ...] = ("claude-3-5-sonnet-20241022",)
+    # 生成数が少ない・くだけたトーンのリクエストに優先して使用する高速で安価なモデル（空の場合は振り分けない）
+    claude_fast_models: Tuple[str, ...] = ("claude-3-5-haiku-20241022",)
+    claude_fast_max_copies: int = 1
+    claude_fast_tones: Tuple[Tone, ...] = (Tone.CASUAL, Tone.FRIENDLY, Tone.HUMOROUS)
+    # max_tokens の上限（リクエストごとの max_tokens は生成数と出力の実績から見積もる）
+    claude_max_tokens: int = 4096
+    claude_temperature: float = 0.7
+    # 出力の実績が集まるまでの広告文1件あたりの出力トークン数と、見積もりに掛ける余裕の倍率
+    claude_max_tokens_per_copy: int = 250
+    claude_max_tokens_headroom: float = 1.2
+    # 出力が max_tokens で打ち切られた場合に、不足分を続けて生成する回数の上限
+    claude_max_continuations: int = 2
+    # 直近のレイテンシの分位点がこの秒数を超えるモデルは同じ区分の他のモデルより後に回す（0 以下で無効）
+    model_routing_latency_budget_seconds: float = 0.0
+    model_routing_latency_quantile: float = 0.95
+    model_routing_min_samples: int = 20
+    # 1リクエストあたりの見積もり料金（米ドル）がこれを超えるモデルは後に回す（0 以下で無効）
+    model_routing_cost_budget_usd: float = 0.0
+    # retry-after がない場合に、スロットリングされたモデルを後回しにする秒数
+    model_routing_throttle_cooldown_seconds: float = 10.0
+
+    # Claude API 呼び出しの再試行設定（429/529/タイムアウトなどの一時的なエラーが対象）
+    claude_max_retries: int = 3
+    claude_retry_base_delay_seconds: float = 0.5
+    claude_retry_max_delay_seconds: float = 8.0
+    # 再試行と待機を含めた1回の生成にかけられる秒数（0 以下で無制限）
+    claude_deadline_seconds: float = 90.0
+
+    # 受付制御設定（予測した応答までの時間が期限を超える生成のリクエストを、処理を始めずに 503 で拒否する）
+    admission_control: bool = True
+    # クライアントが X-Request-Timeout で期限を指定しない場合の、応答までの期限の秒数
+    admission_deadline_seconds: float = 60.0
+    # 処理中の生成の数の上限（0 以下で無制限）
+    admission_max_in_flight: int = 0
+    # 1件あたりのレイテンシの指数移動平均で新しい値にかける重み
+    admission_latency_smoothing: float = 0.2
+
+    # Claude API のクライアント側レート制限（0 以下で制限しない）
+    rate_limit_requests_per_minute: int = 0
+    rate_limit_tokens_per_minute: int = 0
+    # memory: ワーカーごとに制限 / sqlite: 複数ワーカーで上限を共有
+    rate_limit_backend: Literal["memory", "sqlite"] = "memory"
+    rate_limit_sqlite_path: str = "rate_limit.sqlite3"
+    # 一括処理の呼び出しが対話的な呼び出し用に残しておく容量の割合
+    rate_limit_bulk_reserve_ratio: float = 0.2
+
+    # サーキットブレーカー設定
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_seconds: float = 30.0
+
+    # ヘッジリクエスト設定（直近のレイテンシの分位点を超えた生成をもう1件並行して行う）
+    hedge_enabled: bool = True
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+    # 生成数の多いリクエストを分割する際の1回あたりの生成数
+    fan_out_max_copies_per_call: int = 5
+    # 重複除去で取り除いた分を追加で生成するか
+    fan_out_top_up: bool = True
+
+    # ほぼ同じ広告文の除去設定（しきい値は文字 n-gram の Jaccard 類似度）
+    near_duplicate_filter: bool = True
+    near_duplicate_threshold: float = 0.8
+
+    # Claude API コネクションプール設定
+    claude_base_url: Optional[str] = None
+    claude_max_connections: int = 100
+    claude_max_keepalive_connections: int = 20
+    claude_keepalive_expiry_seconds: float = 30.0
+    claude_http2: bool = False
+    # 起動時に anthropic の読み込みとクライアントの生成を済ませるか（無効の場合は最初のリクエストで行う）
+    claude_warm_up_on_startup: bool = False
+
+    # 生成結果キャッシュ設定
+    cache_backend: Literal["memory", "sqlite", "none"] = "memory"
+    cache_ttl_seconds: float = 3600.0
+    cache_max_entries: int = 1024
+    cache_sqlite_path: str = "ad_copy_cache.sqlite3"
+
+    # 冪等キー設定
+    # memory: プロセス内 / sqlite: ワーカー間で共有し再起動後も保持 / none: Idempotency-Key を無視
+    idempotency_backend: Literal["memory", "sqlite", "none"] = "memory"
+    idempotency_ttl_seconds: float = 86400.0
+    idempotency_max_entries: int = 10000
+    idempotency_sqlite_path: str = "idempotency.sqlite3"
+
+    # 一括生成のバックプレッシャー設定
+    batch_max_items: int = 10000
+    batch_max_concurrency: int = 4
+    batch_global_max_concurrency: int = 8
+
+    # トレース設定
+    # none: 無効 / console: 標準エラー出力 / file: JSON Lines ファイル / otel: OpenTelemetry API
+    tracing_exporter: Literal["none", "console", "file", "otel"] = "none"
+    tracing_file_path: str = "traces.jsonl"
+
+    # 非同期一括生成ジョブ設定
+    batch_job_backend: Literal["anthropic", "local"] = "anthropic"
+    batch_job_store_path: str = "batch_jobs.sqlite3"
+    batch_job_local_max_concurrency: int = 2
+
+    # バックグラウンド生成ジョブ設定
+    # ワーカーは明示的に有効にする。job_workers が 0 の場合は、このプロセスではジョブを処理しない
+    # （登録のみ受け付け、キューは最初に /jobs を呼び出した時点で作成する）
+    job_queue_path: str = "generation_jobs.sqlite3"
+    job_workers: int = 0
+    job_visibility_timeout_seconds: float = 60.0
+    job_poll_interval_seconds: float = 1.0
+    job_max_attempts: int = 3
+    job_retry_base_delay_seconds: float = 2.0
+    job_retry_max_delay_seconds: float = 60.0
+
     class Config:
-        env_file = ".env"
\ No newline at end of file
+        env_file = ".env"
+        frozen = True
\ No newline at end of file
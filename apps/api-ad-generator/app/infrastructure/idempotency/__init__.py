@@ -0,0 +1,18 @@
+"""Idempotency keys for Ad Generator."""
+
+from .coordinator import IdempotencyCoordinator, IdempotencyStats
+from .store import (
+    IdempotencyRecord,
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+)
+
+__all__ = [
+    "IdempotencyCoordinator",
+    "IdempotencyRecord",
+    "IdempotencyStats",
+    "IdempotencyStore",
+    "InMemoryIdempotencyStore",
+    "SQLiteIdempotencyStore",
+]
@@ -0,0 +1,117 @@
+"""冪等キーを指定したリクエストの実行を1回にまとめるコーディネーター."""
+
+import asyncio
+import functools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from app.domain.entities import AdCopy
+from app.domain.exceptions import IdempotencyKeyMismatchError
+from app.infrastructure.idempotency.store import IdempotencyRecord, IdempotencyStore
+
+
+@dataclass
+class IdempotencyStats:
+    """冪等キーを指定したリクエストの処理状況を保持する統計情報."""
+
+    executions: int = 0
+    joined: int = 0
+    replays: int = 0
+    mismatches: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "executions": self.executions,
+            "joined": self.joined,
+            "replays": self.replays,
+            "mismatches": self.mismatches,
+        }
+
+
+class IdempotencyCoordinator:
+    """同じ冪等キーのリクエストを1回の実行にまとめ、成功した結果を再送する.
+
+    - 実行中のリクエストがあれば、その完了を待って同じ結果を返す
+    - 成功した結果はストアに保存し、期限内の再送ではそのまま返す
+    - 失敗した結果は保存しないため、再送すると改めて実行する
+    - 同じ冪等キーで内容の異なるリクエストは IdempotencyKeyMismatchError とする
+
+    実行中のリクエストへの合流はプロセス内に限られる。
+    """
+
+    def __init__(self, store: IdempotencyStore) -> None:
+        self._store = store
+        self._in_flight: Dict[str, Tuple[str, "asyncio.Future[List[AdCopy]]"]] = {}
+        self.stats = IdempotencyStats()
+
+    @property
+    def store(self) -> IdempotencyStore:
+        """結果を保存するストア."""
+        return self._store
+
+    async def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[List[AdCopy]]],
+    ) -> Tuple[List[AdCopy], bool]:
+        """冪等キーに対する最初のリクエストであれば operation を実行する.
+
+        Args:
+            key: 冪等キー
+            fingerprint: リクエストの内容の指紋
+            operation: 広告文を生成する処理
+
+        Returns:
+            生成された広告文と、最初のリクエストの結果を返したかどうかの組
+
+        Raises:
+            IdempotencyKeyMismatchError: 冪等キーが異なる内容のリクエストに使用済みの場合
+        """
+        entry = self._in_flight.get(key)
+        if entry is None:
+            record = await self._store.get(key)
+            if record is not None:
+                self._check_fingerprint(key, record.fingerprint, fingerprint)
+                self.stats.replays += 1
+                return list(record.ad_copies), True
+            # 保存された結果を確認している間に始まった実行があれば合流する
+            entry = self._in_flight.get(key)
+
+        if entry is not None:
+            self._check_fingerprint(key, entry[0], fingerprint)
+            self.stats.joined += 1
+            # 待機側がキャンセルされても共有している実行は継続させる
+            return list(await asyncio.shield(entry[1])), True
+
+        future = asyncio.ensure_future(self._execute_and_store(key, fingerprint, operation))
+        future.add_done_callback(functools.partial(self._on_done, key))
+        self._in_flight[key] = (fingerprint, future)
+        self.stats.executions += 1
+        return list(await asyncio.shield(future)), False
+
+    async def _execute_and_store(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[List[AdCopy]]],
+    ) -> List[AdCopy]:
+        ad_copies = await operation()
+        await self._store.set(key, IdempotencyRecord(fingerprint=fingerprint, ad_copies=ad_copies))
+        return ad_copies
+
+    def _check_fingerprint(self, key: str, stored: str, fingerprint: str) -> None:
+        if stored != fingerprint:
+            self.stats.mismatches += 1
+            raise IdempotencyKeyMismatchError(
+                f"冪等キーは異なる内容のリクエストに使用されています: {key}"
+            )
+
+    def _on_done(self, key: str, future: "asyncio.Future[List[AdCopy]]") -> None:
+        entry = self._in_flight.get(key)
+        if entry is not None and entry[1] is future:
+            del self._in_flight[key]
+        # 全ての待機側がキャンセル済みでも未取得例外の警告を出さない
+        if not future.cancelled():
+            future.exception()
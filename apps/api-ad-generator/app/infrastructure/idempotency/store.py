@@ -0,0 +1,169 @@
+"""冪等キーごとの生成結果を保存するストア."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from app.domain.entities import AdCopy
+from app.infrastructure.cache.serialization import dump_ad_copies, load_ad_copies
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """冪等キーで実行したリクエストの内容の指紋と生成結果."""
+
+    fingerprint: str
+    ad_copies: List[AdCopy]
+
+
+class IdempotencyStore(ABC):
+    """冪等キーごとの生成結果を保存するストアのインターフェース."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """冪等キーに対応する記録を取得する（存在しない・期限切れの場合は None）."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, record: IdempotencyRecord) -> None:
+        """記録を保存する."""
+        pass
+
+    @abstractmethod
+    async def size(self) -> int:
+        """保存されている記録の数を取得する."""
+        pass
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """プロセス内で保持する TTL 付きのストア（上限を超えると古い記録から削除する）."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._records: "OrderedDict[str, Tuple[float, IdempotencyRecord]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+
+        expires_at, record = entry
+        if expires_at <= self._clock():
+            del self._records[key]
+            return None
+        return record
+
+    async def set(self, key: str, record: IdempotencyRecord) -> None:
+        self._records[key] = (self._clock() + self._ttl_seconds, record)
+        self._records.move_to_end(key)
+        while len(self._records) > self._max_entries:
+            self._records.popitem(last=False)
+
+    async def size(self) -> int:
+        return len(self._records)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """複数ワーカーで共有でき、再起動後も残る SQLite ファイルベースのストア."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS idempotency_records (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    ad_copies TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_idempotency_records_expires_at "
+                "ON idempotency_records (expires_at)"
+            )
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, record: IdempotencyRecord) -> None:
+        await asyncio.to_thread(
+            self._set, key, record.fingerprint, dump_ad_copies(record.ad_copies)
+        )
+
+    async def size(self) -> int:
+        return await asyncio.to_thread(self._size)
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, ad_copies FROM idempotency_records "
+                "WHERE key = ? AND expires_at > ?",
+                (key, self._clock()),
+            ).fetchone()
+        if row is None:
+            return None
+        return IdempotencyRecord(fingerprint=row[0], ad_copies=load_ad_copies(row[1]))
+
+    def _set(self, key: str, fingerprint: str, ad_copies: str) -> None:
+        now = self._clock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO idempotency_records (key, fingerprint, ad_copies, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    ad_copies = excluded.ad_copies,
+                    expires_at = excluded.expires_at
+                """,
+                (key, fingerprint, ad_copies, now + self._ttl_seconds),
+            )
+            # 期限切れの記録と、上限を超えた古い記録を削除する
+            self._connection.execute(
+                "DELETE FROM idempotency_records WHERE expires_at <= ?", (now,)
+            )
+            self._connection.execute(
+                """
+                DELETE FROM idempotency_records WHERE key IN (
+                    SELECT key FROM idempotency_records
+                    ORDER BY expires_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_entries,),
+            )
+
+    def _size(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM idempotency_records").fetchone()
+        return int(row[0])
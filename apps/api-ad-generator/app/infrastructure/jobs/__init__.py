@@ -0,0 +1,13 @@
+"""Background generation jobs for Ad Generator."""
+
+from .queue import ClaimedJob, SQLiteJobQueue
+from .repository import QueuedGenerationJobRepository
+from .worker_pool import GenerationJobWorkerPool, JobWorkerStats
+
+__all__ = [
+    "ClaimedJob",
+    "GenerationJobWorkerPool",
+    "JobWorkerStats",
+    "QueuedGenerationJobRepository",
+    "SQLiteJobQueue",
+]
@@ -0,0 +1,381 @@
+"""広告文生成ジョブを永続化する SQLite のジョブキュー."""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.domain.entities import (
+    AdCopy,
+    AdInput,
+    GenerationJob,
+    GenerationJobStatus,
+    Tone,
+)
+from app.domain.exceptions import (
+    AdGenerationError,
+    DomainError,
+    GenerationTimeoutError,
+    InvalidInputError,
+    ServiceUnavailableError,
+    TransientGenerationError,
+)
+from app.infrastructure.cache.serialization import dump_ad_copies, load_ad_copies
+
+# 保存したエラーを復元する際に使用する例外クラス
+_ERROR_TYPES = {
+    "InvalidInputError": InvalidInputError,
+    "AdGenerationError": AdGenerationError,
+    "ServiceUnavailableError": ServiceUnavailableError,
+    "TransientGenerationError": TransientGenerationError,
+    "GenerationTimeoutError": GenerationTimeoutError,
+}
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    """ワーカーが取り出したジョブとリース."""
+
+    job_id: str
+    lease_id: str
+    ad_input: AdInput
+    attempts: int
+    recovered: bool = False
+
+
+def _dump_ad_input(ad_input: AdInput) -> str:
+    return json.dumps(
+        {
+            "productName": ad_input.product_name,
+            "targetAudience": ad_input.target_audience,
+            "appealPoints": list(ad_input.appeal_points),
+            "tone": ad_input.tone.value if ad_input.tone else None,
+            "numCopies": ad_input.num_copies,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _load_ad_input(serialized: str) -> AdInput:
+    item = json.loads(serialized)
+    return AdInput(
+        product_name=item["productName"],
+        target_audience=item["targetAudience"],
+        appeal_points=item["appealPoints"],
+        tone=Tone(item["tone"]) if item["tone"] else None,
+        num_copies=item["numCopies"],
+    )
+
+
+def _dump_error(error: DomainError) -> str:
+    return json.dumps({"type": type(error).__name__, "message": error.message}, ensure_ascii=False)
+
+
+def _load_error(serialized: str) -> DomainError:
+    item = json.loads(serialized)
+    return _ERROR_TYPES.get(item["type"], AdGenerationError)(item["message"])
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=UTC)
+
+
+class SQLiteJobQueue:
+    """広告文生成ジョブを SQLite（WAL モード）に保存し、リース付きで取り出すキュー.
+
+    取り出したジョブには visibility_timeout 秒のリースを付け、期限内に完了・失敗が
+    記録されなければ、ワーカーのプロセスが異常終了したものとみなして再び取り出せるようにする。
+    取り出しは BEGIN IMMEDIATE のトランザクションで行うため、同じファイルを開いた
+    複数のプロセスのワーカーが同じジョブを重複して取り出すことはない。
+    リースを失ったワーカーの完了・失敗の記録は無視する。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """キューを初期化する.
+
+        Args:
+            path: データベースファイルのパス
+            max_attempts: 1つのジョブを取り出す回数の上限（再試行を含む）
+            clock: 現在時刻（UNIX 時間）を返す関数
+        """
+        self._max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            # available_at は、待機中のジョブでは取り出せるようになる時刻、
+            # 処理中のジョブではリースの期限を表す
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS generation_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    ad_input TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    lease_id TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL,
+                    ad_copies TEXT,
+                    error TEXT
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS generation_jobs_available
+                ON generation_jobs (status, available_at)
+                """
+            )
+
+    def enqueue(self, ad_input: AdInput) -> GenerationJob:
+        """ジョブを登録する."""
+        job_id = uuid.uuid4().hex
+        now = self._clock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO generation_jobs (job_id, ad_input, status, available_at, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (job_id, _dump_ad_input(ad_input), GenerationJobStatus.QUEUED.value, now, now),
+            )
+        return GenerationJob(
+            job_id=job_id, status=GenerationJobStatus.QUEUED, created_at=_to_datetime(now)
+        )
+
+    def claim(self, visibility_timeout: float) -> Optional[ClaimedJob]:
+        """取り出せるジョブのうち最も古いものにリースを付けて取り出す.
+
+        リースの期限が切れた処理中のジョブも取り出す。取り出した回数が
+        max_attempts に達したジョブは、取り出さずに失敗として記録する。
+
+        Args:
+            visibility_timeout: リースの秒数
+
+        Returns:
+            取り出したジョブ（取り出せるジョブがない場合は None）
+        """
+        with self._lock, self._connection:
+            # 他のプロセスと同じジョブを取り出さないよう、先に書き込みロックを取得する
+            self._connection.execute("BEGIN IMMEDIATE")
+            while True:
+                now = self._clock()
+                row = self._connection.execute(
+                    """
+                    SELECT job_id, ad_input, status, attempts FROM generation_jobs
+                    WHERE status IN (?, ?) AND available_at <= ?
+                    ORDER BY available_at, created_at LIMIT 1
+                    """,
+                    (GenerationJobStatus.QUEUED.value, GenerationJobStatus.RUNNING.value, now),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                job_id, ad_input, status, attempts = row
+                recovered = status == GenerationJobStatus.RUNNING.value
+                if recovered and attempts >= self._max_attempts:
+                    self._finish(
+                        job_id,
+                        GenerationJobStatus.FAILED,
+                        now,
+                        error=AdGenerationError("ジョブの処理が完了しないまま再試行の上限に達しました"),
+                    )
+                    continue
+
+                lease_id = uuid.uuid4().hex
+                self._connection.execute(
+                    """
+                    UPDATE generation_jobs
+                    SET status = ?, attempts = attempts + 1, available_at = ?, lease_id = ?
+                    WHERE job_id = ?
+                    """,
+                    (GenerationJobStatus.RUNNING.value, now + visibility_timeout, lease_id, job_id),
+                )
+                return ClaimedJob(
+                    job_id=job_id,
+                    lease_id=lease_id,
+                    ad_input=_load_ad_input(ad_input),
+                    attempts=attempts + 1,
+                    recovered=recovered,
+                )
+
+    def extend(self, job_id: str, lease_id: str, visibility_timeout: float) -> bool:
+        """リースの期限を延長する.
+
+        Returns:
+            延長できたかどうか（リースを失っていた場合は False）
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                """
+                UPDATE generation_jobs SET available_at = ?
+                WHERE job_id = ? AND lease_id = ? AND status = ?
+                """,
+                (
+                    self._clock() + visibility_timeout,
+                    job_id,
+                    lease_id,
+                    GenerationJobStatus.RUNNING.value,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, lease_id: str, ad_copies: List[AdCopy]) -> bool:
+        """ジョブを成功として記録し、生成結果を保存する.
+
+        Returns:
+            記録できたかどうか（リースを失っていた場合は False）
+        """
+        with self._lock, self._connection:
+            return self._finish(
+                job_id,
+                GenerationJobStatus.SUCCEEDED,
+                self._clock(),
+                lease_id=lease_id,
+                ad_copies=dump_ad_copies(ad_copies),
+            )
+
+    def fail(
+        self,
+        job_id: str,
+        lease_id: str,
+        error: DomainError,
+        retry_delay: Optional[float] = None,
+    ) -> Optional[GenerationJobStatus]:
+        """ジョブの失敗を記録する.
+
+        retry_delay が指定され、取り出した回数が max_attempts に達していない場合は、
+        retry_delay 秒後に再び取り出せるようにする。それ以外の場合は失敗として記録する。
+
+        Returns:
+            記録後のジョブの状態（リースを失っていた場合は None）
+        """
+        now = self._clock()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT attempts FROM generation_jobs WHERE job_id = ? AND lease_id = ? AND status = ?",
+                (job_id, lease_id, GenerationJobStatus.RUNNING.value),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if retry_delay is not None and row[0] < self._max_attempts:
+                self._connection.execute(
+                    """
+                    UPDATE generation_jobs
+                    SET status = ?, available_at = ?, lease_id = NULL, error = ?
+                    WHERE job_id = ?
+                    """,
+                    (GenerationJobStatus.QUEUED.value, now + retry_delay, _dump_error(error), job_id),
+                )
+                return GenerationJobStatus.QUEUED
+
+            self._finish(job_id, GenerationJobStatus.FAILED, now, lease_id=lease_id, error=error)
+            return GenerationJobStatus.FAILED
+
+    def release(self, job_id: str, lease_id: str) -> bool:
+        """処理を中断したジョブのリースを返却し、すぐに取り出せるようにする.
+
+        中断は失敗ではないため、取り出した回数には含めない。
+
+        Returns:
+            返却できたかどうか（リースを失っていた場合は False）
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                """
+                UPDATE generation_jobs
+                SET status = ?, attempts = attempts - 1, available_at = ?, lease_id = NULL
+                WHERE job_id = ? AND lease_id = ? AND status = ?
+                """,
+                (
+                    GenerationJobStatus.QUEUED.value,
+                    self._clock(),
+                    job_id,
+                    lease_id,
+                    GenerationJobStatus.RUNNING.value,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """ジョブを取得する."""
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT job_id, status, attempts, created_at, finished_at, ad_copies, error
+                FROM generation_jobs WHERE job_id = ?
+                """,
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        job_id, status, attempts, created_at, finished_at, ad_copies, error = row
+        status = GenerationJobStatus(status)
+        return GenerationJob(
+            job_id=job_id,
+            status=status,
+            attempts=attempts,
+            created_at=_to_datetime(created_at),
+            finished_at=_to_datetime(finished_at),
+            ad_copies=load_ad_copies(ad_copies) if ad_copies is not None else None,
+            # 再試行を待っているジョブの直前のエラーは返さない
+            error=_load_error(error) if status == GenerationJobStatus.FAILED else None,
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """状態ごとのジョブ数を返す."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM generation_jobs GROUP BY status"
+            ).fetchall()
+        counts = {status.value: 0 for status in GenerationJobStatus}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        with self._lock:
+            self._connection.close()
+
+    def _finish(
+        self,
+        job_id: str,
+        status: GenerationJobStatus,
+        now: float,
+        lease_id: Optional[str] = None,
+        ad_copies: Optional[str] = None,
+        error: Optional[DomainError] = None,
+    ) -> bool:
+        """ジョブを完了状態にする（ロックとトランザクションの中で呼び出す）."""
+        query = """
+            UPDATE generation_jobs
+            SET status = ?, finished_at = ?, lease_id = NULL, ad_copies = ?, error = ?
+            WHERE job_id = ? AND status = ?
+        """
+        params: List[Any] = [
+            status.value,
+            now,
+            ad_copies,
+            _dump_error(error) if error is not None else None,
+            job_id,
+            GenerationJobStatus.RUNNING.value,
+        ]
+        if lease_id is not None:
+            query += " AND lease_id = ?"
+            params.append(lease_id)
+        return self._connection.execute(query, params).rowcount == 1
@@ -0,0 +1,39 @@
+"""ジョブキューを使用する広告文生成ジョブリポジトリの実装."""
+
+import asyncio
+from typing import Callable, Optional
+
+from app.domain.entities import AdInput, GenerationJob
+from app.domain.exceptions import JobNotFoundError
+from app.domain.repositories import GenerationJobRepository
+from app.infrastructure.jobs.queue import SQLiteJobQueue
+
+
+class QueuedGenerationJobRepository(GenerationJobRepository):
+    """ジョブを SQLite のジョブキューに登録し、ワーカーが保存した結果を返すリポジトリの実装."""
+
+    def __init__(
+        self, queue: SQLiteJobQueue, on_submit: Optional[Callable[[], None]] = None
+    ) -> None:
+        """リポジトリを初期化する.
+
+        Args:
+            queue: ジョブキュー
+            on_submit: ジョブを登録した後に呼び出す関数（待機中のワーカーへの通知に使用する）
+        """
+        self._queue = queue
+        self._on_submit = on_submit
+
+    async def submit(self, ad_input: AdInput) -> GenerationJob:
+        """ジョブをキューに登録する."""
+        job = await asyncio.to_thread(self._queue.enqueue, ad_input)
+        if self._on_submit is not None:
+            self._on_submit()
+        return job
+
+    async def get_job(self, job_id: str) -> GenerationJob:
+        """ジョブの最新の状態と結果を取得する."""
+        job = await asyncio.to_thread(self._queue.get, job_id)
+        if job is None:
+            raise JobNotFoundError(f"ジョブが見つかりません: {job_id}")
+        return job
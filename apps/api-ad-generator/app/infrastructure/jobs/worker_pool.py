@@ -0,0 +1,206 @@
+"""ジョブキューから広告文生成ジョブを取り出して処理するワーカープール."""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.application.usecases import GenerateAdCopyUseCase
+from app.domain.entities import GenerationJobStatus
+from app.domain.exceptions import (
+    AdGenerationError,
+    DomainError,
+    GenerationTimeoutError,
+    ServiceUnavailableError,
+)
+from app.infrastructure.jobs.queue import ClaimedJob, SQLiteJobQueue
+from app.infrastructure.rate_limit import RequestPriority, request_priority
+from app.infrastructure.resilience import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobWorkerStats:
+    """ワーカープールが処理したジョブの統計情報."""
+
+    claimed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retried: int = 0
+    recovered: int = 0
+    lost_leases: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "recovered": self.recovered,
+            "lostLeases": self.lost_leases,
+        }
+
+
+class GenerationJobWorkerPool:
+    """ジョブキューを num_workers 個の非同期ワーカーで処理するワーカープール.
+
+    - ワーカーはジョブを取り出し、一括生成と同じ低い優先度で広告文生成ユースケースを実行する
+    - 処理中はリースの期限の 1/3 ごとにリースを延長する
+    - 上流の混雑やタイムアウトで失敗したジョブは、バックオフの後に再試行する
+    - 停止時に処理中だったジョブはリースを返却し、次に起動したワーカーが処理する
+    """
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        usecase: GenerateAdCopyUseCase,
+        num_workers: int = 4,
+        visibility_timeout: float = 60.0,
+        poll_interval: float = 1.0,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        """ワーカープールを初期化する.
+
+        Args:
+            queue: ジョブキュー
+            usecase: ジョブの処理に使用する広告文生成ユースケース
+            num_workers: 同時に処理するジョブの数
+            visibility_timeout: 取り出したジョブのリースの秒数
+            poll_interval: 取り出せるジョブがない場合にキューを確認する間隔の秒数
+            retry_policy: 失敗したジョブを再試行するまでの待ち時間を決めるポリシー
+        """
+        self._queue = queue
+        self._usecase = usecase
+        self._num_workers = num_workers
+        self._visibility_timeout = visibility_timeout
+        self._poll_interval = poll_interval
+        self._retry_policy = retry_policy or RetryPolicy(base_delay=2.0, max_delay=60.0)
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self.stats = JobWorkerStats()
+
+    @property
+    def running(self) -> bool:
+        """ワーカーが起動しているかどうか."""
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """ワーカーを起動する."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._run_worker(), name=f"generation-job-worker-{index}")
+            for index in range(self._num_workers)
+        ]
+        for worker in self._workers:
+            worker.add_done_callback(self._on_worker_done)
+
+    async def stop(self) -> None:
+        """ワーカーを停止する（処理中のジョブはリースを返却する）."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def notify(self) -> None:
+        """ジョブが登録されたことを待機中のワーカーに知らせる."""
+        self._wakeup.set()
+
+    async def to_dict(self) -> Dict[str, Any]:
+        """統計情報とキューにある状態ごとのジョブ数を辞書に変換する（ジョブ数は別スレッドで数える）."""
+        counts = await asyncio.to_thread(self._queue.counts)
+        return {
+            "workers": len(self._workers),
+            **self.stats.to_dict(),
+            **{f"{status}Jobs": count for status, count in counts.items()},
+        }
+
+    def _on_worker_done(self, worker: asyncio.Task) -> None:
+        """終了したワーカーを一覧から外し、予期せず終了した場合は記録する."""
+        with contextlib.suppress(ValueError):
+            self._workers.remove(worker)
+        if not worker.cancelled() and worker.exception() is not None:
+            logger.error("ワーカー %s が終了しました", worker.get_name(), exc_info=worker.exception())
+
+    async def _run_worker(self) -> None:
+        """ジョブを取り出して処理し続ける."""
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await asyncio.to_thread(self._queue.claim, self._visibility_timeout)
+            except Exception:
+                logger.exception("ジョブの取り出しに失敗しました")
+                claimed = None
+
+            if claimed is None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                continue
+
+            try:
+                await self._process(claimed)
+            except Exception:
+                # 結果を記録できなかったジョブは、リースの期限後に再び取り出される
+                logger.exception("ジョブ %s の処理に失敗しました", claimed.job_id)
+
+    async def _process(self, claimed: ClaimedJob) -> None:
+        """取り出したジョブを処理し、結果をキューに記録する."""
+        self.stats.claimed += 1
+        if claimed.recovered:
+            self.stats.recovered += 1
+
+        heartbeat = asyncio.create_task(self._heartbeat(claimed))
+        priority_token = request_priority.set(RequestPriority.BULK)
+        try:
+            ad_copies = await self._usecase.execute(claimed.ad_input)
+        except asyncio.CancelledError:
+            # 停止時は処理を中断したジョブをすぐに他のワーカーが取り出せるようにする
+            self._queue.release(claimed.job_id, claimed.lease_id)
+            raise
+        except DomainError as e:
+            await self._record_failure(claimed, e)
+        except Exception as e:
+            await self._record_failure(
+                claimed, AdGenerationError(f"ジョブの処理中にエラーが発生しました: {str(e)}")
+            )
+        else:
+            if await asyncio.to_thread(
+                self._queue.complete, claimed.job_id, claimed.lease_id, ad_copies
+            ):
+                self.stats.succeeded += 1
+            else:
+                self.stats.lost_leases += 1
+        finally:
+            request_priority.reset(priority_token)
+            heartbeat.cancel()
+
+    async def _record_failure(self, claimed: ClaimedJob, error: DomainError) -> None:
+        """失敗を記録し、再試行できるエラーの場合はバックオフの後に再試行させる."""
+        retry_delay: Optional[float] = None
+        if isinstance(error, (ServiceUnavailableError, GenerationTimeoutError)):
+            retry_after = error.retry_after if isinstance(error, ServiceUnavailableError) else None
+            retry_delay = self._retry_policy.backoff(claimed.attempts - 1, retry_after)
+
+        status = await asyncio.to_thread(
+            self._queue.fail, claimed.job_id, claimed.lease_id, error, retry_delay
+        )
+        if status == GenerationJobStatus.QUEUED:
+            self.stats.retried += 1
+        elif status == GenerationJobStatus.FAILED:
+            self.stats.failed += 1
+            logger.warning("ジョブ %s が失敗しました: %s", claimed.job_id, error.message)
+        else:
+            self.stats.lost_leases += 1
+
+    async def _heartbeat(self, claimed: ClaimedJob) -> None:
+        """処理中のジョブのリースを定期的に延長する."""
+        interval = self._visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(
+                self._queue.extend, claimed.job_id, claimed.lease_id, self._visibility_timeout
+            ):
+                return
@@ -0,0 +1,40 @@
+"""最初に属性を参照するまで読み込みを遅らせるモジュールの import."""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """モジュールを最初に属性を参照した時点で読み込むように import する.
+
+    起動時に使用しない重い依存（anthropic など）の読み込みを、最初のリクエストか
+    起動時のウォームアップまで遅らせるために使用する。すでに読み込まれている場合は
+    そのモジュールを返す。
+
+    Python 3.11 の LazyLoader は読み込みをスレッド間で排他しないため、最初の属性の参照は
+    1つのスレッド（イベントループやロックの内側）から行うこと。
+
+    Args:
+        name: モジュール名
+
+    Returns:
+        ModuleType: 最初に属性を参照した時点で読み込まれるモジュール
+
+    Raises:
+        ModuleNotFoundError: モジュールが見つからない場合
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
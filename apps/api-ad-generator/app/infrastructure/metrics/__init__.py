@@ -0,0 +1,17 @@
+"""Metrics for Ad Generator."""
+
+from .instruments import REGISTRY, observe_request_parse, record_error, render_stats
+from .middleware import MetricsMiddleware
+from .registry import Counter, Gauge, Histogram, MetricsRegistry
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "REGISTRY",
+    "observe_request_parse",
+    "record_error",
+    "render_stats",
+]
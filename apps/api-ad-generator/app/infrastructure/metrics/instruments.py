@@ -0,0 +1,133 @@
+"""アプリケーション全体で使用するメトリクスの定義."""
+
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.infrastructure.metrics.registry import (
+    MetricsRegistry,
+    format_labels,
+    format_value,
+)
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "ad_generator_http_requests",
+    "HTTP リクエスト数",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "ad_generator_http_request_duration_seconds",
+    "HTTP リクエストの処理時間（ストリーミングはレスポンスの送信完了まで）",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "ad_generator_http_requests_in_flight",
+    "処理中の HTTP リクエスト数",
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "ad_generator_stage_duration_seconds",
+    "広告文生成の段階ごとの処理時間",
+    ("stage",),
+)
+UPSTREAM_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "ad_generator_upstream_requests_in_flight",
+    "応答を待っている Claude API へのリクエスト数",
+)
+UPSTREAM_TOKENS = REGISTRY.counter(
+    "ad_generator_upstream_tokens",
+    "Claude API のトークン使用量",
+    ("type",),
+)
+UPSTREAM_MODEL_REQUESTS = REGISTRY.counter(
+    "ad_generator_upstream_model_requests",
+    "モデルごとの Claude API へのリクエスト数（outcome: success / throttled / error）",
+    ("model", "outcome"),
+)
+UPSTREAM_MODEL_DURATION = REGISTRY.histogram(
+    "ad_generator_upstream_model_duration_seconds",
+    "モデルごとの成功したリクエストの応答時間（ストリーミングは応答の読み終わりまで）",
+    ("model",),
+)
+UPSTREAM_COST = REGISTRY.counter(
+    "ad_generator_upstream_cost_usd",
+    "モデルごとのトークン使用量から見積もった料金（米ドル）",
+    ("model",),
+)
+AD_COPY_RESPONSES = REGISTRY.counter(
+    "ad_generator_ad_copy_responses",
+    "出力形式（mode: text / tool）と結果（outcome: parsed / parse_failure）ごとの Claude API の応答数",
+    ("mode", "outcome"),
+)
+AD_COPY_OUTPUT_TOKENS = REGISTRY.counter(
+    "ad_generator_ad_copy_output_tokens",
+    "出力形式ごとの、広告文を取り出した応答の出力トークン数",
+    ("mode",),
+)
+AD_COPIES_EXTRACTED = REGISTRY.counter(
+    "ad_generator_ad_copies_extracted",
+    "出力形式ごとの、応答から取り出した広告文の数",
+    ("mode",),
+)
+ERRORS = REGISTRY.counter(
+    "ad_generator_errors",
+    "例外の種類ごとのエラー数",
+    ("type",),
+)
+
+# 段階ごとのヒストグラム（ホットパスでラベルを引かないよう事前に取得しておく）
+# - request_parse: リクエストの受信から、ボディの読み込みとバリデーションを経てハンドラーに入るまで
+# - validation: リクエストモデルからドメインエンティティへの変換
+# - rate_limit_wait: レート制限の割り当て待ち
+# - prompt_build: プロンプトの構築
+# - upstream: Claude API の応答待ち（同時リクエスト数の上限による待ちを含まない）
+# - response_parse: Claude API の応答からの広告文の抽出
+# - response_build: レスポンスモデルの構築
+REQUEST_PARSE = STAGE_DURATION.labels("request_parse")
+VALIDATION = STAGE_DURATION.labels("validation")
+RATE_LIMIT_WAIT = STAGE_DURATION.labels("rate_limit_wait")
+PROMPT_BUILD = STAGE_DURATION.labels("prompt_build")
+UPSTREAM = STAGE_DURATION.labels("upstream")
+RESPONSE_PARSE = STAGE_DURATION.labels("response_parse")
+RESPONSE_BUILD = STAGE_DURATION.labels("response_build")
+
+# ミドルウェアがリクエストを受け取った時刻
+request_started_at: ContextVar[Optional[float]] = ContextVar("request_started_at", default=None)
+
+
+def observe_request_parse() -> None:
+    """リクエストの受信からハンドラーに入るまでの時間を記録する."""
+    started = request_started_at.get()
+    if started is not None:
+        REQUEST_PARSE.observe(time.perf_counter() - started)
+
+
+def record_error(error: BaseException) -> None:
+    """例外の種類ごとのエラー数を数える."""
+    ERRORS.labels(type(error).__name__).inc()
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def render_stats(stats: Dict[str, Dict[str, Any]]) -> str:
+    """/stats の統計情報を Prometheus のテキスト形式に変換する.
+
+    数値は ad_generator_<セクション>_<項目> の値として、文字列は
+    その値をラベルに持つ値1のサンプルとして出力する。
+    """
+    lines: List[str] = []
+    for section, values in stats.items():
+        for key, value in values.items():
+            name = f"ad_generator_{_snake_case(section)}_{_snake_case(key)}"
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                continue
+            lines.append(f"# TYPE {name} untyped")
+            if isinstance(value, str):
+                lines.append(f"{name}{format_labels(('value',), (value,))} 1")
+            else:
+                lines.append(f"{name} {format_value(value)}")
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,258 @@
+"""Prometheus のテキスト形式で出力できる軽量なメトリクス.
+
+記録はイベントループのスレッドから行う前提でロックを取らない。
+ラベル値ごとの子メトリクスは初回に作成して使い回すため、
+ホットパスでは事前に labels() で取得した子メトリクスを使用する。
+"""
+
+import bisect
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+# 既定のヒストグラムのバケット（秒）。ミリ秒単位の処理から上流の呼び出しまでを扱う
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """ラベルを Prometheus のテキスト形式に整形する."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def format_value(value: float) -> str:
+    """サンプルの値を Prometheus のテキスト形式に整形する."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """ラベル値ごとの子メトリクスを保持するメトリクスの基底クラス."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _child(self, values: Tuple[str, ...]) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} のラベルは {self.labelnames} です")
+            child = self._new_child()
+            self._children[values] = child
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """メトリクスを Prometheus のテキスト形式で返す."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines) + "\n"
+
+
+class _Value:
+    """カウンターやゲージの1系列の値."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """値を増やす."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """値を減らす."""
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        """値を設定する."""
+        self.value = value
+
+
+class Counter(_Metric):
+    """単調増加するカウンター."""
+
+    type_name = "counter"
+
+    def labels(self, *values: str) -> _Value:
+        """ラベル値に対応する系列を返す."""
+        return self._child(values)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """ラベルのないカウンターを増やす."""
+        self.labels().inc(amount)
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{format_labels(self.labelnames, values)} {format_value(child.value)}"
+            for values, child in self._children.items()
+        ]
+
+
+class Gauge(Counter):
+    """増減するゲージ."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        """ラベルのないゲージを減らす."""
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        """ラベルのないゲージの値を設定する."""
+        self.labels().set(value)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, values)} {format_value(child.value)}"
+            for values, child in self._children.items()
+        ]
+
+
+class _Timer:
+    """with 文のブロックの経過時間をヒストグラムに記録する."""
+
+    __slots__ = ("_histogram", "_started")
+
+    def __init__(self, histogram: "_HistogramValue") -> None:
+        self._histogram = histogram
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._started)
+
+
+class _HistogramValue:
+    """ヒストグラムの1系列の値（バケットごとの件数は累積せずに保持する）."""
+
+    __slots__ = ("_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """観測値を記録する."""
+        self.counts[bisect.bisect_left(self._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> _Timer:
+        """with 文のブロックの経過時間を記録するタイマーを返す."""
+        return _Timer(self)
+
+
+class Histogram(_Metric):
+    """観測値の分布をバケットごとの件数で保持するヒストグラム."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._bounds = tuple(sorted(buckets))
+
+    def labels(self, *values: str) -> _HistogramValue:
+        """ラベル値に対応する系列を返す."""
+        return self._child(values)
+
+    def observe(self, value: float) -> None:
+        """ラベルのないヒストグラムに観測値を記録する."""
+        self.labels().observe(value)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self._bounds)
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        names = self.labelnames + ("le",)
+        for values, child in self._children.items():
+            cumulative = 0
+            bounds = [format_value(bound) for bound in self._bounds] + ["+Inf"]
+            for bound, count in zip(bounds, child.counts, strict=True):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(names, values + (bound,))} {cumulative}")
+            labels = format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+_M = TypeVar("_M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """メトリクスをまとめて Prometheus のテキスト形式で出力するレジストリ."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """カウンターを登録する."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """ゲージを登録する."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        """ヒストグラムを登録する."""
+        return self._register(
+            Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+        )
+
+    def render(self) -> str:
+        """登録されたすべてのメトリクスを Prometheus のテキスト形式で返す."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+    def _register(self, metric: _M) -> _M:
+        if metric.name in self._metrics:
+            raise ValueError(f"メトリクス {metric.name} は登録済みです")
+        self._metrics[metric.name] = metric
+        return metric
@@ -0,0 +1,12 @@
+"""Model routing for Ad Generator."""
+
+from .models import MODEL_PRICES, ModelProfile
+from .router import ModelRouter, ModelStats, RoutingPolicy
+
+__all__ = [
+    "MODEL_PRICES",
+    "ModelProfile",
+    "ModelRouter",
+    "ModelStats",
+    "RoutingPolicy",
+]
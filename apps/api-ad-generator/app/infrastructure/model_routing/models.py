@@ -0,0 +1,66 @@
+"""モデルごとの生成パラメータと料金."""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# 既知のモデルの料金（米ドル / 100万トークン。入力, 出力）
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "claude-3-haiku-20240307": (0.25, 1.25),
+    "claude-3-5-haiku-20241022": (0.8, 4.0),
+    "claude-3-5-sonnet-20241022": (3.0, 15.0),
+    "claude-3-7-sonnet-20250219": (3.0, 15.0),
+    "claude-sonnet-4-20250514": (3.0, 15.0),
+    "claude-opus-4-20250514": (15.0, 75.0),
+}
+
+# プロンプトキャッシュの書き込み・読み込みの、通常の入力に対する料金の倍率
+_CACHE_WRITE_PRICE_RATIO = 1.25
+_CACHE_READ_PRICE_RATIO = 0.1
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """モデルごとの生成パラメータと料金を保持する.
+
+    料金が不明なモデルは input_price / output_price を None とし、料金を見積もらない。
+    """
+
+    name: str
+    max_tokens: int = 2000
+    temperature: float = 0.7
+    input_price: Optional[float] = None
+    output_price: Optional[float] = None
+
+    @classmethod
+    def from_name(cls, name: str, max_tokens: int = 2000, temperature: float = 0.7) -> "ModelProfile":
+        """既知の料金表を使ってプロファイルを作成する."""
+        input_price, output_price = MODEL_PRICES.get(name, (None, None))
+        return cls(
+            name=name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            input_price=input_price,
+            output_price=output_price,
+        )
+
+    @property
+    def has_price(self) -> bool:
+        """料金が分かっているか."""
+        return self.input_price is not None and self.output_price is not None
+
+    def cost(
+        self,
+        input_tokens: float,
+        output_tokens: float,
+        cache_creation_input_tokens: float = 0,
+        cache_read_input_tokens: float = 0,
+    ) -> float:
+        """トークン使用量から料金（米ドル）を見積もる（料金が不明な場合は 0）."""
+        if self.input_price is None or self.output_price is None:
+            return 0.0
+        input_cost = self.input_price * (
+            input_tokens
+            + cache_creation_input_tokens * _CACHE_WRITE_PRICE_RATIO
+            + cache_read_input_tokens * _CACHE_READ_PRICE_RATIO
+        )
+        return (input_cost + self.output_price * output_tokens) / 1_000_000
@@ -0,0 +1,237 @@
+"""リクエストごとに使用するモデルを選択するルーター."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.domain.entities import AdInput, Tone
+from app.infrastructure.metrics.instruments import (
+    UPSTREAM_COST,
+    UPSTREAM_MODEL_DURATION,
+    UPSTREAM_MODEL_REQUESTS,
+)
+from app.infrastructure.model_routing.models import ModelProfile
+from app.infrastructure.resilience import LatencyTracker
+
+
+@dataclass(frozen=True)
+class RoutingPolicy:
+    """リクエストの内容から使用するモデルの区分を決めるポリシー.
+
+    生成数が fast_max_copies 以下、またはトーンが fast_tones に含まれるリクエストは
+    高速で安価なモデルを、それ以外（フォーマル・専門的なトーンなど）は品質を重視する
+    モデルを優先する。もう一方の区分のモデルはスロットリング時のフォールバック先とする。
+    """
+
+    quality_models: Tuple[str, ...]
+    fast_models: Tuple[str, ...] = ()
+    fast_max_copies: int = 1
+    fast_tones: FrozenSet[Tone] = frozenset({Tone.CASUAL, Tone.FRIENDLY, Tone.HUMOROUS})
+
+    def __post_init__(self) -> None:
+        """バリデーションロジック."""
+        if not self.quality_models:
+            raise ValueError("品質を重視するモデルを最低1つ指定してください")
+
+    def use_fast_models(self, ad_input: AdInput) -> bool:
+        """高速なモデルを優先するかどうか."""
+        if not self.fast_models:
+            return False
+        return ad_input.num_copies <= self.fast_max_copies or ad_input.tone in self.fast_tones
+
+
+@dataclass
+class ModelStats:
+    """モデルごとのリクエスト数・レイテンシ・料金を保持する統計情報."""
+
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    total_latency: float = 0.0
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """成功したリクエストの平均レイテンシ（秒）."""
+        if self.requests == 0:
+            return None
+        return self.total_latency / self.requests
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "inputTokens": self.input_tokens,
+            "outputTokens": self.output_tokens,
+            "costUsd": self.cost_usd,
+            "meanLatencySeconds": self.mean_latency,
+            "p95LatencySeconds": self.latency.quantile(0.95),
+        }
+
+
+class ModelRouter:
+    """ポリシー・レイテンシ・料金・スロットリングの状況から、試すモデルの順序を決める.
+
+    - ポリシーで決めた区分のモデルを先に、もう一方の区分のモデルを後に並べる
+    - 区分の中では設定順に並べ、直近のレイテンシが latency_budget を超えるモデルと、
+      見積もり料金が cost_budget を超えるモデルは後に回す
+    - スロットリングされたモデルは、retry-after（ない場合は throttle_cooldown 秒）の間は最後に回す
+    """
+
+    def __init__(
+        self,
+        models: Sequence[ModelProfile],
+        policy: RoutingPolicy,
+        latency_budget: Optional[float] = None,
+        latency_quantile: float = 0.95,
+        cost_budget: Optional[float] = None,
+        min_samples: int = 20,
+        throttle_cooldown: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """ルーターを初期化する.
+
+        Args:
+            models: 使用するモデルのプロファイル
+            policy: モデルの区分を決めるポリシー
+            latency_budget: 区分の中で優先するモデルのレイテンシの上限秒数（None の場合は考慮しない）
+            latency_quantile: latency_budget と比較するレイテンシの分位点
+            cost_budget: 区分の中で優先するモデルの1リクエストあたりの見積もり料金の上限
+                （米ドル。None の場合は考慮しない）
+            min_samples: レイテンシを判断に使うのに必要な最小件数
+            throttle_cooldown: retry-after がない場合にスロットリングされたモデルを避ける秒数
+            clock: 現在時刻を返す関数
+
+        Raises:
+            ValueError: ポリシーのモデルにプロファイルがない場合
+        """
+        self._profiles = {profile.name: profile for profile in models}
+        missing = [
+            name
+            for name in policy.quality_models + policy.fast_models
+            if name not in self._profiles
+        ]
+        if missing:
+            raise ValueError(f"モデルのプロファイルがありません: {', '.join(missing)}")
+        self._policy = policy
+        self._latency_budget = latency_budget
+        self._latency_quantile = latency_quantile
+        self._cost_budget = cost_budget
+        self._throttle_cooldown = throttle_cooldown
+        self._clock = clock
+        self._throttled_until: Dict[str, float] = {}
+        self.stats: Dict[str, ModelStats] = {
+            name: ModelStats(latency=LatencyTracker(min_samples=min_samples))
+            for name in self._profiles
+        }
+
+    @classmethod
+    def single(cls, profile: ModelProfile) -> "ModelRouter":
+        """常に1つのモデルを使用するルーターを作成する."""
+        return cls([profile], RoutingPolicy(quality_models=(profile.name,)))
+
+    @property
+    def default_profile(self) -> ModelProfile:
+        """品質を重視する区分の先頭のモデル."""
+        return self._profiles[self._policy.quality_models[0]]
+
+    def candidates(self, ad_input: AdInput) -> List[ModelProfile]:
+        """入力に対して試すモデルを優先順に返す."""
+        if self._policy.use_fast_models(ad_input):
+            preferred, fallbacks = self._policy.fast_models, self._policy.quality_models
+        else:
+            preferred, fallbacks = self._policy.quality_models, self._policy.fast_models
+        ordered = self._rank(preferred) + self._rank(
+            [name for name in fallbacks if name not in preferred]
+        )
+
+        now = self._clock()
+        available = [profile for profile in ordered if self._throttled_until.get(profile.name, 0.0) <= now]
+        if len(available) == len(ordered):
+            return ordered
+        throttled = sorted(
+            (profile for profile in ordered if profile not in available),
+            key=lambda profile: self._throttled_until[profile.name],
+        )
+        return available + throttled
+
+    def record_success(
+        self,
+        model: str,
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_creation_input_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+    ) -> float:
+        """成功したリクエストのレイテンシと使用量を記録し、見積もった料金を返す."""
+        cost = self._profiles[model].cost(
+            input_tokens, output_tokens, cache_creation_input_tokens, cache_read_input_tokens
+        )
+        stats = self.stats[model]
+        stats.requests += 1
+        stats.input_tokens += input_tokens + cache_creation_input_tokens + cache_read_input_tokens
+        stats.output_tokens += output_tokens
+        stats.cost_usd += cost
+        stats.total_latency += latency
+        stats.latency.record(latency)
+        self._throttled_until.pop(model, None)
+        UPSTREAM_MODEL_REQUESTS.labels(model, "success").inc()
+        UPSTREAM_MODEL_DURATION.labels(model).observe(latency)
+        UPSTREAM_COST.labels(model).inc(cost)
+        return cost
+
+    def record_throttled(self, model: str, retry_after: Optional[float] = None) -> None:
+        """スロットリングされたモデルを一定時間後回しにする."""
+        cooldown = retry_after if retry_after is not None else self._throttle_cooldown
+        self._throttled_until[model] = self._clock() + cooldown
+        self.stats[model].throttled += 1
+        UPSTREAM_MODEL_REQUESTS.labels(model, "throttled").inc()
+
+    def record_error(self, model: str) -> None:
+        """スロットリング以外の失敗を記録する."""
+        self.stats[model].errors += 1
+        UPSTREAM_MODEL_REQUESTS.labels(model, "error").inc()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """モデルごとの統計情報を辞書に変換する."""
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    def _rank(self, names: Sequence[str]) -> List[ModelProfile]:
+        """区分の中のモデルを、予算内のものを先にして設定順に並べる."""
+        profiles = [self._profiles[name] for name in names]
+        within_budget = [profile for profile in profiles if self._within_budget(profile)]
+        return within_budget + [profile for profile in profiles if profile not in within_budget]
+
+    def _within_budget(self, profile: ModelProfile) -> bool:
+        """直近のレイテンシと見積もり料金が上限以内か（判断できない場合は以内とみなす）."""
+        if self._latency_budget is not None:
+            latency = self.stats[profile.name].latency.quantile(self._latency_quantile)
+            if latency is not None and latency > self._latency_budget:
+                return False
+        if self._cost_budget is not None:
+            cost = self.expected_cost(profile)
+            if cost is not None and cost > self._cost_budget:
+                return False
+        return True
+
+    def expected_cost(self, profile: ModelProfile) -> Optional[float]:
+        """直近の平均トークン数から1リクエストあたりの料金を見積もる.
+
+        Returns:
+            見積もった料金（料金が不明、またはまだ記録がない場合は None）
+        """
+        if not profile.has_price:
+            return None
+        # トークン数はモデルよりも入力に依存するため、全モデルの平均を使う
+        requests = sum(stats.requests for stats in self.stats.values())
+        if requests == 0:
+            return None
+        input_tokens = sum(stats.input_tokens for stats in self.stats.values()) / requests
+        output_tokens = sum(stats.output_tokens for stats in self.stats.values()) / requests
+        return profile.cost(input_tokens, output_tokens)
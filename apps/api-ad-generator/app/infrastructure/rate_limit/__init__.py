@@ -0,0 +1,23 @@
+"""Rate limiting for Ad Generator."""
+
+from .limiter import (
+    RateLimiter,
+    RateLimitStats,
+    RequestPriority,
+    estimate_message_tokens,
+    request_priority,
+)
+from .stores import InMemoryRateLimitStore, RateLimitStore, SQLiteRateLimitStore
+from .token_bucket import TokenBucket
+
+__all__ = [
+    "InMemoryRateLimitStore",
+    "RateLimitStats",
+    "RateLimitStore",
+    "RateLimiter",
+    "RequestPriority",
+    "SQLiteRateLimitStore",
+    "TokenBucket",
+    "estimate_message_tokens",
+    "request_priority",
+]
@@ -0,0 +1,169 @@
+"""優先度付きの待ち行列を持つクライアント側のレート制限."""
+
+import asyncio
+import heapq
+import itertools
+import json
+import math
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from app.infrastructure.rate_limit.stores import RateLimitStore
+
+# 入力トークン数の見積もりに使用する UTF-8 のバイト数（日本語は1文字が約1トークン）
+_BYTES_PER_TOKEN = 3
+
+
+class RequestPriority(IntEnum):
+    """上流の呼び出しの優先度（値が小さいほど優先する）."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+# 現在のリクエストの優先度（一括生成のルートで設定される）
+request_priority: ContextVar[RequestPriority] = ContextVar(
+    "request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+def estimate_message_tokens(params: Dict[str, Any]) -> int:
+    """Messages API のリクエストが消費するトークン数を見積もる.
+
+    入力はプロンプトとツールの定義の UTF-8 のバイト数から、出力は max_tokens から見積もる。
+
+    Args:
+        params: Messages API のリクエストパラメータ
+
+    Returns:
+        入力と出力を合わせたトークン数の見積もり
+    """
+    prompt_bytes = 0
+    for message in params.get("messages", []):
+        content = message.get("content", "")
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+        prompt_bytes += len(content.encode("utf-8"))
+    system = params.get("system")
+    if system:
+        if not isinstance(system, str):
+            system = json.dumps(system, ensure_ascii=False)
+        prompt_bytes += len(system.encode("utf-8"))
+    tools = params.get("tools")
+    if tools:
+        prompt_bytes += len(json.dumps(tools, ensure_ascii=False).encode("utf-8"))
+    return math.ceil(prompt_bytes / _BYTES_PER_TOKEN) + int(params.get("max_tokens", 0))
+
+
+@dataclass
+class RateLimitStats:
+    """レート制限による待機の状況を保持する統計情報."""
+
+    acquired: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    tokens_given_back: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "waitSeconds": self.wait_seconds,
+            "tokensGivenBack": self.tokens_given_back,
+        }
+
+
+class RateLimiter:
+    """1分あたりのリクエスト数とトークン数を、優先度の高い呼び出しから割り当てる.
+
+    プロセス内では優先度順（同じ優先度では到着順）の待ち行列の先頭だけが
+    ストアから取り出しを試み、後続は先頭が取り出し終えるまで待つ。
+    複数ワーカーで共有するストアでは待ち行列は共有されないため、
+    一括処理の呼び出しは容量の一部（bulk_reserve_ratio）を対話的な呼び出し用に残す。
+    """
+
+    def __init__(self, store: RateLimitStore, bulk_reserve_ratio: float = 0.2) -> None:
+        """レート制限を初期化する.
+
+        Args:
+            store: バケットの残量を保持するストア
+            bulk_reserve_ratio: 一括処理の呼び出しが残しておく容量の割合
+        """
+        if not (0.0 <= bulk_reserve_ratio < 1.0):
+            raise ValueError("予約する容量の割合は0.0以上1.0未満で指定してください")
+        self._store = store
+        self._bulk_reserve_ratio = bulk_reserve_ratio
+        self._waiters: List[List[Any]] = []
+        self._counter = itertools.count()
+        self.stats = RateLimitStats()
+
+    @property
+    def store(self) -> RateLimitStore:
+        """使用中のストア."""
+        return self._store
+
+    @property
+    def waiting(self) -> int:
+        """割り当てを待っている呼び出しの数."""
+        return len(self._waiters)
+
+    async def acquire(self, tokens: int, priority: Optional[RequestPriority] = None) -> None:
+        """1リクエストと tokens トークンを取り出せるまで待つ.
+
+        Args:
+            tokens: 消費するトークン数の見積もり
+            priority: 優先度（None の場合は現在のリクエストの優先度）
+        """
+        if priority is None:
+            priority = request_priority.get()
+        reserve_ratio = self._bulk_reserve_ratio if priority >= RequestPriority.BULK else 0.0
+        wakeup = asyncio.Event()
+        waiter = [priority, next(self._counter), wakeup]
+        heapq.heappush(self._waiters, waiter)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            while True:
+                timeout: Optional[float] = None
+                if self._waiters[0] is waiter:
+                    timeout = await self._store.take(tokens, reserve_ratio)
+                    if timeout == 0.0:
+                        break
+                wakeup.clear()
+                try:
+                    # 先頭になるか、残量が補充されるまで待つ
+                    # （wait_for は待機の完了と同時のキャンセルを取りこぼすため使わない）
+                    async with asyncio.timeout(timeout):
+                        await wakeup.wait()
+                except TimeoutError:
+                    pass
+        finally:
+            self._remove(waiter)
+
+        self.stats.acquired += 1
+        waited = loop.time() - started
+        if waited > 0.001:
+            self.stats.waited += 1
+            self.stats.wait_seconds += waited
+
+    async def give_back(self, tokens: int) -> None:
+        """見積もりより使用量が少なかったトークンを戻す."""
+        if tokens <= 0:
+            return
+        await self._store.give_back(tokens)
+        self.stats.tokens_given_back += tokens
+        if self._waiters:
+            self._waiters[0][2].set()
+
+    def _remove(self, waiter: List[Any]) -> None:
+        """待ち行列から取り除き、新たな先頭を起こす."""
+        if self._waiters and self._waiters[0] is waiter:
+            heapq.heappop(self._waiters)
+        elif waiter in self._waiters:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+        if self._waiters:
+            self._waiters[0][2].set()
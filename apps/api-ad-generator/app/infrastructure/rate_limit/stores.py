@@ -0,0 +1,163 @@
+"""トークンバケットの残量を保持するストアの実装."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+
+from app.infrastructure.rate_limit.token_bucket import (
+    REQUESTS,
+    TOKENS,
+    TokenBucket,
+    give_back,
+    take,
+)
+
+
+class RateLimitStore(ABC):
+    """リクエスト数とトークン数のバケットの残量を保持するストアのインターフェース."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> None:
+        """ストアを初期化する.
+
+        Args:
+            requests_per_minute: 1分あたりのリクエスト数の上限（None の場合は制限しない）
+            tokens_per_minute: 1分あたりのトークン数の上限（None の場合は制限しない）
+        """
+        self._buckets: Dict[str, TokenBucket] = {}
+        if requests_per_minute is not None:
+            self._buckets[REQUESTS] = TokenBucket(requests_per_minute)
+        if tokens_per_minute is not None:
+            self._buckets[TOKENS] = TokenBucket(tokens_per_minute)
+
+    @abstractmethod
+    async def take(self, tokens: float, reserve_ratio: float = 0.0) -> float:
+        """1リクエストと tokens トークンを取り出す.
+
+        Args:
+            tokens: 取り出すトークン数
+            reserve_ratio: 取り出した後も残しておく容量の割合
+
+        Returns:
+            取り出した場合は 0、取り出せない場合は取り出せるようになるまでの秒数
+        """
+        pass
+
+    @abstractmethod
+    async def give_back(self, tokens: float) -> None:
+        """見積もりより使用量が少なかったトークンを戻す."""
+        pass
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """プロセス内で残量を保持するストア."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(requests_per_minute, tokens_per_minute)
+        self._clock = clock
+        self._levels: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, tokens: float, reserve_ratio: float = 0.0) -> float:
+        return take(
+            self._buckets,
+            self._levels,
+            {REQUESTS: 1, TOKENS: tokens},
+            self._clock(),
+            reserve_ratio,
+        )
+
+    async def give_back(self, tokens: float) -> None:
+        give_back(self._buckets, self._levels, {TOKENS: tokens}, self._clock())
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """複数ワーカーで残量を共有する SQLite ファイルベースのストア.
+
+    取り出しは BEGIN IMMEDIATE のトランザクション内で行い、
+    複数のプロセスが同時に取り出しても上限を超えないようにする。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(requests_per_minute, tokens_per_minute)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # トランザクションを明示的に開始するため自動コミットモードで接続する
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, timeout=5.0, isolation_level=None
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    name TEXT PRIMARY KEY,
+                    level REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    async def take(self, tokens: float, reserve_ratio: float = 0.0) -> float:
+        return await asyncio.to_thread(
+            self._update,
+            lambda levels, now: take(
+                self._buckets, levels, {REQUESTS: 1, TOKENS: tokens}, now, reserve_ratio
+            ),
+        )
+
+    async def give_back(self, tokens: float) -> None:
+        await asyncio.to_thread(
+            self._update,
+            lambda levels, now: give_back(self._buckets, levels, {TOKENS: tokens}, now),
+        )
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        with self._lock:
+            self._connection.close()
+
+    def _update(
+        self, update: Callable[[Dict[str, Tuple[float, float]], float], Optional[float]]
+    ) -> float:
+        """排他ロックを取得した状態で残量を読み込み、update で更新して書き戻す."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                levels = {
+                    name: (level, updated_at)
+                    for name, level, updated_at in self._connection.execute(
+                        "SELECT name, level, updated_at FROM rate_limit_buckets"
+                    )
+                }
+                result = update(levels, self._clock())
+                self._connection.executemany(
+                    """
+                    INSERT INTO rate_limit_buckets (name, level, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        level = excluded.level,
+                        updated_at = excluded.updated_at
+                    """,
+                    [(name, level, updated_at) for name, (level, updated_at) in levels.items()],
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return result or 0.0
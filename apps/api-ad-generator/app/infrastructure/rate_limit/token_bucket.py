@@ -0,0 +1,92 @@
+"""トークンバケットの補充と待ち時間の計算."""
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+# バケットの名前
+REQUESTS = "requests"
+TOKENS = "tokens"
+
+
+@dataclass(frozen=True)
+class TokenBucket:
+    """1分あたりの上限から決まるトークンバケットの仕様.
+
+    容量は1分あたりの上限と同じとし、上限の 1/60 ずつ毎秒補充する。
+    バケットの残量は状態として持たず、ストアが保存する。
+    """
+
+    per_minute: float
+
+    @property
+    def capacity(self) -> float:
+        """バケットの容量."""
+        return self.per_minute
+
+    @property
+    def refill_per_second(self) -> float:
+        """1秒あたりの補充量."""
+        return self.per_minute / 60
+
+    def refill(self, level: float, elapsed: float) -> float:
+        """elapsed 秒経過した後の残量を返す."""
+        return min(self.capacity, level + max(elapsed, 0.0) * self.refill_per_second)
+
+    def time_until(self, level: float, amount: float, reserve_ratio: float = 0.0) -> float:
+        """amount を取り出せるようになるまでの秒数を返す（すぐに取り出せる場合は 0）.
+
+        Args:
+            level: 現在の残量
+            amount: 取り出す量（容量を超える場合は容量まで切り詰める）
+            reserve_ratio: 取り出した後も残しておく容量の割合
+        """
+        required = min(amount, self.capacity) + reserve_ratio * self.capacity
+        required = min(required, self.capacity)
+        if level >= required:
+            return 0.0
+        return (required - level) / self.refill_per_second
+
+
+def take(
+    buckets: Mapping[str, TokenBucket],
+    levels: Dict[str, Tuple[float, float]],
+    amounts: Mapping[str, float],
+    now: float,
+    reserve_ratio: float = 0.0,
+) -> float:
+    """全てのバケットから同時に取り出す.
+
+    levels は (残量, 更新時刻) をバケット名ごとに保持し、補充後の値に更新される。
+    いずれかのバケットの残量が足りない場合はどのバケットからも取り出さない。
+
+    Returns:
+        取り出した場合は 0、取り出せない場合は取り出せるようになるまでの秒数
+    """
+    refilled: Dict[str, float] = {}
+    wait = 0.0
+    for name, bucket in buckets.items():
+        level, updated_at = levels.get(name, (bucket.capacity, now))
+        refilled[name] = bucket.refill(level, now - updated_at)
+        wait = max(wait, bucket.time_until(refilled[name], amounts.get(name, 0.0), reserve_ratio))
+
+    for name, bucket in buckets.items():
+        level = refilled[name]
+        if wait == 0.0:
+            level -= min(amounts.get(name, 0.0), bucket.capacity)
+        levels[name] = (level, now)
+    return wait
+
+
+def give_back(
+    buckets: Mapping[str, TokenBucket],
+    levels: Dict[str, Tuple[float, float]],
+    amounts: Mapping[str, float],
+    now: float,
+) -> None:
+    """見積もりより使用量が少なかった分をバケットに戻す."""
+    for name, amount in amounts.items():
+        bucket: Optional[TokenBucket] = buckets.get(name)
+        if bucket is None or amount <= 0 or name not in levels:
+            continue
+        level, updated_at = levels[name]
+        levels[name] = (min(bucket.capacity, bucket.refill(level, now - updated_at) + amount), now)
@@ -0,0 +1,16 @@
+"""Resilience for Ad Generator."""
+
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .latency import LatencyTracker
+from .resilient_repository import ResilienceStats, ResilientAdGenerationRepository
+from .retry import RetryPolicy, parse_retry_after
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitState",
+    "LatencyTracker",
+    "ResilienceStats",
+    "ResilientAdGenerationRepository",
+    "RetryPolicy",
+    "parse_retry_after",
+]
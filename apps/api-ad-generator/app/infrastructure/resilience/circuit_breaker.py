@@ -0,0 +1,93 @@
+"""上流の障害時に呼び出しを即座に失敗させるサーキットブレーカー."""
+
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+from app.domain.exceptions import ServiceUnavailableError
+
+
+class CircuitState(str, Enum):
+    """サーキットブレーカーの状態."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """連続した失敗が続いた場合に一定時間呼び出しを遮断する.
+
+    閉（CLOSED）状態で連続失敗数がしきい値に達すると開（OPEN）状態になり、
+    reset_timeout 秒の間は上流を呼び出さずに ServiceUnavailableError を送出する。
+    その後の半開（HALF_OPEN）状態では1件だけ試行を通し、成功すれば閉状態に、
+    失敗すれば再び開状態に戻る。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """サーキットブレーカーを初期化する.
+
+        Args:
+            failure_threshold: 開状態にする連続失敗数
+            reset_timeout: 開状態を維持する秒数
+            clock: 現在時刻（秒）を返す関数
+        """
+        if failure_threshold < 1:
+            raise ValueError("連続失敗数のしきい値は1以上で指定してください")
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """現在の状態."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at < self._reset_timeout:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def acquire(self) -> None:
+        """上流を呼び出してよいかを確認する.
+
+        Raises:
+            ServiceUnavailableError: 遮断中の場合
+        """
+        state = self.state
+        if state == CircuitState.OPEN:
+            retry_after = self._reset_timeout - (self._clock() - self._opened_at)
+            raise ServiceUnavailableError(
+                "Claude APIが不安定なため、一時的にリクエストを停止しています",
+                retry_after=retry_after,
+            )
+        if state == CircuitState.HALF_OPEN:
+            if self._probing:
+                raise ServiceUnavailableError(
+                    "Claude APIの復旧を確認中のため、一時的にリクエストを停止しています"
+                )
+            self._probing = True
+
+    def record_success(self) -> None:
+        """呼び出しの成功を記録する."""
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """呼び出しの失敗を記録する."""
+        probing, self._probing = self._probing, False
+        self._failures += 1
+        if probing or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """成否を判定できずに終わった呼び出し（キャンセルなど）を記録する."""
+        self._probing = False
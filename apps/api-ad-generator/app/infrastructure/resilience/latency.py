@@ -0,0 +1,38 @@
+"""直近のレイテンシからパーセンタイルを推定するトラッカー."""
+
+import math
+from collections import deque
+from typing import Deque, Optional
+
+
+class LatencyTracker:
+    """直近 window 件の成功したリクエストのレイテンシを保持する."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        """トラッカーを初期化する.
+
+        Args:
+            window: 保持するレイテンシの件数
+            min_samples: パーセンタイルを返すのに必要な最小件数
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        """レイテンシ（秒）を記録する."""
+        self._samples.append(latency)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """レイテンシの q 分位点（0.0〜1.0）を返す.
+
+        Returns:
+            q 分位点の秒数（記録が min_samples 件に満たない場合は None）
+        """
+        if len(self._samples) < max(self._min_samples, 1):
+            return None
+        ordered = sorted(self._samples)
+        index = min(math.ceil(q * len(ordered)) - 1, len(ordered) - 1)
+        return ordered[max(index, 0)]
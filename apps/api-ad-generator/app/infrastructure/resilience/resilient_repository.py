@@ -0,0 +1,296 @@
+"""再試行・期限・サーキットブレーカー・ヘッジリクエストを備えたリポジトリデコレーター."""
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import GenerationTimeoutError, TransientGenerationError
+from app.domain.repositories import AdGenerationRepository
+from app.infrastructure.resilience.circuit_breaker import CircuitBreaker, CircuitState
+from app.infrastructure.resilience.latency import LatencyTracker
+from app.infrastructure.resilience.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ResilienceStats:
+    """再試行やヘッジリクエストの状況を保持する統計情報."""
+
+    attempts: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    hedges_skipped: int = 0
+    deadline_exceeded: int = 0
+    rejected: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """統計情報を辞書に変換する."""
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedgeWins": self.hedge_wins,
+            "hedgesSkipped": self.hedges_skipped,
+            "deadlineExceeded": self.deadline_exceeded,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientAdGenerationRepository(AdGenerationRepository):
+    """一時的な障害を再試行で吸収し、上流の不調時は即座に失敗させるリポジトリ.
+
+    - TransientGenerationError はジッター付き指数バックオフで再試行する
+    - 再試行と待機を含めた1回の呼び出し全体を deadline 秒以内に収める
+    - 連続した失敗でサーキットブレーカーが開き、上流を呼び出さずに失敗させる
+    - 直近のレイテンシの分位点を超えた生成は、もう1件並行して生成し早い方を使う
+      （上流への呼び出しに空きがない場合は、ヘッジしても待ち行列に並ぶだけのためヘッジしない）
+    """
+
+    def __init__(
+        self,
+        inner: AdGenerationRepository,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[float] = None,
+        hedge_quantile: Optional[float] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        record_latency: bool = True,
+        has_capacity: Optional[Callable[[], bool]] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """リポジトリを初期化する.
+
+        Args:
+            inner: 実際に生成を行うリポジトリ
+            retry_policy: 再試行ポリシー
+            circuit_breaker: サーキットブレーカー
+            deadline: 1回の呼び出しにかけられる秒数（None の場合は無制限）
+            hedge_quantile: ヘッジリクエストを開始するレイテンシの分位点
+                （None の場合はヘッジしない）
+            latency_tracker: レイテンシを記録するトラッカー
+            record_latency: 生成にかかった時間を latency_tracker に記録するか
+                （False の場合は、inner が上流の呼び出しのレイテンシを記録する）
+            has_capacity: 上流への呼び出しを待たずに始められるかを返す関数
+                （None の場合は常に空きがあるとみなす）
+            sleep: 再試行までの待機に使用する関数
+            rng: バックオフのジッターに使用する乱数生成器
+        """
+        self._inner = inner
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._deadline = deadline
+        self._hedge_quantile = hedge_quantile
+        self._latency_tracker = latency_tracker if latency_tracker is not None else LatencyTracker()
+        self._record_latency = record_latency
+        self._has_capacity = has_capacity
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self.stats = ResilienceStats()
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """使用中のサーキットブレーカー."""
+        return self._circuit_breaker
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        """期限内で再試行しながら広告文を生成する.
+
+        Raises:
+            ServiceUnavailableError: サーキットブレーカーが開いている場合や、
+                再試行しても一時的なエラーが解消しなかった場合
+            GenerationTimeoutError: 期限内に生成が完了しなかった場合
+        """
+        deadline = self._start_deadline()
+        retry_number = 0
+        while True:
+            self._acquire()
+            try:
+                ad_copies = await self._within_deadline(
+                    lambda: self._generate_with_hedge(ad_input), deadline
+                )
+            except (TransientGenerationError, GenerationTimeoutError) as e:
+                self._circuit_breaker.record_failure()
+                delay = self._retry_delay(e, retry_number, deadline)
+                if delay is None:
+                    raise
+                logger.warning("広告文の生成を%.2f秒後に再試行します: %s", delay, e.message)
+            except Exception:
+                # パースエラーなどは上流が応答しているため障害として数えない
+                self._circuit_breaker.record_success()
+                raise
+            except BaseException:
+                self._circuit_breaker.release()
+                raise
+            else:
+                self._circuit_breaker.record_success()
+                return ad_copies
+
+            self.stats.retries += 1
+            retry_number += 1
+            await self._sleep(delay)
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        """期限内で広告文をストリーミングする.
+
+        最初の1件を返す前に発生した一時的なエラーのみ再試行する。
+        返し始めた後に再試行すると同じ広告文を重複して返すことになるため、
+        その場合はエラーをそのまま伝える。
+        """
+        deadline = self._start_deadline()
+        retry_number = 0
+        while True:
+            self._acquire()
+            num_yielded = 0
+            iterator = self._inner.stream_ad_copies(ad_input).__aiter__()
+            try:
+                while True:
+                    try:
+                        ad_copy = await self._within_deadline(iterator.__anext__, deadline)
+                    except StopAsyncIteration:
+                        break
+                    num_yielded += 1
+                    yield ad_copy
+            except (TransientGenerationError, GenerationTimeoutError) as e:
+                self._circuit_breaker.record_failure()
+                delay = None if num_yielded else self._retry_delay(e, retry_number, deadline)
+                if delay is None:
+                    raise
+                logger.warning("広告文のストリーミングを%.2f秒後に再試行します: %s", delay, e.message)
+            except Exception:
+                self._circuit_breaker.record_success()
+                raise
+            except BaseException:
+                self._circuit_breaker.release()
+                raise
+            else:
+                self._circuit_breaker.record_success()
+                return
+            finally:
+                await iterator.aclose()
+
+            self.stats.retries += 1
+            retry_number += 1
+            await self._sleep(delay)
+
+    def _acquire(self) -> None:
+        try:
+            self._circuit_breaker.acquire()
+        except Exception:
+            self.stats.rejected += 1
+            raise
+        self.stats.attempts += 1
+
+    def _start_deadline(self) -> Optional[float]:
+        if self._deadline is None:
+            return None
+        return asyncio.get_running_loop().time() + self._deadline
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return deadline - asyncio.get_running_loop().time()
+
+    async def _within_deadline(
+        self, call: Callable[[], Awaitable[T]], deadline: Optional[float]
+    ) -> T:
+        """call の結果を期限まで待つ.
+
+        Raises:
+            GenerationTimeoutError: 期限を過ぎた場合
+        """
+        remaining = self._remaining(deadline)
+        if remaining is None:
+            return await call()
+        if remaining <= 0:
+            self.stats.deadline_exceeded += 1
+            raise GenerationTimeoutError("広告文の生成が期限内に完了しませんでした")
+        timeout = asyncio.timeout(remaining)
+        try:
+            async with timeout:
+                return await call()
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            self.stats.deadline_exceeded += 1
+            raise GenerationTimeoutError("広告文の生成が期限内に完了しませんでした") from None
+
+    def _retry_delay(
+        self, error: Exception, retry_number: int, deadline: Optional[float]
+    ) -> Optional[float]:
+        """再試行までの待ち時間を返す（再試行しない場合は None）."""
+        if isinstance(error, GenerationTimeoutError) or retry_number >= self._retry_policy.max_retries:
+            return None
+        retry_after = error.retry_after if isinstance(error, TransientGenerationError) else None
+        delay = self._retry_policy.backoff(retry_number, retry_after, self._rng)
+        remaining = self._remaining(deadline)
+        if remaining is not None and delay >= remaining:
+            # 待っている間に期限を過ぎるため再試行しない
+            return None
+        return delay
+
+    async def _generate_with_hedge(self, ad_input: AdInput) -> List[AdCopy]:
+        """生成が遅い場合はもう1件並行して生成し、先に成功した結果を返す."""
+        hedge_delay = None
+        if (
+            self._hedge_quantile is not None
+            and self._circuit_breaker.state == CircuitState.CLOSED
+        ):
+            hedge_delay = self._latency_tracker.quantile(self._hedge_quantile)
+        if hedge_delay is None:
+            return await self._timed_generate(ad_input)
+
+        primary = asyncio.ensure_future(self._timed_generate(ad_input))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            if self._has_capacity is not None and not self._has_capacity():
+                self.stats.hedges_skipped += 1
+                return await primary
+
+            self.stats.hedges += 1
+            hedge = asyncio.ensure_future(self._timed_generate(ad_input))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            assert error is not None
+            raise error
+        finally:
+            # 遅い方の生成は結果を待たずに止める
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed_generate(self, ad_input: AdInput) -> List[AdCopy]:
+        if not self._record_latency:
+            return await self._inner.generate_ad_copies(ad_input)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        ad_copies = await self._inner.generate_ad_copies(ad_input)
+        self._latency_tracker.record(loop.time() - started)
+        return ad_copies
@@ -0,0 +1,75 @@
+"""指数バックオフによる再試行ポリシー."""
+
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """ジッター付き指数バックオフで再試行の待ち時間を決めるポリシー.
+
+    待ち時間は 0〜min(max_delay, base_delay * 2^n) の一様乱数（フルジッター）とし、
+    同時に失敗した多数のリクエストが同じ時刻に再試行しないように分散させる。
+    サーバーから retry-after が返された場合は、その秒数以上待つ。
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(
+        self,
+        retry_number: int,
+        retry_after: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+    ) -> float:
+        """n 回目（0 始まり）の再試行までの待ち時間を計算する.
+
+        Args:
+            retry_number: 何回目の再試行か（0 始まり）
+            retry_after: サーバーが指定した待ち時間の秒数
+            rng: ジッターに使用する乱数生成器
+
+        Returns:
+            待ち時間の秒数
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry_number))
+        delay = (rng or random).uniform(0.0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """レスポンスヘッダーから再試行までの待ち時間を取り出す.
+
+    retry-after-ms（ミリ秒）、retry-after（秒数または HTTP 日付）の順に参照する。
+
+    Args:
+        headers: レスポンスヘッダー
+
+    Returns:
+        待ち時間の秒数（指定がない・解釈できない場合は None）
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
@@ -0,0 +1,27 @@
+"""Tracing for Ad Generator."""
+
+from .exporters import InMemorySpanExporter, JSONLinesSpanExporter, SpanExporter
+from .tracer import (
+    OpenTelemetryTracer,
+    RecordingSpan,
+    RecordingTracer,
+    Span,
+    Tracer,
+    configure_tracing,
+    get_tracer,
+    start_span,
+)
+
+__all__ = [
+    "InMemorySpanExporter",
+    "JSONLinesSpanExporter",
+    "OpenTelemetryTracer",
+    "RecordingSpan",
+    "RecordingTracer",
+    "Span",
+    "SpanExporter",
+    "Tracer",
+    "configure_tracing",
+    "get_tracer",
+    "start_span",
+]
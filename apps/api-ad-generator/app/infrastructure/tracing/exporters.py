@@ -0,0 +1,73 @@
+"""記録したスパンの出力先."""
+
+import json
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, List, Optional, TextIO
+
+if TYPE_CHECKING:
+    from app.infrastructure.tracing.tracer import RecordingSpan
+
+
+class SpanExporter(ABC):
+    """終了したスパンを出力するエクスポーター."""
+
+    @abstractmethod
+    def export(self, span: "RecordingSpan") -> None:
+        """スパンを出力する."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """未出力のスパンを出力し、リソースを解放する."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """スパンをメモリに保持するエクスポーター（テストや調査用）."""
+
+    def __init__(self) -> None:
+        self.spans: List["RecordingSpan"] = []
+
+    def export(self, span: "RecordingSpan") -> None:
+        self.spans.append(span)
+
+    def close(self) -> None:
+        # メモリに保持しているだけのため、解放するリソースはない
+        pass
+
+
+class JSONLinesSpanExporter(SpanExporter):
+    """スパンを1行1件の JSON で出力するエクスポーター.
+
+    項目名は OpenTelemetry のスパンに合わせているため、ローカルのコレクターで
+    取り込んだり、jq で trace_id ごとに集計したりできる。
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, path: Optional[str] = None) -> None:
+        """エクスポーターを初期化する.
+
+        Args:
+            stream: 出力先のストリーム（path と stream がどちらも未指定の場合は標準エラー出力）
+            path: 追記するファイルのパス
+        """
+        self._owns_stream = path is not None
+        if path is not None:
+            stream = open(path, "a", encoding="utf-8")
+        self._stream: TextIO = stream or sys.stderr
+        # 同期クライアントのワーカースレッドから書き込まれても行が混ざらないようにする
+        self._lock = threading.Lock()
+
+    def export(self, span: "RecordingSpan") -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=_to_json)
+        with self._lock:
+            self._stream.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.flush()
+            if self._owns_stream:
+                self._stream.close()
+
+
+def _to_json(value: Any) -> str:
+    return str(value)
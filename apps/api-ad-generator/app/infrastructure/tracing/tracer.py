@@ -0,0 +1,212 @@
+"""ルート・ユースケース・リポジトリの各層の処理区間を記録するトレーサー.
+
+無効な場合は状態を持たない共有の no-op スパンを返すため、
+計測箇所のコストは関数呼び出し1回分に収まる。
+"""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional
+
+from app.infrastructure.tracing.exporters import SpanExporter
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - opentelemetry は任意依存
+    otel_trace = None
+
+
+class Span(ABC):
+    """処理区間を表すスパン（with 文で開始・終了する）."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: Any) -> None:
+        """スパンに属性を設定する."""
+
+    @abstractmethod
+    def __enter__(self) -> "Span":
+        pass
+
+    @abstractmethod
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        pass
+
+
+class _NoopSpan(Span):
+    """トレースが無効な場合に使用する何もしないスパン."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer(ABC):
+    """スパンを作成するトレーサー."""
+
+    @abstractmethod
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """スパンを作成する（with 文に入った時点で開始する）."""
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """未出力のスパンを出力し、リソースを解放する."""
+
+
+# 現在のスパン（非同期タスクにはタスク作成時の値が引き継がれる）
+_current_span: ContextVar[Optional["RecordingSpan"]] = ContextVar("current_span", default=None)
+
+
+class RecordingSpan(Span):
+    """開始・終了時刻と属性を記録し、終了時にエクスポーターへ渡すスパン."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_span_id", "attributes",
+        "start_time_unix_nano", "end_time_unix_nano", "status", "status_message",
+        "_exporter", "_token",
+    )
+
+    def __init__(self, name: str, attributes: Dict[str, Any], exporter: SpanExporter) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = ""
+        self.parent_span_id: Optional[str] = None
+        self.start_time_unix_nano = 0
+        self.end_time_unix_nano = 0
+        self.status = "UNSET"
+        self.status_message: Optional[str] = None
+        self._exporter = exporter
+        self._token: Optional[Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "RecordingSpan":
+        parent = _current_span.get()
+        if parent is None:
+            self.trace_id = os.urandom(16).hex()
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_span_id = parent.span_id
+        self._token = _current_span.set(self)
+        self.start_time_unix_nano = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.end_time_unix_nano = time.time_ns()
+        if exc_type is not None:
+            self.status = "ERROR"
+            self.status_message = f"{exc_type.__name__}: {exc_value}"
+            self.attributes["exception.type"] = exc_type.__name__
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self._exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """OpenTelemetry のスパンに対応する項目名の辞書に変換する."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_time_unix_nano,
+            "endTimeUnixNano": self.end_time_unix_nano,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+
+class RecordingTracer(Tracer):
+    """スパンを記録してエクスポーターに出力するトレーサー."""
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self._exporter = exporter
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        return RecordingSpan(name, dict(attributes) if attributes else {}, self._exporter)
+
+    def shutdown(self) -> None:
+        self._exporter.close()
+
+
+class _OpenTelemetrySpan(Span):
+    """OpenTelemetry のスパンを現在のスパンとして開始・終了する."""
+
+    __slots__ = ("_context_manager", "_span")
+
+    def __init__(self, context_manager: Any) -> None:
+        self._context_manager = context_manager
+        self._span: Any = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def __enter__(self) -> "_OpenTelemetrySpan":
+        self._span = self._context_manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self._context_manager.__exit__(exc_type, exc_value, traceback)
+
+
+class OpenTelemetryTracer(Tracer):
+    """OpenTelemetry API のトレーサーにスパンを渡す.
+
+    出力先は OpenTelemetry SDK 側の設定（TracerProvider とエクスポーター）に従う。
+    """
+
+    def __init__(self) -> None:
+        if otel_trace is None:
+            raise RuntimeError("opentelemetry-api がインストールされていません")
+        self._tracer = otel_trace.get_tracer("api-ad-generator")
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        return _OpenTelemetrySpan(self._tracer.start_as_current_span(name, attributes=attributes))
+
+    def shutdown(self) -> None:
+        # スパンの出力とリソースの解放は OpenTelemetry SDK 側の TracerProvider が行う
+        pass
+
+
+_tracer: Optional[Tracer] = None
+
+
+def configure_tracing(tracer: Optional[Tracer]) -> None:
+    """プロセス全体で使用するトレーサーを設定する（None でトレースを無効にする）."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """設定されているトレーサーを返す."""
+    return _tracer
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+    """スパンを作成する.
+
+    トレースが無効な場合は何もしない共有のスパンを返す。
+
+    Args:
+        name: スパン名
+        attributes: スパンの属性
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.start_span(name, attributes)
@@ -1,19 +1,53 @@
 """FastAPI API for Ad Generator."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.dependencies import get_settings
+from app.dependencies import (
+    get_admission_controller,
+    get_settings,
+    shutdown_dependencies,
+    startup_dependencies,
+)
+from app.infrastructure.admission import AdmissionController, AdmissionControlMiddleware
 from app.infrastructure.api.routes import router
+from app.infrastructure.api.stats_routes import router as stats_router
+from app.infrastructure.metrics import MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create shared clients on startup and close them on shutdown."""
+    # Settings are read here rather than at import time to keep the import cheap
+    settings = get_settings()
+    app.title = settings.app_name
+    app.version = settings.app_version
+    app.state.job_worker_pool = await startup_dependencies()
+    app.state.admission_controller = get_admission_controller(settings=settings)
+    try:
+        yield
+    finally:
+        app.state.admission_controller = None
+        await shutdown_dependencies(app.state.job_worker_pool)
+        app.state.job_worker_pool = None
+
+
+def admission_controller() -> Optional[AdmissionController]:
+    """Return the admission controller created on startup (None before startup or when disabled)."""
+    return getattr(app.state, "admission_controller", None)
 
-settings = get_settings()
 
 app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
     description="API for Ad Generator",
+    lifespan=lifespan,
 )
 
+# Admission-control-middleware (inside CORS so that rejections carry the CORS headers)
+app.add_middleware(AdmissionControlMiddleware, get_controller=admission_controller)
+
 # CORS-middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,8 +57,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics-middleware (outermost so that the durations include the other middleware)
+app.add_middleware(MetricsMiddleware)
+
 # Include router
 app.include_router(router)
+app.include_router(stats_router)
 
 
 @app.get("/")
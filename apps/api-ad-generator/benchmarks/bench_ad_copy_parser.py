@@ -0,0 +1,136 @@
+"""広告文パーサーのマイクロベンチマーク.
+
+従来の find/rfind + json.loads による抽出と、ad_copy_parser による抽出の
+スループットと、ファズコーパスに対する成功率を比較する。
+
+    uv run python -m benchmarks.bench_ad_copy_parser
+"""
+
+import argparse
+import gc
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from app.domain.entities import AdCopy
+from app.infrastructure.clients import ad_copy_parser
+from app.infrastructure.clients.ad_copy_parser import (
+    JSON_BACKEND,
+    AdCopyStreamParser,
+    ad_copy_from_dict,
+    parse_ad_copies,
+)
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "ad_copy_parser"
+
+
+def legacy_parse(text: str) -> List[AdCopy]:
+    """変更前の _parse_response と同じ方法でパースする."""
+    start_index = text.find("{")
+    end_index = text.rfind("}") + 1
+    if start_index == -1 or end_index == 0:
+        raise ValueError("JSONが見つかりません")
+    data = json.loads(text[start_index:end_index])
+    return [ad_copy_from_dict(item) for item in data.get("adCopies", [])]
+
+
+def stdlib_parse(text: str) -> List[AdCopy]:
+    """orjson を使用せずにパースする."""
+    backend, loads = ad_copy_parser.orjson, ad_copy_parser._loads
+    ad_copy_parser.orjson, ad_copy_parser._loads = None, json.loads
+    try:
+        return parse_ad_copies(text)
+    finally:
+        ad_copy_parser.orjson, ad_copy_parser._loads = backend, loads
+
+
+def stream_parse(text: str, chunk_size: int = 16) -> List[AdCopy]:
+    """ストリーミング用パーサーに一定サイズずつ与えてパースする."""
+    parser = AdCopyStreamParser()
+    items: List[Dict[str, Any]] = []
+    for start in range(0, len(text), chunk_size):
+        items.extend(parser.feed(text[start:start + chunk_size]))
+    if not parser.finished:
+        raise ValueError("adCopies 配列が閉じていません")
+    return [ad_copy_from_dict(item) for item in items]
+
+
+def build_output(num_copies: int) -> str:
+    """前後に説明文を含む、モデル出力を模したテキストを生成する."""
+    body = {
+        "adCopies": [
+            {
+                "copyText": f"【限定{i}】毎日の健康管理を {{スマート}} に。" * 3,
+                "headline": f"見出し{i}",
+                "callToAction": "今すぐチェック",
+                "evaluation": {
+                    "relevanceScore": 0.9,
+                    "creativityScore": 0.8,
+                    "targetAudienceAppeal": "忙しいビジネスパーソンに響く",
+                },
+            }
+            for i in range(num_copies)
+        ]
+    }
+    return (
+        "以下のとおり広告文を生成しました。\n```json\n"
+        + json.dumps(body, ensure_ascii=False, indent=2)
+        + "\n```\n"
+    )
+
+
+def measure(parse: Callable[[str], List[AdCopy]], text: str, seconds: float) -> float:
+    """一定時間パースを繰り返し、1秒あたりの処理件数を返す."""
+    gc.collect()
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        parse(text)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def robustness(parse: Callable[[str], List[AdCopy]]) -> int:
+    """ファズコーパスのうち期待どおりの結果になった件数を返す."""
+    expected = json.loads((CORPUS_DIR / "expected.json").read_text(encoding="utf-8"))
+    passed = 0
+    for name, copies in expected.items():
+        text = (CORPUS_DIR / f"{name}.txt").read_text(encoding="utf-8")
+        try:
+            result = [ad_copy.copy_text for ad_copy in parse(text)]
+        except (ValueError, KeyError):
+            result = None
+        if result == copies:
+            passed += 1
+    return passed
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=0.5, help="1計測あたりの秒数")
+    args = parser.parse_args()
+
+    parsers: Dict[str, Callable[[str], List[AdCopy]]] = {
+        "legacy": legacy_parse,
+        "json": stdlib_parse,
+        "stream": stream_parse,
+    }
+    if JSON_BACKEND == "orjson":
+        parsers["orjson"] = parse_ad_copies
+
+    total = len(json.loads((CORPUS_DIR / "expected.json").read_text(encoding="utf-8")))
+    print(f"JSON backend: {JSON_BACKEND}")
+    print(f"{'parser':<8} {'corpus':>8} " + " ".join(f"{f'{n} copies':>14}" for n in (5, 50, 500)))
+    for name, parse in parsers.items():
+        rates = [measure(parse, build_output(n), args.seconds) for n in (5, 50, 500)]
+        print(
+            f"{name:<8} {robustness(parse):>3}/{total:<4} "
+            + " ".join(f"{rate:>10.0f} /s" for rate in rates)
+        )
+
+
+if __name__ == "__main__":
+    main()
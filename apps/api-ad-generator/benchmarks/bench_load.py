@@ -0,0 +1,363 @@
+"""フェイクの Claude API に対して API 全体の負荷試験を行うベンチマーク.
+
+フェイクの Claude API サーバーと、uvicorn で起動したアプリケーションをそれぞれ
+別プロセスで起動し、指定した同時接続数でリクエストを送り続けて
+スループット（RPS）、レイテンシの p50/p95/p99、ワーカーごとのメモリ使用量を計測する。
+
+    uv run python -m benchmarks.bench_load
+    uv run python -m benchmarks.bench_load --stream --concurrency 64
+    uv run python -m benchmarks.bench_load --error-rate 0.05 --fake-latency uniform:0.1,1.0
+    uv run python -m benchmarks.bench_load --compare        # ベースラインと比較する
+    uv run python -m benchmarks.bench_load --update-baseline
+
+結果はシナリオ（生成/ストリーミング）ごとに benchmarks/baselines/bench_load.json の
+値と比較でき、RPS の低下や p95/p99 の悪化が許容範囲を超えた場合は終了コード1で終了する。
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "bench_load.json"
+
+# アプリケーションのルートディレクトリ（uvicorn の作業ディレクトリ）
+_APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """レイテンシの分布の指定から、秒数を返す関数を作成する.
+
+    Args:
+        spec: fixed:秒数 / uniform:最小,最大 / lognormal:中央値,シグマ
+        rng: 乱数生成器
+
+    Raises:
+        ValueError: 分布の指定が不正な場合
+    """
+    kind, _, arguments = spec.partition(":")
+    values = [float(value) for value in arguments.split(",") if value]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"レイテンシの分布の指定が不正です: {spec}")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """昇順に並んだ値の分位点を最近傍順位法で返す."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(q * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_listening(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"プロセスが終了しました（終了コード {process.returncode}）")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"ポート {port} で待ち受けが開始されませんでした")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _peak_rss_mb(pid: int) -> Optional[float]:
+    """プロセスの最大常駐メモリ（VmHWM）を MB で返す（/proc がない環境では None）."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _worker_pids(pid: int, workers: int) -> List[int]:
+    """アプリケーションを処理しているプロセスの ID を返す.
+
+    ワーカーが1つの場合は uvicorn のプロセス自身が、複数の場合は子プロセスが処理する。
+    """
+    if workers <= 1:
+        return [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="utf-8") as children:
+            return [int(child) for child in children.read().split()]
+    except OSError:
+        return []
+
+
+class LoadResult:
+    """1回の負荷試験で計測した値."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.first_byte_latencies: List[float] = []
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, status: str, latency: float, first_byte: Optional[float]) -> None:
+        """1リクエスト分の結果を記録する."""
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status == "200":
+            self.latencies.append(latency)
+            if first_byte is not None:
+                self.first_byte_latencies.append(first_byte)
+
+
+async def _drive(
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    stream: bool,
+    num_copies: int,
+) -> LoadResult:
+    """同時接続数を保ってリクエストを送り続け、計測期間中の結果を返す."""
+    result = LoadResult()
+    counter = iter(range(sys.maxsize))
+    path = "/generate-ad-copy/stream" if stream else "/generate-ad-copy"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + warmup
+        measure_until = measure_from + duration
+
+        async def worker() -> None:
+            while loop.time() < measure_until:
+                # 入力を毎回変えてキャッシュや同一入力の共有が効かないようにする
+                body = {
+                    "productName": f"ベンチマーク商品{next(counter)}",
+                    "targetAudience": "20代のビジネスパーソン",
+                    "appealPoints": ["軽量", "長持ちバッテリー"],
+                    "numCopies": num_copies,
+                }
+                started = loop.time()
+                first_byte: Optional[float] = None
+                try:
+                    async with client.stream("POST", path, json=body) as response:
+                        async for _ in response.aiter_raw():
+                            if first_byte is None:
+                                first_byte = loop.time() - started
+                        status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                finished = loop.time()
+                # 計測期間中に完了したリクエストを数える（開始時刻で絞ると長い応答ほど漏れる）
+                if measure_from <= finished <= measure_until:
+                    result.record(status, finished - started, first_byte if stream else None)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return result
+
+
+def _summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    return {
+        name: None if (value := percentile(values, q)) is None else round(value * 1000, 1)
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """フェイクサーバーとアプリケーションを起動して負荷試験を行う."""
+    fake_port = _free_port()
+    app_port = _free_port()
+    fake = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.bench_load", "--serve-fake", str(fake_port),
+            "--fake-latency", args.fake_latency, "--error-rate", str(args.error_rate),
+            "--num-copies", str(args.num_copies), "--seed", str(args.seed),
+        ],
+        cwd=_APP_DIR,
+    )
+    env = {
+        **os.environ,
+        "ANTHROPIC_API_KEY": "bench",
+        "CLAUDE_BASE_URL": f"http://127.0.0.1:{fake_port}",
+        # 上流の呼び出しを計測するため生成結果のキャッシュは使用しない
+        "CACHE_BACKEND": "none",
+        # 既定では同時リクエスト数の上限による待ちではなく、アプリケーション自体の処理時間を計測する
+        "CLAUDE_MAX_CONCURRENCY": str(args.claude_max_concurrency or args.concurrency),
+    }
+    app = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+            "--port", str(app_port), "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        cwd=_APP_DIR,
+        env=env,
+    )
+    try:
+        _wait_until_listening(fake_port, fake)
+        _wait_until_listening(app_port, app)
+        result = asyncio.run(
+            _drive(
+                f"http://127.0.0.1:{app_port}",
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                stream=args.stream,
+                num_copies=args.num_copies,
+            )
+        )
+        memory = [_peak_rss_mb(pid) for pid in _worker_pids(app.pid, args.workers)]
+    finally:
+        _stop(app)
+        _stop(fake)
+
+    completed = sum(result.statuses.values())
+    summary: Dict[str, Any] = {
+        "scenario": _scenario(args),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "fakeLatency": args.fake_latency,
+            "errorRate": args.error_rate,
+            "numCopies": args.num_copies,
+            "claudeMaxConcurrency": args.claude_max_concurrency or args.concurrency,
+        },
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "requests": completed,
+        "statuses": result.statuses,
+        "rps": round(len(result.latencies) / args.duration, 1),
+        "latencyMs": _summarize(result.latencies),
+        "memoryPerWorkerMb": memory,
+    }
+    if args.stream:
+        summary["firstByteMs"] = _summarize(result.first_byte_latencies)
+    return summary
+
+
+def _scenario(args: argparse.Namespace) -> str:
+    return "stream" if args.stream else "generate"
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """ベースラインに対して許容範囲を超えて悪化した項目を返す."""
+    regressions: List[str] = []
+    if summary["rps"] < baseline["rps"] * (1 - tolerance):
+        regressions.append(f"rps: {baseline['rps']} -> {summary['rps']}")
+    for name in ("p95", "p99"):
+        before = baseline["latencyMs"].get(name)
+        after = summary["latencyMs"].get(name)
+        if before is not None and after is not None and after > before * (1 + tolerance):
+            regressions.append(f"latency {name}: {before}ms -> {after}ms")
+    return regressions
+
+
+def serve_fake(port: int, args: argparse.Namespace) -> None:
+    """フェイクの Claude API サーバーを起動する（負荷試験から子プロセスとして起動される）."""
+    import uvicorn
+
+    from tests.fakes.fake_claude_server import FakeClaudeServer
+
+    rng = random.Random(args.seed)
+    server = FakeClaudeServer(
+        num_copies=args.num_copies,
+        latency_sampler=latency_sampler(args.fake_latency, rng),
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16, help="同時接続数")
+    parser.add_argument("--duration", type=float, default=20.0, help="計測する秒数")
+    parser.add_argument("--warmup", type=float, default=3.0, help="計測前に負荷をかける秒数")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn のワーカー数")
+    parser.add_argument("--stream", action="store_true", help="ストリーミングのエンドポイントを計測する")
+    parser.add_argument(
+        "--fake-latency",
+        default="lognormal:0.2,0.3",
+        help="フェイクサーバーのレイテンシの分布（fixed:秒 / uniform:最小,最大 / lognormal:中央値,シグマ）",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="フェイクサーバーがエラーを返す割合")
+    parser.add_argument("--num-copies", type=int, default=3, help="1リクエストで生成する広告文の数")
+    parser.add_argument("--seed", type=int, default=0, help="フェイクサーバーの乱数のシード")
+    parser.add_argument(
+        "--claude-max-concurrency",
+        type=int,
+        help="アプリケーションの Claude API への同時リクエスト数の上限（既定は同時接続数と同じ）",
+    )
+    parser.add_argument("--output", type=Path, help="結果の JSON を書き出すパス")
+    parser.add_argument("--compare", action="store_true", help="ベースラインと比較する")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="比較で許容する悪化の割合")
+    parser.add_argument("--update-baseline", action="store_true", help="結果をベースラインとして保存する")
+    parser.add_argument("--serve-fake", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_fake is not None:
+        serve_fake(args.serve_fake, args)
+        return
+
+    summary = run(args)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    baselines: Dict[str, Any] = {}
+    if BASELINE_PATH.exists():
+        baselines = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+    if args.update_baseline:
+        baselines[summary["scenario"]] = summary
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baselines, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"ベースラインを更新しました: {BASELINE_PATH}")
+        return
+
+    if args.compare:
+        baseline = baselines.get(summary["scenario"])
+        if baseline is None:
+            print(f"シナリオ {summary['scenario']} のベースラインがありません", file=sys.stderr)
+            sys.exit(1)
+        if baseline["config"] != summary["config"]:
+            print("警告: ベースラインと設定が異なります", file=sys.stderr)
+        regressions = compare(summary, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("ベースラインからの悪化はありません")
+
+
+if __name__ == "__main__":
+    main()
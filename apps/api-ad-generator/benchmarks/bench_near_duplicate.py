@@ -0,0 +1,75 @@
+"""ほぼ同じ広告文の検出のマイクロベンチマーク.
+
+生成数の多いリクエストを想定した件数の広告文について、numpy による
+MinHash と、numpy を使用しない n-gram 集合の比較の処理時間を比較する。
+
+    uv run python -m benchmarks.bench_near_duplicate
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from app.domain.services import near_duplicate_detector
+from app.domain.services.near_duplicate_detector import NearDuplicateDetector
+
+_PHRASES = [
+    "5日間充電不要",
+    "毎日の健康管理を",
+    "もっと手軽に",
+    "スタイリッシュなデザインで",
+    "ビジネスシーンにも",
+    "睡眠の質を見える化",
+    "心拍数を24時間記録",
+    "今なら送料無料",
+    "あなたの毎日に寄り添う",
+    "新しい習慣をはじめよう",
+]
+
+
+def build_texts(count: int, seed: int = 0) -> List[str]:
+    """ほぼ同じものを含む広告文を生成する."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        if texts and rng.random() < 0.3:
+            # 既存の広告文の末尾だけを変えたものを混ぜる
+            texts.append(rng.choice(texts)[:-2] + rng.choice("!。？"))
+        else:
+            texts.append("、".join(rng.sample(_PHRASES, 4)) + "。")
+    return texts
+
+
+def measure(detector: NearDuplicateDetector, texts: List[str], seconds: float) -> float:
+    """一定時間検出を繰り返し、1回あたりのミリ秒を返す."""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        detector.find_duplicates(texts)
+        count += 1
+    return (time.perf_counter() - started) / count * 1000
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=0.5, help="1計測あたりの秒数")
+    args = parser.parse_args()
+
+    sizes = (10, 50, 200)
+    implementations = {"n-gram sets": None}
+    if near_duplicate_detector.np is not None:
+        implementations = {"minhash": near_duplicate_detector.np, "n-gram sets": None}
+
+    print(f"{'implementation':<14} " + " ".join(f"{f'{n} copies':>12}" for n in sizes))
+    for name, numpy_module in implementations.items():
+        near_duplicate_detector.np = numpy_module
+        detector = NearDuplicateDetector()
+        timings = [measure(detector, build_texts(n), args.seconds) for n in sizes]
+        print(f"{name:<14} " + " ".join(f"{timing:>9.2f} ms" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
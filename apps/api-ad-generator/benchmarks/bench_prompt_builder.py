@@ -0,0 +1,80 @@
+"""プロンプト構築のマイクロベンチマーク.
+
+従来の f-string で指示全体を毎回組み立てる方法と、共通の指示を
+システムプロンプトに分離し、事前に解析したテンプレートで商品情報だけを
+埋め込む方法について、1件あたりの構築時間とリクエストごとに送る文字数を比較する。
+
+    uv run python -m benchmarks.bench_prompt_builder
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from app.domain.entities import AdInput, Tone
+from app.infrastructure.clients.prompt_builder import SYSTEM_PROMPT, AdCopyPromptBuilder
+
+# 変更前のプロンプト末尾に含まれていた出力形式の指示（システムプロンプトの3行目以降と同じ）
+_OUTPUT_FORMAT = SYSTEM_PROMPT.split("\n", 2)[2]
+
+
+def legacy_build_prompt(ad_input: AdInput) -> str:
+    """変更前の、指示全体を毎回組み立てるプロンプト構築."""
+    tone_description = ""
+    if ad_input.tone:
+        tone_description = f"トーン: {ad_input.tone.get_description()}"
+
+    appeal_points_text = "\n".join([f"- {point}" for point in ad_input.appeal_points])
+
+    return f"""
+あなたは広告文作成のプロフェッショナルです。以下の情報をもとに効果的な広告文を{ad_input.num_copies}つ作成してください。
+
+商品・サービス名: {ad_input.product_name}
+ターゲット層: {ad_input.target_audience}
+アピールポイント:
+{appeal_points_text}
+{tone_description}
+
+{_OUTPUT_FORMAT}"""
+
+
+def measure(build: Callable[[AdInput], str], ad_input: AdInput, seconds: float) -> float:
+    """一定時間構築を繰り返し、1件あたりのマイクロ秒を返す."""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            build(ad_input)
+        count += 100
+    return (time.perf_counter() - started) / count * 1_000_000
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=0.5, help="1計測あたりの秒数")
+    args = parser.parse_args()
+
+    ad_input = AdInput(
+        product_name="最新型スマートウォッチ 'Watch X'",
+        target_audience="健康志向の20代〜40代のビジネスパーソン",
+        appeal_points=["バッテリー持続時間5日間", "心拍数・睡眠トラッキング機能", "スタイリッシュなデザイン"],
+        tone=Tone.PROFESSIONAL,
+        num_copies=5,
+    )
+    builder = AdCopyPromptBuilder()
+    implementations = {
+        "f-string": legacy_build_prompt,
+        "template": builder.user_content,
+    }
+
+    print(f"{'implementation':<14} {'build':>10} {'chars/request':>14}")
+    for name, build in implementations.items():
+        timing = measure(build, ad_input, args.seconds)
+        print(f"{name:<14} {timing:>7.2f} us {len(build(ad_input)):>14}")
+    print(f"{'(system)':<14} {'':>10} {len(SYSTEM_PROMPT):>14}  cached after the first request")
+
+
+if __name__ == "__main__":
+    main()
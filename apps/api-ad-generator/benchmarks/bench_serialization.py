@@ -0,0 +1,220 @@
+"""広告文生成のリクエスト・レスポンス変換のマイクロベンチマーク.
+
+上流の呼び出しを固定の広告文を返すユースケースに置き換え、ASGI アプリを
+ネットワークを介さずに直接呼び出して、1リクエストあたりの CPU 時間を比較する。
+
+* legacy: レスポンスモデルを組み立て、response_model で再検証してから JSON に変換する
+* fast: 検証済みのエンティティから辞書を組み立て、そのまま JSON に変換する
+
+レスポンスの変換だけにかかる時間と、広告文1件あたりのメモリ使用量も表示する。
+
+    uv run python -m benchmarks.bench_serialization
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+
+from app.dependencies import get_generate_ad_copy_usecase
+from app.domain.entities import AdCopy, AdCopyEvaluation, AdInput
+from app.infrastructure.api.models import (
+    AdCopyGenerationRequest,
+    AdCopyGenerationResponse,
+)
+from app.infrastructure.api.responses import (
+    JSON_BACKEND,
+    FastJSONResponse,
+    ad_copies_to_dicts,
+)
+from app.infrastructure.api.routes import _to_ad_input, _to_generated_copies, router
+
+
+@dataclass(frozen=True)
+class LegacyAdCopy:
+    """__slots__ を使用しない、変更前の広告文エンティティ."""
+
+    copy_text: str
+    headline: str
+    call_to_action: str
+    evaluation: AdCopyEvaluation
+
+
+class FixedUseCase:
+    """上流を呼び出さずに固定の広告文を返すユースケース."""
+
+    def __init__(self, ad_copies: List[AdCopy]) -> None:
+        self._ad_copies = ad_copies
+
+    async def execute(self, ad_input: AdInput) -> List[AdCopy]:
+        return self._ad_copies[: ad_input.num_copies]
+
+
+def build_app(usecase: FixedUseCase) -> FastAPI:
+    """変更前の処理を /legacy に、現在の処理を /generate-ad-copy に持つアプリを組み立てる."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_generate_ad_copy_usecase] = lambda: usecase
+
+    @app.post("/legacy", response_model=AdCopyGenerationResponse)
+    async def legacy_generate_ad_copy(
+        request: AdCopyGenerationRequest,
+        usecase: FixedUseCase = Depends(get_generate_ad_copy_usecase),
+    ) -> AdCopyGenerationResponse:
+        ad_copies = await usecase.execute(_to_ad_input(request))
+        return AdCopyGenerationResponse(generated_copies=_to_generated_copies(ad_copies))
+
+    return app
+
+
+def make_caller(app: FastAPI, path: str, body: bytes) -> Callable[[], Awaitable[bytes]]:
+    """ASGI アプリに1リクエストを送り、レスポンスボディを返す関数を作る."""
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def call() -> bytes:
+        chunks: List[bytes] = []
+        received = False
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal received
+            if received:
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and message["status"] != 200:
+                raise RuntimeError(f"{path}: status {message['status']}")
+            if message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await app(dict(scope), receive, send)
+        return b"".join(chunks)
+
+    return call
+
+
+def measure_async(call: Callable[[], Awaitable[Any]], seconds: float) -> float:
+    """一定時間呼び出しを繰り返し、1回あたりの CPU 時間（マイクロ秒）を返す."""
+
+    async def run() -> float:
+        for _ in range(100):
+            await call()
+        count = 0
+        started = time.process_time()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for _ in range(100):
+                await call()
+            count += 100
+        return (time.process_time() - started) / count * 1_000_000
+
+    return asyncio.run(run())
+
+
+def measure(operation: Callable[[], Any], seconds: float) -> float:
+    """一定時間操作を繰り返し、1回あたりの CPU 時間（マイクロ秒）を返す."""
+    count = 0
+    started = time.process_time()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            operation()
+        count += 100
+    return (time.process_time() - started) / count * 1_000_000
+
+
+def instance_size(instance: Any) -> int:
+    """インスタンスとインスタンス辞書のバイト数を返す（属性の値は含めない）."""
+    size = sys.getsizeof(instance)
+    if hasattr(instance, "__dict__"):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="1計測あたりの秒数")
+    parser.add_argument("--num-copies", type=int, default=5, help="1リクエストあたりの広告文の数")
+    args = parser.parse_args()
+
+    ad_copies = [
+        AdCopy(
+            copy_text=f"毎日の健康管理を、もっとスマートに。バッテリー5日間のWatch X（{i}）",
+            headline="Watch X 新登場",
+            call_to_action="今すぐ予約！",
+            evaluation=AdCopyEvaluation(
+                relevance_score=0.9,
+                creativity_score=0.75,
+                target_audience_appeal="忙しいビジネスパーソンに響く",
+            ),
+        )
+        for i in range(args.num_copies)
+    ]
+    app = build_app(FixedUseCase(ad_copies))
+    body = json.dumps(
+        {
+            "productName": "最新型スマートウォッチ 'Watch X'",
+            "targetAudience": "健康志向の20代〜40代のビジネスパーソン",
+            "appealPoints": ["バッテリー持続時間5日間", "心拍数・睡眠トラッキング機能"],
+            "numCopies": args.num_copies,
+        }
+    ).encode()
+    legacy_call = make_caller(app, "/legacy", body)
+    fast_call = make_caller(app, "/generate-ad-copy", body)
+    if json.loads(asyncio.run(legacy_call())) != json.loads(asyncio.run(fast_call())):
+        raise RuntimeError("legacy と fast のレスポンスが一致しません")
+
+    def legacy_response() -> bytes:
+        # FastAPI は返されたモデルを辞書に変換し、response_model で検証し直してから JSON に変換する
+        model = AdCopyGenerationResponse(generated_copies=_to_generated_copies(ad_copies))
+        content = AdCopyGenerationResponse.model_validate(model.model_dump(by_alias=True))
+        return JSONResponse(content.model_dump(by_alias=True, mode="json")).body
+
+    def fast_response() -> bytes:
+        return FastJSONResponse({"generatedCopies": ad_copies_to_dicts(ad_copies)}).body
+
+    print(f"json backend: {JSON_BACKEND}, {args.num_copies} copies/request")
+    print(f"{'implementation':<14} {'request':>12} {'response build':>16}")
+    rows = [
+        ("legacy", legacy_call, legacy_response),
+        ("fast", fast_call, fast_response),
+    ]
+    for name, call, build in rows:
+        request_us = measure_async(call, args.seconds)
+        build_us = measure(build, args.seconds)
+        print(f"{name:<14} {request_us:>9.1f} us {build_us:>13.1f} us")
+
+    evaluation = ad_copies[0].evaluation
+    legacy_copy = LegacyAdCopy(copy_text="x", headline="x", call_to_action="x", evaluation=evaluation)
+    print(
+        f"AdCopy instance: {instance_size(legacy_copy)} bytes without __slots__, "
+        f"{instance_size(ad_copies[0])} bytes with __slots__"
+    )
+
+
+if __name__ == "__main__":
+    main()
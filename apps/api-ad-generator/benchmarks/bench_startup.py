@@ -0,0 +1,219 @@
+"""アプリケーションのコールドスタートの時間を計測するベンチマーク.
+
+新しいプロセスごとに次の2つを計測し、中央値が予算を超えた場合は終了コード1で終了する。
+
+- import: `python -X importtime -c "import app.main"` で計測した app.main の読み込み時間
+- firstResponse: プロセスの起動から、lifespan の起動処理を経て `GET /` の応答を
+  受け取るまでの時間（インタープリタの起動を含む）
+
+また、起動時に読み込まないようにしている重い依存（anthropic など）が
+app.main の読み込みで読み込まれていないことも確認する。
+
+    uv run python -m benchmarks.bench_startup
+    uv run python -m benchmarks.bench_startup --runs 10 --import-budget-ms 800
+    uv run python -m benchmarks.bench_startup --warm-up   # 起動時のウォームアップを有効にする
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# アプリケーションのルートディレクトリ（子プロセスの作業ディレクトリ）
+_APP_DIR = Path(__file__).resolve().parent.parent
+
+# 最初に使用するまで読み込まない重い依存
+LAZY_MODULES = ("anthropic",)
+
+_CHECK_LAZY_MODULES = (
+    "import sys, json, app.main; "
+    "print(json.dumps([name for name in {names!r} if name in sys.modules "
+    "and type(sys.modules[name]).__name__ != '_LazyModule']))"
+)
+
+
+def _env(warm_up: bool, data_dir: str) -> Dict[str, str]:
+    """子プロセスの環境変数を作成する（SQLite のファイルは一時ディレクトリに作成する）."""
+    return {
+        **os.environ,
+        "ANTHROPIC_API_KEY": "bench",
+        "CLAUDE_WARM_UP_ON_STARTUP": "true" if warm_up else "false",
+        "JOB_QUEUE_PATH": str(Path(data_dir) / "generation_jobs.sqlite3"),
+        "BATCH_JOB_STORE_PATH": str(Path(data_dir) / "batch_jobs.sqlite3"),
+    }
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    """-X importtime の出力から app.main の読み込み時間（ミリ秒）を取得する."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=_APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(completed.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "app.main":
+            return int(fields[1]) / 1000
+    raise RuntimeError("importtime の出力に app.main がありません")
+
+
+def measure_first_response(env: Dict[str, str]) -> float:
+    """プロセスの起動から最初の応答を受け取るまでの時間（ミリ秒）を計測する."""
+    started = time.time()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--first-response"],
+        cwd=_APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    responded = float(completed.stdout.strip().splitlines()[-1])
+    return (responded - started) * 1000
+
+
+def eager_modules(env: Dict[str, str]) -> List[str]:
+    """app.main の読み込みで読み込まれてしまった重い依存を返す."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHECK_LAZY_MODULES.format(names=LAZY_MODULES)],
+        cwd=_APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def first_response() -> None:
+    """app.main を読み込み、起動処理の後に GET / を呼び出して応答を受け取った時刻を出力する.
+
+    計測から子プロセスとして起動される。HTTP クライアントの読み込みを計測に含めないよう、
+    ASGI アプリケーションを直接呼び出す。
+    """
+    from app.main import app
+
+    async def call() -> float:
+        messages: List[Dict[str, Any]] = []
+
+        async def receive() -> Dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: Dict[str, Any]) -> None:
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/",
+            "raw_path": b"/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", 80),
+        }
+        async with app.router.lifespan_context(app):
+            await app(scope, receive, send)
+            responded = time.time()
+        status = messages[0]["status"]
+        if status != 200:
+            raise RuntimeError(f"GET / が {status} を返しました")
+        return responded
+
+    print(asyncio.run(call()))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """新しいプロセスでの読み込み時間と最初の応答までの時間を計測する."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = _env(args.warm_up, data_dir)
+        # 1回目はバイトコードのコンパイルを含むため計測しない
+        measure_import(env)
+        imports = [measure_import(env) for _ in range(args.runs)]
+        first_responses = [measure_first_response(env) for _ in range(args.runs)]
+        eager = eager_modules(env)
+
+    return {
+        "config": {"runs": args.runs, "warmUp": args.warm_up},
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "importMs": _summarize(imports),
+        "firstResponseMs": _summarize(first_responses),
+        "eagerModules": eager,
+    }
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "median": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def check(summary: Dict[str, Any], import_budget_ms: float, first_response_budget_ms: float) -> List[str]:
+    """予算を超えた項目と、起動時に読み込まれた重い依存を返す."""
+    violations: List[str] = []
+    if summary["importMs"]["median"] > import_budget_ms:
+        violations.append(f"import: {summary['importMs']['median']}ms > {import_budget_ms}ms")
+    if summary["firstResponseMs"]["median"] > first_response_budget_ms:
+        violations.append(
+            f"first response: {summary['firstResponseMs']['median']}ms > {first_response_budget_ms}ms"
+        )
+    for name in summary["eagerModules"]:
+        violations.append(f"{name} is imported by app.main")
+    return violations
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="計測するプロセスの数")
+    parser.add_argument("--warm-up", action="store_true", help="起動時のウォームアップを有効にする")
+    parser.add_argument(
+        "--import-budget-ms", type=float, default=1000.0, help="app.main の読み込み時間の予算"
+    )
+    parser.add_argument(
+        "--first-response-budget-ms",
+        type=float,
+        default=2000.0,
+        help="プロセスの起動から最初の応答までの時間の予算",
+    )
+    parser.add_argument("--output", type=Path, help="結果の JSON を書き出すパス")
+    parser.add_argument("--first-response", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.first_response:
+        first_response()
+        return
+
+    summary = run(args)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    violations = check(summary, args.import_budget_ms, args.first_response_budget_ms)
+    for violation in violations:
+        print(f"REGRESSION {violation}", file=sys.stderr)
+    if violations:
+        sys.exit(1)
+    print("予算内で起動しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""トレースの記録のオーバーヘッドを計測するマイクロベンチマーク.
+
+トレースが無効な場合と、メモリに記録する場合のスパン1件あたりの時間を比較する。
+
+    uv run python -m benchmarks.bench_tracing
+"""
+
+import argparse
+
+from app.infrastructure.tracing import (
+    InMemorySpanExporter,
+    RecordingTracer,
+    configure_tracing,
+    start_span,
+)
+from benchmarks.bench_metrics import measure
+
+
+def span() -> None:
+    """属性を1つ設定したスパンを1件記録する."""
+    with start_span("bench") as current:
+        current.set_attribute("ad.num_copies", 5)
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=0.5, help="1計測あたりの秒数")
+    args = parser.parse_args()
+
+    configure_tracing(None)
+    print(f"{'disabled':<10} {measure(span, args.seconds):>9.0f} ns/span")
+
+    exporter = InMemorySpanExporter()
+    configure_tracing(RecordingTracer(exporter))
+    try:
+        print(f"{'recording':<10} {measure(span, args.seconds):>9.0f} ns/span")
+    finally:
+        configure_tracing(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""テスト全体で共有するフィクスチャとヘルパー."""
+
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from app.dependencies import get_settings
+from app.domain.entities import AdInput
+
+# 設定で指定するデータファイルの環境変数と、一時ディレクトリに作成するファイル名
+_DATA_FILES = {
+    "JOB_QUEUE_PATH": "generation_jobs.sqlite3",
+    "BATCH_JOB_STORE_PATH": "batch_jobs.sqlite3",
+    "CACHE_SQLITE_PATH": "ad_copy_cache.sqlite3",
+    "IDEMPOTENCY_SQLITE_PATH": "idempotency.sqlite3",
+    "RATE_LIMIT_SQLITE_PATH": "rate_limit.sqlite3",
+    "TRACING_FILE_PATH": "traces.jsonl",
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_files(tmp_path, monkeypatch) -> Iterator[None]:
+    """アプリケーションのデータファイルを、作業ディレクトリではなくテストごとの一時ディレクトリに作成する."""
+    for name, filename in _DATA_FILES.items():
+        monkeypatch.setenv(name, str(tmp_path / filename))
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+class FakeClock:
+    """手動で進める時計."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_ad_input(product_name: str = "Test Product", **overrides: Any) -> AdInput:
+    """テスト用の広告文生成の入力を作成する（指定しない項目は共通の値を使用する）."""
+    values: Dict[str, Any] = {
+        "product_name": product_name,
+        "target_audience": "20代女性",
+        "appeal_points": ["ポイント1"],
+        "num_copies": 1,
+    }
+    values.update(overrides)
+    return AdInput(**values)
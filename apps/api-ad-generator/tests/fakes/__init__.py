@@ -0,0 +1 @@
+"""テスト用のフェイク実装."""
@@ -0,0 +1,423 @@
+"""ローカルで動作する Claude Messages API のフェイクサーバー."""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+# テキストの出力で JSON の前に置く文章
+_PREFACE = "以下が広告文です。\n"
+
+
+def build_ad_copies(num_copies: int) -> List[Dict[str, Any]]:
+    """フェイクの広告文の要素を生成する."""
+    return [
+        {
+            "copyText": f"フェイク広告文{i + 1}",
+            "headline": f"ヘッドライン{i + 1}",
+            "callToAction": "今すぐチェック！",
+            "evaluation": {
+                "relevanceScore": 0.9,
+                "creativityScore": 0.8,
+                "targetAudienceAppeal": "響きやすい",
+            },
+        }
+        for i in range(num_copies)
+    ]
+
+
+def build_ad_copies_text(num_copies: int) -> str:
+    """フェイクの広告文 JSON テキストを生成する."""
+    return _PREFACE + json.dumps({"adCopies": build_ad_copies(num_copies)}, ensure_ascii=False)
+
+
+def build_message(
+    text: str,
+    model: str = "claude-3-5-sonnet-20241022",
+    usage: Optional[Dict[str, int]] = None,
+    stop_reason: str = "end_turn",
+) -> Dict[str, Any]:
+    """Messages API のレスポンスボディを生成する."""
+    return {
+        "id": "msg_fake",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": usage or {"input_tokens": 100, "output_tokens": 200},
+    }
+
+
+# プロンプトから生成数を読み取るパターン
+_NUM_COPIES_PATTERN = re.compile(r"広告文を(\d+)つ")
+
+# HTTP ステータスコードごとの Claude API のエラー種類
+_ERROR_TYPES = {
+    429: "rate_limit_error",
+    500: "api_error",
+    529: "overloaded_error",
+}
+
+
+@dataclass
+class Fault:
+    """フェイクサーバーに注入する障害."""
+
+    status: Optional[int] = None
+    retry_after: Optional[float] = None
+    latency: Optional[float] = None
+
+
+class FakeClaudeServer:
+    """固定レイテンシで応答し、同時実行数を記録するフェイクサーバー.
+
+    inject_fault で注入した障害は、到着したリクエストに順に適用される。
+    負荷試験では latency_sampler でレイテンシの分布を、error_rate で
+    ランダムに発生させるエラーの割合を指定できる。
+    output_tokens_per_copy を指定すると、プロンプトで指定された数の広告文を返し、
+    max_tokens に収まらない場合は広告文の途中で打ち切って stop_reason を max_tokens とする。
+    ツールが指定されたリクエストには、広告文をツールの呼び出しの入力として返す。
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.1,
+        num_copies: int = 1,
+        stream_chunk_size: int = 20,
+        stream_chunk_delay: float = 0.0,
+        latency_sampler: Optional[Callable[[], float]] = None,
+        error_rate: float = 0.0,
+        error_status: int = 529,
+        seed: Optional[int] = None,
+        output_tokens_per_copy: Optional[int] = None,
+    ) -> None:
+        """フェイクサーバーを初期化する.
+
+        Args:
+            latency: 応答までの秒数（latency_sampler 指定時は使用しない）
+            num_copies: 応答に含める広告文の数
+            stream_chunk_size: ストリーミングで1イベントに含める文字数
+            stream_chunk_delay: ストリーミングのイベント間の秒数
+            latency_sampler: 応答までの秒数をリクエストごとに返す関数
+            error_rate: ランダムにエラーを返すリクエストの割合
+            error_status: ランダムに返すエラーの HTTP ステータスコード
+            seed: エラーの発生に使用する乱数のシード
+            output_tokens_per_copy: 広告文1件あたりの出力トークン数（None の場合は打ち切らない）
+        """
+        self.latency = latency
+        self.num_copies = num_copies
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_chunk_delay = stream_chunk_delay
+        self.latency_sampler = latency_sampler
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self.output_tokens_per_copy = output_tokens_per_copy
+        self.request_count = 0
+        # 到着したリクエストで指定されたモデル名
+        self.models: List[str] = []
+        # 到着したリクエストで指定された max_tokens
+        self.max_tokens: List[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.batches: Dict[str, List[Dict[str, Any]]] = {}
+        self.faults: Deque[Fault] = deque()
+        self._cached_prompts: Set[str] = set()
+        self.app = FastAPI()
+        self.app.post("/v1/messages")(self._create_message)
+        self.app.post("/v1/messages/batches")(self._create_batch)
+        self.app.get("/v1/messages/batches/{batch_id}")(self._retrieve_batch)
+        self.app.get("/v1/messages/batches/{batch_id}/results")(self._batch_results)
+
+    def inject_fault(
+        self,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        latency: Optional[float] = None,
+        count: int = 1,
+    ) -> None:
+        """次の count 件のリクエストに障害を注入する.
+
+        Args:
+            status: 返すエラーの HTTP ステータスコード（None の場合は正常に応答する）
+            retry_after: retry-after ヘッダーの秒数
+            latency: 通常のレイテンシの代わりに待つ秒数
+            count: 障害を適用するリクエスト数
+        """
+        for _ in range(count):
+            self.faults.append(Fault(status=status, retry_after=retry_after, latency=latency))
+
+    async def _create_message(self, request: Request) -> Any:
+        body = await request.json()
+        self.models.append(body["model"])
+        self.max_tokens.append(body["max_tokens"])
+        fault = self._next_fault()
+        if fault.status is not None:
+            self.request_count += 1
+            await asyncio.sleep(self._latency(fault))
+            return self._error_response(fault)
+        if body.get("stream"):
+            return StreamingResponse(
+                self._stream_events(body), media_type="text/event-stream"
+            )
+
+        self.request_count += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._latency(fault))
+        finally:
+            self.in_flight -= 1
+        return self._response_message(body, usage=self._usage(body))
+
+    def _response_message(
+        self, body: Dict[str, Any], usage: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """リクエストに対する Messages API のレスポンスボディを返す."""
+        text, stop_reason, output_tokens, tool_input = self._render(body)
+        if usage is not None:
+            usage["output_tokens"] = output_tokens
+        message = build_message(text, model=body["model"], usage=usage, stop_reason=stop_reason)
+        if body.get("tools"):
+            message["content"] = [self._tool_use_block(body, tool_input)]
+        return message
+
+    def _render(self, body: Dict[str, Any]) -> Tuple[str, str, int, Dict[str, Any]]:
+        """応答のテキスト・stop_reason・出力トークン数・ツールの入力を返す.
+
+        ツールが指定された場合のテキストは、ツールの入力の JSON とする。
+        """
+        use_tool = bool(body.get("tools"))
+        if self.output_tokens_per_copy is None:
+            num_copies = self.num_copies
+        else:
+            num_copies = self._requested_copies(body)
+        ad_copies = build_ad_copies(num_copies)
+        text = json.dumps({"adCopies": ad_copies}, ensure_ascii=False)
+        if not use_tool:
+            text = _PREFACE + text
+        stop_reason = "tool_use" if use_tool else "end_turn"
+        if self.output_tokens_per_copy is None:
+            return text, stop_reason, 200, {"adCopies": ad_copies}
+        fit = body["max_tokens"] // self.output_tokens_per_copy
+        if fit >= num_copies:
+            return text, stop_reason, num_copies * self.output_tokens_per_copy, {"adCopies": ad_copies}
+        # 収まらない最初の広告文の途中で打ち切る
+        cut = [match.start() for match in re.finditer('"copyText"', text)][fit] + 15
+        partial = {"copyText": ad_copies[fit]["copyText"][:3]}
+        return text[:cut], "max_tokens", body["max_tokens"], {"adCopies": ad_copies[:fit] + [partial]}
+
+    @staticmethod
+    def _tool_use_block(body: Dict[str, Any], tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        """指定されたツールの呼び出しのコンテンツブロックを返す."""
+        return {
+            "type": "tool_use",
+            "id": "toolu_fake",
+            "name": body["tools"][0]["name"],
+            "input": tool_input,
+        }
+
+    def _requested_copies(self, body: Dict[str, Any]) -> int:
+        """プロンプトで指定された生成数を返す（読み取れない場合は num_copies）."""
+        content = body["messages"][-1]["content"]
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content)
+        match = _NUM_COPIES_PATTERN.search(content)
+        return int(match.group(1)) if match else self.num_copies
+
+    def _next_fault(self) -> Fault:
+        """注入された障害、または error_rate に従ったランダムな障害を返す."""
+        if self.faults:
+            return self.faults.popleft()
+        if self.error_rate > 0.0 and self._rng.random() < self.error_rate:
+            return Fault(status=self.error_status)
+        return Fault()
+
+    def _latency(self, fault: Optional[Fault] = None) -> float:
+        """このリクエストで応答までに待つ秒数を返す."""
+        if fault is not None and fault.latency is not None:
+            return fault.latency
+        if self.latency_sampler is not None:
+            return self.latency_sampler()
+        return self.latency
+
+    def _usage(self, body: Dict[str, Any]) -> Dict[str, int]:
+        """プロンプトキャッシュを模した使用量を返す.
+
+        cache_control を指定したシステムプロンプトのブロックは、初回は書き込み、
+        2回目以降は読み込みとして1文字1トークンで数える。
+        """
+        usage = {
+            "input_tokens": 100,
+            "output_tokens": 200,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+        system = body.get("system")
+        if isinstance(system, list):
+            for block in system:
+                if not block.get("cache_control"):
+                    continue
+                if block["text"] in self._cached_prompts:
+                    usage["cache_read_input_tokens"] += len(block["text"])
+                else:
+                    self._cached_prompts.add(block["text"])
+                    usage["cache_creation_input_tokens"] += len(block["text"])
+        return usage
+
+    @staticmethod
+    def _error_response(fault: Fault) -> Response:
+        """Claude API と同じ形式のエラーレスポンスを返す."""
+        error_type = _ERROR_TYPES.get(fault.status, "invalid_request_error")
+        body = {"type": "error", "error": {"type": error_type, "message": "injected fault"}}
+        headers = {}
+        if fault.retry_after is not None:
+            headers["retry-after"] = str(fault.retry_after)
+        return Response(
+            json.dumps(body),
+            status_code=fault.status,
+            headers=headers,
+            media_type="application/json",
+        )
+
+    async def _stream_events(self, body: Dict[str, Any]) -> AsyncIterator[str]:
+        """Messages API のストリーミング形式でテキストを分割して返す."""
+        self.request_count += 1
+        message = build_message("", model=body["model"], usage=self._usage(body))
+        message["content"] = []
+        message["stop_reason"] = None
+        text, stop_reason, output_tokens, _ = self._render(body)
+        if body.get("tools"):
+            content_block = self._tool_use_block(body, {})
+            delta_type, delta_key = "input_json_delta", "partial_json"
+        else:
+            content_block = {"type": "text", "text": ""}
+            delta_type, delta_key = "text_delta", "text"
+
+        def event(name: str, data: Dict[str, Any]) -> str:
+            return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        await asyncio.sleep(self._latency())
+        yield event("message_start", {"type": "message_start", "message": message})
+        yield event(
+            "content_block_start",
+            {"type": "content_block_start", "index": 0, "content_block": content_block},
+        )
+        for start in range(0, len(text), self.stream_chunk_size):
+            chunk = text[start:start + self.stream_chunk_size]
+            yield event(
+                "content_block_delta",
+                {"type": "content_block_delta", "index": 0, "delta": {"type": delta_type, delta_key: chunk}},
+            )
+            await asyncio.sleep(self.stream_chunk_delay)
+        yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield event(
+            "message_delta",
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                "usage": {"output_tokens": output_tokens},
+            },
+        )
+        yield event("message_stop", {"type": "message_stop"})
+
+    async def _create_batch(self, request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        batch_id = f"msgbatch_{len(self.batches)}"
+        self.batches[batch_id] = body["requests"]
+        return self._batch(batch_id, str(request.base_url))
+
+    async def _retrieve_batch(self, batch_id: str, request: Request) -> Dict[str, Any]:
+        return self._batch(batch_id, str(request.base_url))
+
+    async def _batch_results(self, batch_id: str) -> Response:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": item["custom_id"],
+                    "result": {
+                        "type": "succeeded",
+                        "message": self._response_message(item["params"]),
+                    },
+                },
+                ensure_ascii=False,
+            )
+            for item in self.batches[batch_id]
+        ]
+        return Response("\n".join(lines), media_type="application/binary")
+
+    def _batch(self, batch_id: str, base_url: str) -> Dict[str, Any]:
+        """バッチは登録直後に処理済みとして返す."""
+        now = "2024-01-01T00:00:00Z"
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended",
+            "request_counts": {
+                "processing": 0,
+                "succeeded": len(self.batches[batch_id]),
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": now,
+            "ended_at": now,
+            "expires_at": now,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{base_url}v1/messages/batches/{batch_id}/results",
+        }
+
+    def handle_sync(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """同期クライアント用にスレッド上でリクエストを処理する."""
+        with self._lock:
+            self.request_count += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self._latency())
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return build_message(build_ad_copies_text(self.num_copies), model=body["model"])
+
+
+@contextmanager
+def serve_in_thread(app: Any) -> Iterator[str]:
+    """ASGI アプリを別スレッドの uvicorn で起動し、ベース URL を返す."""
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
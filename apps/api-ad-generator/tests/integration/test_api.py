@@ -4,8 +4,11 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
+from app.dependencies import get_idempotency_coordinator
 from app.main import app
 from app.domain.entities import AdCopy
+from app.infrastructure.admission import AdmissionController
+from app.infrastructure.idempotency import IdempotencyCoordinator, InMemoryIdempotencyStore
 
 
 client = TestClient(app)
@@ -86,4 +89,195 @@ def test_health_check() -> None:
     """ヘルスチェックエンドポイントのテスト."""
     response = client.get("/")
     assert response.status_code == 200
-    assert response.json() == {"message": "AI駆動型広告文生成API は正常に動作しています"}
\ No newline at end of file
+    assert response.json() == {"message": "AI駆動型広告文生成API は正常に動作しています"}
+
+class TestGenerateAdCopyCache:
+    """広告文生成APIのキャッシュのテスト."""
+
+    @patch("app.infrastructure.clients.claude_client.ClaudeAdGenerationRepository.generate_ad_copies")
+    def test_cache_control_no_cache_bypasses_cache(self, mock_generate) -> None:
+        """Cache-Control: no-cache でキャッシュがバイパスされることをテストする."""
+        # Arrange
+        mock_generate.return_value = [AdCopy(copy_text="キャッシュされる広告文")]
+        request_data = {
+            "productName": "Cached Product",
+            "targetAudience": "30代男性",
+            "appealPoints": ["ポイント1"],
+            "numCopies": 1,
+        }
+
+        # Act
+        first = client.post("/generate-ad-copy", json=request_data)
+        second = client.post("/generate-ad-copy", json=request_data)
+        bypassed = client.post(
+            "/generate-ad-copy", json=request_data, headers={"Cache-Control": "no-cache"}
+        )
+
+        # Assert
+        assert first.status_code == second.status_code == bypassed.status_code == 200
+        assert first.json() == second.json()
+        assert mock_generate.call_count == 2
+
+
+class TestGenerateAdCopyIdempotency:
+    """広告文生成APIの冪等キーのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+        app.dependency_overrides[get_idempotency_coordinator] = lambda: self.coordinator
+        self.request_data = {
+            "productName": "Idempotent Product",
+            "targetAudience": "30代男性",
+            "appealPoints": ["ポイント1"],
+            "numCopies": 1,
+        }
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        app.dependency_overrides.clear()
+
+    @patch("app.infrastructure.clients.claude_client.ClaudeAdGenerationRepository.generate_ad_copies")
+    def test_retry_replays_stored_response(self, mock_generate) -> None:
+        """同じ冪等キーの再送が再生成せずに最初の結果を返すことをテストする."""
+        # Arrange
+        mock_generate.side_effect = [
+            [AdCopy(copy_text="最初の広告文")],
+            [AdCopy(copy_text="再生成された広告文")],
+        ]
+        # キャッシュを使わない場合も再生成されないことを確認する
+        headers = {"Idempotency-Key": "retry-1", "Cache-Control": "no-cache"}
+
+        # Act
+        first = client.post("/generate-ad-copy", json=self.request_data, headers=headers)
+        retried = client.post("/generate-ad-copy", json=self.request_data, headers=headers)
+
+        # Assert
+        assert first.status_code == retried.status_code == 200
+        assert retried.json() == first.json()
+        assert "Idempotent-Replayed" not in first.headers
+        assert retried.headers["Idempotent-Replayed"] == "true"
+        assert mock_generate.call_count == 1
+
+    @patch("app.infrastructure.clients.claude_client.ClaudeAdGenerationRepository.generate_ad_copies")
+    def test_mismatched_body_returns_422(self, mock_generate) -> None:
+        """同じ冪等キーで内容の異なるリクエストに422エラーが返されることをテストする."""
+        # Arrange
+        mock_generate.return_value = [AdCopy(copy_text="広告文")]
+        headers = {"Idempotency-Key": "retry-2"}
+        client.post("/generate-ad-copy", json=self.request_data, headers=headers)
+
+        # Act
+        response = client.post(
+            "/generate-ad-copy", json={**self.request_data, "numCopies": 2}, headers=headers
+        )
+
+        # Assert
+        assert response.status_code == 422
+        assert response.json()["detail"]["code"] == "IDEMPOTENCY_KEY_MISMATCH"
+
+    def test_too_long_key_returns_400(self) -> None:
+        """長すぎる冪等キーで400エラーが返されることをテストする."""
+        # Act
+        response = client.post(
+            "/generate-ad-copy", json=self.request_data, headers={"Idempotency-Key": "k" * 256}
+        )
+
+        # Assert
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "BAD_REQUEST"
+
+
+class TestGenerateAdCopyAdmission:
+    """広告文生成APIの受付制御のテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        # 1件あたり5秒（期限で頭打ち）かかっていると推定し、上流の枠が埋まっている状態にする
+        self.now = 0.0
+        self.controller = AdmissionController(capacity=1, deadline=5.0, clock=lambda: self.now)
+        ticket = self.controller.admit()
+        self.now = 10.0
+        self.controller.release(ticket, completed=True)
+        self.controller.admit()
+        app.state.admission_controller = self.controller
+        self.request_data = {
+            "productName": "Admission Product",
+            "targetAudience": "30代男性",
+            "appealPoints": ["ポイント1"],
+            "numCopies": 1,
+        }
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        app.state.admission_controller = None
+
+    @patch("app.infrastructure.clients.claude_client.ClaudeAdGenerationRepository.generate_ad_copies")
+    def test_overloaded_request_is_rejected_before_generation(self, mock_generate) -> None:
+        """期限内に応答できない見込みのリクエストが生成せずに503で拒否されることをテストする."""
+        # Act
+        response = client.post("/generate-ad-copy", json=self.request_data)
+
+        # Assert
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert response.json()["detail"]["code"] == "SERVICE_UNAVAILABLE"
+        assert mock_generate.call_count == 0
+
+    @patch("app.infrastructure.clients.claude_client.ClaudeAdGenerationRepository.generate_ad_copies")
+    def test_client_deadline_is_used(self, mock_generate) -> None:
+        """X-Request-Timeout で指定した期限で受け付けることをテストする."""
+        # Arrange
+        mock_generate.return_value = [AdCopy(copy_text="広告文")]
+
+        # Act
+        response = client.post(
+            "/generate-ad-copy",
+            json=self.request_data,
+            headers={"X-Request-Timeout": "30", "Cache-Control": "no-cache"},
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert self.controller.stats.admitted == 3
+        assert self.controller.in_flight == 1
+
+
+class TestGenerateAdCopyBatchAPI:
+    """広告文一括生成APIの統合テスト."""
+
+    @patch("app.infrastructure.clients.claude_client.ClaudeAdGenerationRepository.generate_ad_copies")
+    def test_failed_items_do_not_fail_batch(self, mock_generate) -> None:
+        """失敗した項目がバッチ全体を失敗させないことをテストする."""
+        # Arrange
+        async def generate(ad_input):
+            if ad_input.product_name == "Failing Product":
+                raise Exception("API Error")
+            return [AdCopy(copy_text=f"{ad_input.product_name}の広告文")]
+
+        mock_generate.side_effect = generate
+        items = [
+            {"productName": "Batch Product 1", "targetAudience": "20代女性", "appealPoints": ["ポイント1"]},
+            {"productName": "", "targetAudience": "20代女性", "appealPoints": ["ポイント1"]},
+            {"productName": "Failing Product", "targetAudience": "20代女性", "appealPoints": ["ポイント1"]},
+            {"productName": "Batch Product 2", "targetAudience": "20代女性", "appealPoints": ["ポイント1"]},
+        ]
+
+        # Act
+        response = client.post("/generate-ad-copy/batch", json={"items": items})
+
+        # Assert
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["index"] for result in results] == [0, 1, 2, 3]
+        assert results[0]["generatedCopies"][0]["copyText"] == "Batch Product 1の広告文"
+        assert results[1]["error"]["code"] == "BAD_REQUEST"
+        assert results[2]["error"]["code"] == "INTERNAL_SERVER_ERROR"
+        assert results[2]["generatedCopies"] is None
+        assert results[3]["generatedCopies"][0]["copyText"] == "Batch Product 2の広告文"
+
+    def test_empty_batch_returns_422(self) -> None:
+        """空のバッチで422エラーが返されることをテストする."""
+        response = client.post("/generate-ad-copy/batch", json={"items": []})
+
+        assert response.status_code == 422
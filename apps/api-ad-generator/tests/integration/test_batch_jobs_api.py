@@ -0,0 +1,110 @@
+"""非同期一括生成ジョブ API の統合テスト."""
+
+import time
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_batch_job_repository
+from app.infrastructure.batch import (
+    AnthropicMessageBatchBackend,
+    LocalMessageBatchBackend,
+    MessageBatchBackend,
+    SQLiteBatchJobStore,
+)
+from app.infrastructure.clients import (
+    ClaudeAdGenerationRepository,
+    ClaudeBatchJobRepository,
+)
+from app.main import app
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+ITEMS = [
+    {"productName": "Product A", "targetAudience": "20代女性", "appealPoints": ["ポイント1"], "numCopies": 2},
+    {"productName": "Product B", "targetAudience": "30代男性", "appealPoints": ["ポイント2"], "numCopies": 2},
+]
+
+
+def _fake_client(server: FakeClaudeServer) -> anthropic.AsyncAnthropic:
+    return anthropic.AsyncAnthropic(
+        api_key="test_api_key",
+        base_url="http://fake-claude",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+    )
+
+
+@pytest.fixture(params=["local", "anthropic"])
+def backend_factory(request):
+    """ローカル実装と Message Batches API 実装の両方でテストする."""
+    def factory(server: FakeClaudeServer) -> MessageBatchBackend:
+        if request.param == "local":
+            return LocalMessageBatchBackend(client=_fake_client(server))
+        return AnthropicMessageBatchBackend(client=_fake_client(server))
+
+    return factory
+
+
+class TestBatchJobsAPI:
+    """非同期一括生成ジョブAPIの統合テスト."""
+
+    def test_submit_poll_and_fetch_results(self, backend_factory, tmp_path) -> None:
+        """ジョブの登録からポーリング、結果取得までの流れをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.01, num_copies=2)
+        store = SQLiteBatchJobStore(path=str(tmp_path / "jobs.sqlite3"))
+        repository = ClaudeBatchJobRepository(
+            claude_repository=ClaudeAdGenerationRepository(client=_fake_client(server)),
+            backend=backend_factory(server),
+            store=store,
+        )
+        app.dependency_overrides[get_batch_job_repository] = lambda: repository
+
+        try:
+            with TestClient(app) as client:
+                # Act
+                submitted = client.post("/generate-ad-copy/batch-jobs", json={"items": ITEMS})
+                job_id = submitted.json()["jobId"]
+
+                status = submitted.json()["status"]
+                deadline = time.monotonic() + 5.0
+                while status != "ended" and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                    status = client.get(f"/generate-ad-copy/batch-jobs/{job_id}").json()["status"]
+
+                results = client.get(f"/generate-ad-copy/batch-jobs/{job_id}/results")
+        finally:
+            app.dependency_overrides.clear()
+            store.close()
+
+        # Assert
+        assert submitted.status_code == 202
+        assert status == "ended"
+        assert results.status_code == 200
+        body = results.json()["results"]
+        assert [item["index"] for item in body] == [0, 1]
+        assert all(len(item["generatedCopies"]) == 2 for item in body)
+
+    def test_unknown_job_returns_404(self, tmp_path) -> None:
+        """存在しないジョブで404エラーが返されることをテストする."""
+        # Arrange
+        store = SQLiteBatchJobStore(path=str(tmp_path / "jobs.sqlite3"))
+        repository = ClaudeBatchJobRepository(
+            claude_repository=ClaudeAdGenerationRepository(api_key="test_api_key"),
+            backend=LocalMessageBatchBackend(client=anthropic.AsyncAnthropic(api_key="test_api_key")),
+            store=store,
+        )
+        app.dependency_overrides[get_batch_job_repository] = lambda: repository
+
+        # Act
+        try:
+            with TestClient(app) as client:
+                response = client.get("/generate-ad-copy/batch-jobs/unknown")
+        finally:
+            app.dependency_overrides.clear()
+            store.close()
+
+        # Assert
+        assert response.status_code == 404
+        assert response.json()["detail"]["code"] == "NOT_FOUND"
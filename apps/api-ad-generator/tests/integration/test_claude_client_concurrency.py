@@ -0,0 +1,134 @@
+"""Claude クライアントの並行実行に関する負荷テスト."""
+
+import asyncio
+import json
+import time
+from typing import List
+
+import anthropic
+import httpx
+import pytest
+
+from app.domain.entities import AdCopy
+from app.domain.exceptions import AdGenerationError
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+
+def _async_client(server: FakeClaudeServer) -> anthropic.AsyncAnthropic:
+    return anthropic.AsyncAnthropic(
+        api_key="test_api_key",
+        base_url="http://fake-claude",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+    )
+
+
+def _sync_client(server: FakeClaudeServer) -> anthropic.Anthropic:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=server.handle_sync(json.loads(request.content)))
+
+    return anthropic.Anthropic(
+        api_key="test_api_key",
+        base_url="http://fake-claude",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+class TestClaudeClientConcurrency:
+    """フェイクサーバーに対する同時リクエストのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_async_client_requests_overlap(self) -> None:
+        """非同期クライアントで同時リクエストが直列化されないことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.2)
+        repository = ClaudeAdGenerationRepository(
+            client=_async_client(server), max_concurrency=10
+        )
+
+        # Act
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[repository.generate_ad_copies(make_ad_input()) for _ in range(10)]
+        )
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        assert all(len(ad_copies) == 1 for ad_copies in results)
+        assert server.request_count == 10
+        assert server.max_in_flight == 10
+        assert elapsed < 1.0  # 直列実行なら 2.0 秒以上かかる
+
+    @pytest.mark.asyncio
+    async def test_sync_client_is_offloaded_to_threads(self) -> None:
+        """同期クライアントでもイベントループをブロックしないことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.2)
+        repository = ClaudeAdGenerationRepository(
+            client=_sync_client(server), max_concurrency=5
+        )
+
+        # Act
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[repository.generate_ad_copies(make_ad_input()) for _ in range(5)]
+        )
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        assert all(len(ad_copies) == 1 for ad_copies in results)
+        assert server.max_in_flight == 5
+        assert elapsed < 0.8  # 直列実行なら 1.0 秒以上かかる
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_is_respected(self) -> None:
+        """同時リクエスト数が上限を超えないことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.05)
+        repository = ClaudeAdGenerationRepository(
+            client=_async_client(server), max_concurrency=3
+        )
+
+        # Act
+        await asyncio.gather(
+            *[repository.generate_ad_copies(make_ad_input()) for _ in range(9)]
+        )
+
+        # Assert
+        assert server.request_count == 9
+        assert server.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_ad_generation_error(self) -> None:
+        """タイムアウトがAdGenerationErrorに変換されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=1.0)
+        client = _async_client(server).with_options(max_retries=0)
+        repository = ClaudeAdGenerationRepository(client=client, timeout=0.05)
+
+        # Act & Assert
+        with pytest.raises(AdGenerationError, match="Claude APIでエラーが発生しました"):
+            await repository.generate_ad_copies(make_ad_input())
+
+    @pytest.mark.asyncio
+    async def test_paused_stream_releases_concurrency_slot(self) -> None:
+        """ストリーミングの消費を止めている間も、上流の読み出し後は同時リクエストの枠を返すことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        repository = ClaudeAdGenerationRepository(
+            client=_async_client(server), max_concurrency=1
+        )
+        paused = repository.stream_ad_copies(make_ad_input())
+        await anext(paused)
+
+        async def consume() -> List[AdCopy]:
+            return [ad_copy async for ad_copy in repository.stream_ad_copies(make_ad_input())]
+
+        # Act
+        ad_copies = await asyncio.wait_for(consume(), timeout=1.0)
+
+        # Assert
+        assert len(ad_copies) == 1
+        assert server.request_count == 2
+        await paused.aclose()
@@ -0,0 +1,156 @@
+"""共有クライアントプールの統合テスト."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_ad_generation_repository, get_client_pool
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.clients.client_pool import AnthropicClientPool
+from app.main import app
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer, serve_in_thread
+
+
+class TestAnthropicClientPool:
+    """AnthropicClientPoolのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self) -> None:
+        """連続したリクエストで同じコネクションが再利用されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        with serve_in_thread(server.app) as base_url:
+            pool = AnthropicClientPool(api_key="test_api_key", base_url=base_url)
+            repository = ClaudeAdGenerationRepository(client=pool.client)
+
+            # Act
+            for _ in range(5):
+                await repository.generate_ad_copies(make_ad_input())
+            await pool.aclose()
+
+        # Assert
+        assert pool.stats.requests == 5
+        assert pool.stats.connections_opened == 1
+        assert pool.stats.reused_requests == 4
+        assert pool.stats.reuse_ratio == pytest.approx(0.8)
+
+    @pytest.mark.asyncio
+    async def test_sync_client_connections_are_reused(self) -> None:
+        """同期クライアントでもコネクションが再利用されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        with serve_in_thread(server.app) as base_url:
+            pool = AnthropicClientPool(
+                api_key="test_api_key", base_url=base_url, use_sync_client=True
+            )
+            repository = ClaudeAdGenerationRepository(client=pool.client)
+
+            # Act
+            for _ in range(3):
+                await repository.generate_ad_copies(make_ad_input())
+            await pool.aclose()
+
+        # Assert
+        assert pool.stats.requests == 3
+        assert pool.stats.connections_opened == 1
+
+    def test_client_is_created_once(self) -> None:
+        """クライアントが一度だけ生成されることをテストする."""
+        pool = AnthropicClientPool(api_key="test_api_key")
+
+        assert pool.client is pool.client
+
+
+class TestDeferredClient:
+    """クライアントの生成を最初に使用するまで遅らせることのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_created_on_first_use(self) -> None:
+        """リポジトリのクライアントが最初の生成時に一度だけ生成されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        with serve_in_thread(server.app) as base_url:
+            pool = AnthropicClientPool(api_key="test_api_key", base_url=base_url)
+            calls = []
+
+            def client_factory():
+                calls.append(1)
+                return pool.client
+
+            repository = ClaudeAdGenerationRepository(client_factory=client_factory)
+            created_before_use = len(calls)
+
+            # Act
+            for _ in range(2):
+                await repository.generate_ad_copies(make_ad_input())
+            await pool.aclose()
+
+        # Assert
+        assert created_before_use == 0
+        assert len(calls) == 1
+        assert pool.stats.requests == 2
+
+    def test_warm_up_creates_client(self) -> None:
+        """ウォームアップでクライアントが生成されることをテストする."""
+        # Arrange
+        pool = AnthropicClientPool(api_key="test_api_key")
+        repository = ClaudeAdGenerationRepository(client_factory=lambda: pool.client)
+
+        # Act
+        repository.warm_up()
+
+        # Assert
+        assert repository.client is pool.client
+
+    def test_importing_app_does_not_import_anthropic(self) -> None:
+        """app.main の読み込みで anthropic が読み込まれず、設定も読まれないことをテストする."""
+        # Arrange
+        env = {key: value for key, value in os.environ.items() if key != "ANTHROPIC_API_KEY"}
+        code = (
+            "import sys, json, app.main; "
+            "module = sys.modules.get('anthropic'); "
+            "print(json.dumps(module is None or type(module).__name__ == '_LazyModule'))"
+        )
+
+        # Act
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[2],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        # Assert
+        assert json.loads(completed.stdout) is True
+
+
+class TestApplicationLifespan:
+    """アプリケーションのライフサイクルのテスト."""
+
+    def test_lifespan_creates_and_closes_shared_client(self) -> None:
+        """起動時に共有クライアントが生成され、終了時に破棄されることをテストする."""
+        # Act
+        with TestClient(app) as client:
+            assert get_client_pool.cache_info().currsize == 1
+            assert get_ad_generation_repository.cache_info().currsize == 1
+            response = client.get("/stats")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["admission"]["inFlight"] == 0
+        assert set(response.json()["connectionPool"]) == {
+            "requests",
+            "connectionsOpened",
+            "reusedRequests",
+            "reuseRatio",
+        }
+        assert get_client_pool.cache_info().currsize == 0
+        assert get_ad_generation_repository.cache_info().currsize == 0
@@ -0,0 +1,130 @@
+"""バックグラウンド生成ジョブ API の統合テスト."""
+
+import asyncio
+import time
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.usecases import GenerateAdCopyUseCase
+from app.dependencies import get_generation_job_repository, get_settings
+from app.infrastructure.clients import ClaudeAdGenerationRepository
+from app.infrastructure.jobs import (
+    GenerationJobWorkerPool,
+    QueuedGenerationJobRepository,
+    SQLiteJobQueue,
+)
+from app.main import app
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+REQUEST = {
+    "productName": "Product A",
+    "targetAudience": "20代女性",
+    "appealPoints": ["ポイント1"],
+    "numCopies": 2,
+}
+
+
+def _fake_client(server: FakeClaudeServer) -> anthropic.AsyncAnthropic:
+    return anthropic.AsyncAnthropic(
+        api_key="test_api_key",
+        base_url="http://fake-claude",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+    )
+
+
+class TestJobsAPI:
+    """バックグラウンド生成ジョブAPIの統合テスト."""
+
+    @pytest.mark.asyncio
+    async def test_submit_and_poll_until_succeeded(self, tmp_path) -> None:
+        """ジョブの登録から、ワーカーの処理を経て結果を取得するまでの流れをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.01, num_copies=2)
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        pool = GenerationJobWorkerPool(
+            queue,
+            GenerateAdCopyUseCase(ClaudeAdGenerationRepository(client=_fake_client(server))),
+            num_workers=2,
+            poll_interval=0.01,
+        )
+        repository = QueuedGenerationJobRepository(queue, on_submit=pool.notify)
+        app.dependency_overrides[get_generation_job_repository] = lambda: repository
+
+        pool.start()
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                # Act
+                submitted = await client.post("/jobs", json=REQUEST)
+                job_id = submitted.json()["jobId"]
+
+                body = submitted.json()
+                deadline = time.monotonic() + 5.0
+                while body["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+                    await asyncio.sleep(0.02)
+                    body = (await client.get(f"/jobs/{job_id}")).json()
+        finally:
+            await pool.stop()
+            app.dependency_overrides.clear()
+            queue.close()
+
+        # Assert
+        assert submitted.status_code == 202
+        assert submitted.json()["status"] == "queued"
+        assert body["status"] == "succeeded"
+        assert body["attempts"] == 1
+        assert body["finishedAt"] is not None
+        assert len(body["generatedCopies"]) == 2
+        assert body["error"] is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_request_and_unknown_job(self, tmp_path) -> None:
+        """不正な入力で400エラー、存在しないジョブで404エラーが返されることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        app.dependency_overrides[get_generation_job_repository] = (
+            lambda: QueuedGenerationJobRepository(queue)
+        )
+
+        # Act
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                invalid = await client.post("/jobs", json={**REQUEST, "productName": " "})
+                unknown = await client.get("/jobs/unknown")
+            counts = queue.counts()
+        finally:
+            app.dependency_overrides.clear()
+            queue.close()
+
+        # Assert
+        assert invalid.status_code == 400
+        assert invalid.json()["detail"]["code"] == "BAD_REQUEST"
+        assert unknown.status_code == 404
+        assert unknown.json()["detail"]["code"] == "NOT_FOUND"
+        assert sum(counts.values()) == 0
+
+
+class TestJobWorkerLifespan:
+    """ジョブのワーカーのライフサイクルのテスト."""
+
+    def test_shutdown_stops_started_workers(self, monkeypatch) -> None:
+        """起動時に開始したワーカーが終了時に停止されることをテストする."""
+        # Arrange
+        monkeypatch.setenv("JOB_WORKERS", "2")
+        get_settings.cache_clear()
+
+        # Act
+        with TestClient(app):
+            pool = app.state.job_worker_pool
+            running = pool.running
+
+        # Assert
+        assert running is True
+        assert pool.running is False
+        assert app.state.job_worker_pool is None
@@ -0,0 +1,106 @@
+"""max_tokens の見積もりと打ち切られた出力の続きの生成の統合テスト."""
+
+from typing import Any
+
+import anthropic
+import httpx
+import pytest
+
+from app.domain.exceptions import AdGenerationError
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.clients.max_tokens import MaxTokensEstimator
+from app.infrastructure.model_routing import ModelProfile, ModelRouter
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+
+class TestMaxTokens:
+    """生成数に応じた max_tokens と、打ち切られた出力の扱いのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        # 広告文1件あたり300トークンを出力し、max_tokens に収まらない場合は途中で打ち切る
+        self.server = FakeClaudeServer(latency=0.0, output_tokens_per_copy=300)
+        self.client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=self.server.app)),
+        )
+
+    def _repository(self, default_tokens_per_copy: int = 250, **kwargs: Any) -> ClaudeAdGenerationRepository:
+        return ClaudeAdGenerationRepository(
+            client=self.client,
+            max_tokens_estimator=MaxTokensEstimator(default_tokens_per_copy=default_tokens_per_copy),
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_max_tokens_scales_with_num_copies(self) -> None:
+        """生成数に比例した max_tokens でリクエストすることをテストする."""
+        # Arrange
+        repository = self._repository()
+
+        # Act
+        await repository.generate_ad_copies(make_ad_input(num_copies=1))
+        await repository.generate_ad_copies(make_ad_input(num_copies=5))
+
+        # Assert
+        assert self.server.max_tokens == [400, 1600]
+        assert repository.max_tokens_estimator.stats.truncated == 0
+
+    @pytest.mark.asyncio
+    async def test_truncated_output_is_salvaged_and_continued(self) -> None:
+        """打ち切られた出力から閉じている広告文を取り出し、不足分を続けて生成することをテストする."""
+        # Arrange
+        repository = self._repository(default_tokens_per_copy=100)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(make_ad_input(num_copies=5))
+
+        # Assert
+        assert len(ad_copies) == 5
+        assert self.server.max_tokens == [700, 2000]
+        stats = repository.max_tokens_estimator.stats
+        assert (stats.truncated, stats.salvaged_copies, stats.continuations) == (1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_truncated_stream_is_continued(self) -> None:
+        """ストリーミングでも打ち切られた場合に不足分を続けて返すことをテストする."""
+        # Arrange
+        repository = self._repository(default_tokens_per_copy=100)
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in repository.stream_ad_copies(make_ad_input(num_copies=5))]
+
+        # Assert
+        assert len(ad_copies) == 5
+        assert self.server.max_tokens == [700, 2000]
+        assert repository.max_tokens_estimator.stats.continuations == 1
+
+    @pytest.mark.asyncio
+    async def test_salvaged_copies_are_returned_without_continuation(self) -> None:
+        """続きの生成を無効にした場合は取り出せた広告文だけを返すことをテストする."""
+        # Arrange
+        repository = self._repository(default_tokens_per_copy=100, max_continuations=0)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(make_ad_input(num_copies=5))
+
+        # Assert
+        assert len(ad_copies) == 2
+        assert len(self.server.max_tokens) == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_output_without_copies_raises(self) -> None:
+        """広告文を1件も取り出せない場合はエラーになることをテストする."""
+        # Arrange
+        repository = self._repository(
+            model_router=ModelRouter.single(
+                ModelProfile.from_name("claude-3-5-sonnet-20241022", max_tokens=200)
+            ),
+        )
+
+        # Act & Assert
+        with pytest.raises(AdGenerationError):
+            await repository.generate_ad_copies(make_ad_input(num_copies=1))
+        assert self.server.max_tokens == [200, 200, 200]
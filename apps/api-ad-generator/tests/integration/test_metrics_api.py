@@ -0,0 +1,95 @@
+"""メトリクスのエンドポイントの統合テスト."""
+
+import re
+from unittest.mock import AsyncMock
+
+from fastapi.testclient import TestClient
+
+from app.application.usecases import GenerateAdCopyUseCase
+from app.dependencies import get_generate_ad_copy_usecase
+from app.domain.entities import AdCopy
+from app.domain.exceptions import AdGenerationError
+from app.main import app
+
+_REQUEST = {
+    "productName": "Test Product",
+    "targetAudience": "20代女性",
+    "appealPoints": ["ポイント1"],
+}
+
+
+def _sample(text: str, name: str) -> float:
+    """メトリクスのテキストからサンプルの値を取り出す（存在しない場合は0）."""
+    match = re.search(rf"^{re.escape(name)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class TestMetricsAPI:
+    """メトリクスのエンドポイントのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.repository = AsyncMock()
+        app.dependency_overrides[get_generate_ad_copy_usecase] = lambda: GenerateAdCopyUseCase(
+            ad_generation_repository=self.repository
+        )
+        self.client = TestClient(app)
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        app.dependency_overrides.clear()
+
+    def test_requests_and_stages_are_recorded(self) -> None:
+        """リクエスト数と段階ごとの処理時間が記録されることをテストする."""
+        # Arrange
+        self.repository.generate_ad_copies.return_value = [AdCopy(copy_text="広告文")]
+        requests = 'ad_generator_http_requests_total{method="POST",route="/generate-ad-copy",status="200"}'
+        validation = 'ad_generator_stage_duration_seconds_count{stage="validation"}'
+        response_build = 'ad_generator_stage_duration_seconds_count{stage="response_build"}'
+        before = self.client.get("/metrics").text
+
+        # Act
+        response = self.client.post("/generate-ad-copy", json=_REQUEST)
+        after = self.client.get("/metrics").text
+
+        # Assert
+        assert response.status_code == 200
+        assert _sample(after, requests) == _sample(before, requests) + 1
+        assert _sample(after, validation) == _sample(before, validation) + 1
+        assert _sample(after, response_build) == _sample(before, response_build) + 1
+
+    def test_errors_are_counted_by_type(self) -> None:
+        """エラーが例外の種類ごとに数えられることをテストする."""
+        # Arrange
+        self.repository.generate_ad_copies.side_effect = AdGenerationError("生成に失敗しました")
+        errors = 'ad_generator_errors_total{type="AdGenerationError"}'
+        before = self.client.get("/metrics").text
+
+        # Act
+        response = self.client.post("/generate-ad-copy", json=_REQUEST)
+        after = self.client.get("/metrics").text
+
+        # Assert
+        assert response.status_code == 500
+        assert _sample(after, errors) == _sample(before, errors) + 1
+
+    def test_route_label_uses_path_template(self) -> None:
+        """ルートのラベルにパスではなくテンプレートが使われることをテストする."""
+        # Act
+        self.client.get("/generate-ad-copy/batch-jobs/unknown-job")
+        text = self.client.get("/metrics").text
+
+        # Assert
+        assert 'route="/generate-ad-copy/batch-jobs/{job_id}"' in text
+        assert "unknown-job" not in text
+
+    def test_stats_are_exported(self) -> None:
+        """稼働統計が Prometheus 形式で出力されることをテストする."""
+        # Act
+        response = self.client.get("/metrics")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "ad_generator_single_flight_leaders " in response.text
+        assert 'ad_generator_resilience_circuit_state{value="closed"} 1' in response.text
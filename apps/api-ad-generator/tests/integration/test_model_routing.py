@@ -0,0 +1,124 @@
+"""フェイクサーバーに対するモデルの振り分けとフォールバックの統合テスト."""
+
+from functools import partial
+
+import anthropic
+import httpx
+import pytest
+
+from app.domain.entities import Tone
+from app.domain.exceptions import AdGenerationError, TransientGenerationError
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.model_routing import ModelProfile, ModelRouter, RoutingPolicy
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer, build_message
+
+SONNET = "claude-3-5-sonnet-20241022"
+HAIKU = "claude-3-5-haiku-20241022"
+
+
+_ad_input = partial(make_ad_input, tone=Tone.PROFESSIONAL)
+
+
+class TestModelRouting:
+    """ClaudeAdGenerationRepositoryのモデルの振り分けのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.server = FakeClaudeServer(latency=0.0, num_copies=1)
+        client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=self.server.app)),
+            max_retries=0,
+        )
+        self.router = ModelRouter(
+            [ModelProfile.from_name(SONNET, max_tokens=1000), ModelProfile.from_name(HAIKU, max_tokens=500)],
+            RoutingPolicy(quality_models=(SONNET,), fast_models=(HAIKU,)),
+        )
+        self.repository = ClaudeAdGenerationRepository(client=client, model_router=self.router)
+
+    @pytest.mark.asyncio
+    async def test_requests_are_routed_by_policy(self) -> None:
+        """ポリシーに従ってリクエストごとにモデルを選択することをテストする."""
+        # Act
+        await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+        await self.repository.generate_ad_copies(_ad_input(num_copies=3, tone=Tone.FORMAL))
+
+        # Assert
+        assert self.server.models == [HAIKU, SONNET]
+        # max_tokens は見積もりによらずモデルごとの設定値を上限とする
+        params = self.repository._build_message_params(_ad_input(num_copies=5, tone=Tone.CASUAL))
+        assert params["model"] == HAIKU
+        assert params["max_tokens"] == 500
+
+    @pytest.mark.asyncio
+    async def test_throttled_model_falls_back_to_next_model(self) -> None:
+        """スロットリングされた場合は同じ呼び出しの中で次のモデルを使うことをテストする."""
+        # Arrange
+        self.server.inject_fault(status=529, retry_after=30)
+
+        # Act
+        ad_copies = await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+        await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+
+        # Assert
+        # スロットリングされた Haiku は retry-after の間は後回しにする
+        assert len(ad_copies) == 1
+        assert self.server.models == [HAIKU, SONNET, SONNET]
+        stats = self.router.to_dict()
+        assert stats[HAIKU]["throttled"] == 1
+        assert stats[SONNET]["requests"] == 2
+        assert stats[SONNET]["costUsd"] > 0
+
+    @pytest.mark.asyncio
+    async def test_error_is_raised_when_every_model_is_throttled(self) -> None:
+        """全てのモデルがスロットリングされた場合は一時的なエラーを伝えることをテストする."""
+        self.server.inject_fault(status=429, count=2)
+
+        with pytest.raises(TransientGenerationError):
+            await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+
+        assert self.server.models == [HAIKU, SONNET]
+
+    @pytest.mark.asyncio
+    async def test_server_error_does_not_fall_back(self) -> None:
+        """スロットリング以外のエラーでは他のモデルを試さないことをテストする."""
+        self.server.inject_fault(status=500)
+
+        with pytest.raises(TransientGenerationError):
+            await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+
+        assert self.server.models == [HAIKU]
+        assert self.router.to_dict()[HAIKU]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_parse_failure_is_not_counted_as_model_error(self) -> None:
+        """パースの失敗はそのまま送出し、モデルのエラーとして記録しないことをテストする."""
+        # Arrange
+        client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(200, json=build_message("広告文はありません"))
+                )
+            ),
+        )
+        repository = ClaudeAdGenerationRepository(client=client, model_router=self.router)
+
+        # Act & Assert
+        with pytest.raises(AdGenerationError, match="^レスポンスのパースに失敗しました"):
+            await repository.generate_ad_copies(_ad_input(num_copies=1))
+        assert self.router.to_dict()[HAIKU]["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_before_first_copy(self) -> None:
+        """ストリーミングでも最初の1件を返す前なら次のモデルを使うことをテストする."""
+        self.server.inject_fault(status=529)
+
+        ad_copies = [ad_copy async for ad_copy in self.repository.stream_ad_copies(_ad_input(num_copies=1))]
+
+        assert len(ad_copies) == 1
+        assert self.server.models == [HAIKU, SONNET]
+        assert self.router.to_dict()[SONNET]["requests"] == 1
@@ -0,0 +1,74 @@
+"""プロンプトキャッシュの統合テスト."""
+
+import anthropic
+import httpx
+import pytest
+
+from app.infrastructure.clients import prompt_builder
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.clients.prompt_builder import SYSTEM_PROMPT
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+
+class TestPromptCache:
+    """システムプロンプトのキャッシュのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.server = FakeClaudeServer(latency=0.0)
+        self.client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=self.server.app)),
+        )
+
+    @pytest.fixture(autouse=True)
+    def cache_short_prefix(self, monkeypatch) -> None:
+        """キャッシュできる最小のトークン数に満たないシステムプロンプトもキャッシュの対象にする."""
+        monkeypatch.setattr(prompt_builder, "MIN_CACHEABLE_PROMPT_TOKENS", 0)
+
+    @pytest.mark.asyncio
+    async def test_second_request_reads_cached_prefix(self) -> None:
+        """異なる商品でも2回目以降はシステムプロンプトがキャッシュから読まれることをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client)
+
+        # Act
+        await repository.generate_ad_copies(make_ad_input("商品A"))
+        await repository.generate_ad_copies(make_ad_input("商品B"))
+
+        # Assert
+        stats = repository.usage_stats
+        assert stats.requests == 2
+        assert stats.cache_creation_input_tokens == len(SYSTEM_PROMPT)
+        assert stats.cache_read_input_tokens == len(SYSTEM_PROMPT)
+        assert stats.cache_read_ratio > 0.0
+
+    @pytest.mark.asyncio
+    async def test_streaming_records_usage(self) -> None:
+        """ストリーミングでも使用量が記録されることをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client)
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in repository.stream_ad_copies(make_ad_input())]
+
+        # Assert
+        assert len(ad_copies) == 1
+        assert repository.usage_stats.requests == 1
+        assert repository.usage_stats.cache_creation_input_tokens == len(SYSTEM_PROMPT)
+
+    @pytest.mark.asyncio
+    async def test_prompt_cache_can_be_disabled(self) -> None:
+        """キャッシュを無効にするとキャッシュが使われないことをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client, prompt_cache=False)
+
+        # Act
+        await repository.generate_ad_copies(make_ad_input())
+        await repository.generate_ad_copies(make_ad_input())
+
+        # Assert
+        assert repository.usage_stats.cache_creation_input_tokens == 0
+        assert repository.usage_stats.cache_read_input_tokens == 0
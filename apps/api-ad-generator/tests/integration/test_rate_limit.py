@@ -0,0 +1,83 @@
+"""クライアント側のレート制限の統合テスト."""
+
+from typing import List
+from unittest.mock import AsyncMock
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.usecases import GenerateAdCopyBatchUseCase, GenerateAdCopyUseCase
+from app.dependencies import get_generate_ad_copy_batch_usecase
+from app.domain.entities import AdCopy, AdInput
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    RequestPriority,
+    estimate_message_tokens,
+    request_priority,
+)
+from app.main import app
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+
+class TestClaudeRateLimit:
+    """Claude リポジトリのレート制限のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_unused_tokens_are_given_back(self) -> None:
+        """実際の使用量が見積もりより少なかった分が戻されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        limiter = RateLimiter(InMemoryRateLimitStore(requests_per_minute=60, tokens_per_minute=100000))
+        client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+        )
+        repository = ClaudeAdGenerationRepository(client=client, rate_limiter=limiter)
+        estimated = estimate_message_tokens(repository._build_message_params(make_ad_input()))
+
+        # Act
+        await repository.generate_ad_copies(make_ad_input())
+
+        # Assert
+        # フェイクサーバーの使用量は入力100・出力200トークン
+        assert limiter.stats.acquired == 1
+        assert limiter.stats.tokens_given_back == estimated - 300
+
+
+class TestBatchPriority:
+    """一括生成の優先度のテスト."""
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        app.dependency_overrides.clear()
+
+    def test_batch_route_uses_bulk_priority(self) -> None:
+        """一括生成が一括処理の優先度で実行されることをテストする."""
+        # Arrange
+        priorities: List[RequestPriority] = []
+
+        async def generate(ad_input: AdInput) -> List[AdCopy]:
+            priorities.append(request_priority.get())
+            return [AdCopy(copy_text="広告文")]
+
+        repository = AsyncMock()
+        repository.generate_ad_copies.side_effect = generate
+        app.dependency_overrides[get_generate_ad_copy_batch_usecase] = lambda: GenerateAdCopyBatchUseCase(
+            generate_ad_copy_usecase=GenerateAdCopyUseCase(ad_generation_repository=repository),
+            max_concurrency=2,
+        )
+        item = {"productName": "Test Product", "targetAudience": "20代女性", "appealPoints": ["ポイント1"]}
+
+        # Act
+        response = TestClient(app).post("/generate-ad-copy/batch", json={"items": [item, item]})
+
+        # Assert
+        assert response.status_code == 200
+        assert priorities == [RequestPriority.BULK, RequestPriority.BULK]
+        assert request_priority.get() == RequestPriority.INTERACTIVE
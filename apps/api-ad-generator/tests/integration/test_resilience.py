@@ -0,0 +1,234 @@
+"""障害を注入したフェイクサーバーに対する再試行・遮断の統合テスト."""
+
+import asyncio
+import random
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.usecases import GenerateAdCopyUseCase
+from app.dependencies import get_generate_ad_copy_usecase
+from app.domain.exceptions import (
+    AdGenerationError,
+    ServiceUnavailableError,
+    TransientGenerationError,
+)
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.resilience import (
+    CircuitBreaker,
+    LatencyTracker,
+    ResilientAdGenerationRepository,
+    RetryPolicy,
+)
+from app.main import app
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+REQUEST_DATA = {
+    "productName": "Test Product",
+    "targetAudience": "20代女性",
+    "appealPoints": ["ポイント1"],
+    "numCopies": 1,
+}
+
+
+def _claude_repository(server: FakeClaudeServer, **kwargs) -> ClaudeAdGenerationRepository:
+    # 再試行は ResilientAdGenerationRepository で行うため SDK の再試行は無効にする
+    client = anthropic.AsyncAnthropic(
+        api_key="test_api_key",
+        base_url="http://fake-claude",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+        max_retries=0,
+    )
+    return ClaudeAdGenerationRepository(client=client, **kwargs)
+
+
+def _resilient_repository(server: FakeClaudeServer, **kwargs) -> ResilientAdGenerationRepository:
+    kwargs.setdefault("retry_policy", RetryPolicy(max_retries=3, base_delay=0.01, max_delay=0.05))
+    return ResilientAdGenerationRepository(
+        _claude_repository(server), rng=random.Random(0), **kwargs
+    )
+
+
+class TestClaudeErrorClassification:
+    """Claude API のエラーの分類のテスト."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 500, 529])
+    async def test_retryable_status_raises_transient_error(self, status: int) -> None:
+        """再試行できるステータスコードが TransientGenerationError になることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        server.inject_fault(status=status, retry_after=1.5)
+        repository = _claude_repository(server)
+
+        # Act & Assert
+        with pytest.raises(TransientGenerationError, match="Claude APIでエラーが発生しました") as exc_info:
+            await repository.generate_ad_copies(make_ad_input())
+        assert exc_info.value.retry_after == 1.5
+
+    @pytest.mark.asyncio
+    async def test_bad_request_is_not_transient(self) -> None:
+        """400 エラーは一時的なエラーとして扱わないことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        server.inject_fault(status=400)
+        repository = _claude_repository(server)
+
+        # Act & Assert
+        with pytest.raises(AdGenerationError) as exc_info:
+            await repository.generate_ad_copies(make_ad_input())
+        assert not isinstance(exc_info.value, TransientGenerationError)
+
+
+class TestResilienceAgainstFaultyServer:
+    """障害を注入したフェイクサーバーに対する再試行・遮断のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_overload_is_absorbed_by_retries(self) -> None:
+        """一時的な過負荷が再試行で吸収されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        server.inject_fault(status=529, count=2)
+        server.inject_fault(status=429, retry_after=0.05)
+        repository = _resilient_repository(server)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(make_ad_input())
+
+        # Assert
+        assert ad_copies[0].copy_text == "フェイク広告文1"
+        assert server.request_count == 4
+        assert repository.stats.retries == 3
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_while_server_is_down(self) -> None:
+        """上流の障害が続くとサーバーを呼び出さずに失敗することをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        server.inject_fault(status=529, count=100)
+        repository = _resilient_repository(
+            server,
+            retry_policy=RetryPolicy(max_retries=1, base_delay=0.01, max_delay=0.01),
+            circuit_breaker=CircuitBreaker(failure_threshold=4, reset_timeout=60.0),
+        )
+        for _ in range(2):
+            with pytest.raises(TransientGenerationError):
+                await repository.generate_ad_copies(make_ad_input())
+
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableError, match="一時的にリクエストを停止しています"):
+            await repository.generate_ad_copies(make_ad_input())
+        assert server.request_count == 4
+
+    @pytest.mark.asyncio
+    async def test_slow_upstream_is_hedged(self) -> None:
+        """レイテンシが分位点を超えた生成がヘッジで短縮されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.01)
+        repository = _resilient_repository(server, hedge_quantile=0.95)
+        for _ in range(20):
+            await repository.generate_ad_copies(make_ad_input())
+        server.inject_fault(latency=2.0)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(make_ad_input())
+
+        # Assert
+        assert ad_copies[0].copy_text == "フェイク広告文1"
+        assert repository.stats.hedges == 1
+        assert repository.stats.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_upstream_latency_excludes_queueing(self) -> None:
+        """ヘッジに使うレイテンシには、同時リクエスト数の枠を待った時間を含めないことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.1)
+        claude_repository = _claude_repository(
+            server, max_concurrency=1, latency_tracker=LatencyTracker(min_samples=1)
+        )
+
+        # Act
+        await asyncio.gather(*[claude_repository.generate_ad_copies(make_ad_input()) for _ in range(3)])
+
+        # Assert
+        # 3件目は2件分の応答を待ってから呼び出すため、待ち時間を含めると 0.3 秒かかる
+        tracker = claude_repository.latency_tracker
+        assert len(tracker) == 3
+        assert tracker.quantile(1.0) < 0.2
+
+    @pytest.mark.asyncio
+    async def test_hedge_is_skipped_when_upstream_is_saturated(self) -> None:
+        """同時リクエスト数の枠に空きがない場合はヘッジしないことをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.01)
+        claude_repository = _claude_repository(
+            server, max_concurrency=1, latency_tracker=LatencyTracker(min_samples=20)
+        )
+        repository = ResilientAdGenerationRepository(
+            claude_repository,
+            hedge_quantile=0.95,
+            latency_tracker=claude_repository.latency_tracker,
+            record_latency=False,
+            has_capacity=claude_repository.has_free_capacity,
+        )
+        for _ in range(20):
+            await repository.generate_ad_copies(make_ad_input())
+        server.inject_fault(latency=0.5)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(make_ad_input())
+
+        # Assert
+        assert len(ad_copies) == 1
+        assert server.request_count == 21
+        assert repository.stats.hedges == 0
+        assert repository.stats.hedges_skipped == 1
+
+
+class TestResilienceAPI:
+    """上流の障害時の API のレスポンスのテスト."""
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        app.dependency_overrides.clear()
+
+    def _override(self, repository: ResilientAdGenerationRepository) -> None:
+        app.dependency_overrides[get_generate_ad_copy_usecase] = lambda: GenerateAdCopyUseCase(
+            ad_generation_repository=repository
+        )
+
+    def test_exhausted_retries_return_503_with_retry_after(self) -> None:
+        """再試行しても解消しない過負荷が 503 と Retry-After で返されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0)
+        server.inject_fault(status=529, retry_after=0.01, count=1)
+        server.inject_fault(status=429, retry_after=7, count=1)
+        self._override(
+            _resilient_repository(
+                server, retry_policy=RetryPolicy(max_retries=1, base_delay=0.01, max_delay=0.01)
+            )
+        )
+
+        # Act
+        response = TestClient(app).post("/generate-ad-copy", json=REQUEST_DATA)
+
+        # Assert
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert response.json()["detail"]["code"] == "SERVICE_UNAVAILABLE"
+
+    def test_deadline_exceeded_returns_504(self) -> None:
+        """期限内に生成が完了しない場合に 504 が返されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=1.0)
+        self._override(_resilient_repository(server, deadline=0.05))
+
+        # Act
+        response = TestClient(app).post("/generate-ad-copy", json=REQUEST_DATA)
+
+        # Assert
+        assert response.status_code == 504
+        assert response.json()["detail"]["code"] == "GATEWAY_TIMEOUT"
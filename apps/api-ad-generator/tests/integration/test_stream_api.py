@@ -0,0 +1,111 @@
+"""広告文ストリーミング生成 API の統合テスト."""
+
+import json
+import time
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.usecases import StreamAdCopyUseCase
+from app.dependencies import get_stream_ad_copy_usecase
+from app.domain.entities import AdInput
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.main import app
+from tests.fakes.fake_claude_server import FakeClaudeServer, serve_in_thread
+
+REQUEST_DATA = {
+    "productName": "Stream Product",
+    "targetAudience": "20代女性",
+    "appealPoints": ["ポイント1"],
+    "numCopies": 3,
+}
+
+
+def _repository(server: FakeClaudeServer) -> ClaudeAdGenerationRepository:
+    client = anthropic.AsyncAnthropic(
+        api_key="test_api_key",
+        base_url="http://fake-claude",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+    )
+    return ClaudeAdGenerationRepository(client=client)
+
+
+class TestClaudeStreaming:
+    """Claude リポジトリのストリーミング生成のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_first_copy_arrives_before_generation_finishes(self) -> None:
+        """最初の広告文が生成完了前に返されることをテストする."""
+        # Arrange
+        server = FakeClaudeServer(latency=0.0, num_copies=3, stream_chunk_size=10, stream_chunk_delay=0.01)
+        ad_input = AdInput(
+            product_name="Stream Product",
+            target_audience="20代女性",
+            appeal_points=["ポイント1"],
+            num_copies=3,
+        )
+
+        # Act
+        # ASGITransport はレスポンス全体をバッファするため実サーバーで検証する
+        with serve_in_thread(server.app) as base_url:
+            client = anthropic.AsyncAnthropic(api_key="test_api_key", base_url=base_url)
+            repository = ClaudeAdGenerationRepository(client=client)
+            started = time.perf_counter()
+            arrivals = []
+            async for ad_copy in repository.stream_ad_copies(ad_input):
+                arrivals.append((time.perf_counter() - started, ad_copy))
+            total = time.perf_counter() - started
+            await client.close()
+
+        # Assert
+        assert [ad_copy.copy_text for _, ad_copy in arrivals] == [
+            "フェイク広告文1",
+            "フェイク広告文2",
+            "フェイク広告文3",
+        ]
+        assert arrivals[0][0] < total / 2
+
+
+class TestStreamAPI:
+    """広告文ストリーミング生成APIの統合テスト."""
+
+    def setup_method(self) -> None:
+        """テスト前の準備."""
+        server = FakeClaudeServer(latency=0.0, num_copies=3, stream_chunk_size=15)
+        repository = _repository(server)
+        app.dependency_overrides[get_stream_ad_copy_usecase] = lambda: StreamAdCopyUseCase(repository)
+
+    def teardown_method(self) -> None:
+        """テスト後の後片付け."""
+        app.dependency_overrides.clear()
+
+    def test_ndjson_stream(self) -> None:
+        """NDJSON 形式で1行に1件ずつ返されることをテストする."""
+        with TestClient(app) as client:
+            response = client.post("/generate-ad-copy/stream", json=REQUEST_DATA)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["copyText"] for line in lines] == ["フェイク広告文1", "フェイク広告文2", "フェイク広告文3"]
+        assert lines[0]["evaluation"]["relevanceScore"] == 0.9
+
+    def test_sse_stream(self) -> None:
+        """Accept: text/event-stream で SSE 形式で返されることをテストする."""
+        with TestClient(app) as client:
+            response = client.post(
+                "/generate-ad-copy/stream", json=REQUEST_DATA, headers={"Accept": "text/event-stream"}
+            )
+
+        assert response.status_code == 200
+        events = [block.split("\n")[0] for block in response.text.strip().split("\n\n")]
+        assert events == ["event: adCopy"] * 3 + ["event: done"]
+
+    def test_invalid_request_returns_400(self) -> None:
+        """無効なリクエストで400エラーが返されることをテストする."""
+        with TestClient(app) as client:
+            response = client.post("/generate-ad-copy/stream", json={**REQUEST_DATA, "productName": " "})
+
+        assert response.status_code == 400
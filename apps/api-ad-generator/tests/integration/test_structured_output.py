@@ -0,0 +1,142 @@
+"""構造化出力（ツールの入力による広告文の出力）の統合テスト."""
+
+import json
+from functools import partial
+from typing import List
+
+import anthropic
+import httpx
+import pytest
+
+from app.domain.exceptions import AdGenerationError
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.clients.max_tokens import MaxTokensEstimator
+from app.infrastructure.clients.prompt_builder import AD_COPIES_TOOL_NAME
+from tests.conftest import make_ad_input
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+_ad_input = partial(make_ad_input, num_copies=3)
+
+
+class TestStructuredOutput:
+    """構造化出力のテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.server = FakeClaudeServer(latency=0.0, output_tokens_per_copy=100)
+        self.requests: List[httpx.Request] = []
+
+        async def record_request(request: httpx.Request) -> None:
+            self.requests.append(request)
+
+        self.client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self.server.app),
+                event_hooks={"request": [record_request]},
+            ),
+        )
+
+    @pytest.mark.asyncio
+    async def test_ad_copies_are_read_from_tool_input(self) -> None:
+        """ツールの呼び出しを強制し、その入力から広告文を取り出すことをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client, structured_output=True)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(_ad_input())
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == [
+            "フェイク広告文1",
+            "フェイク広告文2",
+            "フェイク広告文3",
+        ]
+        assert ad_copies[0].evaluation is not None
+        body = json.loads(self.requests[0].content)
+        assert body["tool_choice"] == {"type": "tool", "name": AD_COPIES_TOOL_NAME}
+        assert [tool["name"] for tool in body["tools"]] == [AD_COPIES_TOOL_NAME]
+
+    @pytest.mark.asyncio
+    async def test_streaming_reads_tool_input_deltas(self) -> None:
+        """ストリーミングではツールの入力の断片から広告文を1件ずつ返すことをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client, structured_output=True)
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in repository.stream_ad_copies(_ad_input())]
+
+        # Assert
+        assert len(ad_copies) == 3
+        assert repository.output_stats.parsed == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_tool_input_is_continued(self) -> None:
+        """ツールの入力が打ち切られた場合も、閉じている広告文を残して続きを生成することをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(
+            client=self.client,
+            structured_output=True,
+            max_tokens_estimator=MaxTokensEstimator(default_tokens_per_copy=10, min_tokens=0),
+        )
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(_ad_input(num_copies=3))
+
+        # Assert
+        assert len(ad_copies) == 3
+        stats = repository.max_tokens_estimator.stats
+        assert (stats.truncated, stats.salvaged_copies, stats.continuations) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_output_stats_are_recorded_per_mode(self) -> None:
+        """出力形式ごとに出力トークン数と取り出した広告文の数を記録することをテストする."""
+        # Arrange
+        text_repository = ClaudeAdGenerationRepository(client=self.client)
+        tool_repository = ClaudeAdGenerationRepository(client=self.client, structured_output=True)
+
+        # Act
+        await text_repository.generate_ad_copies(_ad_input())
+        await tool_repository.generate_ad_copies(_ad_input())
+
+        # Assert
+        assert text_repository.output_stats.to_dict() == {
+            "mode": "text",
+            "parsed": 1,
+            "parseFailures": 0,
+            "parseFailureRate": 0.0,
+            "outputTokens": 300,
+            "adCopies": 3,
+            "outputTokensPerCopy": 100.0,
+        }
+        assert tool_repository.output_stats.mode == "tool"
+        assert tool_repository.output_stats.ad_copies == 3
+
+    def test_parse_failures_are_recorded(self) -> None:
+        """広告文を取り出せなかった応答がパースの失敗として数えられることをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client)
+
+        # Act
+        with pytest.raises(AdGenerationError):
+            repository._parse_response("JSONを含まない応答")
+
+        # Assert
+        assert repository.output_stats.parse_failures == 1
+        assert repository.output_stats.parse_failure_rate == 1.0
+
+    def test_wrongly_typed_field_is_recorded_as_parse_failure(self) -> None:
+        """型が不正な値を含む応答がパースの失敗として数えられることをテストする."""
+        # Arrange
+        repository = ClaudeAdGenerationRepository(client=self.client)
+        text = json.dumps(
+            {"adCopies": [{"copyText": "本文", "evaluation": {"relevanceScore": None}}]}
+        )
+
+        # Act
+        with pytest.raises(AdGenerationError, match="^レスポンスのパースに失敗しました"):
+            repository._parse_response(text)
+
+        # Assert
+        assert repository.output_stats.parse_failures == 1
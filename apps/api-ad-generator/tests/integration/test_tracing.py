@@ -0,0 +1,75 @@
+"""トレースの統合テスト."""
+
+import anthropic
+import httpx
+from fastapi.testclient import TestClient
+
+from app.application.usecases import GenerateAdCopyUseCase
+from app.dependencies import get_generate_ad_copy_usecase
+from app.infrastructure.clients.claude_client import ClaudeAdGenerationRepository
+from app.infrastructure.tracing import (
+    InMemorySpanExporter,
+    RecordingTracer,
+    configure_tracing,
+)
+from app.main import app
+from tests.fakes.fake_claude_server import FakeClaudeServer
+
+
+class TestGenerateAdCopyTracing:
+    """広告文生成のトレースのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        server = FakeClaudeServer(latency=0.0, num_copies=2)
+        client = anthropic.AsyncAnthropic(
+            api_key="test_api_key",
+            base_url="http://fake-claude",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+        )
+        repository = ClaudeAdGenerationRepository(client=client)
+        app.dependency_overrides[get_generate_ad_copy_usecase] = lambda: GenerateAdCopyUseCase(
+            ad_generation_repository=repository
+        )
+        self.exporter = InMemorySpanExporter()
+        configure_tracing(RecordingTracer(self.exporter))
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        configure_tracing(None)
+        app.dependency_overrides.clear()
+
+    def test_spans_cover_each_layer(self) -> None:
+        """ルートから上流の呼び出しまでの各層のスパンが1つのトレースになることをテストする."""
+        # Arrange
+        request = {
+            "productName": "Test Product",
+            "targetAudience": "20代女性",
+            "appealPoints": ["ポイント1"],
+            "numCopies": 2,
+        }
+
+        # Act
+        response = TestClient(app).post("/generate-ad-copy", json=request)
+
+        # Assert
+        assert response.status_code == 200
+        spans = {span.name: span for span in self.exporter.spans}
+        route = spans["routes.generate_ad_copy"]
+        usecase = spans["GenerateAdCopyUseCase.execute"]
+        assert route.parent_span_id is None
+        assert usecase.parent_span_id == route.span_id
+        for name in (
+            "ClaudeAdGenerationRepository._build_prompt",
+            "claude.messages.create",
+            "ClaudeAdGenerationRepository._parse_response",
+        ):
+            assert spans[name].parent_span_id == usecase.span_id
+            assert spans[name].trace_id == route.trace_id
+
+        upstream = spans["claude.messages.create"].attributes
+        assert upstream["gen_ai.request.model"] == "claude-3-5-sonnet-20241022"
+        assert upstream["gen_ai.usage.input_tokens"] == 100
+        assert upstream["gen_ai.usage.output_tokens"] == 200
+        assert upstream["ad.num_copies"] == 2
+        assert route.attributes["ad.num_copies"] == 2
@@ -0,0 +1,232 @@
+"""広告文パーサーのユニットテスト."""
+
+import json
+import random
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from app.infrastructure.clients import ad_copy_parser
+from app.infrastructure.clients.ad_copy_parser import (
+    AdCopyStreamParser,
+    ad_copies_from_tool_input,
+    ad_copy_from_dict,
+    parse_ad_copies,
+    salvage_ad_copies,
+)
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "fixtures" / "ad_copy_parser"
+EXPECTED = json.loads((CORPUS_DIR / "expected.json").read_text(encoding="utf-8"))
+
+RESPONSE_TEXT = (
+    '以下が広告文です {"前置き"}。\n'
+    + json.dumps(
+        {
+            "adCopies": [
+                {"copyText": '括弧 } を含む "本文" [1]', "headline": "見出し{"},
+                {
+                    "copyText": "2件目",
+                    "evaluation": {
+                        "relevanceScore": 0.9,
+                        "creativityScore": 0.8,
+                        "targetAudienceAppeal": "響く",
+                    },
+                },
+            ]
+        },
+        ensure_ascii=False,
+    )
+    + "\n以上です。}"
+)
+
+
+class TestAdCopyStreamParser:
+    """AdCopyStreamParserのテスト."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, len(RESPONSE_TEXT)])
+    def test_items_are_emitted_regardless_of_chunking(self, chunk_size: int) -> None:
+        """チャンクの区切り方によらず同じ要素が取り出されることをテストする."""
+        # Arrange
+        parser = AdCopyStreamParser()
+
+        # Act
+        items = []
+        for start in range(0, len(RESPONSE_TEXT), chunk_size):
+            items.extend(parser.feed(RESPONSE_TEXT[start:start + chunk_size]))
+
+        # Assert
+        assert [item["copyText"] for item in items] == ['括弧 } を含む "本文" [1]', "2件目"]
+        assert items[0]["headline"] == "見出し{"
+        assert parser.finished
+
+    def test_item_is_emitted_as_soon_as_it_closes(self) -> None:
+        """要素のオブジェクトが閉じた時点で返されることをテストする."""
+        # Arrange
+        parser = AdCopyStreamParser()
+
+        # Act
+        first = parser.feed('{"adCopies": [{"copyText": "1件目"}, {"copyText": "2')
+        second = parser.feed('件目"}]}')
+
+        # Assert
+        assert first == [{"copyText": "1件目"}]
+        assert second == [{"copyText": "2件目"}]
+
+    def test_text_without_array_emits_nothing(self) -> None:
+        """adCopies 配列が無い場合は何も返さないことをテストする."""
+        parser = AdCopyStreamParser()
+
+        assert parser.feed("JSONを含まない応答 {}") == []
+        assert not parser.found_array
+
+
+def test_ad_copy_from_dict_converts_evaluation() -> None:
+    """評価情報を含む要素が変換されることをテストする."""
+    ad_copy = ad_copy_from_dict(
+        {
+            "copyText": "本文",
+            "callToAction": "今すぐ",
+            "evaluation": {"relevanceScore": 0.5, "creativityScore": 0.4, "targetAudienceAppeal": "良い"},
+        }
+    )
+
+    assert ad_copy.copy_text == "本文"
+    assert ad_copy.call_to_action == "今すぐ"
+    assert ad_copy.evaluation is not None
+    assert ad_copy.evaluation.relevance_score == 0.5
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"copyText": None},
+        {"copyText": 1},
+        {"copyText": "本文", "headline": ["見出し"]},
+        {"copyText": "本文", "evaluation": "良い"},
+        {"copyText": "本文", "evaluation": {"relevanceScore": None, "targetAudienceAppeal": "良い"}},
+        {"copyText": "本文", "evaluation": {"relevanceScore": "0.9", "targetAudienceAppeal": "良い"}},
+        {"copyText": "本文", "evaluation": {"creativityScore": True, "targetAudienceAppeal": "良い"}},
+        {"copyText": "本文", "evaluation": {"relevanceScore": 0.5, "targetAudienceAppeal": None}},
+        "本文",
+    ],
+)
+def test_ad_copy_from_dict_rejects_wrongly_typed_fields(item: object) -> None:
+    """型が不正な値を含む要素が ValueError になることをテストする."""
+    with pytest.raises(ValueError):
+        ad_copy_from_dict(item)
+
+
+class TestSalvageAdCopies:
+    """salvage_ad_copiesのテスト."""
+
+    def test_closed_items_are_salvaged_from_truncated_text(self) -> None:
+        """途中で打ち切られた出力から閉じている要素だけが取り出されることをテストする."""
+        # Arrange
+        text = RESPONSE_TEXT[: RESPONSE_TEXT.index('"2件目"') + 3]
+
+        # Act
+        ad_copies = salvage_ad_copies(text)
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == ['括弧 } を含む "本文" [1]']
+
+    def test_text_truncated_before_array_returns_empty(self) -> None:
+        """adCopies 配列が始まる前に打ち切られた場合は空のリストを返すことをテストする."""
+        assert salvage_ad_copies("以下が広告文です。\n{\"adCop") == []
+
+
+class TestAdCopiesFromToolInput:
+    """ad_copies_from_tool_inputのテスト."""
+
+    def test_tool_input_is_converted(self) -> None:
+        """ツールの入力の要素が AdCopy に変換されることをテストする."""
+        # Arrange
+        tool_input = {"adCopies": [{"copyText": "1件目", "headline": "見出し"}, {"copyText": "2件目"}]}
+
+        # Act
+        ad_copies = ad_copies_from_tool_input(tool_input)
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == ["1件目", "2件目"]
+        assert ad_copies[0].headline == "見出し"
+
+    def test_last_item_of_truncated_input_is_dropped(self) -> None:
+        """打ち切られた入力では途中の可能性がある最後の要素を除くことをテストする."""
+        # Arrange
+        tool_input = {"adCopies": [{"copyText": "1件目"}, {"copyText": "2件"}]}
+
+        # Act
+        ad_copies = ad_copies_from_tool_input(tool_input, truncated=True)
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == ["1件目"]
+
+    @pytest.mark.parametrize("tool_input", [None, {}, {"adCopies": "1件目"}, {"adCopies": ["1件目"]}])
+    def test_invalid_input_raises_value_error(self, tool_input: object) -> None:
+        """adCopies 配列がない・要素がオブジェクトでない場合はエラーになることをテストする."""
+        with pytest.raises(ValueError):
+            ad_copies_from_tool_input(tool_input)
+
+    def test_truncated_input_without_array_returns_empty(self) -> None:
+        """配列が始まる前に打ち切られた場合は空のリストを返すことをテストする."""
+        assert ad_copies_from_tool_input({}, truncated=True) == []
+
+
+@pytest.fixture(params=["default", "json"])
+def json_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """インストール済みのバックエンドと標準 json の両方でテストする."""
+    if request.param == "json":
+        monkeypatch.setattr(ad_copy_parser, "orjson", None)
+        monkeypatch.setattr(ad_copy_parser, "_loads", json.loads)
+    return request.param
+
+
+def _stream_copy_texts(text: str, rng: random.Random) -> List[str]:
+    parser = AdCopyStreamParser()
+    items = []
+    index = 0
+    while index < len(text):
+        size = rng.randint(1, 12)
+        items.extend(parser.feed(text[index:index + size]))
+        index += size
+    return [ad_copy_from_dict(item).copy_text for item in items]
+
+
+class TestParseAdCopiesCorpus:
+    """ファズコーパスを使った parse_ad_copies のテスト."""
+
+    @pytest.mark.parametrize("name", sorted(EXPECTED))
+    def test_corpus(self, name: str, json_backend: str) -> None:
+        """コーパスの各出力が期待どおりにパースされることをテストする."""
+        # Arrange
+        text = (CORPUS_DIR / f"{name}.txt").read_text(encoding="utf-8")
+        expected: Optional[List[str]] = EXPECTED[name]
+
+        # Act / Assert
+        if expected is None:
+            with pytest.raises((ValueError, KeyError)):
+                parse_ad_copies(text)
+            return
+
+        assert [ad_copy.copy_text for ad_copy in parse_ad_copies(text)] == expected
+        assert _stream_copy_texts(text, random.Random(name)) == expected
+
+    def test_random_surroundings(self, json_backend: str) -> None:
+        """前後にランダムな括弧や引用符を含む文章があってもパースできることをテストする."""
+        rng = random.Random(20240601)
+        noise_chars = "{}[]\"\\:, あaZ\n"
+        for _ in range(200):
+            # Arrange
+            copies = [
+                "".join(rng.choice(noise_chars) for _ in range(rng.randint(1, 20))).strip() or "x"
+                for _ in range(rng.randint(1, 5))
+            ]
+            body = json.dumps({"adCopies": [{"copyText": copy} for copy in copies]}, ensure_ascii=rng.random() < 0.5)
+            prefix = "".join(rng.choice(noise_chars) for _ in range(rng.randint(0, 30)))
+            suffix = "".join(rng.choice(noise_chars) for _ in range(rng.randint(0, 30)))
+            text = prefix + body + suffix
+
+            # Act / Assert
+            assert [ad_copy.copy_text for ad_copy in parse_ad_copies(text)] == copies
+            assert _stream_copy_texts(text, rng) == copies
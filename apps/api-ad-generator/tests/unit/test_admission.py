@@ -0,0 +1,278 @@
+"""受付制御のユニットテスト."""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.domain.exceptions import ServiceUnavailableError
+from app.infrastructure.admission import AdmissionController, AdmissionControlMiddleware
+from tests.conftest import FakeClock
+
+
+def _primed_controller(clock: FakeClock, latency: float, **kwargs: Any) -> AdmissionController:
+    """1件のレイテンシの推定を済ませた受付制御を作成する."""
+    controller = AdmissionController(clock=clock, **kwargs)
+    ticket = controller.admit()
+    clock.now += latency
+    controller.release(ticket, completed=True)
+    return controller
+
+
+class TestAdmissionController:
+    """AdmissionControllerのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.clock = FakeClock()
+
+    def test_admits_everything_without_latency_estimate(self) -> None:
+        """レイテンシの推定がない間は全てのリクエストを受け付けることをテストする."""
+        # Arrange
+        controller = AdmissionController(capacity=1, deadline=1.0, clock=self.clock)
+
+        # Act
+        tickets = [controller.admit() for _ in range(10)]
+
+        # Assert
+        assert len(tickets) == 10
+        assert controller.in_flight == 10
+        assert controller.predicted_response_time() is None
+
+    def test_rejects_when_predicted_response_time_exceeds_deadline(self) -> None:
+        """予測した応答までの時間が期限を超えると Retry-After 付きで拒否することをテストする."""
+        # Arrange
+        controller = _primed_controller(self.clock, 2.0, capacity=2, deadline=5.0)
+        controller.admit()
+        controller.admit()
+        controller.admit()
+
+        # Act & Assert
+        # 4件目は 2秒 × 4 / 2 = 4秒で期限内、5件目は 2秒 × 5 / 2 = 5秒で期限内、6件目は6秒で期限超過
+        controller.admit()
+        controller.admit()
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            controller.admit()
+        assert exc_info.value.retry_after == pytest.approx(1.0)
+        assert controller.in_flight == 5
+        assert controller.stats.rejected == 1
+
+    def test_client_deadline_overrides_default(self) -> None:
+        """クライアントが指定した期限で判定することをテストする."""
+        # Arrange
+        controller = _primed_controller(self.clock, 2.0, capacity=1, deadline=60.0)
+        controller.admit()
+
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableError):
+            controller.admit(deadline=1.0)
+        assert controller.admit(deadline=4.0) is not None
+
+    def test_idle_controller_admits_after_slow_call(self) -> None:
+        """期限を超える遅い呼び出しの後も、空いていれば受け付けて推定が戻ることをテストする."""
+        # Arrange
+        controller = _primed_controller(self.clock, 70.0, capacity=5, deadline=60.0)
+
+        # Act
+        tickets = [controller.admit() for _ in range(5)]
+        for ticket in tickets:
+            self.clock.now += 1.0
+            controller.release(ticket, completed=True)
+
+        # Assert
+        assert controller.stats.rejected == 0
+        assert controller.latency_estimate < 60.0
+
+    def test_sample_is_clamped_to_deadline(self) -> None:
+        """1件の所要時間が既定の期限で頭打ちになることをテストする."""
+        # Act
+        controller = _primed_controller(self.clock, 300.0, capacity=1, deadline=60.0)
+
+        # Assert
+        assert controller.latency_estimate == pytest.approx(60.0)
+
+    def test_max_in_flight_limits_queue_depth(self) -> None:
+        """処理中の生成の数が上限に達すると拒否することをテストする."""
+        # Arrange
+        controller = AdmissionController(
+            capacity=8, deadline=60.0, max_in_flight=2, clock=self.clock
+        )
+        controller.admit()
+        controller.admit()
+
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableError):
+            controller.admit()
+
+    def test_latency_is_normalized_by_load(self) -> None:
+        """上限を超えて処理していた間のレイテンシは負荷で割って推定することをテストする."""
+        # Arrange
+        controller = AdmissionController(capacity=1, deadline=60.0, smoothing=1.0, clock=self.clock)
+        controller.admit()
+        ticket = controller.admit()
+
+        # Act
+        self.clock.now += 4.0
+        controller.release(ticket, completed=True)
+
+        # Assert
+        assert controller.latency_estimate == pytest.approx(2.0)
+
+    def test_incomplete_requests_do_not_update_estimate(self) -> None:
+        """応答を返せなかったリクエストはレイテンシの推定に使用しないことをテストする."""
+        # Arrange
+        controller = _primed_controller(self.clock, 1.0, capacity=1, deadline=60.0)
+        ticket = controller.admit()
+
+        # Act
+        self.clock.now += 30.0
+        controller.release(ticket, completed=False)
+
+        # Assert
+        assert controller.latency_estimate == pytest.approx(1.0)
+        assert controller.in_flight == 0
+
+
+class BlockingApp:
+    """リクエストの本文を読んだ後、release が設定されるまで応答しない ASGI アプリケーション."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        await receive()
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+
+class FakeConnection:
+    """本文を1回で返し、その後は切断されるか応答が完了するまで待つクライアントの接続."""
+
+    def __init__(self) -> None:
+        self.disconnect = asyncio.Event()
+        self.messages: List[Dict[str, Any]] = []
+        self._body_sent = False
+
+    async def receive(self) -> Dict[str, Any]:
+        if not self._body_sent:
+            self._body_sent = True
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+        await self.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        self.messages.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            self.disconnect.set()
+
+    @property
+    def status(self) -> Optional[int]:
+        for message in self.messages:
+            if message["type"] == "http.response.start":
+                return message["status"]
+        return None
+
+
+def _scope(headers: Optional[List[Any]] = None) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": "/generate-ad-copy",
+        "headers": headers or [],
+    }
+
+
+class TestAdmissionControlMiddleware:
+    """AdmissionControlMiddlewareのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.clock = FakeClock()
+        self.app = BlockingApp()
+
+    @pytest.mark.asyncio
+    async def test_rejects_with_503_and_retry_after(self) -> None:
+        """期限内に応答できない見込みのリクエストに 503 と Retry-After を返すことをテストする."""
+        # Arrange
+        controller = _primed_controller(self.clock, 10.0, capacity=1, deadline=15.0)
+        controller.admit()
+        middleware = AdmissionControlMiddleware(self.app, get_controller=lambda: controller)
+        connection = FakeConnection()
+
+        # Act
+        await middleware(_scope(), connection.receive, connection.send)
+
+        # Assert
+        start, body = connection.messages
+        assert start["status"] == 503
+        assert (b"retry-after", b"5") in start["headers"]
+        assert json.loads(body["body"])["detail"]["code"] == "SERVICE_UNAVAILABLE"
+        assert not self.app.started.is_set()
+
+    @pytest.mark.asyncio
+    async def test_invalid_request_timeout_returns_400(self) -> None:
+        """X-Request-Timeout が不正な場合に 400 を返すことをテストする."""
+        # Arrange
+        controller = AdmissionController(capacity=1, deadline=5.0, clock=self.clock)
+        middleware = AdmissionControlMiddleware(self.app, get_controller=lambda: controller)
+        connection = FakeConnection()
+
+        # Act
+        await middleware(
+            _scope([(b"x-request-timeout", b"-1")]), connection.receive, connection.send
+        )
+
+        # Assert
+        assert connection.status == 400
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_processing(self) -> None:
+        """応答前にクライアントが切断すると処理がキャンセルされることをテストする."""
+        # Arrange
+        controller = AdmissionController(capacity=1, deadline=5.0, clock=self.clock)
+        middleware = AdmissionControlMiddleware(self.app, get_controller=lambda: controller)
+        connection = FakeConnection()
+        request = asyncio.create_task(middleware(_scope(), connection.receive, connection.send))
+        await self.app.started.wait()
+
+        # Act
+        connection.disconnect.set()
+        await request
+
+        # Assert
+        assert self.app.cancelled is True
+        assert connection.messages == []
+        assert controller.in_flight == 0
+        assert controller.stats.disconnected == 1
+        assert controller.latency_estimate is None
+
+    @pytest.mark.asyncio
+    async def test_completed_response_records_latency(self) -> None:
+        """応答を返したリクエストのレイテンシが推定に記録されることをテストする."""
+        # Arrange
+        controller = AdmissionController(capacity=1, deadline=5.0, clock=self.clock)
+        middleware = AdmissionControlMiddleware(self.app, get_controller=lambda: controller)
+        connection = FakeConnection()
+        request = asyncio.create_task(middleware(_scope(), connection.receive, connection.send))
+        await self.app.started.wait()
+
+        # Act
+        self.clock.now += 1.5
+        self.app.release.set()
+        await request
+
+        # Assert
+        assert connection.status == 200
+        assert self.app.cancelled is False
+        assert controller.stats.disconnected == 0
+        assert controller.latency_estimate == pytest.approx(1.5)
@@ -0,0 +1,140 @@
+"""非同期一括生成ジョブリポジトリのユニットテスト."""
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from app.domain.entities import BatchJobStatus
+from app.domain.exceptions import AdGenerationError, JobNotFoundError, JobNotReadyError
+from app.infrastructure.batch import (
+    MessageBatchBackend,
+    MessageBatchResult,
+    SQLiteBatchJobStore,
+)
+from app.infrastructure.clients import (
+    ClaudeAdGenerationRepository,
+    ClaudeBatchJobRepository,
+)
+from tests.conftest import make_ad_input
+
+
+def _response_text(product_name: str, suffix: str = "") -> str:
+    return json.dumps(
+        {"adCopies": [{"copyText": f"{product_name}の広告文{suffix}"}]}, ensure_ascii=False
+    )
+
+
+class InMemoryBatchBackend(MessageBatchBackend):
+    """完了のタイミングをテスト側から制御できるバックエンド."""
+
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, Any]] = []
+        self.ended = False
+        self.results_by_id: Dict[str, MessageBatchResult] = {}
+
+    async def create(self, requests: List[Dict[str, Any]]) -> str:
+        self.requests = requests
+        return "batch_1"
+
+    async def is_ended(self, batch_id: str) -> bool:
+        return self.ended
+
+    async def results(self, batch_id: str) -> List[MessageBatchResult]:
+        # 結果の順序は保証されないため逆順で返す
+        return list(reversed(list(self.results_by_id.values())))
+
+
+class TestClaudeBatchJobRepository:
+    """ClaudeBatchJobRepositoryのテスト."""
+
+    @pytest.fixture(autouse=True)
+    def setup_repository(self, tmp_path) -> None:
+        """テスト前の準備."""
+        self.backend = InMemoryBatchBackend()
+        self.store = SQLiteBatchJobStore(path=str(tmp_path / "jobs.sqlite3"))
+        self.repository = ClaudeBatchJobRepository(
+            claude_repository=ClaudeAdGenerationRepository(api_key="test_api_key"),
+            backend=self.backend,
+            store=self.store,
+        )
+        yield
+        self.store.close()
+
+    @pytest.mark.asyncio
+    async def test_submit_creates_one_request_per_input(self) -> None:
+        """入力ごとに1リクエストのバッチが作成されることをテストする."""
+        # Act
+        job = await self.repository.submit([make_ad_input("A"), make_ad_input("B")])
+
+        # Assert
+        assert job.status == BatchJobStatus.IN_PROGRESS
+        assert job.num_items == 2
+        assert [request["custom_id"] for request in self.backend.requests] == ["0", "1"]
+        assert "A" in self.backend.requests[0]["params"]["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_results_are_collected_in_input_order(self) -> None:
+        """完了したバッチの結果が入力順に取り込まれることをテストする."""
+        # Arrange
+        job = await self.repository.submit([make_ad_input("A"), make_ad_input("B"), make_ad_input("C")])
+        self.backend.results_by_id = {
+            "0": MessageBatchResult(custom_id="0", text=_response_text("A")),
+            "1": MessageBatchResult(custom_id="1", error="overloaded_error"),
+            "2": MessageBatchResult(custom_id="2", text="JSONを含まない応答"),
+        }
+        self.backend.ended = True
+
+        # Act
+        updated = await self.repository.get_job(job.job_id)
+        results = await self.repository.get_results(job.job_id)
+
+        # Assert
+        assert updated.status == BatchJobStatus.ENDED
+        assert updated.ended_at is not None
+        assert [result.index for result in results] == [0, 1, 2]
+        assert results[0].ad_copies[0].copy_text == "Aの広告文"
+        assert isinstance(results[1].error, AdGenerationError)
+        assert "overloaded_error" in results[1].error.message
+        assert "パースに失敗しました" in results[2].error.message
+
+    @pytest.mark.asyncio
+    async def test_large_input_is_split_and_merged(self) -> None:
+        """生成数の多い入力が分割して登録され、結果が1つにまとめられることをテストする."""
+        # Arrange
+        job = await self.repository.submit([make_ad_input("A", num_copies=12), make_ad_input("B")])
+        custom_ids = [request["custom_id"] for request in self.backend.requests]
+        self.backend.results_by_id = {
+            "0.0": MessageBatchResult(custom_id="0.0", text=_response_text("A", "1")),
+            "0.1": MessageBatchResult(custom_id="0.1", error="overloaded_error"),
+            "0.2": MessageBatchResult(custom_id="0.2", text=_response_text("A", "3")),
+            "1": MessageBatchResult(custom_id="1", text=_response_text("B")),
+        }
+        self.backend.ended = True
+
+        # Act
+        await self.repository.get_job(job.job_id)
+        results = await self.repository.get_results(job.job_id)
+
+        # Assert
+        assert custom_ids == ["0.0", "0.1", "0.2", "1"]
+        assert [
+            request["params"]["messages"][0]["content"].count("4つ作成")
+            for request in self.backend.requests[:3]
+        ] == [1, 1, 1]
+        assert sorted(ad_copy.copy_text for ad_copy in results[0].ad_copies) == ["Aの広告文1", "Aの広告文3"]
+        assert results[1].ad_copies[0].copy_text == "Bの広告文"
+
+    @pytest.mark.asyncio
+    async def test_results_before_completion_raise_error(self) -> None:
+        """完了前に結果を取得するとエラーが発生することをテストする."""
+        job = await self.repository.submit([make_ad_input("A")])
+
+        with pytest.raises(JobNotReadyError):
+            await self.repository.get_results(job.job_id)
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_raises_error(self) -> None:
+        """存在しないジョブでエラーが発生することをテストする."""
+        with pytest.raises(JobNotFoundError):
+            await self.repository.get_job("unknown")
@@ -0,0 +1,103 @@
+"""一括生成ユースケースのユニットテスト."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.application.usecases import GenerateAdCopyBatchUseCase, GenerateAdCopyUseCase
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import AdGenerationError
+from app.domain.repositories import AdGenerationRepository
+from tests.conftest import make_ad_input
+
+
+class RecordingRepository(AdGenerationRepository):
+    """同時実行数を記録し、指定された商品名で失敗するリポジトリ."""
+
+    def __init__(self, failing_products: List[str]) -> None:
+        self.failing_products = failing_products
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # 後ろの項目ほど早く完了させて順序の入れ替わりを起こす
+            await asyncio.sleep(0.01 / (len(ad_input.product_name) + 1))
+            if ad_input.product_name in self.failing_products:
+                raise AdGenerationError("API Error")
+            return [AdCopy(copy_text=f"{ad_input.product_name}の広告文")]
+        finally:
+            self.in_flight -= 1
+
+
+class TestGenerateAdCopyBatchUseCase:
+    """GenerateAdCopyBatchUseCaseのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_returned_in_input_order(self) -> None:
+        """結果が入力と同じ順序で返され、失敗は項目ごとのエラーになることをテストする."""
+        # Arrange
+        repository = RecordingRepository(failing_products=["BB"])
+        usecase = GenerateAdCopyBatchUseCase(
+            GenerateAdCopyUseCase(repository), max_concurrency=3
+        )
+        names = ["A", "BB", "CCC", "DDDD"]
+
+        # Act
+        results = await usecase.execute([make_ad_input(name) for name in names])
+
+        # Assert
+        assert [result.index for result in results] == [0, 1, 2, 3]
+        assert results[0].ad_copies == [AdCopy(copy_text="Aの広告文")]
+        assert not results[1].succeeded
+        assert isinstance(results[1].error, AdGenerationError)
+        assert results[3].ad_copies == [AdCopy(copy_text="DDDDの広告文")]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self) -> None:
+        """同時実行数が上限を超えないことをテストする."""
+        # Arrange
+        repository = RecordingRepository(failing_products=[])
+        usecase = GenerateAdCopyBatchUseCase(
+            GenerateAdCopyUseCase(repository), max_concurrency=2
+        )
+
+        # Act
+        results = await usecase.execute([make_ad_input(f"P{i}") for i in range(10)])
+
+        # Assert
+        assert len(results) == 10
+        assert repository.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_global_limiter_is_shared_between_batches(self) -> None:
+        """全体の同時実行数制限が複数の一括生成で共有されることをテストする."""
+        # Arrange
+        repository = RecordingRepository(failing_products=[])
+        limiter = asyncio.Semaphore(3)
+        usecases = [
+            GenerateAdCopyBatchUseCase(
+                GenerateAdCopyUseCase(repository), max_concurrency=4, global_limiter=limiter
+            )
+            for _ in range(2)
+        ]
+
+        # Act
+        await asyncio.gather(
+            *[usecase.execute([make_ad_input(f"P{i}") for i in range(8)]) for usecase in usecases]
+        )
+
+        # Assert
+        assert repository.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_input_returns_empty_results(self) -> None:
+        """空の入力で空の結果が返されることをテストする."""
+        usecase = GenerateAdCopyBatchUseCase(
+            GenerateAdCopyUseCase(RecordingRepository(failing_products=[])), max_concurrency=2
+        )
+
+        assert await usecase.execute([]) == []
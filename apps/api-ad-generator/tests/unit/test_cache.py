@@ -0,0 +1,329 @@
+"""生成結果キャッシュのユニットテスト."""
+
+import itertools
+from functools import partial
+from typing import AsyncIterator, List
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.domain.entities import AdCopy, AdCopyEvaluation, AdInput, Tone
+from app.infrastructure.cache import (
+    CacheControl,
+    CachedAdGenerationRepository,
+    InMemoryLRUCacheBackend,
+    SQLiteCacheBackend,
+    ad_input_cache_key,
+    cache_control,
+    generation_cache_key,
+)
+from tests.conftest import FakeClock, make_ad_input
+
+_ad_input = partial(
+    make_ad_input, appeal_points=["ポイント1", "ポイント2"], tone=Tone.CASUAL, num_copies=2
+)
+
+
+class TestAdInputCacheKey:
+    """キャッシュキー生成のテスト."""
+
+    def test_whitespace_and_width_are_normalized(self) -> None:
+        """空白や全角半角の違いが同じキーになることをテストする."""
+        key1 = ad_input_cache_key(_ad_input(product_name="Test  Product "))
+        key2 = ad_input_cache_key(_ad_input(product_name="Ｔｅｓｔ　Product"))
+
+        assert key1 == key2
+
+    def test_different_inputs_have_different_keys(self) -> None:
+        """異なる入力が異なるキーになることをテストする."""
+        assert ad_input_cache_key(_ad_input()) != ad_input_cache_key(_ad_input(num_copies=3))
+        assert ad_input_cache_key(_ad_input()) != ad_input_cache_key(_ad_input(tone=None))
+
+    def test_appeal_point_order_is_normalized(self) -> None:
+        """アピールポイントの順序や空白の違いが同じキーになることをテストする."""
+        key1 = ad_input_cache_key(_ad_input(appeal_points=["ポイント1", "ポイント2"]))
+        key2 = ad_input_cache_key(_ad_input(appeal_points=[" ポイント2", "ポイント1 "]))
+
+        assert key1 == key2
+
+    def test_generation_key_ignores_num_copies(self) -> None:
+        """生成結果を蓄積するキーは生成数によらないことをテストする."""
+        assert generation_cache_key(_ad_input(num_copies=1)) == generation_cache_key(_ad_input(num_copies=5))
+        assert generation_cache_key(_ad_input()) != generation_cache_key(_ad_input(tone=None))
+
+
+class TestInMemoryLRUCacheBackend:
+    """InMemoryLRUCacheBackendのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self) -> None:
+        """上限を超えると最も使われていないエントリが削除されることをテストする."""
+        # Arrange
+        backend = InMemoryLRUCacheBackend(max_entries=2)
+        await backend.set("a", [AdCopy(copy_text="A")])
+        await backend.set("b", [AdCopy(copy_text="B")])
+        await backend.get("a")
+
+        # Act
+        await backend.set("c", [AdCopy(copy_text="C")])
+
+        # Assert
+        assert await backend.get("a") == [AdCopy(copy_text="A")]
+        assert await backend.get("b") is None
+        assert await backend.size() == 2
+        assert backend.stats.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_not_returned(self) -> None:
+        """TTLを過ぎたエントリが返されないことをテストする."""
+        # Arrange
+        clock = FakeClock()
+        backend = InMemoryLRUCacheBackend(ttl_seconds=10.0, clock=clock)
+        await backend.set("a", [AdCopy(copy_text="A")])
+
+        # Act
+        clock.now += 10.0
+
+        # Assert
+        assert await backend.get("a") is None
+        assert backend.stats.expirations == 1
+
+
+class TestSQLiteCacheBackend:
+    """SQLiteCacheBackendのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_entries_are_shared_between_instances(self, tmp_path) -> None:
+        """同じファイルを使う別インスタンス間でエントリを共有できることをテストする."""
+        # Arrange
+        path = str(tmp_path / "cache.sqlite3")
+        writer = SQLiteCacheBackend(path=path)
+        reader = SQLiteCacheBackend(path=path)
+        ad_copies = [
+            AdCopy(
+                copy_text="素晴らしい商品です",
+                headline="ヘッドライン",
+                evaluation=AdCopyEvaluation(0.9, 0.8, "良い響き"),
+            )
+        ]
+
+        # Act
+        await writer.set("a", ad_copies)
+
+        # Assert
+        assert await reader.get("a") == ad_copies
+        writer.close()
+        reader.close()
+
+    @pytest.mark.asyncio
+    async def test_size_and_ttl_are_bounded(self, tmp_path) -> None:
+        """エントリ数の上限とTTLが適用されることをテストする."""
+        # Arrange
+        clock = FakeClock()
+        backend = SQLiteCacheBackend(
+            path=str(tmp_path / "cache.sqlite3"), max_entries=2, ttl_seconds=10.0, clock=clock
+        )
+
+        # Act
+        for key in ["a", "b", "c"]:
+            clock.now += 1.0
+            await backend.set(key, [AdCopy(copy_text=key)])
+
+        # Assert
+        assert await backend.size() == 2
+        assert await backend.get("a") is None
+        clock.now += 10.0
+        assert await backend.get("c") is None
+        backend.close()
+
+
+def _ad_copy(copy_text: str, score: float) -> AdCopy:
+    return AdCopy(
+        copy_text=copy_text,
+        evaluation=AdCopyEvaluation(
+            relevance_score=score, creativity_score=score, target_audience_appeal="響く"
+        ),
+    )
+
+
+_generations = itertools.count(1)
+
+
+async def _generate(ad_input: AdInput) -> List[AdCopy]:
+    """要求された数だけ、後の要素ほど評価の低い広告文を返す."""
+    generation = next(_generations)
+    return [
+        _ad_copy(f"広告文{generation}-{i + 1}", score=0.9 - 0.1 * i) for i in range(ad_input.num_copies)
+    ]
+
+
+class TestCachedAdGenerationRepository:
+    """CachedAdGenerationRepositoryのテスト."""
+
+    def setup_method(self) -> None:
+        """テスト前の準備."""
+        self.inner = Mock()
+        self.inner.generate_ad_copies = AsyncMock(side_effect=_generate)
+        self.backend = InMemoryLRUCacheBackend()
+        self.repository = CachedAdGenerationRepository(self.inner, self.backend)
+
+    @pytest.mark.asyncio
+    async def test_identical_input_is_served_from_cache(self) -> None:
+        """同一入力の2回目がキャッシュから返されることをテストする."""
+        # Act
+        first = await self.repository.generate_ad_copies(_ad_input())
+        second = await self.repository.generate_ad_copies(_ad_input())
+
+        # Assert
+        assert first == second
+        self.inner.generate_ad_copies.assert_called_once()
+        assert self.backend.stats.hits == 1
+        assert self.backend.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_no_cache_bypasses_lookup(self) -> None:
+        """no-cache指定でキャッシュを参照せずに再生成することをテストする."""
+        # Arrange
+        await self.repository.generate_ad_copies(_ad_input())
+
+        # Act
+        token = cache_control.set(CacheControl.from_header("no-cache"))
+        try:
+            await self.repository.generate_ad_copies(_ad_input())
+        finally:
+            cache_control.reset(token)
+
+        # Assert
+        assert self.inner.generate_ad_copies.call_count == 2
+        assert self.backend.stats.bypasses == 1
+
+    @pytest.mark.asyncio
+    async def test_no_store_does_not_write(self) -> None:
+        """no-store指定で結果が保存されないことをテストする."""
+        # Act
+        token = cache_control.set(CacheControl.from_header("no-store"))
+        try:
+            await self.repository.generate_ad_copies(_ad_input())
+        finally:
+            cache_control.reset(token)
+
+        # Assert
+        assert await self.backend.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_smaller_request_is_served_from_larger_generation(self) -> None:
+        """生成数の少ないリクエストが、蓄積した広告文の上位から返されることをテストする."""
+        # Arrange
+        generated = await self.repository.generate_ad_copies(_ad_input(num_copies=5))
+
+        # Act
+        ad_copies = await self.repository.generate_ad_copies(_ad_input(num_copies=2))
+
+        # Assert
+        assert ad_copies == generated[:2]
+        self.inner.generate_ad_copies.assert_called_once()
+        assert self.backend.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_only_missing_copies_are_generated(self) -> None:
+        """蓄積が足りない場合は不足分だけを生成し、評価の高い順に返すことをテストする."""
+        # Arrange
+        await self.repository.generate_ad_copies(_ad_input(num_copies=2))
+
+        # Act
+        ad_copies = await self.repository.generate_ad_copies(
+            _ad_input(num_copies=4, appeal_points=["ポイント2", "ポイント1"])
+        )
+
+        # Assert
+        assert self.inner.generate_ad_copies.call_args.args[0].num_copies == 2
+        scores = [ad_copy.evaluation.relevance_score for ad_copy in ad_copies]
+        assert len(ad_copies) == 4
+        assert scores == sorted(scores, reverse=True)
+        assert self.backend.stats.partial_hits == 1
+        assert len(await self.backend.get(generation_cache_key(_ad_input()))) == 4
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_stored_copies_before_missing_ones(self) -> None:
+        """ストリーミングでは蓄積した広告文を先に返し、不足分を生成して蓄積に加えることをテストする."""
+        # Arrange
+        stored = await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+        streamed_inputs: List[AdInput] = []
+
+        async def stream(ad_input: AdInput) -> AsyncIterator[AdCopy]:
+            streamed_inputs.append(ad_input)
+            yield _ad_copy("ストリーミング", score=0.5)
+
+        self.inner.stream_ad_copies = stream
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in self.repository.stream_ad_copies(_ad_input(num_copies=2))]
+
+        # Assert
+        assert ad_copies[0] == stored[0]
+        assert ad_copies[1].copy_text == "ストリーミング"
+        assert [ad_input.num_copies for ad_input in streamed_inputs] == [1]
+        assert len(await self.backend.get(generation_cache_key(_ad_input()))) == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicates_of_stored_copies_are_generated_again(self) -> None:
+        """不足分の生成が蓄積と重複した場合に、生成し直して要求された数を返すことをテストする."""
+        # Arrange
+        stored = await self.repository.generate_ad_copies(_ad_input(num_copies=2))
+        regenerations = iter(
+            [
+                [_ad_copy(stored[0].copy_text, 0.5), _ad_copy("新しい広告文1", 0.5)],
+                [_ad_copy("新しい広告文2", 0.4)],
+            ]
+        )
+        self.inner.generate_ad_copies = AsyncMock(side_effect=lambda ad_input: next(regenerations))
+
+        # Act
+        ad_copies = await self.repository.generate_ad_copies(_ad_input(num_copies=4))
+
+        # Assert
+        assert len(ad_copies) == 4
+        calls = self.inner.generate_ad_copies.call_args_list
+        assert [call.args[0].num_copies for call in calls] == [2, 1]
+        assert len(await self.backend.get(generation_cache_key(_ad_input()))) == 4
+
+    @pytest.mark.asyncio
+    async def test_regeneration_stops_without_new_copies(self) -> None:
+        """生成し直しても重複しか得られない場合は、それ以上生成しないことをテストする."""
+        # Arrange
+        stored = await self.repository.generate_ad_copies(_ad_input(num_copies=2))
+        self.inner.generate_ad_copies = AsyncMock(return_value=[_ad_copy(stored[1].copy_text, 0.5)])
+
+        # Act
+        ad_copies = await self.repository.generate_ad_copies(_ad_input(num_copies=3))
+
+        # Assert
+        assert ad_copies == stored
+        self.inner.generate_ad_copies.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_skips_duplicates_of_stored_copies(self) -> None:
+        """ストリーミングで蓄積と重複した広告文を返さず、不足分を生成し直すことをテストする."""
+        # Arrange
+        stored = await self.repository.generate_ad_copies(_ad_input(num_copies=1))
+        streamed_inputs: List[AdInput] = []
+        regenerations = iter([[stored[0].copy_text, "新しい広告文1"], ["新しい広告文2"]])
+
+        async def stream(ad_input: AdInput) -> AsyncIterator[AdCopy]:
+            streamed_inputs.append(ad_input)
+            for copy_text in next(regenerations):
+                yield _ad_copy(copy_text, score=0.5)
+
+        self.inner.stream_ad_copies = stream
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in self.repository.stream_ad_copies(_ad_input(num_copies=3))]
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == [
+            stored[0].copy_text,
+            "新しい広告文1",
+            "新しい広告文2",
+        ]
+        assert [ad_input.num_copies for ad_input in streamed_inputs] == [2, 1]
+        assert len(await self.backend.get(generation_cache_key(_ad_input()))) == 3
@@ -53,7 +53,7 @@ class TestAdInput:
 
     def test_invalid_num_copies_raises_error(self) -> None:
         """無効な生成数でエラーが発生することをテストする."""
-        with pytest.raises(ValueError, match="生成数は1から5の間で指定してください"):
+        with pytest.raises(ValueError, match="生成数は1から50の間で指定してください"):
             AdInput(
                 product_name="Test Product",
                 target_audience="20代女性",
@@ -61,12 +61,12 @@ class TestAdInput:
                 num_copies=0,
             )
 
-        with pytest.raises(ValueError, match="生成数は1から5の間で指定してください"):
+        with pytest.raises(ValueError, match="生成数は1から50の間で指定してください"):
             AdInput(
                 product_name="Test Product",
                 target_audience="20代女性",
                 appeal_points=["ポイント1"],
-                num_copies=6,
+                num_copies=51,
             )
 
 
@@ -132,6 +132,12 @@ class TestAdCopy:
         with pytest.raises(ValueError, match="広告文の本文は必須です"):
             AdCopy(copy_text="")
 
+    def test_ad_copy_has_no_instance_dict(self) -> None:
+        """広告文が __slots__ で属性を保持し、インスタンス辞書を持たないことをテストする."""
+        ad_copy = AdCopy(copy_text="素晴らしい商品です")
+
+        assert not hasattr(ad_copy, "__dict__")
+
 
 class TestTone:
     """Toneエンティティのテスト."""
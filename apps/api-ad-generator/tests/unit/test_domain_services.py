@@ -0,0 +1,148 @@
+"""ドメインサービスのユニットテスト."""
+
+import pytest
+
+from app.domain.entities import AdCopy, AdCopyEvaluation
+from app.domain.services import (
+    AdCopyFanOutService,
+    AdCopyRankingService,
+    NearDuplicateDetector,
+    near_duplicate_detector,
+)
+from tests.conftest import make_ad_input
+
+
+def _ad_copy(copy_text: str, relevance: float = 0.5, creativity: float = 0.5) -> AdCopy:
+    return AdCopy(
+        copy_text=copy_text,
+        evaluation=AdCopyEvaluation(
+            relevance_score=relevance,
+            creativity_score=creativity,
+            target_audience_appeal="コメント",
+        ),
+    )
+
+
+class TestAdCopyRankingService:
+    """AdCopyRankingServiceのテスト."""
+
+    def setup_method(self) -> None:
+        """テスト前の準備."""
+        self.service = AdCopyRankingService()
+
+    def test_deduplicate_ignores_width_and_whitespace(self) -> None:
+        """全角半角や空白の違いだけの広告文が重複とみなされることをテストする."""
+        # Arrange
+        ad_copies = [_ad_copy("Watch X で快適に"), _ad_copy("Ｗａｔｃｈ　Ｘ  で快適に"), _ad_copy("別の広告文")]
+
+        # Act
+        unique = self.service.deduplicate(ad_copies)
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in unique] == ["Watch X で快適に", "別の広告文"]
+
+    def test_rank_orders_by_score_and_keeps_ties_stable(self) -> None:
+        """評価スコアの高い順に並び、同点は元の順序を保つことをテストする."""
+        # Arrange
+        ad_copies = [
+            AdCopy(copy_text="評価なし"),
+            _ad_copy("中1", 0.5, 0.5),
+            _ad_copy("高", 0.9, 0.9),
+            _ad_copy("中2", 0.6, 0.4),
+        ]
+
+        # Act
+        ranked = self.service.rank(ad_copies)
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ranked] == ["高", "中1", "中2", "評価なし"]
+
+    def test_merge_limits_result(self) -> None:
+        """複数の結果をまとめて上位だけを返すことをテストする."""
+        merged = self.service.merge([[_ad_copy("A", 0.1)], [_ad_copy("B", 0.9), _ad_copy("A", 0.8)]], limit=1)
+
+        assert [ad_copy.copy_text for ad_copy in merged] == ["B"]
+
+
+class TestAdCopyFanOutService:
+    """AdCopyFanOutServiceのテスト."""
+
+    @pytest.mark.parametrize(
+        "num_copies, expected",
+        [(3, [3]), (5, [5]), (6, [3, 3]), (12, [4, 4, 4]), (50, [5] * 10), (11, [4, 4, 3])],
+    )
+    def test_split_balances_copies(self, num_copies: int, expected: list) -> None:
+        """生成数が上限以下の呼び出しに均等に割り振られることをテストする."""
+        sub_inputs = AdCopyFanOutService(max_copies_per_call=5).split(make_ad_input(num_copies=num_copies))
+
+        assert [sub_input.num_copies for sub_input in sub_inputs] == expected
+        assert all(sub_input.product_name == "Test Product" for sub_input in sub_inputs)
+
+    def test_invalid_max_copies_per_call_raises_error(self) -> None:
+        """1回の生成数に0以下を指定するとエラーが発生することをテストする."""
+        with pytest.raises(ValueError):
+            AdCopyFanOutService(max_copies_per_call=0)
+
+
+@pytest.fixture(params=["default", "pure_python"])
+def detector(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> NearDuplicateDetector:
+    """インストール済みの実装と numpy を使用しない実装の両方でテストする."""
+    if request.param == "pure_python":
+        monkeypatch.setattr(near_duplicate_detector, "np", None)
+    return NearDuplicateDetector(threshold=0.7)
+
+
+class TestNearDuplicateDetector:
+    """NearDuplicateDetectorのテスト."""
+
+    def test_near_identical_texts_are_detected(self, detector: NearDuplicateDetector) -> None:
+        """句読点や一部の語だけが異なる広告文がほぼ同じと判定されることをテストする."""
+        # Arrange
+        texts = [
+            "5日間充電不要のスマートウォッチで、毎日の健康管理をもっと手軽に。",
+            "5日間充電不要のスマートウォッチで毎日の健康管理をもっと手軽に!",
+            "5日間充電不要のスマートウォッチで、毎日の健康管理をもっと手軽に始めよう。",
+            "スタイリッシュなデザインで、ビジネスシーンにも自然になじむ一本。",
+        ]
+
+        # Act
+        duplicates = detector.find_duplicates(texts)
+
+        # Assert
+        assert duplicates == [False, True, True, False]
+
+    def test_is_duplicate_compares_with_kept_texts(self, detector: NearDuplicateDetector) -> None:
+        """残したテキストとの比較で判定されることをテストする."""
+        kept = ["睡眠の質を見える化して、明日のパフォーマンスを高めよう。"]
+
+        assert detector.is_duplicate("睡眠の質を見える化して明日のパフォーマンスを高めよう", kept)
+        assert not detector.is_duplicate("心拍数を24時間記録する高精度センサー搭載。", kept)
+
+    def test_similarity_of_short_texts(self) -> None:
+        """n-gram より短いテキストでも類似度を計算できることをテストする."""
+        detector = NearDuplicateDetector()
+
+        assert detector.similarity("新発売", "新発売") == 1.0
+        assert detector.similarity("新発売", "限定") == 0.0
+
+    def test_invalid_threshold_raises_error(self) -> None:
+        """無効なしきい値でエラーが発生することをテストする."""
+        with pytest.raises(ValueError):
+            NearDuplicateDetector(threshold=0.0)
+
+
+def test_ranking_service_keeps_highest_scored_near_duplicate() -> None:
+    """ほぼ同じ広告文のうち評価スコアの最も高いものが残ることをテストする."""
+    # Arrange
+    service = AdCopyRankingService(near_duplicate_detector=NearDuplicateDetector(threshold=0.7))
+    results = [
+        [_ad_copy("毎日の健康管理をもっと手軽に、もっとスマートに。", 0.5)],
+        [_ad_copy("毎日の健康管理をもっと手軽に もっとスマートに!", 0.9)],
+        [_ad_copy("ビジネスシーンになじむスタイリッシュなデザイン。", 0.1)],
+    ]
+
+    # Act
+    merged = service.merge(results)
+
+    # Assert
+    assert [ad_copy.evaluation.relevance_score for ad_copy in merged] == [0.9, 0.1]
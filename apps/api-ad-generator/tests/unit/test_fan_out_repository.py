@@ -0,0 +1,244 @@
+"""生成の分割リポジトリのユニットテスト."""
+
+import asyncio
+import itertools
+import time
+from typing import AsyncIterator, List, Optional
+
+import pytest
+
+from app.domain.entities import AdCopy, AdCopyEvaluation, AdInput
+from app.domain.exceptions import AdGenerationError
+from app.domain.repositories import AdGenerationRepository
+from app.domain.services import (
+    AdCopyFanOutService,
+    AdCopyRankingService,
+    NearDuplicateDetector,
+)
+from app.infrastructure.clients import FanOutAdGenerationRepository
+from tests.conftest import make_ad_input
+
+
+class CountingRepository(AdGenerationRepository):
+    """呼び出しごとに異なる広告文を一定時間後に返すリポジトリ."""
+
+    def __init__(self, latency: float = 0.0, duplicates: int = 0, near_duplicates: int = 0) -> None:
+        self.latency = latency
+        self.duplicates = duplicates
+        self.near_duplicates = near_duplicates
+        self.requested: List[int] = []
+        self.fail_calls: List[int] = []
+        self._counter = itertools.count()
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        call = len(self.requested)
+        self.requested.append(ad_input.num_copies)
+        await asyncio.sleep(self.latency)
+        if call in self.fail_calls:
+            raise AdGenerationError(f"{call}回目の生成に失敗しました")
+        return [self._next_copy() for _ in range(ad_input.num_copies)]
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        for ad_copy in await self.generate_ad_copies(ad_input):
+            await asyncio.sleep(0)
+            yield ad_copy
+
+    def _next_copy(self) -> AdCopy:
+        number = next(self._counter)
+        # 先頭から duplicates 件は同じ本文を返す
+        text = "重複する広告文" if number < self.duplicates else f"広告文{number}"
+        if number < self.near_duplicates:
+            # 末尾だけが異なる、ほぼ同じ広告文を返す
+            text = f"毎日の健康管理をもっと手軽に、もっとスマートに{'!' * number}"
+        return AdCopy(
+            copy_text=text,
+            evaluation=AdCopyEvaluation(
+                relevance_score=(number % 10) / 10,
+                creativity_score=0.5,
+                target_audience_appeal="コメント",
+            ),
+        )
+
+
+class TailRepository(AdGenerationRepository):
+    """広告文を返した後に、応答の残りを読むような待ちが入るリポジトリ."""
+
+    def __init__(self) -> None:
+        self.finished = 0
+        self.cancelled = 0
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        return [AdCopy(copy_text=f"広告文{i}") for i in range(ad_input.num_copies)]
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        for ad_copy in await self.generate_ad_copies(ad_input):
+            yield ad_copy
+        try:
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+
+
+class TestFanOutAdGenerationRepository:
+    """FanOutAdGenerationRepositoryのテスト."""
+
+    def _repository(self, inner: AdGenerationRepository) -> FanOutAdGenerationRepository:
+        return FanOutAdGenerationRepository(inner, fan_out_service=AdCopyFanOutService(5))
+
+    @pytest.mark.asyncio
+    async def test_small_request_is_not_split(self) -> None:
+        """上限以下の生成数では分割しないことをテストする."""
+        inner = CountingRepository()
+
+        ad_copies = await self._repository(inner).generate_ad_copies(make_ad_input(num_copies=3))
+
+        assert inner.requested == [3]
+        assert len(ad_copies) == 3
+
+    @pytest.mark.asyncio
+    async def test_large_request_runs_in_parallel_and_is_ranked(self) -> None:
+        """生成数の多いリクエストが並列に分割され、スコア順にまとめられることをテストする."""
+        # Arrange
+        inner = CountingRepository(latency=0.1)
+
+        # Act
+        started = time.perf_counter()
+        ad_copies = await self._repository(inner).generate_ad_copies(make_ad_input(num_copies=50))
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        assert inner.requested == [5] * 10
+        assert len(ad_copies) == 50
+        assert len({ad_copy.copy_text for ad_copy in ad_copies}) == 50
+        scores = [ad_copy.evaluation.relevance_score for ad_copy in ad_copies]
+        assert scores == sorted(scores, reverse=True)
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_topped_up(self) -> None:
+        """重複除去で不足した分が追加で生成されることをテストする."""
+        # Arrange
+        inner = CountingRepository(duplicates=3)
+
+        # Act
+        ad_copies = await self._repository(inner).generate_ad_copies(make_ad_input(num_copies=10))
+
+        # Assert
+        assert inner.requested == [5, 5, 2]
+        assert len(ad_copies) == 10
+        assert len({ad_copy.copy_text for ad_copy in ad_copies}) == 10
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_are_removed_and_topped_up(self) -> None:
+        """ほぼ同じ広告文が取り除かれ、取り除いた分が追加で生成されることをテストする."""
+        # Arrange
+        inner = CountingRepository(near_duplicates=3)
+        ranking_service = AdCopyRankingService(near_duplicate_detector=NearDuplicateDetector())
+        repository = FanOutAdGenerationRepository(
+            inner,
+            fan_out_service=AdCopyFanOutService(5, ranking_service=ranking_service),
+            ranking_service=ranking_service,
+        )
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(make_ad_input(num_copies=3))
+
+        # Assert
+        assert inner.requested == [3, 2]
+        assert [ad_copy.copy_text.startswith("毎日の") for ad_copy in ad_copies].count(True) == 1
+        assert len(ad_copies) == 3
+
+    @pytest.mark.asyncio
+    async def test_top_up_can_be_disabled(self) -> None:
+        """追加の生成を無効にできることをテストする."""
+        inner = CountingRepository(duplicates=2)
+        repository = FanOutAdGenerationRepository(inner, top_up=False)
+
+        ad_copies = await repository.generate_ad_copies(make_ad_input(num_copies=3))
+
+        assert inner.requested == [3]
+        assert len(ad_copies) == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_returns_succeeded_copies(self) -> None:
+        """一部の生成に失敗しても成功した分を返すことをテストする."""
+        # Arrange
+        inner = CountingRepository()
+        inner.fail_calls = [1]
+
+        # Act
+        ad_copies = await self._repository(inner).generate_ad_copies(make_ad_input(num_copies=10))
+
+        # Assert
+        assert len(ad_copies) == 5
+        assert inner.requested == [5, 5]
+
+    @pytest.mark.asyncio
+    async def test_all_failures_raise_error(self) -> None:
+        """全ての生成に失敗した場合はエラーが発生することをテストする."""
+        inner = CountingRepository()
+        inner.fail_calls = [0, 1]
+
+        with pytest.raises(AdGenerationError, match="0回目の生成に失敗しました"):
+            await self._repository(inner).generate_ad_copies(make_ad_input(num_copies=10))
+
+    @pytest.mark.asyncio
+    async def test_stream_deduplicates_and_stops_at_requested_count(self) -> None:
+        """ストリーミングで重複を除き、要求数に達したら終了することをテストする."""
+        # Arrange
+        inner = CountingRepository(duplicates=3)
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in self._repository(inner).stream_ad_copies(make_ad_input(num_copies=10))]
+
+        # Assert
+        texts = [ad_copy.copy_text for ad_copy in ad_copies]
+        assert len(texts) == len(set(texts))
+        assert texts.count("重複する広告文") == 1
+        assert inner.requested == [5, 5]
+
+    @pytest.mark.asyncio
+    async def test_stream_raises_when_every_call_fails(self) -> None:
+        """ストリーミングで全ての生成に失敗した場合はエラーが発生することをテストする."""
+        inner = CountingRepository()
+        inner.fail_calls = [0, 1]
+        error: Optional[Exception] = None
+
+        try:
+            async for _ in self._repository(inner).stream_ad_copies(make_ad_input(num_copies=10)):
+                pass
+        except AdGenerationError as e:
+            error = e
+
+        assert error is not None
+
+    @pytest.mark.asyncio
+    async def test_stream_waits_for_inner_streams_after_requested_count(self) -> None:
+        """要求数に達した後も、内側のストリームを中断せずに読み終えることをテストする."""
+        # Arrange
+        inner = TailRepository()
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in self._repository(inner).stream_ad_copies(make_ad_input(num_copies=3))]
+
+        # Assert
+        assert len(ad_copies) == 3
+        assert inner.finished == 1
+        assert inner.cancelled == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_cancels_inner_streams_when_consumer_stops(self) -> None:
+        """呼び出し側が中断した場合は内側のストリームを止めることをテストする."""
+        # Arrange
+        inner = TailRepository()
+        stream = self._repository(inner).stream_ad_copies(make_ad_input(num_copies=3))
+
+        # Act
+        await stream.__anext__()
+        await stream.aclose()
+
+        # Assert
+        assert inner.finished == 0
+        assert inner.cancelled == 1
@@ -0,0 +1,439 @@
+"""バックグラウンド生成ジョブのキューとワーカープールのユニットテスト."""
+
+import asyncio
+import sqlite3
+import time
+from functools import partial
+from typing import Callable, List, Optional
+
+import pytest
+
+from app.domain.entities import AdCopy, AdInput, GenerationJobStatus
+from app.domain.exceptions import (
+    AdGenerationError,
+    InvalidInputError,
+    JobNotFoundError,
+    ServiceUnavailableError,
+)
+from app.infrastructure.jobs import (
+    GenerationJobWorkerPool,
+    QueuedGenerationJobRepository,
+    SQLiteJobQueue,
+)
+from app.infrastructure.rate_limit import RequestPriority, request_priority
+from app.infrastructure.resilience import RetryPolicy
+from tests.conftest import FakeClock, make_ad_input
+
+_ad_input = partial(make_ad_input, num_copies=2)
+
+
+def _ad_copies(ad_input: AdInput) -> List[AdCopy]:
+    return [
+        AdCopy(copy_text=f"{ad_input.product_name}の広告文{i}", headline="見出し", call_to_action="今すぐ")
+        for i in range(ad_input.num_copies)
+    ]
+
+
+class FakeUseCase:
+    """一定時間待ってから広告文を返すユースケース（先頭の失敗を順に送出する）."""
+
+    def __init__(self, delay: float = 0.0, failures: Optional[List[Exception]] = None) -> None:
+        self.delay = delay
+        self.failures = list(failures or [])
+        self.priorities: List[RequestPriority] = []
+        self.started = asyncio.Event()
+
+    async def execute(self, ad_input: AdInput) -> List[AdCopy]:
+        self.priorities.append(request_priority.get())
+        self.started.set()
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            raise self.failures.pop(0)
+        return _ad_copies(ad_input)
+
+
+class FlakyJobQueue(SQLiteJobQueue):
+    """最初の完了の記録に失敗するジョブキュー."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path=path)
+        self.complete_failures = 1
+
+    def complete(self, job_id: str, lease_id: str, ad_copies: List[AdCopy]) -> bool:
+        if self.complete_failures:
+            self.complete_failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().complete(job_id, lease_id, ad_copies)
+
+
+async def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("条件が満たされませんでした")
+        await asyncio.sleep(0.01)
+
+
+class TestSQLiteJobQueue:
+    """SQLiteJobQueueのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.clock = FakeClock()
+
+    def test_claims_jobs_in_submission_order(self, tmp_path) -> None:
+        """登録順にジョブが取り出されることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"), clock=self.clock)
+        first = queue.enqueue(_ad_input("Product A"))
+        self.clock.now += 1
+        second = queue.enqueue(_ad_input("Product B"))
+
+        # Act
+        claimed = [queue.claim(visibility_timeout=30), queue.claim(visibility_timeout=30)]
+
+        # Assert
+        assert [job.job_id for job in claimed] == [first.job_id, second.job_id]
+        assert claimed[0].ad_input == _ad_input("Product A")
+        assert claimed[0].attempts == 1
+        assert queue.claim(visibility_timeout=30) is None
+        assert queue.get(first.job_id).status == GenerationJobStatus.RUNNING
+        queue.close()
+
+    def test_jobs_and_results_survive_reopen(self, tmp_path) -> None:
+        """ジョブと結果がプロセスの再起動後も残ることをテストする."""
+        # Arrange
+        path = str(tmp_path / "jobs.sqlite3")
+        queue = SQLiteJobQueue(path=path, clock=self.clock)
+        job = queue.enqueue(_ad_input())
+        queue.close()
+
+        # Act
+        queue = SQLiteJobQueue(path=path, clock=self.clock)
+        claimed = queue.claim(visibility_timeout=30)
+        completed = queue.complete(claimed.job_id, claimed.lease_id, _ad_copies(claimed.ad_input))
+        queue.close()
+        stored = SQLiteJobQueue(path=path, clock=self.clock).get(job.job_id)
+
+        # Assert
+        assert claimed.job_id == job.job_id
+        assert completed is True
+        assert stored.status == GenerationJobStatus.SUCCEEDED
+        assert stored.ad_copies == _ad_copies(_ad_input())
+        assert stored.finished_at is not None
+
+    def test_expired_lease_is_claimed_again(self, tmp_path) -> None:
+        """リースの期限が切れたジョブが再び取り出され、元のワーカーの記録は無視されることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"), clock=self.clock)
+        queue.enqueue(_ad_input())
+        stale = queue.claim(visibility_timeout=30)
+
+        # Act
+        self.clock.now += 29
+        before_expiry = queue.claim(visibility_timeout=30)
+        self.clock.now += 2
+        recovered = queue.claim(visibility_timeout=30)
+        stale_completed = queue.complete(stale.job_id, stale.lease_id, _ad_copies(stale.ad_input))
+
+        # Assert
+        assert before_expiry is None
+        assert recovered.job_id == stale.job_id
+        assert recovered.recovered is True
+        assert recovered.attempts == 2
+        assert stale_completed is False
+        assert queue.extend(stale.job_id, stale.lease_id, 30) is False
+        assert queue.get(stale.job_id).status == GenerationJobStatus.RUNNING
+        queue.close()
+
+    def test_extend_postpones_expiry(self, tmp_path) -> None:
+        """リースを延長すると期限まで取り出されないことをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"), clock=self.clock)
+        queue.enqueue(_ad_input())
+        claimed = queue.claim(visibility_timeout=30)
+
+        # Act
+        self.clock.now += 20
+        extended = queue.extend(claimed.job_id, claimed.lease_id, 30)
+        self.clock.now += 20
+
+        # Assert
+        assert extended is True
+        assert queue.claim(visibility_timeout=30) is None
+        queue.close()
+
+    def test_failed_job_is_retried_after_delay_until_max_attempts(self, tmp_path) -> None:
+        """再試行の待ち時間の後に再び取り出され、上限に達すると失敗になることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(
+            path=str(tmp_path / "jobs.sqlite3"), max_attempts=2, clock=self.clock
+        )
+        job = queue.enqueue(_ad_input())
+        error = ServiceUnavailableError("混雑しています")
+
+        # Act
+        first = queue.claim(visibility_timeout=30)
+        first_status = queue.fail(first.job_id, first.lease_id, error, retry_delay=10)
+        waiting = queue.get(job.job_id)
+        before_delay = queue.claim(visibility_timeout=30)
+        self.clock.now += 10
+        second = queue.claim(visibility_timeout=30)
+        second_status = queue.fail(second.job_id, second.lease_id, error, retry_delay=10)
+        failed = queue.get(job.job_id)
+
+        # Assert
+        assert first_status == GenerationJobStatus.QUEUED
+        assert waiting.status == GenerationJobStatus.QUEUED
+        assert waiting.error is None
+        assert before_delay is None
+        assert second.attempts == 2
+        assert second_status == GenerationJobStatus.FAILED
+        assert failed.status == GenerationJobStatus.FAILED
+        assert isinstance(failed.error, ServiceUnavailableError)
+        assert failed.error.message == "混雑しています"
+        assert queue.counts() == {"queued": 0, "running": 0, "succeeded": 0, "failed": 1}
+        queue.close()
+
+    def test_job_that_never_finishes_fails_after_max_attempts(self, tmp_path) -> None:
+        """ワーカーの異常終了を繰り返すジョブが上限で失敗になることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(
+            path=str(tmp_path / "jobs.sqlite3"), max_attempts=2, clock=self.clock
+        )
+        job = queue.enqueue(_ad_input())
+
+        # Act
+        queue.claim(visibility_timeout=30)
+        self.clock.now += 31
+        queue.claim(visibility_timeout=30)
+        self.clock.now += 31
+        claimed = queue.claim(visibility_timeout=30)
+
+        # Assert
+        assert claimed is None
+        assert queue.get(job.job_id).status == GenerationJobStatus.FAILED
+        assert isinstance(queue.get(job.job_id).error, AdGenerationError)
+        queue.close()
+
+    def test_release_does_not_count_as_attempt(self, tmp_path) -> None:
+        """リースを返却したジョブはすぐに取り出され、回数に数えられないことをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"), clock=self.clock)
+        queue.enqueue(_ad_input())
+        claimed = queue.claim(visibility_timeout=30)
+
+        # Act
+        released = queue.release(claimed.job_id, claimed.lease_id)
+        reclaimed = queue.claim(visibility_timeout=30)
+
+        # Assert
+        assert released is True
+        assert reclaimed.attempts == 1
+        assert reclaimed.recovered is False
+        queue.close()
+
+
+class TestQueuedGenerationJobRepository:
+    """QueuedGenerationJobRepositoryのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_submit_notifies_and_unknown_job_raises(self, tmp_path) -> None:
+        """登録時に通知され、存在しないジョブで例外が発生することをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        notified: List[bool] = []
+        repository = QueuedGenerationJobRepository(queue, on_submit=lambda: notified.append(True))
+
+        # Act
+        job = await repository.submit(_ad_input())
+        stored = await repository.get_job(job.job_id)
+
+        # Assert
+        assert notified == [True]
+        assert stored.status == GenerationJobStatus.QUEUED
+        with pytest.raises(JobNotFoundError):
+            await repository.get_job("unknown")
+        queue.close()
+
+
+class TestGenerationJobWorkerPool:
+    """GenerationJobWorkerPoolのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_processes_jobs_with_bulk_priority(self, tmp_path) -> None:
+        """ジョブが低い優先度で処理され、結果が保存されることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        usecase = FakeUseCase()
+        pool = GenerationJobWorkerPool(queue, usecase, num_workers=2, poll_interval=0.01)
+        jobs = [queue.enqueue(_ad_input(f"Product {i}")) for i in range(3)]
+
+        # Act
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats.succeeded == 3)
+        finally:
+            await pool.stop()
+
+        # Assert
+        for i, job in enumerate(jobs):
+            stored = queue.get(job.job_id)
+            assert stored.status == GenerationJobStatus.SUCCEEDED
+            assert stored.ad_copies == _ad_copies(_ad_input(f"Product {i}"))
+        assert usecase.priorities == [RequestPriority.BULK] * 3
+        assert (await pool.to_dict())["succeededJobs"] == 3
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_retried(self, tmp_path) -> None:
+        """上流の混雑で失敗したジョブが再試行されることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        usecase = FakeUseCase(failures=[ServiceUnavailableError("混雑しています")])
+        pool = GenerationJobWorkerPool(
+            queue,
+            usecase,
+            num_workers=1,
+            poll_interval=0.01,
+            retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.01),
+        )
+        job = queue.enqueue(_ad_input())
+
+        # Act
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats.succeeded == 1)
+        finally:
+            await pool.stop()
+
+        # Assert
+        stored = queue.get(job.job_id)
+        assert stored.status == GenerationJobStatus.SUCCEEDED
+        assert stored.attempts == 2
+        assert pool.stats.retried == 1
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_input_is_not_retried(self, tmp_path) -> None:
+        """再試行しても成功しないエラーでは再試行しないことをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        usecase = FakeUseCase(failures=[InvalidInputError("入力が不正です")])
+        pool = GenerationJobWorkerPool(queue, usecase, num_workers=1, poll_interval=0.01)
+        job = queue.enqueue(_ad_input())
+
+        # Act
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats.failed == 1)
+        finally:
+            await pool.stop()
+
+        # Assert
+        stored = queue.get(job.job_id)
+        assert stored.status == GenerationJobStatus.FAILED
+        assert stored.attempts == 1
+        assert isinstance(stored.error, InvalidInputError)
+        assert pool.stats.retried == 0
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_recovers_job_left_by_crashed_worker(self, tmp_path) -> None:
+        """異常終了したワーカーが処理中だったジョブを、リースの期限後に別のワーカーが完了させることをテストする."""
+        # Arrange
+        path = str(tmp_path / "jobs.sqlite3")
+        crashed = SQLiteJobQueue(path=path)
+        job = crashed.enqueue(_ad_input())
+        # 取り出した後に完了を記録しないまま終了したプロセスを再現する
+        crashed.claim(visibility_timeout=0.2)
+        crashed.close()
+
+        queue = SQLiteJobQueue(path=path)
+        pool = GenerationJobWorkerPool(queue, FakeUseCase(), num_workers=1, poll_interval=0.01)
+
+        # Act
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats.succeeded == 1)
+        finally:
+            await pool.stop()
+
+        # Assert
+        stored = queue.get(job.job_id)
+        assert stored.status == GenerationJobStatus.SUCCEEDED
+        assert stored.attempts == 2
+        assert pool.stats.recovered == 1
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_releases_in_flight_job(self, tmp_path) -> None:
+        """停止時に処理中だったジョブが待機中に戻ることをテストする."""
+        # Arrange
+        queue = SQLiteJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        usecase = FakeUseCase(delay=10.0)
+        pool = GenerationJobWorkerPool(queue, usecase, num_workers=1, poll_interval=0.01)
+        job = queue.enqueue(_ad_input())
+
+        # Act
+        pool.start()
+        await asyncio.wait_for(usecase.started.wait(), 5.0)
+        await pool.stop()
+
+        # Assert
+        stored = queue.get(job.job_id)
+        assert stored.status == GenerationJobStatus.QUEUED
+        assert stored.attempts == 0
+        assert pool.running is False
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_failure_to_record_result(self, tmp_path) -> None:
+        """結果の記録に失敗してもワーカーが終了せず、次のジョブを処理することをテストする."""
+        # Arrange
+        queue = FlakyJobQueue(path=str(tmp_path / "jobs.sqlite3"))
+        pool = GenerationJobWorkerPool(queue, FakeUseCase(), num_workers=1, poll_interval=0.01)
+        first = queue.enqueue(_ad_input("Product 1"))
+        second = queue.enqueue(_ad_input("Product 2"))
+
+        # Act
+        pool.start()
+        try:
+            await _wait_for(lambda: pool.stats.succeeded == 1)
+            workers = (await pool.to_dict())["workers"]
+        finally:
+            await pool.stop()
+
+        # Assert
+        assert workers == 1
+        assert queue.get(first.job_id).status == GenerationJobStatus.RUNNING
+        assert queue.get(second.job_id).status == GenerationJobStatus.SUCCEEDED
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_workers(self, tmp_path) -> None:
+        """ワーカー数を増やすと同じ数のジョブを短い時間で処理できることをテストする."""
+
+        async def drain(num_workers: int) -> float:
+            queue = SQLiteJobQueue(path=str(tmp_path / f"jobs_{num_workers}.sqlite3"))
+            for i in range(8):
+                queue.enqueue(_ad_input(f"Product {i}"))
+            pool = GenerationJobWorkerPool(
+                queue, FakeUseCase(delay=0.05), num_workers=num_workers, poll_interval=0.01
+            )
+            started = time.perf_counter()
+            pool.start()
+            try:
+                await _wait_for(lambda: pool.stats.succeeded == 8)
+            finally:
+                await pool.stop()
+                queue.close()
+            return time.perf_counter() - started
+
+        # Act
+        single = await drain(1)
+        parallel = await drain(4)
+
+        # Assert
+        assert single >= 0.4
+        assert parallel < single / 2
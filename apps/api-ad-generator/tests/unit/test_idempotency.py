@@ -0,0 +1,168 @@
+"""冪等キーのストアとコーディネーターのユニットテスト."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.domain.entities import AdCopy
+from app.domain.exceptions import AdGenerationError, IdempotencyKeyMismatchError
+from app.infrastructure.idempotency import (
+    IdempotencyCoordinator,
+    IdempotencyRecord,
+    InMemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+)
+from tests.conftest import FakeClock
+
+
+class CountingOperation:
+    """呼び出し回数を数え、呼び出しごとに異なる広告文を返す生成処理."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0) -> None:
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self) -> List[AdCopy]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise AdGenerationError("生成に失敗しました")
+        return [AdCopy(copy_text=f"広告文{self.calls}")]
+
+
+class TestIdempotencyStores:
+    """冪等キーのストアのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_in_memory_store_expires_and_evicts(self) -> None:
+        """期限切れの記録と上限を超えた古い記録が削除されることをテストする."""
+        # Arrange
+        clock = FakeClock()
+        store = InMemoryIdempotencyStore(max_entries=2, ttl_seconds=10, clock=clock)
+        record = IdempotencyRecord(fingerprint="f", ad_copies=[AdCopy(copy_text="広告文")])
+
+        # Act
+        await store.set("a", record)
+        await store.set("b", record)
+        await store.set("c", record)
+        evicted = await store.get("a")
+        clock.now += 10
+        expired = await store.get("b")
+
+        # Assert
+        assert evicted is None
+        assert expired is None
+
+    @pytest.mark.asyncio
+    async def test_sqlite_store_survives_reopen(self, tmp_path) -> None:
+        """SQLite のストアの記録が再起動後も残ることをテストする."""
+        # Arrange
+        path = str(tmp_path / "idempotency.sqlite3")
+        store = SQLiteIdempotencyStore(path=path)
+        record = IdempotencyRecord(fingerprint="f", ad_copies=[AdCopy(copy_text="広告文")])
+        await store.set("key", record)
+        store.close()
+
+        # Act
+        reopened = SQLiteIdempotencyStore(path=path)
+        stored = await reopened.get("key")
+        size = await reopened.size()
+        reopened.close()
+
+        # Assert
+        assert stored == record
+        assert size == 1
+
+
+class TestIdempotencyCoordinator:
+    """IdempotencyCoordinatorのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.coordinator = IdempotencyCoordinator(InMemoryIdempotencyStore())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_retries_join_running_execution(self) -> None:
+        """実行中の再送が同じ実行の結果を受け取ることをテストする."""
+        # Arrange
+        operation = CountingOperation(delay=0.05)
+
+        # Act
+        results = await asyncio.gather(
+            *(self.coordinator.execute("key", "f", operation) for _ in range(3))
+        )
+
+        # Assert
+        assert operation.calls == 1
+        assert [result[0] for result in results] == [[AdCopy(copy_text="広告文1")]] * 3
+        assert sorted(result[1] for result in results) == [False, True, True]
+        assert self.coordinator.stats.executions == 1
+        assert self.coordinator.stats.joined == 2
+
+    @pytest.mark.asyncio
+    async def test_completed_result_is_replayed(self) -> None:
+        """完了した実行の結果が再送にそのまま返されることをテストする."""
+        # Arrange
+        operation = CountingOperation()
+        first, _ = await self.coordinator.execute("key", "f", operation)
+
+        # Act
+        replayed, is_replay = await self.coordinator.execute("key", "f", operation)
+
+        # Assert
+        assert operation.calls == 1
+        assert replayed == first
+        assert is_replay is True
+        assert self.coordinator.stats.replays == 1
+
+    @pytest.mark.asyncio
+    async def test_mismatched_request_is_rejected(self) -> None:
+        """同じキーで内容の異なるリクエストが拒否されることをテストする."""
+        # Arrange
+        operation = CountingOperation(delay=0.05)
+        running = asyncio.ensure_future(self.coordinator.execute("key", "f", operation))
+        await asyncio.sleep(0)
+
+        # Act & Assert
+        with pytest.raises(IdempotencyKeyMismatchError):
+            await self.coordinator.execute("key", "other", operation)
+        await running
+        with pytest.raises(IdempotencyKeyMismatchError):
+            await self.coordinator.execute("key", "other", operation)
+        assert operation.calls == 1
+        assert self.coordinator.stats.mismatches == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_execution_is_not_stored(self) -> None:
+        """失敗した実行は保存されず、再送で改めて実行されることをテストする."""
+        # Arrange
+        operation = CountingOperation(failures=1)
+        with pytest.raises(AdGenerationError):
+            await self.coordinator.execute("key", "f", operation)
+
+        # Act
+        ad_copies, is_replay = await self.coordinator.execute("key", "f", operation)
+
+        # Assert
+        assert operation.calls == 2
+        assert ad_copies == [AdCopy(copy_text="広告文2")]
+        assert is_replay is False
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_does_not_cancel_execution(self) -> None:
+        """最初のリクエストが切断されても実行が継続し、再送が結果を受け取ることをテストする."""
+        # Arrange
+        operation = CountingOperation(delay=0.05)
+        first = asyncio.ensure_future(self.coordinator.execute("key", "f", operation))
+        await asyncio.sleep(0)
+
+        # Act
+        first.cancel()
+        ad_copies, is_replay = await self.coordinator.execute("key", "f", operation)
+
+        # Assert
+        assert operation.calls == 1
+        assert ad_copies == [AdCopy(copy_text="広告文1")]
+        assert is_replay is True
@@ -0,0 +1,74 @@
+"""max_tokens の見積もりのユニットテスト."""
+
+from app.infrastructure.clients.max_tokens import MaxTokensEstimator
+
+
+class TestMaxTokensEstimator:
+    """MaxTokensEstimatorのテスト."""
+
+    def test_default_is_used_until_enough_samples(self) -> None:
+        """記録が少ない間は既定の1件あたりのトークン数で見積もることをテストする."""
+        # Arrange
+        estimator = MaxTokensEstimator(
+            default_tokens_per_copy=200, overhead_tokens=100, headroom=1.0, min_samples=3
+        )
+        estimator.record(output_tokens=1100, num_copies=2)
+
+        # Act
+        max_tokens = estimator.max_tokens(num_copies=3, limit=4096)
+
+        # Assert
+        assert estimator.tokens_per_copy() == 200
+        assert max_tokens == 700
+
+    def test_quantile_of_observed_output_is_used(self) -> None:
+        """記録が集まると1件あたりのトークン数の分位点で見積もることをテストする."""
+        # Arrange
+        estimator = MaxTokensEstimator(overhead_tokens=0, quantile=0.9, headroom=1.5, min_samples=10)
+        for tokens_per_copy in range(10, 110, 10):
+            estimator.record(output_tokens=tokens_per_copy * 2, num_copies=2)
+
+        # Act
+        max_tokens = estimator.max_tokens(num_copies=4, limit=4096)
+
+        # Assert
+        assert estimator.tokens_per_copy() == 90
+        assert max_tokens == 540
+        assert estimator.to_dict()["samples"] == 10
+
+    def test_quantile_follows_recent_window(self) -> None:
+        """保持する件数を超えた古い記録が分位点から除かれることをテストする."""
+        # Arrange
+        estimator = MaxTokensEstimator(overhead_tokens=0, quantile=1.0, window=3, min_samples=3)
+        for output_tokens in [500, 100, 200]:
+            estimator.record(output_tokens=output_tokens, num_copies=1)
+
+        # Act
+        before = estimator.tokens_per_copy()
+        estimator.record(output_tokens=300, num_copies=1)
+
+        # Assert
+        assert before == 500
+        assert estimator.tokens_per_copy() == 300
+        assert estimator.to_dict()["samples"] == 3
+
+    def test_max_tokens_is_bounded_by_limit_and_minimum(self) -> None:
+        """見積もりが上限と下限の範囲に収まることをテストする."""
+        # Arrange
+        estimator = MaxTokensEstimator(default_tokens_per_copy=500, min_tokens=256)
+
+        # Act & Assert
+        assert estimator.max_tokens(num_copies=10, limit=2000) == 2000
+        assert MaxTokensEstimator(default_tokens_per_copy=10).max_tokens(num_copies=1, limit=2000) == 256
+        assert MaxTokensEstimator(default_tokens_per_copy=10).max_tokens(num_copies=1, limit=100) == 100
+
+    def test_responses_without_copies_are_not_recorded(self) -> None:
+        """広告文を含まない出力は記録しないことをテストする."""
+        # Arrange
+        estimator = MaxTokensEstimator()
+
+        # Act
+        estimator.record(output_tokens=300, num_copies=0)
+
+        # Assert
+        assert estimator.to_dict()["samples"] == 0
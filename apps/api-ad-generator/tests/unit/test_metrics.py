@@ -0,0 +1,111 @@
+"""メトリクスのユニットテスト."""
+
+import pytest
+
+from app.infrastructure.metrics import MetricsRegistry, render_stats
+
+
+class TestMetricsRegistry:
+    """メトリクスのレジストリのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.registry = MetricsRegistry()
+
+    def test_counter_is_rendered_with_total_suffix(self) -> None:
+        """カウンターが _total 付きの名前で出力されることをテストする."""
+        # Arrange
+        counter = self.registry.counter("app_errors", "エラー数", ("type",))
+
+        # Act
+        counter.labels("ValueError").inc()
+        counter.labels("ValueError").inc(2)
+
+        # Assert
+        assert self.registry.render() == (
+            "# HELP app_errors エラー数\n"
+            "# TYPE app_errors counter\n"
+            'app_errors_total{type="ValueError"} 3\n'
+        )
+
+    def test_gauge_goes_up_and_down(self) -> None:
+        """ゲージの値が増減することをテストする."""
+        # Arrange
+        gauge = self.registry.gauge("app_in_flight", "処理中の数")
+
+        # Act
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        # Assert
+        assert "app_in_flight 1\n" in self.registry.render()
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """ヒストグラムのバケットが累積の件数で出力されることをテストする."""
+        # Arrange
+        histogram = self.registry.histogram("app_seconds", "処理時間", buckets=(0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        # Assert
+        lines = self.registry.render().splitlines()
+        assert 'app_seconds_bucket{le="0.1"} 2' in lines
+        assert 'app_seconds_bucket{le="1"} 3' in lines
+        assert 'app_seconds_bucket{le="+Inf"} 4' in lines
+        assert "app_seconds_sum 2.65" in lines
+        assert "app_seconds_count 4" in lines
+
+    def test_timer_records_elapsed_time(self) -> None:
+        """with 文のブロックの経過時間が記録されることをテストする."""
+        # Arrange
+        stage = self.registry.histogram("app_stage_seconds", "段階", ("stage",)).labels("parse")
+
+        # Act
+        with stage.time():
+            pass
+
+        # Assert
+        assert stage.count == 1
+        assert stage.sum >= 0.0
+
+    def test_label_values_are_escaped(self) -> None:
+        """ラベル値の引用符と改行がエスケープされることをテストする."""
+        # Arrange
+        counter = self.registry.counter("app_errors", "エラー数", ("type",))
+
+        # Act
+        counter.labels('a"b\nc').inc()
+
+        # Assert
+        assert 'app_errors_total{type="a\\"b\\nc"} 1' in self.registry.render()
+
+    def test_wrong_number_of_labels_is_rejected(self) -> None:
+        """ラベルの数が定義と異なる場合はエラーになることをテストする."""
+        counter = self.registry.counter("app_errors", "エラー数", ("type",))
+
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+
+    def test_duplicate_name_is_rejected(self) -> None:
+        """同じ名前のメトリクスを登録するとエラーになることをテストする."""
+        self.registry.counter("app_errors", "エラー数")
+
+        with pytest.raises(ValueError):
+            self.registry.gauge("app_errors", "エラー数")
+
+
+def test_render_stats() -> None:
+    """稼働統計の数値と文字列が Prometheus 形式に変換されることをテストする."""
+    # Act
+    text = render_stats(
+        {"resilience": {"hedgeWins": 2, "circuitState": "closed", "enabled": True}}
+    )
+
+    # Assert
+    lines = text.splitlines()
+    assert "ad_generator_resilience_hedge_wins 2" in lines
+    assert 'ad_generator_resilience_circuit_state{value="closed"} 1' in lines
+    assert not any("enabled" in line for line in lines)
@@ -0,0 +1,165 @@
+"""モデルルーターのユニットテスト."""
+
+from functools import partial
+from typing import List
+
+import pytest
+
+from app.domain.entities import AdInput, Tone
+from app.infrastructure.model_routing import ModelProfile, ModelRouter, RoutingPolicy
+from tests.conftest import FakeClock, make_ad_input
+
+SONNET = "claude-3-5-sonnet-20241022"
+HAIKU = "claude-3-5-haiku-20241022"
+OPUS = "claude-opus-4-20250514"
+
+
+_ad_input = partial(make_ad_input, num_copies=3, tone=Tone.PROFESSIONAL)
+
+
+class TestModelProfile:
+    """ModelProfileのテスト."""
+
+    def test_cost_includes_prompt_cache_prices(self) -> None:
+        """プロンプトキャッシュの書き込み・読み込みの料金を含めて見積もることをテストする."""
+        profile = ModelProfile.from_name(SONNET)
+
+        cost = profile.cost(
+            input_tokens=1_000_000,
+            output_tokens=1_000_000,
+            cache_creation_input_tokens=1_000_000,
+            cache_read_input_tokens=1_000_000,
+        )
+
+        assert cost == pytest.approx(3.0 + 15.0 + 3.75 + 0.3)
+
+    def test_unknown_model_has_no_price(self) -> None:
+        """料金表にないモデルは料金を見積もらないことをテストする."""
+        profile = ModelProfile.from_name("unknown-model")
+
+        assert not profile.has_price
+        assert profile.cost(1000, 1000) == 0.0
+
+
+class TestModelRouter:
+    """ModelRouterのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.clock = FakeClock(now=0.0)
+
+    def _router(self, **kwargs) -> ModelRouter:
+        kwargs.setdefault("clock", self.clock)
+        return ModelRouter(
+            [ModelProfile.from_name(name) for name in (SONNET, OPUS, HAIKU)],
+            RoutingPolicy(quality_models=(SONNET, OPUS), fast_models=(HAIKU,)),
+            **kwargs,
+        )
+
+    @staticmethod
+    def _names(router: ModelRouter, ad_input: AdInput) -> List[str]:
+        return [profile.name for profile in router.candidates(ad_input)]
+
+    def test_professional_copy_prefers_quality_models(self) -> None:
+        """専門的なトーンの複数件の生成は品質を重視するモデルを優先することをテストする."""
+        router = self._router()
+
+        assert self._names(router, _ad_input(num_copies=3, tone=Tone.FORMAL)) == [SONNET, OPUS, HAIKU]
+
+    @pytest.mark.parametrize(
+        "ad_input",
+        [_ad_input(num_copies=1, tone=Tone.FORMAL), _ad_input(num_copies=5, tone=Tone.CASUAL)],
+    )
+    def test_single_copy_or_casual_tone_prefers_fast_models(self, ad_input: AdInput) -> None:
+        """1件の生成やくだけたトーンは高速なモデルを優先することをテストする."""
+        router = self._router()
+
+        assert self._names(router, ad_input) == [HAIKU, SONNET, OPUS]
+
+    def test_throttled_model_is_tried_last_until_cooldown_ends(self) -> None:
+        """スロットリングされたモデルは retry-after の間だけ最後に回すことをテストする."""
+        # Arrange
+        router = self._router()
+
+        # Act
+        router.record_throttled(SONNET, retry_after=5.0)
+        during_cooldown = self._names(router, _ad_input())
+        self.clock.now = 5.0
+        after_cooldown = self._names(router, _ad_input())
+
+        # Assert
+        assert during_cooldown == [OPUS, HAIKU, SONNET]
+        assert after_cooldown == [SONNET, OPUS, HAIKU]
+        assert router.stats[SONNET].throttled == 1
+
+    def test_throttled_model_without_retry_after_uses_cooldown(self) -> None:
+        """retry-after がない場合は既定の秒数だけ後回しにすることをテストする."""
+        router = self._router(throttle_cooldown=2.0)
+
+        router.record_throttled(HAIKU)
+        self.clock.now = 1.0
+        during_cooldown = self._names(router, _ad_input(num_copies=1))
+        self.clock.now = 2.0
+
+        assert during_cooldown == [SONNET, OPUS, HAIKU]
+        assert self._names(router, _ad_input(num_copies=1)) == [HAIKU, SONNET, OPUS]
+
+    def test_slow_model_is_demoted_within_its_group(self) -> None:
+        """直近のレイテンシが上限を超えるモデルは同じ区分の中で後に回すことをテストする."""
+        # Arrange
+        router = self._router(latency_budget=2.0, min_samples=3)
+
+        # Act
+        for _ in range(3):
+            router.record_success(SONNET, latency=5.0)
+            router.record_success(OPUS, latency=1.0)
+
+        # Assert
+        assert self._names(router, _ad_input()) == [OPUS, SONNET, HAIKU]
+
+    def test_latency_is_ignored_until_enough_samples(self) -> None:
+        """記録が少ない間はレイテンシで並べ替えないことをテストする."""
+        router = self._router(latency_budget=2.0, min_samples=3)
+
+        router.record_success(SONNET, latency=5.0)
+
+        assert self._names(router, _ad_input()) == [SONNET, OPUS, HAIKU]
+
+    def test_expensive_model_is_demoted_by_cost_budget(self) -> None:
+        """見積もり料金が上限を超えるモデルは後に回すことをテストする."""
+        # Arrange
+        router = ModelRouter(
+            [ModelProfile.from_name(name) for name in (OPUS, SONNET)],
+            RoutingPolicy(quality_models=(OPUS, SONNET)),
+            cost_budget=0.01,
+        )
+
+        # Act
+        before = self._names(router, _ad_input())
+        router.record_success(OPUS, latency=1.0, input_tokens=500, output_tokens=500)
+
+        # Assert
+        # Opus: 500 * 15 / 1M + 500 * 75 / 1M = 0.045 ドル、Sonnet: 0.009 ドル
+        assert before == [OPUS, SONNET]
+        assert self._names(router, _ad_input()) == [SONNET, OPUS]
+
+    def test_record_success_accumulates_cost_and_latency(self) -> None:
+        """成功したリクエストの料金とレイテンシを記録することをテストする."""
+        router = self._router()
+
+        cost = router.record_success(HAIKU, latency=0.5, input_tokens=1000, output_tokens=2000)
+        router.record_success(HAIKU, latency=1.5)
+
+        stats = router.to_dict()[HAIKU]
+        assert cost == pytest.approx((1000 * 0.8 + 2000 * 4.0) / 1_000_000)
+        assert stats["requests"] == 2
+        assert stats["costUsd"] == pytest.approx(cost)
+        assert stats["meanLatencySeconds"] == pytest.approx(1.0)
+
+    def test_policy_models_require_profiles(self) -> None:
+        """ポリシーのモデルにプロファイルがない場合はエラーになることをテストする."""
+        with pytest.raises(ValueError, match=HAIKU):
+            ModelRouter(
+                [ModelProfile.from_name(SONNET)],
+                RoutingPolicy(quality_models=(SONNET,), fast_models=(HAIKU,)),
+            )
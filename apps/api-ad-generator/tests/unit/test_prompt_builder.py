@@ -0,0 +1,129 @@
+"""プロンプトビルダーのユニットテスト."""
+
+import dataclasses
+
+import pytest
+
+from app.domain.entities import AdInput, Tone
+from app.infrastructure.clients.prompt_builder import (
+    AD_COPIES_TOOL,
+    MIN_CACHEABLE_PROMPT_TOKENS,
+    STRUCTURED_SYSTEM_PROMPT,
+    SYSTEM_PROMPT,
+    AdCopyPromptBuilder,
+    PromptTemplate,
+)
+
+
+class TestPromptTemplate:
+    """事前解析したテンプレートのテスト."""
+
+    def test_render_matches_str_format(self) -> None:
+        """str.format と同じ文字列を組み立てることをテストする."""
+        template = "{a}と{b}の{a}。{{括弧}}"
+
+        assert PromptTemplate(template).render(a="1", b="2") == template.format(a="1", b="2")
+
+    def test_format_spec_is_rejected(self) -> None:
+        """書式指定を含むテンプレートはエラーになることをテストする."""
+        with pytest.raises(ValueError):
+            PromptTemplate("{value:>10}")
+
+    def test_missing_value_raises_key_error(self) -> None:
+        """値が足りない場合は KeyError になることをテストする."""
+        with pytest.raises(KeyError):
+            PromptTemplate("{a}{b}").render(a="1")
+
+
+class TestAdCopyPromptBuilder:
+    """プロンプトビルダーのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.ad_input = AdInput(
+            product_name="Test Product",
+            target_audience="20代女性",
+            appeal_points=["ポイント1", "ポイント2"],
+            tone=Tone.CASUAL,
+            num_copies=3,
+        )
+
+    def test_system_block_is_marked_for_caching(self) -> None:
+        """システムプロンプトにキャッシュの指定が付くことをテストする."""
+        # Act
+        builder = AdCopyPromptBuilder(min_cache_tokens=100)
+
+        # Assert
+        assert builder.prompt_cached is True
+        assert builder.system() == [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_short_prefix_is_not_marked_for_caching(self) -> None:
+        """共通部分がキャッシュできる最小のトークン数に満たない場合は指定を付けないことをテストする."""
+        # Act
+        builder = AdCopyPromptBuilder()
+
+        # Assert
+        assert builder.prefix_tokens < MIN_CACHEABLE_PROMPT_TOKENS
+        assert builder.prompt_cached is False
+        assert builder.system() == [{"type": "text", "text": SYSTEM_PROMPT}]
+
+    def test_system_block_without_caching(self) -> None:
+        """キャッシュを無効にするとキャッシュの指定が付かないことをテストする."""
+        # Act
+        system = AdCopyPromptBuilder(cache_system_prompt=False).system()
+
+        # Assert
+        assert system == [{"type": "text", "text": SYSTEM_PROMPT}]
+
+    def test_system_block_is_shared(self) -> None:
+        """システムプロンプトのブロックをリクエストごとに作り直さないことをテストする."""
+        builder = AdCopyPromptBuilder()
+
+        assert builder.system()[0] is builder.system()[0]
+
+    def test_user_content_contains_only_request_fields(self) -> None:
+        """ユーザーメッセージには商品情報のみが含まれることをテストする."""
+        # Act
+        content = AdCopyPromptBuilder().user_content(self.ad_input)
+
+        # Assert
+        assert "3つ作成" in content
+        assert "商品・サービス名: Test Product" in content
+        assert "ターゲット層: 20代女性" in content
+        assert "- ポイント1\n- ポイント2" in content
+        assert content.endswith(f"\nトーン: {Tone.CASUAL.get_description()}")
+        assert "出力形式例" not in content
+
+    def test_user_content_without_tone(self) -> None:
+        """トーンを指定しない場合はトーンの行が含まれないことをテストする."""
+        # Arrange
+        self.ad_input = dataclasses.replace(self.ad_input, tone=None)
+
+        # Act
+        content = AdCopyPromptBuilder().user_content(self.ad_input)
+
+        # Assert
+        assert "トーン" not in content
+        assert content.endswith("- ポイント2")
+
+    def test_structured_output_forces_ad_copies_tool(self) -> None:
+        """構造化出力ではツールの呼び出しを強制し、出力形式を文章で指示しないことをテストする."""
+        # Arrange
+        builder = AdCopyPromptBuilder(structured_output=True)
+
+        # Act
+        params = builder.output_params()
+
+        # Assert
+        assert params == {
+            "tools": [AD_COPIES_TOOL],
+            "tool_choice": {"type": "tool", "name": AD_COPIES_TOOL["name"]},
+        }
+        assert builder.system()[0]["text"] == STRUCTURED_SYSTEM_PROMPT
+        assert "出力形式例" not in STRUCTURED_SYSTEM_PROMPT
+
+    def test_text_output_has_no_output_params(self) -> None:
+        """構造化出力でない場合は追加のパラメータがないことをテストする."""
+        assert AdCopyPromptBuilder().output_params() == {}
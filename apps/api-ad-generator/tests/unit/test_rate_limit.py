@@ -0,0 +1,242 @@
+"""クライアント側のレート制限のユニットテスト."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.infrastructure.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    RequestPriority,
+    SQLiteRateLimitStore,
+    TokenBucket,
+    estimate_message_tokens,
+    request_priority,
+)
+from tests.conftest import FakeClock
+
+
+class TestTokenBucket:
+    """トークンバケットの計算のテスト."""
+
+    def test_refill_is_capped_at_capacity(self) -> None:
+        """補充量が容量を超えないことをテストする."""
+        bucket = TokenBucket(per_minute=60)
+
+        assert bucket.refill(0.0, 10.0) == 10.0
+        assert bucket.refill(55.0, 10.0) == 60.0
+
+    def test_time_until_accounts_for_reserve(self) -> None:
+        """予約する容量の分も待ち時間に含めることをテストする."""
+        bucket = TokenBucket(per_minute=60)
+
+        assert bucket.time_until(10.0, 5.0) == 0.0
+        assert bucket.time_until(10.0, 15.0) == pytest.approx(5.0)
+        assert bucket.time_until(10.0, 5.0, reserve_ratio=0.5) == pytest.approx(25.0)
+
+    def test_amount_larger_than_capacity_waits_for_full_bucket(self) -> None:
+        """容量を超える量は満杯になれば取り出せることをテストする."""
+        bucket = TokenBucket(per_minute=60)
+
+        assert bucket.time_until(60.0, 1000.0) == 0.0
+
+
+class TestInMemoryRateLimitStore:
+    """プロセス内のストアのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.clock = FakeClock()
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute_is_enforced(self) -> None:
+        """1分あたりのリクエスト数を超えると待ち時間が返されることをテストする."""
+        # Arrange
+        store = InMemoryRateLimitStore(requests_per_minute=3, clock=self.clock)
+
+        # Act
+        waits = [await store.take(0) for _ in range(4)]
+
+        # Assert
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(20.0)
+
+    @pytest.mark.asyncio
+    async def test_take_is_all_or_nothing(self) -> None:
+        """トークンが足りない場合はリクエスト数も消費しないことをテストする."""
+        # Arrange
+        store = InMemoryRateLimitStore(
+            requests_per_minute=2, tokens_per_minute=600, clock=self.clock
+        )
+
+        # Act
+        first = await store.take(500)
+        second = await store.take(500)
+        third = await store.take(100)
+
+        # Assert
+        assert first == 0.0
+        assert second == pytest.approx(40.0)
+        assert third == 0.0
+
+    @pytest.mark.asyncio
+    async def test_bucket_refills_over_time(self) -> None:
+        """時間の経過で残量が補充されることをテストする."""
+        # Arrange
+        store = InMemoryRateLimitStore(tokens_per_minute=600, clock=self.clock)
+        await store.take(600)
+
+        # Act
+        before = await store.take(100)
+        self.clock.now += 10.0
+        after = await store.take(100)
+
+        # Assert
+        assert before == pytest.approx(10.0)
+        assert after == 0.0
+
+    @pytest.mark.asyncio
+    async def test_give_back_restores_tokens(self) -> None:
+        """戻したトークンをすぐに再利用できることをテストする."""
+        # Arrange
+        store = InMemoryRateLimitStore(tokens_per_minute=600, clock=self.clock)
+        await store.take(600)
+
+        # Act
+        await store.give_back(400)
+        wait = await store.take(400)
+
+        # Assert
+        assert wait == 0.0
+
+
+class TestSQLiteRateLimitStore:
+    """複数ワーカーで共有するストアのテスト."""
+
+    @pytest.mark.asyncio
+    async def test_budget_is_shared_between_workers(self, tmp_path) -> None:
+        """同じファイルを使うストア間で上限が共有されることをテストする."""
+        # Arrange
+        clock = FakeClock()
+        path = str(tmp_path / "rate_limit.sqlite3")
+        workers = [
+            SQLiteRateLimitStore(path, requests_per_minute=10, clock=clock) for _ in range(3)
+        ]
+
+        # Act
+        waits = await asyncio.gather(*(workers[i % 3].take(0) for i in range(15)))
+
+        # Assert
+        assert sum(1 for wait in waits if wait == 0.0) == 10
+        for worker in workers:
+            worker.close()
+
+    @pytest.mark.asyncio
+    async def test_state_survives_reopen(self, tmp_path) -> None:
+        """ワーカーを再起動しても残量が引き継がれることをテストする."""
+        # Arrange
+        clock = FakeClock()
+        path = str(tmp_path / "rate_limit.sqlite3")
+        store = SQLiteRateLimitStore(path, tokens_per_minute=600, clock=clock)
+        await store.take(600)
+        store.close()
+
+        # Act
+        reopened = SQLiteRateLimitStore(path, tokens_per_minute=600, clock=clock)
+        wait = await reopened.take(60)
+        reopened.close()
+
+        # Assert
+        assert wait == pytest.approx(6.0)
+
+
+class TestRateLimiter:
+    """優先度付きのレート制限のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_goes_ahead_of_bulk(self) -> None:
+        """後から来た対話的な呼び出しが先に割り当てられることをテストする."""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitStore(tokens_per_minute=6000), bulk_reserve_ratio=0.0)
+        await limiter.acquire(6000)
+        order: List[str] = []
+
+        async def acquire(name: str, priority: RequestPriority) -> None:
+            await limiter.acquire(50, priority)
+            order.append(name)
+
+        # Act
+        bulk = asyncio.create_task(acquire("bulk", RequestPriority.BULK))
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(acquire("interactive", RequestPriority.INTERACTIVE))
+        await asyncio.gather(bulk, interactive)
+
+        # Assert
+        assert order == ["interactive", "bulk"]
+        assert limiter.stats.waited == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_leaves_reserve_for_interactive(self) -> None:
+        """一括処理の呼び出しが予約された容量を使わないことをテストする."""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitStore(requests_per_minute=10), bulk_reserve_ratio=0.5)
+        for _ in range(5):
+            await limiter.acquire(0, RequestPriority.BULK)
+
+        # Act
+        bulk = asyncio.create_task(limiter.acquire(0, RequestPriority.BULK))
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(limiter.acquire(0, RequestPriority.INTERACTIVE), timeout=1.0)
+
+        # Assert
+        assert not bulk.done()
+        bulk.cancel()
+        await asyncio.gather(bulk, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_priority_defaults_to_request_context(self) -> None:
+        """優先度を省略するとリクエストの優先度が使われることをテストする."""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitStore(requests_per_minute=10), bulk_reserve_ratio=0.5)
+        for _ in range(5):
+            await limiter.acquire(0)
+
+        # Act
+        token = request_priority.set(RequestPriority.BULK)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(limiter.acquire(0), timeout=0.05)
+        finally:
+            request_priority.reset(token)
+
+        # Assert
+        await asyncio.wait_for(limiter.acquire(0), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_block_queue(self) -> None:
+        """キャンセルされた呼び出しが待ち行列に残らないことをテストする."""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitStore(tokens_per_minute=6000))
+        await limiter.acquire(6000)
+        head = asyncio.create_task(limiter.acquire(6000))
+        await asyncio.sleep(0.01)
+
+        # Act
+        follower = asyncio.create_task(limiter.acquire(10))
+        await asyncio.sleep(0.01)
+        head.cancel()
+
+        # Assert
+        await asyncio.wait_for(follower, timeout=1.0)
+
+
+def test_estimate_message_tokens() -> None:
+    """プロンプトのバイト数と max_tokens からトークン数を見積もることをテストする."""
+    params = {
+        "max_tokens": 2000,
+        "messages": [{"role": "user", "content": "あいうえお" + "a" * 15}],
+    }
+
+    # 日本語5文字（15バイト）と英字15文字（15バイト）で30バイト
+    assert estimate_message_tokens(params) == 10 + 2000
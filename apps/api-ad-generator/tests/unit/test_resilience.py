@@ -0,0 +1,403 @@
+"""再試行・サーキットブレーカー・ヘッジリクエストのユニットテスト."""
+
+import asyncio
+import random
+from functools import partial
+from typing import AsyncIterator, List, Optional
+
+import pytest
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import (
+    AdGenerationError,
+    GenerationTimeoutError,
+    ServiceUnavailableError,
+    TransientGenerationError,
+)
+from app.domain.repositories import AdGenerationRepository
+from app.infrastructure.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    LatencyTracker,
+    ResilientAdGenerationRepository,
+    RetryPolicy,
+    parse_retry_after,
+)
+from tests.conftest import FakeClock, make_ad_input
+
+_ad_input = partial(make_ad_input, num_copies=2)
+
+
+class ScriptedRepository(AdGenerationRepository):
+    """呼び出しごとに指定したレイテンシと例外で応答するリポジトリ."""
+
+    def __init__(
+        self,
+        errors: Optional[List[Optional[Exception]]] = None,
+        latencies: Optional[List[float]] = None,
+        num_streamed_before_error: int = 0,
+    ) -> None:
+        self.errors = errors or []
+        self.latencies = latencies or []
+        self.num_streamed_before_error = num_streamed_before_error
+        self.calls = 0
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        call = self.calls
+        self.calls += 1
+        if call < len(self.latencies):
+            await asyncio.sleep(self.latencies[call])
+        if call < len(self.errors) and self.errors[call] is not None:
+            raise self.errors[call]
+        return [AdCopy(copy_text=f"{call}回目の広告文{i}") for i in range(ad_input.num_copies)]
+
+    async def stream_ad_copies(self, ad_input: AdInput) -> AsyncIterator[AdCopy]:
+        call = self.calls
+        self.calls += 1
+        error = self.errors[call] if call < len(self.errors) else None
+        for i in range(ad_input.num_copies):
+            if error is not None and i >= self.num_streamed_before_error:
+                raise error
+            await asyncio.sleep(0)
+            yield AdCopy(copy_text=f"{call}回目の広告文{i}")
+
+
+class RecordingSleep:
+    """待機時間を記録し、実際には待たない sleep."""
+
+    def __init__(self) -> None:
+        self.delays: List[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+
+
+class TestRetryPolicy:
+    """再試行ポリシーのテスト."""
+
+    def test_backoff_is_jittered_within_exponential_ceiling(self) -> None:
+        """待ち時間が指数的に増える上限の範囲で分散することをテストする."""
+        # Arrange
+        policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+        rng = random.Random(0)
+
+        # Act
+        delays = [[policy.backoff(n, rng=rng) for _ in range(200)] for n in range(5)]
+
+        # Assert
+        for n, samples in enumerate(delays):
+            ceiling = min(4.0, 0.5 * 2 ** n)
+            assert all(0.0 <= delay <= ceiling for delay in samples)
+            # 全てが同じ値にならずに分散している
+            assert max(samples) - min(samples) > ceiling / 2
+
+    def test_backoff_waits_at_least_retry_after(self) -> None:
+        """retry-after が指定された場合はその秒数以上待つことをテストする."""
+        # Arrange
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+
+        # Act
+        delays = [policy.backoff(0, retry_after=3.0, rng=random.Random(i)) for i in range(20)]
+
+        # Assert
+        assert all(delay == 3.0 for delay in delays)
+
+    @pytest.mark.parametrize(
+        "headers, expected",
+        [
+            ({"retry-after": "2"}, 2.0),
+            ({"retry-after": "0.5"}, 0.5),
+            ({"retry-after-ms": "1500", "retry-after": "9"}, 1.5),
+            ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+            ({"retry-after": "invalid"}, None),
+            ({}, None),
+        ],
+    )
+    def test_parse_retry_after(self, headers, expected) -> None:
+        """retry-after ヘッダーを秒数に変換できることをテストする."""
+        assert parse_retry_after(headers) == expected
+
+
+class TestCircuitBreaker:
+    """サーキットブレーカーのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.clock = FakeClock(now=0.0)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        """連続失敗数がしきい値に達すると開状態になることをテストする."""
+        # Act
+        for _ in range(2):
+            self.breaker.acquire()
+            self.breaker.record_failure()
+        state_before = self.breaker.state
+        self.breaker.acquire()
+        self.breaker.record_failure()
+
+        # Assert
+        assert state_before == CircuitState.CLOSED
+        assert self.breaker.state == CircuitState.OPEN
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            self.breaker.acquire()
+        assert exc_info.value.retry_after == 10.0
+
+    def test_success_resets_failure_count(self) -> None:
+        """成功すると連続失敗数がリセットされることをテストする."""
+        # Act
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+
+        # Assert
+        assert self.breaker.state == CircuitState.CLOSED
+
+    def test_half_open_allows_single_probe(self) -> None:
+        """リセット時間の経過後は1件だけ試行を通すことをテストする."""
+        # Arrange
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10.0
+
+        # Act
+        self.breaker.acquire()
+
+        # Assert
+        assert self.breaker.state == CircuitState.HALF_OPEN
+        with pytest.raises(ServiceUnavailableError):
+            self.breaker.acquire()
+
+    def test_probe_result_closes_or_reopens(self) -> None:
+        """試行の成否で閉状態または開状態に戻ることをテストする."""
+        # Arrange
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10.0
+
+        # Act & Assert
+        self.breaker.acquire()
+        self.breaker.record_failure()
+        assert self.breaker.state == CircuitState.OPEN
+
+        self.clock.now = 20.0
+        self.breaker.acquire()
+        self.breaker.record_success()
+        assert self.breaker.state == CircuitState.CLOSED
+
+
+class TestLatencyTracker:
+    """レイテンシのトラッカーのテスト."""
+
+    def test_quantile_requires_min_samples(self) -> None:
+        """記録が最小件数に満たない場合は分位点を返さないことをテストする."""
+        # Arrange
+        tracker = LatencyTracker(min_samples=5)
+        for latency in [0.1, 0.2, 0.3, 0.4]:
+            tracker.record(latency)
+
+        # Act & Assert
+        assert tracker.quantile(0.95) is None
+        tracker.record(0.5)
+        assert tracker.quantile(0.95) == 0.5
+
+    def test_quantile_uses_recent_window(self) -> None:
+        """直近 window 件のみから分位点を計算することをテストする."""
+        # Arrange
+        tracker = LatencyTracker(window=100, min_samples=1)
+        for _ in range(100):
+            tracker.record(10.0)
+        for i in range(100):
+            tracker.record(i / 100)
+
+        # Act
+        p95 = tracker.quantile(0.95)
+
+        # Assert
+        assert p95 == pytest.approx(0.94)
+
+
+class TestResilientAdGenerationRepository:
+    """再試行・期限・サーキットブレーカー・ヘッジを備えたリポジトリのテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.sleep = RecordingSleep()
+
+    def _repository(self, inner: AdGenerationRepository, **kwargs) -> ResilientAdGenerationRepository:
+        kwargs.setdefault("retry_policy", RetryPolicy(max_retries=3, base_delay=0.1, max_delay=1.0))
+        return ResilientAdGenerationRepository(
+            inner, sleep=self.sleep, rng=random.Random(0), **kwargs
+        )
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self) -> None:
+        """一時的なエラーは再試行されることをテストする."""
+        # Arrange
+        inner = ScriptedRepository(
+            errors=[TransientGenerationError("overloaded"), TransientGenerationError("overloaded")]
+        )
+        repository = self._repository(inner)
+
+        # Act
+        ad_copies = await repository.generate_ad_copies(_ad_input())
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == ["2回目の広告文0", "2回目の広告文1"]
+        assert inner.calls == 3
+        assert len(self.sleep.delays) == 2
+        assert all(0.0 <= delay <= 0.2 for delay in self.sleep.delays)
+        assert repository.stats.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_honors_retry_after(self) -> None:
+        """retry-after の秒数以上待ってから再試行することをテストする."""
+        # Arrange
+        inner = ScriptedRepository(errors=[TransientGenerationError("rate limited", retry_after=2.5)])
+        repository = self._repository(inner)
+
+        # Act
+        await repository.generate_ad_copies(_ad_input())
+
+        # Assert
+        assert self.sleep.delays == [2.5]
+
+    @pytest.mark.asyncio
+    async def test_non_transient_errors_are_not_retried(self) -> None:
+        """一時的でないエラーは再試行されないことをテストする."""
+        # Arrange
+        inner = ScriptedRepository(errors=[AdGenerationError("レスポンスのパースに失敗しました")])
+        repository = self._repository(inner)
+
+        # Act & Assert
+        with pytest.raises(AdGenerationError, match="パースに失敗しました"):
+            await repository.generate_ad_copies(_ad_input())
+        assert inner.calls == 1
+        assert self.sleep.delays == []
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self) -> None:
+        """再試行の上限に達すると最後のエラーを送出することをテストする."""
+        # Arrange
+        inner = ScriptedRepository(errors=[TransientGenerationError(f"overloaded {i}") for i in range(10)])
+        repository = self._repository(inner)
+
+        # Act & Assert
+        with pytest.raises(TransientGenerationError, match="overloaded 3"):
+            await repository.generate_ad_copies(_ad_input())
+        assert inner.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_is_not_waited(self) -> None:
+        """待っている間に期限を過ぎる場合は再試行しないことをテストする."""
+        # Arrange
+        inner = ScriptedRepository(errors=[TransientGenerationError("rate limited", retry_after=30.0)])
+        repository = self._repository(inner, deadline=5.0)
+
+        # Act & Assert
+        with pytest.raises(TransientGenerationError) as exc_info:
+            await repository.generate_ad_copies(_ad_input())
+        assert exc_info.value.retry_after == 30.0
+        assert self.sleep.delays == []
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_slow_generation(self) -> None:
+        """期限を過ぎた生成は GenerationTimeoutError になることをテストする."""
+        # Arrange
+        inner = ScriptedRepository(latencies=[1.0])
+        repository = self._repository(inner, deadline=0.05)
+
+        # Act & Assert
+        with pytest.raises(GenerationTimeoutError):
+            await repository.generate_ad_copies(_ad_input())
+        assert repository.stats.deadline_exceeded == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self) -> None:
+        """サーキットブレーカーが開くと上流を呼び出さずに失敗することをテストする."""
+        # Arrange
+        inner = ScriptedRepository(errors=[TransientGenerationError("overloaded")] * 10)
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+        repository = self._repository(
+            inner, retry_policy=RetryPolicy(max_retries=0), circuit_breaker=breaker
+        )
+        for _ in range(2):
+            with pytest.raises(TransientGenerationError):
+                await repository.generate_ad_copies(_ad_input())
+
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await repository.generate_ad_copies(_ad_input())
+        assert not isinstance(exc_info.value, TransientGenerationError)
+        assert exc_info.value.retry_after == pytest.approx(30.0, abs=1.0)
+        assert inner.calls == 2
+        assert repository.stats.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_request_is_hedged(self) -> None:
+        """分位点を超えた生成はもう1件並行して生成し、早い方を返すことをテストする."""
+        # Arrange
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(0.01)
+        inner = ScriptedRepository(latencies=[1.0, 0.0])
+        repository = self._repository(inner, hedge_quantile=0.95, latency_tracker=tracker)
+
+        # Act
+        started = asyncio.get_running_loop().time()
+        ad_copies = await repository.generate_ad_copies(_ad_input())
+        elapsed = asyncio.get_running_loop().time() - started
+
+        # Assert
+        assert ad_copies[0].copy_text == "1回目の広告文0"
+        assert elapsed < 0.5
+        assert repository.stats.hedges == 1
+        assert repository.stats.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_request_is_not_hedged(self) -> None:
+        """分位点より早く終わった生成はヘッジしないことをテストする."""
+        # Arrange
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(1.0)
+        inner = ScriptedRepository(latencies=[0.0])
+        repository = self._repository(inner, hedge_quantile=0.95, latency_tracker=tracker)
+
+        # Act
+        await repository.generate_ad_copies(_ad_input())
+
+        # Assert
+        assert inner.calls == 1
+        assert repository.stats.hedges == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_retries_before_first_copy(self) -> None:
+        """最初の広告文を返す前の一時的なエラーは再試行されることをテストする."""
+        # Arrange
+        inner = ScriptedRepository(errors=[TransientGenerationError("overloaded")])
+        repository = self._repository(inner)
+
+        # Act
+        ad_copies = [ad_copy async for ad_copy in repository.stream_ad_copies(_ad_input())]
+
+        # Assert
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == ["1回目の広告文0", "1回目の広告文1"]
+        assert inner.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_does_not_retry_after_first_copy(self) -> None:
+        """広告文を返し始めた後のエラーは再試行されないことをテストする."""
+        # Arrange
+        inner = ScriptedRepository(
+            errors=[TransientGenerationError("overloaded")], num_streamed_before_error=1
+        )
+        repository = self._repository(inner)
+        ad_copies = []
+
+        # Act & Assert
+        with pytest.raises(TransientGenerationError):
+            async for ad_copy in repository.stream_ad_copies(_ad_input()):
+                ad_copies.append(ad_copy)
+        assert [ad_copy.copy_text for ad_copy in ad_copies] == ["0回目の広告文0"]
+        assert inner.calls == 1
@@ -0,0 +1,62 @@
+"""レスポンスの JSON 変換のユニットテスト."""
+
+import json
+from typing import List
+
+from app.domain.entities import AdCopy, AdCopyEvaluation
+from app.infrastructure.api.models import (
+    AdCopyGenerationResponse,
+    GeneratedAdCopyResponse,
+)
+from app.infrastructure.api.responses import (
+    FastJSONResponse,
+    ad_copies_to_dicts,
+    ad_copy_to_dict,
+    dump_json,
+)
+
+
+def _ad_copies() -> List[AdCopy]:
+    return [
+        AdCopy(
+            copy_text="毎日の健康管理を、もっとスマートに",
+            headline="Watch X 新登場",
+            call_to_action="今すぐ予約！",
+            evaluation=AdCopyEvaluation(
+                relevance_score=0.9,
+                creativity_score=0.75,
+                target_audience_appeal="忙しいビジネスパーソンに響く",
+            ),
+        ),
+        AdCopy(copy_text="評価なしの広告文"),
+    ]
+
+
+class TestFastJSONResponse:
+    """レスポンスの JSON 変換のテスト."""
+
+    def test_ad_copy_matches_response_model(self) -> None:
+        """広告文の辞書がレスポンスモデルの出力と一致することをテストする."""
+        # Arrange
+        ad_copy = _ad_copies()[0]
+        model = GeneratedAdCopyResponse.model_validate(ad_copy_to_dict(ad_copy))
+
+        # Act
+        payload = json.loads(dump_json(ad_copy_to_dict(ad_copy)))
+
+        # Assert
+        assert payload == json.loads(model.model_dump_json(by_alias=True))
+
+    def test_body_matches_response_model(self) -> None:
+        """レスポンスボディがレスポンスモデルの出力と一致することをテストする."""
+        # Arrange
+        content = {"generatedCopies": ad_copies_to_dicts(_ad_copies())}
+        model = AdCopyGenerationResponse.model_validate(content)
+
+        # Act
+        response = FastJSONResponse(content)
+
+        # Assert
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == json.loads(model.model_dump_json(by_alias=True))
+        assert response.body.decode("utf-8").startswith('{"generatedCopies":[{"copyText":"毎日')
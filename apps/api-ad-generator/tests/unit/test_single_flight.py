@@ -0,0 +1,146 @@
+"""リクエスト集約のユニットテスト."""
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from app.domain.entities import AdCopy, AdInput
+from app.domain.exceptions import AdGenerationError
+from app.domain.repositories import AdGenerationRepository
+from app.infrastructure.cache import SingleFlightAdGenerationRepository
+from tests.conftest import make_ad_input
+
+
+class SlowRepository(AdGenerationRepository):
+    """完了をテスト側から制御できるリポジトリ."""
+
+    def __init__(self) -> None:
+        self.call_count = 0
+        self.release = asyncio.Event()
+        self.error: Optional[Exception] = None
+        self.cancelled = False
+
+    async def generate_ad_copies(self, ad_input: AdInput) -> List[AdCopy]:
+        self.call_count += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return [AdCopy(copy_text=f"{ad_input.product_name}の広告文")]
+
+
+class TestSingleFlightAdGenerationRepository:
+    """SingleFlightAdGenerationRepositoryのテスト."""
+
+    def setup_method(self) -> None:
+        """テスト前の準備."""
+        self.inner = SlowRepository()
+        self.repository = SingleFlightAdGenerationRepository(self.inner)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_call(self) -> None:
+        """同時の重複リクエストが1回の生成を共有することをテストする."""
+        # Act
+        tasks = [
+            asyncio.create_task(self.repository.generate_ad_copies(make_ad_input()))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        self.inner.release.set()
+        results = await asyncio.gather(*tasks)
+
+        # Assert
+        assert self.inner.call_count == 1
+        assert all(result == results[0] for result in results)
+        assert self.repository.stats.leaders == 1
+        assert self.repository.stats.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_different_inputs_are_not_coalesced(self) -> None:
+        """異なる入力は別々に生成されることをテストする."""
+        # Act
+        tasks = [
+            asyncio.create_task(self.repository.generate_ad_copies(make_ad_input(name)))
+            for name in ["A", "B"]
+        ]
+        await asyncio.sleep(0)
+        self.inner.release.set()
+        await asyncio.gather(*tasks)
+
+        # Assert
+        assert self.inner.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_every_waiter(self) -> None:
+        """エラーが全ての待機側に伝播することをテストする."""
+        # Arrange
+        self.inner.error = AdGenerationError("API Error")
+
+        # Act
+        tasks = [
+            asyncio.create_task(self.repository.generate_ad_copies(make_ad_input()))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        self.inner.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Assert
+        assert self.inner.call_count == 1
+        assert all(isinstance(result, AdGenerationError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_shared_call(self) -> None:
+        """1つの待機側をキャンセルしても共有の生成が継続することをテストする."""
+        # Arrange
+        cancelled = asyncio.create_task(self.repository.generate_ad_copies(make_ad_input()))
+        waiting = asyncio.create_task(self.repository.generate_ad_copies(make_ad_input()))
+        await asyncio.sleep(0)
+
+        # Act
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        self.inner.release.set()
+        result = await waiting
+
+        # Assert
+        assert cancelled.cancelled()
+        assert result == [AdCopy(copy_text="Test Productの広告文")]
+        assert self.inner.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelling_every_waiter_cancels_shared_call(self) -> None:
+        """全ての待機側をキャンセルすると共有の生成もキャンセルされることをテストする."""
+        # Arrange
+        waiters = [
+            asyncio.create_task(self.repository.generate_ad_copies(make_ad_input())) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        # Act
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        # Assert
+        assert all(waiter.cancelled() for waiter in waiters)
+        assert self.inner.cancelled is True
+        assert self.inner.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_completed_call_is_not_reused(self) -> None:
+        """完了した生成結果は後続のリクエストで再利用されないことをテストする."""
+        # Arrange
+        self.inner.release.set()
+
+        # Act
+        await self.repository.generate_ad_copies(make_ad_input())
+        await self.repository.generate_ad_copies(make_ad_input())
+
+        # Assert
+        assert self.inner.call_count == 2
@@ -0,0 +1,122 @@
+"""トレースのユニットテスト."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.infrastructure.tracing import (
+    InMemorySpanExporter,
+    JSONLinesSpanExporter,
+    OpenTelemetryTracer,
+    RecordingTracer,
+    configure_tracing,
+    start_span,
+)
+
+
+class TestTracing:
+    """スパンの記録のテスト."""
+
+    def setup_method(self) -> None:
+        """テストの前準備."""
+        self.exporter = InMemorySpanExporter()
+        configure_tracing(RecordingTracer(self.exporter))
+
+    def teardown_method(self) -> None:
+        """テストの後片付け."""
+        configure_tracing(None)
+
+    def test_disabled_tracing_returns_shared_noop_span(self) -> None:
+        """トレースが無効な場合は共有の no-op スパンが返されることをテストする."""
+        # Arrange
+        configure_tracing(None)
+
+        # Act
+        with start_span("a") as first, start_span("b") as second:
+            first.set_attribute("key", "value")
+
+        # Assert
+        assert first is second
+        assert self.exporter.spans == []
+
+    def test_child_span_inherits_trace(self) -> None:
+        """入れ子のスパンが同じトレースの子になることをテストする."""
+        # Act
+        with start_span("parent", {"ad.num_copies": 3}):
+            with start_span("child") as child:
+                child.set_attribute("gen_ai.usage.input_tokens", 100)
+
+        # Assert
+        child, parent = self.exporter.spans
+        assert parent.parent_span_id is None
+        assert child.trace_id == parent.trace_id
+        assert child.parent_span_id == parent.span_id
+        assert parent.attributes == {"ad.num_copies": 3}
+        assert child.attributes == {"gen_ai.usage.input_tokens": 100}
+        assert parent.start_time_unix_nano <= child.start_time_unix_nano
+        assert child.end_time_unix_nano <= parent.end_time_unix_nano
+
+    def test_exception_marks_span_as_error(self) -> None:
+        """例外で終了したスパンがエラーとして記録されることをテストする."""
+        # Act
+        with pytest.raises(ValueError):
+            with start_span("failing"):
+                raise ValueError("boom")
+
+        # Assert
+        span = self.exporter.spans[0]
+        assert span.status == "ERROR"
+        assert span.status_message == "ValueError: boom"
+        assert span.attributes["exception.type"] == "ValueError"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_parent(self) -> None:
+        """並行するタスクのスパンがそれぞれ同じ親の子になることをテストする."""
+        # Arrange
+        async def work(name: str) -> None:
+            with start_span(name):
+                await asyncio.sleep(0.01)
+
+        # Act
+        with start_span("parent"):
+            await asyncio.gather(work("a"), work("b"))
+
+        # Assert
+        spans = {span.name: span for span in self.exporter.spans}
+        assert spans["a"].parent_span_id == spans["parent"].span_id
+        assert spans["b"].parent_span_id == spans["parent"].span_id
+
+
+def test_json_lines_exporter_appends_to_file(tmp_path) -> None:
+    """スパンが1行1件の JSON としてファイルに追記されることをテストする."""
+    # Arrange
+    path = tmp_path / "traces.jsonl"
+    tracer = RecordingTracer(JSONLinesSpanExporter(path=str(path)))
+    configure_tracing(tracer)
+
+    # Act
+    try:
+        with start_span("parent"):
+            with start_span("child"):
+                pass
+    finally:
+        configure_tracing(None)
+        tracer.shutdown()
+
+    # Assert
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["name"] for record in records] == ["child", "parent"]
+    assert records[0]["parentSpanId"] == records[1]["spanId"]
+    assert records[0]["traceId"] == records[1]["traceId"]
+
+
+def test_open_telemetry_tracer_accepts_attributes() -> None:
+    """OpenTelemetry API 経由でスパンを作成できることをテストする."""
+    pytest.importorskip("opentelemetry")
+    configure_tracing(OpenTelemetryTracer())
+    try:
+        with start_span("span", {"ad.num_copies": 1}) as span:
+            span.set_attribute("gen_ai.usage.output_tokens", 200)
+    finally:
+        configure_tracing(None)